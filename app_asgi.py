@@ -0,0 +1,350 @@
+"""
+AWS Pricing API 서버 - ASGI 버전
+
+app_swagger.py와 같은 경로와 응답 형식을 비동기로 처리하는 ASGI 애플리케이션입니다.
+가격 조회 중에도 요청마다 스레드를 점유하지 않으므로 한 프로세스에서 느린 AWS 호출을
+많이 동시에 진행할 수 있습니다. 캐시, 가격 색인, 속도 제한기는 app_swagger.py의 객체와 공유합니다.
+
+    uvicorn app_asgi:app --port 7777
+    gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn.conf.py app_asgi:app
+
+Swagger 문서(JSON)는 /swagger.json에서 제공합니다 (app_swagger.py와 같은 모델).
+"""
+
+import functools
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+import app_swagger
+import metrics
+import profiling
+from app_swagger import format_stream_event, get_stream_format
+from async_pricing_client import AsyncAWSPricingClient, AsyncPricingCalculator
+
+
+class HTTPRequest:
+    """ASGI 요청 정보 (메서드, 경로, 헤더, 본문)"""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])
+        }
+        self.query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        self.body = body
+        # 일치한 경로 규칙 (지표 레이블, 일치하지 않으면 unmatched)
+        self.route = 'unmatched'
+
+    def get_json(self) -> Optional[Any]:
+        """본문을 JSON으로 파싱합니다 (본문이 없거나 JSON이 아니면 None)."""
+        if not self.body:
+            return None
+        json_codec = app_swagger.json_codec
+        try:
+            return json_codec.loads(self.body)
+        except json_codec.decode_errors:
+            return None
+
+    def query_param(self, name: str) -> Optional[str]:
+        """쿼리 매개변수의 첫 번째 값을 반환합니다 (없으면 None)."""
+        values = self.query.get(name)
+        return values[0] if values else None
+
+    def stream_format(self) -> Optional[str]:
+        """Accept 헤더에 명시된 스트리밍 형식을 반환합니다 (app_swagger.get_stream_format과 같은 규칙)."""
+        return get_stream_format(parse_accept_header(self.headers.get('accept', ''), MIMEAccept))
+
+
+class StreamingBody:
+    """이벤트를 만들어지는 대로 전송할 응답 본문"""
+
+    def __init__(self, events: AsyncIterator[Dict[str, Any]], stream_format: str):
+        self.events = events
+        self.stream_format = stream_format
+
+
+class TextBody:
+    """JSON이 아닌 텍스트 응답 본문 (예: /metrics)"""
+
+    def __init__(self, text: str, content_type: str):
+        self.text = text
+        self.content_type = content_type
+
+
+# 핸들러 반환값: (상태 코드, JSON 본문, StreamingBody 또는 TextBody)
+HandlerResult = Tuple[int, Any]
+
+
+class PricingASGIApp:
+    """app_swagger.py의 엔드포인트를 비동기로 처리하는 ASGI 애플리케이션 클래스"""
+
+    def __init__(self, pricing_client: AsyncAWSPricingClient, pricing_calculator: AsyncPricingCalculator):
+        """
+        PricingASGIApp 초기화
+
+        Args:
+            pricing_client (AsyncAWSPricingClient): 비동기 가격 조회 클라이언트
+            pricing_calculator (AsyncPricingCalculator): 비동기 비용 계산기
+        """
+        self.pricing_client = pricing_client
+        self.pricing_calculator = pricing_calculator
+        self._swagger_schema: Optional[Dict[str, Any]] = None
+        self.routes: List[Tuple[str, 're.Pattern', Callable[..., Awaitable[HandlerResult]]]] = [
+            ('GET', re.compile(r'^/api/services$'), self.get_services),
+            ('GET', re.compile(r'^/api/services/([^/]+)/attributes$'), self.get_service_attributes),
+            ('GET', re.compile(r'^/api/services/([^/]+)/attributes/([^/]+)/values$'), self.get_attribute_values),
+            ('POST', re.compile(r'^/api/pricing$'), self.post_pricing),
+            ('POST', re.compile(r'^/api/calculate$'), self.post_calculate),
+            ('POST', re.compile(r'^/api/calculate/scenarios$'), self.post_calculate_scenarios),
+            ('GET', re.compile(r'^/api/cache/status$'), self.get_cache_status),
+            ('GET', re.compile(r'^/api/filter-documentation$'), self.get_filter_documentation),
+            ('GET', re.compile(r'^/api/?$'), self.get_index),
+            ('GET', re.compile(r'^/swagger\.json$'), self.get_swagger),
+            ('GET', re.compile(r'^/metrics$'), self.get_metrics),
+        ]
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        request = HTTPRequest(scope, body)
+        token = metrics.begin_request() if metrics.metrics_enabled() else None
+        status, payload = await self._dispatch(request)
+        if isinstance(payload, StreamingBody):
+            await self._send_stream(send, payload)
+            if token is not None:
+                metrics.end_request(token, request.method, request.route, status)
+            return
+
+        if isinstance(payload, TextBody):
+            content_type, body = payload.content_type, payload.text.encode('utf-8')
+        else:
+            with metrics.span('serialize'):
+                content_type, body = 'application/json', app_swagger.json_codec.dumps(payload)
+
+        headers = []
+        if token is not None:
+            timing = metrics.end_request(token, request.method, request.route, status)
+            if timing is not None and metrics.server_timing_enabled():
+                headers.append((b'server-timing', timing.server_timing().encode('latin-1')))
+        await self._send_body(send, status, content_type, body, headers)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if app_swagger.catalog_refresher is not None:
+                    app_swagger.catalog_refresher.ensure_started()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if app_swagger.catalog_refresher is not None:
+                    app_swagger.catalog_refresher.stop(timeout=1)
+                await self.pricing_client.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _dispatch(self, request: HTTPRequest) -> HandlerResult:
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            path_matched = True
+            if method == request.method:
+                request.route = pattern.pattern.strip('^$')
+                return await handler(request, *(unquote(group) for group in match.groups()))
+        if path_matched:
+            return 405, {'error': 'Method not allowed'}
+        return 404, {'error': 'Not found'}
+
+    @staticmethod
+    async def _send_body(send: Callable, status: int, content_type: str, body: bytes,
+                         headers: List[Tuple[bytes, bytes]]) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', content_type.encode('latin-1')),
+                (b'content-length', str(len(body)).encode('latin-1'))
+            ] + headers
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _send_stream(send: Callable, stream: StreamingBody) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', stream.stream_format.encode('latin-1')),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')
+            ]
+        })
+        try:
+            async for event in stream.events:
+                await send({
+                    'type': 'http.response.body',
+                    'body': format_stream_event(event, stream.stream_format).encode('utf-8'),
+                    'more_body': True
+                })
+        except Exception as e:
+            # 응답 전송을 시작한 뒤에는 상태 코드를 바꿀 수 없으므로 error 이벤트로 전송
+            await send({
+                'type': 'http.response.body',
+                'body': format_stream_event({'type': 'error', 'error': str(e)}, stream.stream_format).encode('utf-8'),
+                'more_body': True
+            })
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def get_services(self, request: HTTPRequest) -> HandlerResult:
+        """모든 서비스 목록을 반환합니다."""
+        try:
+            return 200, {'services': await self.pricing_client.get_services()}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def get_service_attributes(self, request: HTTPRequest, service_code: str) -> HandlerResult:
+        """특정 서비스의 속성 목록을 반환합니다."""
+        try:
+            attributes = await self.pricing_client.get_service_attributes(service_code)
+            return 200, {'serviceCode': service_code, 'attributes': attributes}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def get_attribute_values(self, request: HTTPRequest, service_code: str, attribute_name: str) -> HandlerResult:
+        """특정 서비스의 특정 속성에 대한 가능한 값 목록을 반환합니다."""
+        try:
+            values = await self.pricing_client.get_attribute_values(service_code, attribute_name)
+            if not values:
+                values = [f'Invalid attribute name "{attribute_name}". Please check the correct attribute name.']
+            return 200, {'serviceCode': service_code, 'attributeName': attribute_name, 'values': values}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def post_pricing(self, request: HTTPRequest) -> HandlerResult:
+        """입력받은 AWS 리소스 정보를 기반으로 가격을 계산하여 반환합니다."""
+        try:
+            data = request.get_json()
+            if not data:
+                return 400, {'error': 'No data provided'}
+
+            service_code = data.get('serviceCode')
+            filters = data.get('filters', [])
+            if not service_code:
+                return 400, {'error': 'Service code is required'}
+
+            price_info = await self.pricing_calculator.calculate_price(
+                service_code, filters, bool(data.get('purchaseOptions'))
+            )
+            return 200, price_info
+
+        except ValueError as e:
+            return 404, {'error': str(e)}
+
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def post_calculate(self, request: HTTPRequest) -> HandlerResult:
+        """여러 AWS 리소스의 조합에 대한 총 비용을 계산하여 반환합니다."""
+        try:
+            data = request.get_json()
+            if not data:
+                return 400, {'error': 'No data provided'}
+
+            resources = data.get('resources', [])
+            if not resources:
+                return 400, {'error': 'Resources are required'}
+
+            if profiling.profile_requested(request.query_param('profile'),
+                                           request.headers.get(profiling.PROFILE_HEADER.lower())):
+                denied = profiling.authorize(request.headers.get(profiling.TOKEN_HEADER.lower()))
+                if denied:
+                    return 403, {'error': denied}
+                # 동기 계산기를 스레드 풀에서 프로파일링 (app_swagger.py와 같은 보고서)
+                total_cost, report = await self.pricing_client.run_sync(
+                    functools.partial(profiling.profile_call, name='calculate'),
+                    app_swagger.pricing_calculator.calculate_total_cost, resources
+                )
+                return 200, {**total_cost, 'profile': report}
+
+            stream_format = request.stream_format()
+            if stream_format:
+                return 200, StreamingBody(self.pricing_calculator.iter_total_cost(resources), stream_format)
+
+            return 200, await self.pricing_calculator.calculate_total_cost(resources)
+
+        except profiling.ProfilerBusyError as e:
+            return 409, {'error': str(e)}
+
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def post_calculate_scenarios(self, request: HTTPRequest) -> HandlerResult:
+        """여러 시나리오에 대한 총 비용을 계산하여 반환합니다 (가격 조회와 배열 연산은 스레드 풀에서 실행)."""
+        try:
+            data = request.get_json()
+            if not data:
+                return 400, {'error': 'No data provided'}
+
+            resources = data.get('resources', [])
+            if not resources:
+                return 400, {'error': 'Resources are required'}
+
+            return 200, await self.pricing_client.run_sync(
+                app_swagger.scenario_calculator.calculate_scenarios, resources, data.get('scenarios')
+            )
+
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def get_cache_status(self, request: HTTPRequest) -> HandlerResult:
+        """캐시 신선도와 백그라운드 새로고침 상태를 반환합니다."""
+        return 200, app_swagger.get_cache_status()
+
+    async def get_filter_documentation(self, request: HTTPRequest) -> HandlerResult:
+        """AWS 서비스별 필터 필드와 값에 대한 상세 설명을 제공합니다."""
+        return 200, app_swagger.FilterDocumentation(api=app_swagger.api).get()
+
+    async def get_index(self, request: HTTPRequest) -> HandlerResult:
+        """API 서버의 기본 정보와 사용 가능한 엔드포인트 목록을 반환합니다."""
+        return 200, app_swagger.Index(api=app_swagger.api).get()
+
+    async def get_swagger(self, request: HTTPRequest) -> HandlerResult:
+        """app_swagger.py의 모델로 만든 Swagger(OpenAPI 2.0) 문서를 반환합니다."""
+        if self._swagger_schema is None:
+            with app_swagger.app.test_request_context():
+                self._swagger_schema = app_swagger.api.__schema__
+        return 200, self._swagger_schema
+
+    async def get_metrics(self, request: HTTPRequest) -> HandlerResult:
+        """구간별 소요 시간, 업스트림 호출, 구성 요소 상태 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+        if not metrics.metrics_enabled():
+            return 404, TextBody('metrics disabled\n', 'text/plain')
+        return 200, TextBody(metrics.registry.render(), metrics.CONTENT_TYPE)
+
+
+# 비동기 클라이언트와 계산기 (app_swagger.py의 캐시, 가격 색인, 속도 제한기를 공유)
+async_pricing_client = AsyncAWSPricingClient(app_swagger.pricing_client)
+async_pricing_calculator = AsyncPricingCalculator(app_swagger.pricing_calculator, async_pricing_client)
+
+app = PricingASGIApp(async_pricing_client, async_pricing_calculator)
@@ -5,12 +5,16 @@ AWS Pricing API를 활용하여 AWS 리소스 정보를 입력받으면 비용
 Swagger/OpenAPI 문서가 통합되어 있어 API를 쉽게 탐색하고 테스트할 수 있습니다.
 """
 
-from flask import Flask, request
+from flask import Flask, Response, g, request, stream_with_context
 from flask_restx import Api, Resource, fields, Namespace
+from flask_restx.representations import output_json
 import os
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
+import metrics
+import profiling
 from aws_pricing_client import AWSPricingClient, PricingCalculator
+from catalog_refresher import create_catalog_refresher_from_env
+from cost_engine import ScenarioCalculator
 
 # Flask 애플리케이션 생성
 app = Flask(__name__)
@@ -32,6 +36,174 @@ ns = api.namespace('api', description='AWS Pricing API 작업')
 # AWS Pricing 클라이언트 및 계산기 초기화
 pricing_client = AWSPricingClient()
 pricing_calculator = PricingCalculator(pricing_client)
+scenario_calculator = ScenarioCalculator(pricing_calculator)
+
+# 요청/응답 JSON 코덱 (PriceList 디코딩과 같은 백엔드)
+json_codec = pricing_client.json_codec
+
+# 캐시된 카탈로그 백그라운드 새로고침 (PRICING_REFRESH_INTERVAL=0이면 None)
+catalog_refresher = create_catalog_refresher_from_env(pricing_client, pricing_calculator)
+
+
+@app.before_request
+def start_catalog_refresher():
+    """요청을 처리하는 프로세스에서 새로고침 스레드를 시작합니다 (gunicorn 마스터에서는 시작하지 않음)."""
+    if catalog_refresher is not None:
+        catalog_refresher.ensure_started()
+
+
+def get_cache_status() -> Dict[str, Any]:
+    """
+    캐시 신선도와 새로고침 상태를 반환합니다.
+    
+    Returns:
+        Dict[str, Any]: 새로고침 상태, 메모리 캐시, 동시 조회 합치기, 영속 캐시, 가격 색인, 공유 가격표 통계
+    """
+    persistent_cache = pricing_client.persistent_cache
+    price_index = pricing_calculator.price_index
+    shared_table = pricing_calculator.shared_table
+    return {
+        'refresher': catalog_refresher.status() if catalog_refresher is not None else {'enabled': False},
+        'memoryCache': pricing_client.cache.stats(),
+        'singleFlight': pricing_client.single_flight.stats(),
+        'persistentCache': persistent_cache.stats() if persistent_cache is not None else None,
+        'priceIndex': price_index.stats() if price_index is not None else None,
+        'sharedPriceTable': shared_table.stats() if shared_table is not None else None
+    }
+
+
+def collect_component_metrics():
+    """/metrics 요청마다 연결 풀, 속도 제한기, 캐시, 동시 조회 합치기, 가격 색인, 공유 가격표 상태를 게이지로 수집합니다."""
+    status = get_cache_status()
+    families = metrics.gauges_from_stats(
+        'pricing_connection_pool', pricing_client.pool_monitor.metrics(), 'Connection pool'
+    )
+    families += metrics.gauges_from_stats('pricing_rate_limiter', pricing_client.rate_limiter.metrics(), 'Rate limiter')
+    families += metrics.gauges_from_stats('pricing_memory_cache', status['memoryCache'], 'Memory cache')
+    families += metrics.gauges_from_stats('pricing_single_flight', status['singleFlight'], 'Single flight')
+    families += metrics.gauges_from_stats('pricing_persistent_cache', status['persistentCache'], 'Persistent cache')
+    families += metrics.gauges_from_stats('pricing_price_index', status['priceIndex'], 'Price index')
+    families += metrics.gauges_from_stats(
+        'pricing_shared_price_table', status['sharedPriceTable'], 'Shared price table'
+    )
+    return families
+
+
+metrics.registry.register_collector(collect_component_metrics)
+
+
+@app.before_request
+def begin_request_metrics():
+    """요청별 구간 측정을 시작합니다."""
+    if metrics.metrics_enabled():
+        g.metrics_token = metrics.begin_request()
+
+
+@app.after_request
+def finish_request_metrics(response: Response) -> Response:
+    """요청 처리 시간을 기록하고, 설정된 경우 Server-Timing 헤더를 추가합니다."""
+    token = g.pop('metrics_token', None)
+    if token is None:
+        return response
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    timing = metrics.end_request(token, request.method, endpoint, response.status_code)
+    if timing is not None and metrics.server_timing_enabled():
+        response.headers['Server-Timing'] = timing.server_timing()
+    return response
+
+
+@api.representation('application/json')
+def output_json_with_metrics(data: Any, code: int, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    리소스 응답을 JSON 코덱(orjson 등)으로 직렬화하고 소요 시간을 serialize 구간으로 기록합니다.
+    
+    디버그 모드이거나 RESTX_JSON 설정이 있으면 들여쓰기 등 설정을 지키도록 Flask-RestX 기본 직렬화를 사용합니다.
+    """
+    with metrics.span('serialize'):
+        if app.debug or app.config.get('RESTX_JSON'):
+            return output_json(data, code, headers)
+        response = Response(json_codec.dumps(data) + b'\n', status=code, mimetype='application/json')
+        response.headers.extend(headers or {})
+        return response
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """구간별 소요 시간, 업스트림 호출, 구성 요소 상태 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+    if not metrics.metrics_enabled():
+        return Response('metrics disabled\n', status=404, mimetype='text/plain')
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+# 스트리밍 응답 형식 (Accept 헤더에 명시한 경우에만 사용)
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+
+def get_stream_format(accept_mimetypes: Optional[Any] = None) -> Optional[str]:
+    """
+    Accept 헤더에 명시된 스트리밍 형식을 반환합니다.
+    
+    Args:
+        accept_mimetypes (Optional[Any]): 파싱된 Accept 헤더 (werkzeug MIMEAccept, 생략 시 현재 요청)
+    
+    Returns:
+        Optional[str]: NDJSON_MIMETYPE 또는 SSE_MIMETYPE (스트리밍을 요청하지 않았으면 None)
+    """
+    if accept_mimetypes is None:
+        accept_mimetypes = request.accept_mimetypes
+    accepted = [mimetype for mimetype, quality in accept_mimetypes if quality > 0]
+    for mimetype in accepted:
+        if mimetype in (NDJSON_MIMETYPE, SSE_MIMETYPE):
+            return mimetype
+    return None
+
+
+def format_stream_event(event: Dict[str, Any], stream_format: str) -> str:
+    """
+    이벤트 하나를 스트리밍 형식에 맞는 문자열로 변환합니다.
+    
+    Args:
+        event (Dict[str, Any]): 'type' 필드를 가진 이벤트
+        stream_format (str): NDJSON_MIMETYPE 또는 SSE_MIMETYPE
+    
+    Returns:
+        str: NDJSON 한 줄 또는 SSE 이벤트 블록
+    """
+    data = json_codec.dumps(event).decode('utf-8')
+    if stream_format == SSE_MIMETYPE:
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + '\n'
+
+
+def stream_response(events: Iterable[Dict[str, Any]], stream_format: str) -> Response:
+    """
+    이벤트를 만들어지는 대로 전송하는 스트리밍 응답을 생성합니다.
+    
+    응답 전송을 시작한 뒤 발생한 오류는 상태 코드를 바꿀 수 없으므로 error 이벤트로 전송합니다.
+    
+    Args:
+        events (Iterable[Dict[str, Any]]): 전송할 이벤트 (지연 생성)
+        stream_format (str): NDJSON_MIMETYPE 또는 SSE_MIMETYPE
+    
+    Returns:
+        Response: 청크 단위로 전송되는 응답
+    """
+    def generate():
+        try:
+            for event in events:
+                yield format_stream_event(event, stream_format)
+        except Exception as e:
+            yield format_stream_event({'type': 'error', 'error': str(e)}, stream_format)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=stream_format,
+        headers={
+            'Cache-Control': 'no-cache',
+            # 프록시(nginx 등)가 응답을 모아서 보내지 않도록 함
+            'X-Accel-Buffering': 'no'
+        }
+    )
 
 # 모델 정의
 service_model = api.model('Service', {
@@ -62,14 +234,34 @@ attribute_values_model = api.model('AttributeValues', {
 
 pricing_request_model = api.model('PricingRequest', {
     'serviceCode': fields.String(required=True, description='서비스 코드 (예: AmazonEC2)'),
-    'filters': fields.List(fields.Nested(filter_model), description='필터 목록')
+    'filters': fields.List(fields.Nested(filter_model), description='필터 목록'),
+    'purchaseOptions': fields.Boolean(description='온디맨드/예약 구매 옵션별 실질 월 비용 포함 여부', default=False)
+})
+
+price_tier_model = api.model('PriceTier', {
+    'beginRange': fields.Float(description='구간 시작 사용량'),
+    'endRange': fields.Float(description='구간 끝 사용량 (마지막 구간은 null)'),
+    'pricePerUnit': fields.Float(description='구간 단위당 가격')
 })
 
 pricing_info_model = api.model('PricingInfo', {
     'currency': fields.String(description='통화 (예: USD)'),
-    'pricePerUnit': fields.Float(description='단위당 가격'),
+    'pricePerUnit': fields.Float(description='단위당 가격 (구간별 가격이면 첫 구간 가격)'),
     'unit': fields.String(description='단위 (예: Hrs)'),
-    'description': fields.String(description='설명')
+    'description': fields.String(description='설명'),
+    'tiers': fields.List(fields.Nested(price_tier_model), description='구간별 가격 (S3 스토리지, 데이터 전송 등)')
+})
+
+purchase_option_model = api.model('PurchaseOption', {
+    'termType': fields.String(description='약정 유형 (OnDemand 또는 Reserved)'),
+    'leaseContractLength': fields.String(description='계약 기간 (예: 1yr, 3yr)'),
+    'purchaseOption': fields.String(description='구매 옵션 (예: No Upfront, Partial Upfront, All Upfront)'),
+    'offeringClass': fields.String(description='제공 클래스 (예: standard, convertible)'),
+    'upfrontFee': fields.Float(description='선결제 금액'),
+    'recurringPricePerUnit': fields.Float(description='단위당 반복 요금'),
+    'unit': fields.String(description='반복 요금 단위 (예: Hrs)'),
+    'effectiveMonthlyCost': fields.Float(description='실질 월 비용 (반복 요금 * 730시간 + 선결제 금액 / 계약 개월 수)'),
+    'savingsVsOnDemand': fields.Float(description='온디맨드 대비 절감률 (예: 0.37)')
 })
 
 pricing_response_model = api.model('PricingResponse', {
@@ -78,7 +270,9 @@ pricing_response_model = api.model('PricingResponse', {
         'serviceCode': fields.String(description='서비스 코드 (예: AmazonEC2)'),
         'resourceDetails': fields.Raw(description='리소스 상세 정보'),
         'pricing': fields.Nested(pricing_info_model, description='가격 정보'),
-        'estimatedMonthlyCost': fields.Float(description='예상 월 비용')
+        'estimatedMonthlyCost': fields.Float(description='예상 월 비용'),
+        'purchaseOptions': fields.List(fields.Nested(purchase_option_model),
+                                       description='구매 옵션별 실질 월 비용 (purchaseOptions 요청 시)')
     })), description='가격 정보 목록')
 })
 
@@ -113,15 +307,80 @@ total_cost_model = api.model('TotalCost', {
     'timeUnit': fields.String(description='시간 단위 (예: monthly)')
 })
 
+profile_function_model = api.model('ProfileFunction', {
+    'function': fields.String(description='함수 (파일:줄(이름))'),
+    'calls': fields.Integer(description='호출 횟수'),
+    'primitiveCalls': fields.Integer(description='재귀 호출을 제외한 호출 횟수'),
+    'totalTimeMs': fields.Float(description='함수 자체 실행 시간 (밀리초)'),
+    'cumulativeTimeMs': fields.Float(description='하위 호출을 포함한 실행 시간 (밀리초)')
+})
+
+profile_allocation_model = api.model('ProfileAllocation', {
+    'location': fields.String(description='할당을 일으킨 소스 줄 (예: aws_pricing_client.py:490)'),
+    'sizeBytes': fields.Integer(description='요청 종료 시점에 남아 있는 할당 크기 (바이트)'),
+    'count': fields.Integer(description='할당 횟수')
+})
+
+profile_report_model = api.model('ProfileReport', {
+    'durationMs': fields.Float(description='프로파일링한 계산 시간 (밀리초)'),
+    'threads': fields.Integer(description='측정한 스레드 작업 수'),
+    'functions': fields.List(fields.Nested(profile_function_model), description='누적 시간 상위 함수'),
+    'allocations': fields.Nested(api.model('ProfileAllocations', {
+        'currentBytes': fields.Integer(description='종료 시점 추적 메모리 (바이트)'),
+        'peakBytes': fields.Integer(description='최대 추적 메모리 (바이트)'),
+        'top': fields.List(fields.Nested(profile_allocation_model), description='할당 크기 상위 소스 줄')
+    }), description='tracemalloc 메모리 할당 통계'),
+    'profileFile': fields.String(description='PRICING_PROFILE_DIR에 저장한 pstats 파일 이름')
+})
+
 calculation_response_model = api.model('CalculationResponse', {
     'totalCost': fields.Nested(total_cost_model, description='총 비용 정보'),
-    'resourceCosts': fields.List(fields.Nested(resource_cost_model), description='리소스별 비용 정보')
+    'resourceCosts': fields.List(fields.Nested(resource_cost_model), description='리소스별 비용 정보'),
+    'uniqueLookups': fields.Integer(description='실제로 가격을 조회한 (서비스 코드, 필터) 조합 수 (같은 조합의 리소스는 한 번만 조회)'),
+    'profile': fields.Nested(profile_report_model, description='프로파일링 결과 (profile=1 요청에만 포함)')
+})
+
+scenario_model = api.model('Scenario', {
+    'name': fields.String(description='시나리오 이름 (예: double-capacity)'),
+    'quantityScale': fields.Float(description='모든 리소스 수량에 곱할 값', default=1),
+    'usageScale': fields.Float(description='모든 리소스 사용량에 곱할 값', default=1),
+    'usageValue': fields.Float(description='모든 리소스의 사용량을 이 값으로 대체 (예: 220시간)'),
+    'priceScale': fields.Float(description='단위당 가격에 곱할 값 (예: 할인율 0.9)', default=1),
+    'filterOverrides': fields.Raw(description='필터 값 변경 (예: {"location": "EU (Frankfurt)"}로 리전 변경)')
+})
+
+scenario_request_model = api.model('ScenarioRequest', {
+    'resources': fields.List(fields.Nested(resource_request_model), required=True, description='리소스 요청 목록'),
+    'scenarios': fields.List(fields.Nested(scenario_model), description='시나리오 목록 (생략하면 기준 시나리오 하나)')
+})
+
+scenario_result_model = api.model('ScenarioResult', {
+    'name': fields.String(description='시나리오 이름'),
+    'totalCost': fields.Nested(total_cost_model, description='총 비용 정보'),
+    'serviceSubtotals': fields.Raw(description='서비스별 소계 (서비스 코드 → 금액)'),
+    'unpricedCount': fields.Integer(description='가격 정보를 찾지 못해 제외한 리소스 수'),
+    'deltaFromBaseline': fields.Float(description='첫 번째 시나리오 대비 총 비용 차이')
+})
+
+scenario_response_model = api.model('ScenarioResponse', {
+    'lineItemCount': fields.Integer(description='리소스 수'),
+    'uniqueLookups': fields.Integer(description='실제로 가격을 조회한 (서비스 코드, 필터) 조합 수'),
+    'scenarios': fields.List(fields.Nested(scenario_result_model), description='시나리오별 비용')
 })
 
 error_model = api.model('Error', {
     'error': fields.String(description='오류 메시지')
 })
 
+cache_status_model = api.model('CacheStatus', {
+    'refresher': fields.Raw(description='백그라운드 새로고침 상태 (실행 여부, 주기, 마지막 실행, 서비스별 신선도)'),
+    'memoryCache': fields.Raw(description='메모리 캐시 통계'),
+    'singleFlight': fields.Raw(description='동시 조회 합치기 통계 (전체 호출, 실제 실행, 합쳐진 호출, 진행 중인 키 수)'),
+    'persistentCache': fields.Raw(description='영속 캐시 통계 (사용하지 않으면 null)'),
+    'priceIndex': fields.Raw(description='가격 색인 통계 (사용하지 않으면 null)'),
+    'sharedPriceTable': fields.Raw(description='워커 공유 가격표 통계 (사용하지 않으면 null)')
+})
+
 # API 엔드포인트 정의
 @ns.route('/services')
 class ServiceList(Resource):
@@ -218,6 +477,10 @@ class Pricing(Resource):
         
         서비스 코드와 필터 목록을 입력받아 해당 리소스의 가격 정보를 조회하고,
         예상 월 비용을 계산하여 반환합니다.
+        purchaseOptions가 true이면 가격 정보마다 온디맨드와 예약(1년/3년 x 선결제 없음/부분/전체) 구매 옵션의
+        실질 월 비용을 함께 반환합니다 (이미 조회한 제품 정보의 약정으로 계산하므로 추가 API 호출 없음).
+        
+        가격 정보는 일치 점수 상위 목록이라 모든 제품을 비교한 뒤에야 정해지므로 스트리밍 응답은 지원하지 않습니다.
         """
         try:
             data = request.get_json()
@@ -235,7 +498,7 @@ class Pricing(Resource):
                     'error': 'Service code is required'
                 }, 400
             
-            price_info = pricing_calculator.calculate_price(service_code, filters)
+            price_info = pricing_calculator.calculate_price(service_code, filters, bool(data.get('purchaseOptions')))
             return price_info
         
         except ValueError as e:
@@ -251,10 +514,15 @@ class Pricing(Resource):
 
 @ns.route('/calculate')
 class Calculate(Resource):
-    @ns.doc('calculate_cost')
+    @ns.doc('calculate_cost', params={
+        'profile': {'in': 'query', 'type': 'integer', 'description': '1이면 계산을 프로파일링 (X-Profile-Token 헤더 필요)'}
+    })
     @ns.expect(calculation_request_model)
+    @ns.produces(['application/json', NDJSON_MIMETYPE, SSE_MIMETYPE])
     @ns.response(200, '성공', calculation_response_model)
     @ns.response(400, '잘못된 요청', error_model)
+    @ns.response(403, '프로파일링 권한 없음', error_model)
+    @ns.response(409, '다른 요청을 프로파일링하는 중', error_model)
     @ns.response(500, '서버 오류', error_model)
     def post(self):
         """
@@ -262,6 +530,15 @@ class Calculate(Resource):
         
         여러 리소스 요청 목록을 입력받아 각 리소스의 비용을 계산하고,
         총 비용을 계산하여 반환합니다.
+        서비스 코드와 필터가 같은 리소스는 가격을 한 번만 조회하며 (uniqueLookups),
+        리소스마다 수량과 사용량을 곱해 비용을 계산합니다.
+        
+        Accept 헤더가 application/x-ndjson 또는 text/event-stream이면
+        리소스 비용을 계산이 끝나는 대로 전송하고 (index: 요청 목록에서의 위치),
+        마지막에 totalCost 이벤트로 총 비용을 전송합니다.
+        
+        ?profile=1 (또는 X-Profile: 1 헤더)과 PRICING_PROFILE_TOKEN과 같은 X-Profile-Token 헤더를 보내면
+        계산을 cProfile과 tracemalloc으로 측정하여 profile 필드에 함께 반환합니다 (항상 JSON 응답).
         """
         try:
             data = request.get_json()
@@ -278,15 +555,92 @@ class Calculate(Resource):
                     'error': 'Resources are required'
                 }, 400
             
+            if profiling.profile_requested(request.args.get('profile'), request.headers.get(profiling.PROFILE_HEADER)):
+                denied = profiling.authorize(request.headers.get(profiling.TOKEN_HEADER))
+                if denied:
+                    return {
+                        'error': denied
+                    }, 403
+                total_cost, report = profiling.profile_call(
+                    pricing_calculator.calculate_total_cost, resources, name='calculate'
+                )
+                return {**total_cost, 'profile': report}
+            
+            stream_format = get_stream_format()
+            if stream_format:
+                return stream_response(pricing_calculator.iter_total_cost(resources), stream_format)
+            
             total_cost = pricing_calculator.calculate_total_cost(resources)
             return total_cost
         
+        except profiling.ProfilerBusyError as e:
+            return {
+                'error': str(e)
+            }, 409
+        
+        except Exception as e:
+            return {
+                'error': str(e)
+            }, 500
+
+
+@ns.route('/calculate/scenarios')
+class CalculateScenarios(Resource):
+    @ns.doc('calculate_scenarios')
+    @ns.expect(scenario_request_model)
+    @ns.response(200, '성공', scenario_response_model)
+    @ns.response(400, '잘못된 요청', error_model)
+    @ns.response(500, '서버 오류', error_model)
+    def post(self):
+        """
+        여러 가정(시나리오)에 대한 리소스 조합의 총 비용을 한 번에 계산합니다.
+        
+        수량 배율, 사용량 변경, 가격 배율, 필터 변경(예: 리전 변경) 시나리오마다
+        총 비용과 서비스별 소계를 계산합니다. 가격은 (서비스 코드, 필터) 조합마다 한 번만 조회하고,
+        비용은 NumPy 배열 연산으로 계산하므로 수만 개의 리소스도 한 번에 평가할 수 있습니다.
+        """
+        try:
+            data = request.get_json()
+            
+            if not data:
+                return {
+                    'error': 'No data provided'
+                }, 400
+            
+            resources = data.get('resources', [])
+            
+            if not resources:
+                return {
+                    'error': 'Resources are required'
+                }, 400
+            
+            return scenario_calculator.calculate_scenarios(resources, data.get('scenarios'))
+        
+        except ValueError as e:
+            return {
+                'error': str(e)
+            }, 400
+        
         except Exception as e:
             return {
                 'error': str(e)
             }, 500
 
 
+@ns.route('/cache/status')
+class CacheStatus(Resource):
+    @ns.doc('get_cache_status')
+    @ns.response(200, '성공', cache_status_model)
+    def get(self):
+        """
+        캐시 신선도와 백그라운드 새로고침 상태를 반환합니다.
+        
+        서비스별 캐시 항목 수와 가장 오래된 항목의 경과 시간, 마지막 변경 감지 시각,
+        카탈로그 게시일과 캐시/가격 색인 통계를 확인할 수 있습니다.
+        """
+        return get_cache_status()
+
+
 @ns.route('/filter-documentation')
 class FilterDocumentation(Resource):
     @ns.doc('get_filter_documentation')
@@ -499,6 +853,16 @@ class Index(Resource):
                     'method': 'POST',
                     'description': '여러 AWS 리소스의 조합에 대한 총 비용을 계산하여 반환'
                 },
+                {
+                    'path': '/api/calculate/scenarios',
+                    'method': 'POST',
+                    'description': '여러 시나리오(수량, 사용량, 리전 변경 등)에 대한 총 비용을 한 번에 계산하여 반환'
+                },
+                {
+                    'path': '/api/cache/status',
+                    'method': 'GET',
+                    'description': '캐시 신선도와 백그라운드 새로고침 상태를 반환'
+                },
                 {
                     'path': '/api/filter-documentation',
                     'method': 'GET',
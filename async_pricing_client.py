@@ -0,0 +1,384 @@
+"""
+Async Pricing Client
+
+AWSPricingClient와 PricingCalculator의 비동기(asyncio) 버전 모듈입니다.
+
+aiobotocore가 설치되어 있으면 제품 조회 페이지 요청을 이벤트 루프에서 직접 실행하므로
+요청마다 스레드를 점유하지 않고 많은 AWS 호출을 동시에 진행할 수 있습니다.
+설치되어 있지 않으면 동기 클라이언트를 제한된 크기의 스레드 풀에서 실행합니다.
+
+캐시, 속도 제한기, 로컬 저장소, 가격 색인은 감싼 동기 객체와 공유합니다.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+import metrics
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from pricing_cache import make_cache_key
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+except ImportError:  # aiobotocore 미설치 시 스레드 풀 사용
+    AioConfig = None
+    get_session = None
+
+
+class AsyncAWSPricingClient:
+    """AWSPricingClient를 감싸 같은 조회를 코루틴으로 제공하는 클래스"""
+
+    def __init__(self,
+                 pricing_client: Optional[AWSPricingClient] = None,
+                 use_aiobotocore: Optional[bool] = None,
+                 max_threads: Optional[int] = None):
+        """
+        AsyncAWSPricingClient 초기화
+
+        Args:
+            pricing_client (Optional[AWSPricingClient]): 캐시와 속도 제한기를 공유할 동기 클라이언트
+                                                         지정하지 않으면 새로 생성
+            use_aiobotocore (Optional[bool]): 제품 조회에 aiobotocore 사용 여부
+                                              지정하지 않으면 설치되어 있을 때 사용
+            max_threads (Optional[int]): 동기 클라이언트를 실행할 스레드 풀 크기
+                                         지정하지 않으면 환경 변수 PRICING_MAX_WORKERS 값을 사용 (기본값: 8)
+
+        Raises:
+            ValueError: use_aiobotocore=True인데 aiobotocore가 설치되어 있지 않은 경우
+        """
+        self.pricing_client = pricing_client if pricing_client is not None else AWSPricingClient()
+        if use_aiobotocore is None:
+            use_aiobotocore = get_session is not None
+        if use_aiobotocore and get_session is None:
+            raise ValueError("aiobotocore is not installed")
+        self.use_aiobotocore = use_aiobotocore
+        if max_threads is None:
+            max_threads = int(os.environ.get('PRICING_MAX_WORKERS', 8))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_threads), thread_name_prefix='pricing-async')
+        self._client = None
+        self._client_lock: Optional[asyncio.Lock] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def run_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        동기 함수를 스레드 풀에서 실행하고 결과를 기다립니다 (로컬 저장소 조회, CPU 작업 등).
+
+        Args:
+            func (Callable[..., Any]): 실행할 함수 (현재 요청의 구간 측정에 합산됨)
+            *args: func에 전달할 인자
+
+        Returns:
+            Any: func의 반환값
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(metrics.bind_context(func), *args))
+
+    def _aio_config_options(self) -> Dict[str, Any]:
+        """동기 클라이언트와 같은 연결 풀 크기, 시간 제한, keep-alive 설정을 aiobotocore 설정으로 변환합니다."""
+        config = self.pricing_client.client_config
+        return {
+            'retries': {'total_max_attempts': 1, 'mode': 'standard'},
+            'max_pool_connections': config.max_pool_connections,
+            'connect_timeout': config.connect_timeout,
+            'read_timeout': config.read_timeout,
+            'tcp_keepalive': config.tcp_keepalive,
+        }
+
+    async def _get_client(self) -> Any:
+        """aiobotocore Pricing 클라이언트를 반환합니다 (처음 사용할 때 생성)."""
+        if self._client is None:
+            if self._client_lock is None:
+                self._client_lock = asyncio.Lock()
+            async with self._client_lock:
+                if self._client is None:
+                    exit_stack = AsyncExitStack()
+                    # 스로틀링 재시도는 rate_limiter가 담당하므로 botocore 자체 재시도는 끔
+                    self._client = await exit_stack.enter_async_context(get_session().create_client(
+                        'pricing',
+                        region_name=self.pricing_client.region_name,
+                        endpoint_url=self.pricing_client.endpoint_url,
+                        config=AioConfig(**self._aio_config_options())
+                    ))
+                    self._exit_stack = exit_stack
+        return self._client
+
+    async def close(self) -> None:
+        """aiobotocore 클라이언트와 스레드 풀을 정리합니다."""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+        self._executor.shutdown(wait=False)
+
+    async def _single_flight(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        같은 키로 진행 중인 조회가 있으면 그 결과를 기다리고, 없으면 func를 실행합니다.
+
+        SingleFlight의 asyncio 버전입니다 (이벤트 루프 하나 안에서만 합침).
+        """
+        future = self._flights.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 호출자가 없을 때 "exception was never retrieved" 경고가 나지 않도록 조회 처리
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    async def _cached_or_run(self, key: Tuple[Hashable, ...], func: Callable[..., Any], *args: Any) -> Any:
+        """메모리 캐시에 있으면 바로 반환하고, 없으면 동기 메서드를 스레드 풀에서 실행합니다."""
+        hit, value = self.pricing_client.cache.get(key)
+        if hit:
+            return list(value)
+        return await self.run_sync(func, *args)
+
+    async def get_services(self) -> List[Dict[str, str]]:
+        """AWSPricingClient.get_services의 비동기 버전"""
+        return await self._cached_or_run(make_cache_key('get_services'), self.pricing_client.get_services)
+
+    async def get_service_attributes(self, service_code: str) -> List[str]:
+        """AWSPricingClient.get_service_attributes의 비동기 버전"""
+        return await self._cached_or_run(
+            make_cache_key('get_service_attributes', service_code),
+            self.pricing_client.get_service_attributes, service_code
+        )
+
+    async def get_attribute_values(self, service_code: str, attribute_name: str) -> List[str]:
+        """AWSPricingClient.get_attribute_values의 비동기 버전"""
+        return await self._cached_or_run(
+            make_cache_key('get_attribute_values', service_code, attribute_name),
+            self.pricing_client.get_attribute_values, service_code, attribute_name
+        )
+
+    async def get_products(self, service_code: str, filters: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        AWSPricingClient.get_products의 비동기 버전
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록
+
+        Returns:
+            List[Dict[str, Any]]: 제품 정보 목록
+
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시
+        """
+        key = make_cache_key('get_products', service_code, filters)
+        hit, products = self.pricing_client.cache.get(key)
+        if hit:
+            return list(products)
+
+        # 로컬 저장소(SQLite) 조회와 aiobotocore가 없는 경우는 스레드 풀에서 동기 클라이언트로 처리
+        if not self.use_aiobotocore or self.pricing_client.use_offer_store(service_code):
+            return await self.run_sync(self.pricing_client.get_products, service_code, filters)
+
+        products = await self._single_flight(key, lambda: self._fetch_products(service_code, filters))
+        if self.pricing_client.persistent_cache is not None:
+            await self.run_sync(self.pricing_client.note_catalog_version, service_code, products)
+        self.pricing_client.cache.set(key, products)
+        return list(products)
+
+    async def _fetch_products(self, service_code: str, filters: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """aiobotocore로 AWS Pricing API에서 제품 정보를 페이지 단위로 가져옵니다."""
+        client = await self._get_client()
+        request = {
+            'ServiceCode': service_code,
+            'Filters': AWSPricingClient.format_filters(filters),
+            'FormatVersion': 'aws_v1'
+        }
+        products = []
+
+        try:
+            while True:
+                started = time.perf_counter()
+                response = await self.pricing_client.rate_limiter.call_async(
+                    lambda: client.get_products(**request)
+                )
+                elapsed = time.perf_counter() - started
+                price_lists = response.get('PriceList', [])
+                if metrics.metrics_enabled():
+                    metrics.UPSTREAM_SECONDS.observe(elapsed, operation='get_products')
+                    metrics.UPSTREAM_PAGES.inc(operation='get_products')
+                    metrics.UPSTREAM_PAGE_BYTES.observe(sum(map(len, price_lists)), operation='get_products')
+                metrics.record_span('upstream', elapsed)
+
+                json_codec = self.pricing_client.json_codec
+                with metrics.span('parse'):
+                    for price_list in price_lists:
+                        # PriceList는 JSON 문자열로 반환되므로 파싱 필요
+                        try:
+                            products.append(json_codec.decode_product(price_list))
+                        except json_codec.decode_errors as e:
+                            print(f"Error parsing product JSON: {e}")
+
+                next_token = response.get('NextToken')
+                if not next_token:
+                    break
+                request['NextToken'] = next_token
+
+        except ClientError as e:
+            print(f"Error getting products for {service_code}: {e}")
+            raise
+
+        return products
+
+
+class AsyncPricingCalculator:
+    """PricingCalculator의 가격 선택/비용 계산 로직을 비동기 조회와 함께 사용하는 클래스"""
+
+    def __init__(self,
+                 calculator: PricingCalculator,
+                 pricing_client: AsyncAWSPricingClient,
+                 max_concurrency: Optional[int] = None):
+        """
+        AsyncPricingCalculator 초기화
+
+        Args:
+            calculator (PricingCalculator): 가격 색인과 계산 로직을 공유할 동기 계산기
+            pricing_client (AsyncAWSPricingClient): 비동기 가격 조회 클라이언트
+            max_concurrency (Optional[int]): calculate_total_cost에서 동시에 조회할 최대 리소스 수
+                                             지정하지 않으면 환경 변수 PRICING_ASYNC_MAX_CONCURRENCY 값을 사용 (기본값: 64)
+        """
+        self.calculator = calculator
+        self.pricing_client = pricing_client
+        if max_concurrency is None:
+            max_concurrency = int(os.environ.get('PRICING_ASYNC_MAX_CONCURRENCY', 64))
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def calculate_price(self, service_code: str, filters: List[Dict[str, str]],
+                              purchase_options: bool = False) -> Dict[str, Any]:
+        """
+        PricingCalculator.calculate_price의 비동기 버전
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록
+            purchase_options (bool): 구매 옵션별 실질 월 비용 포함 여부
+
+        Returns:
+            Dict[str, Any]: 가격 정보 목록 (상위 10개)
+
+        Raises:
+            ValueError: 가격 정보를 찾을 수 없는 경우
+        """
+        indexed = self.calculator.lookup_price_index(service_code, filters, purchase_options)
+        if indexed is not None:
+            return indexed
+
+        products = await self.pricing_client.get_products(service_code, filters)
+        # 일치 점수 계산과 정렬은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+        return await self.pricing_client.run_sync(
+            self.calculator.select_price_infos, service_code, filters, products, purchase_options
+        )
+
+    async def _resolve_price_info(self, resource: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """리소스 요청에 가장 잘 맞는 가격 정보를 조회합니다 (가격 정보를 찾을 수 없으면 None)."""
+        service_code = resource.get('serviceCode', '')
+        filters = resource.get('filters', [])
+
+        async with self._get_semaphore():
+            try:
+                return (await self.calculate_price(service_code, filters))['priceInfos'][0]
+            except ValueError as e:
+                print(f"Error calculating cost for {service_code}: {e}")
+                # 오류가 발생해도 다른 리소스는 계속 진행
+                return None
+
+    async def calculate_total_cost(self, resources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        PricingCalculator.calculate_total_cost의 비동기 버전 (리소스별 조회를 동시에 진행)
+
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록
+
+        Returns:
+            Dict[str, Any]: 총 비용 정보 (리소스 비용은 입력 순서, uniqueLookups: 조회한 조합 수)
+        """
+        specs, positions = self.calculator.group_resources(resources)
+        spec_price_infos = await asyncio.gather(*(self._resolve_price_info(spec) for spec in specs))
+
+        resource_costs: List[Optional[Dict[str, Any]]] = [None] * len(resources)
+        for spec_positions, price_info in zip(positions, spec_price_infos):
+            if price_info is None:
+                continue
+            spec_costs = self.calculator.build_resource_costs(
+                [resources[position] for position in spec_positions], price_info
+            )
+            for position, resource_cost in zip(spec_positions, spec_costs):
+                resource_costs[position] = resource_cost
+
+        summary = self.calculator.summarize_total_cost(resource_costs)
+        summary['uniqueLookups'] = len(specs)
+        return summary
+
+    async def iter_total_cost(self, resources: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        PricingCalculator.iter_total_cost의 비동기 버전
+
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록
+
+        Yields:
+            Dict[str, Any]: 계산이 끝난 순서의 resourceCost 이벤트, 마지막에 totalCost 이벤트
+        """
+        async def resolve(spec_index: int, spec: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+            return spec_index, await self._resolve_price_info(spec)
+
+        specs, positions = self.calculator.group_resources(resources)
+        tasks = [asyncio.ensure_future(resolve(spec_index, spec)) for spec_index, spec in enumerate(specs)]
+        resource_costs: List[Optional[Dict[str, Any]]] = [None] * len(resources)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                spec_index, price_info = await next_done
+                if price_info is None:
+                    continue
+                spec_positions = positions[spec_index]
+                spec_costs = self.calculator.build_resource_costs(
+                    [resources[index] for index in spec_positions], price_info
+                )
+                for index, resource_cost in zip(spec_positions, spec_costs):
+                    resource_costs[index] = resource_cost
+                    yield {
+                        'type': 'resourceCost',
+                        'index': index,
+                        'resourceCost': resource_cost
+                    }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        summary = self.calculator.summarize_total_cost(resource_costs)
+        yield {
+            'type': 'totalCost',
+            'totalCost': summary['totalCost'],
+            'resourceCount': len(summary['resourceCosts']),
+            'uniqueLookups': len(specs)
+        }
@@ -5,23 +5,270 @@ AWS Pricing API와 통신하여 가격 정보를 조회하는 클라이언트 
 """
 
 import boto3
+import heapq
 import json
-from typing import List, Dict, Any, Optional
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Sequence, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+import metrics
+import profiling
+from connection_pool import PoolMonitor, create_client_config_from_env
+from json_codec import create_json_codec_from_env
+from offer_store import open_offer_store_from_env
+from persistent_cache import open_persistent_cache_from_env
+from price_index import create_price_index_from_env
+from shared_price_table import PriceTableWriter, open_shared_price_table_from_env
+from pricing_cache import create_cache_from_env, make_cache_key, normalize_filters
+from rate_limiter import create_rate_limiter_from_env
+from single_flight import SingleFlight
+from term_table import TermTable
+from tier_engine import TierSchedule, parse_tiers
+
+
+class FetchStopped(Exception):
+    """iter_products 호출자가 반복을 멈춰 제품 조회를 중단했을 때 발생하는 예외"""
+
+    def __init__(self, loader: Callable[[], Any]):
+        super().__init__('Product fetch stopped by the caller')
+        # 중단된 조회 함수 (같은 조회에 합쳐진 다른 호출자는 다시 조회)
+        self.loader = loader
+
 
 class AWSPricingClient:
     """AWS Pricing API와 통신하여 가격 정보를 조회하는 클라이언트 클래스"""
+    
+    # iter_products가 호출자에게 넘기기 전에 쌓아 두는 최대 제품 수 (get_products 한 페이지)
+    PRODUCT_STREAM_BUFFER = 100
 
-    def __init__(self, region_name: str = "us-east-1"):
+    def __init__(self, region_name: str = "us-east-1", cache: Optional[Any] = None,
+                 offer_store: Optional[Any] = None, offline: Optional[bool] = None,
+                 rate_limiter: Optional[Any] = None, persistent_cache: Optional[Any] = None,
+                 client_config: Optional[Config] = None, endpoint_url: Optional[str] = None,
+                 client_mode: Optional[str] = None, json_codec: Optional[Any] = None):
         """
         AWSPricingClient 초기화
         
         Args:
             region_name (str): AWS 리전 이름 (기본값: us-east-1)
                                참고: AWS Pricing API는 us-east-1과 ap-south-1 리전에서만 사용 가능
+            cache (Optional[Any]): 조회 결과 캐시 (PricingCache 또는 get_or_load/invalidate를 제공하는 객체)
+                                   지정하지 않으면 환경 변수 설정에 따라 생성
+            offer_store (Optional[Any]): 벌크 가격 파일을 적재한 로컬 저장소 (OfferStore)
+                                         지정하지 않으면 환경 변수 PRICING_OFFER_DB 경로를 사용
+                                         적재된 서비스는 AWS API 호출 없이 저장소에서 조회
+            offline (Optional[bool]): True이면 모든 조회를 로컬 저장소에서만 처리 (AWS API 호출 안 함)
+                                      지정하지 않으면 환경 변수 PRICING_OFFLINE 값을 사용
+            rate_limiter (Optional[Any]): 모든 AWS API 호출에 적용할 속도 제한기 (AdaptiveRateLimiter)
+                                          지정하지 않으면 환경 변수 설정에 따라 생성
+            persistent_cache (Optional[Any]): 카탈로그 조회 결과를 디스크에 보관하는 영속 캐시 (PersistentCatalogCache)
+                                              지정하지 않으면 환경 변수 PRICING_PERSISTENT_CACHE 경로를 사용
+            client_config (Optional[Config]): botocore 클라이언트 설정 (연결 풀 크기, 시간 제한, keep-alive)
+                                              지정하지 않으면 환경 변수 설정에 따라 생성 (create_client_config_from_env)
+            endpoint_url (Optional[str]): Pricing API 엔드포인트 URL (테스트용 대역 서버 등)
+                                          지정하지 않으면 환경 변수 PRICING_ENDPOINT_URL 값을 사용 (기본값: AWS 기본 엔드포인트)
+            client_mode (Optional[str]): 'shared'이면 모든 스레드가 클라이언트 하나(연결 풀 하나)를 공유하고,
+                                         'per-thread'이면 스레드마다 별도 세션과 클라이언트를 사용
+                                         지정하지 않으면 환경 변수 PRICING_CLIENT_MODE 값을 사용 (기본값: shared)
+            json_codec (Optional[Any]): PriceList 디코딩에 사용할 JSON 코덱 (JSONCodec)
+                                        지정하지 않으면 환경 변수 설정에 따라 생성 (create_json_codec_from_env)
+        
+        Raises:
+            ValueError: client_mode 값이 올바르지 않거나, 오프라인 모드인데 로컬 저장소가 없는 경우
+        """
+        if client_mode is None:
+            client_mode = os.environ.get('PRICING_CLIENT_MODE', 'shared')
+        if client_mode not in ('shared', 'per-thread'):
+            raise ValueError(f"Invalid client mode: {client_mode}")
+        self.region_name = region_name
+        self.client_mode = client_mode
+        self.client_config = client_config if client_config is not None else create_client_config_from_env()
+        self.endpoint_url = endpoint_url if endpoint_url is not None else os.environ.get('PRICING_ENDPOINT_URL') or None
+        self._thread_clients = threading.local()
+        self._client_lock = threading.Lock()
+        self._shared_client = self._create_client(boto3.client) if client_mode == 'shared' else None
+        # 공유 클라이언트는 풀 크기만큼만 동시에 호출하여 연결을 재사용 (스레드별 클라이언트는 사용량만 측정)
+        self.pool_monitor = PoolMonitor(
+            self.client_config.max_pool_connections if client_mode == 'shared' else None
+        )
+        self.cache = cache if cache is not None else create_cache_from_env()
+        self.offer_store = offer_store if offer_store is not None else open_offer_store_from_env()
+        if offline is None:
+            offline = os.environ.get('PRICING_OFFLINE', 'false').lower() in ('1', 'true', 'yes')
+        if offline and self.offer_store is None:
+            raise ValueError("Offline mode requires an offer store (set PRICING_OFFER_DB)")
+        self.offline = offline
+        self.rate_limiter = rate_limiter if rate_limiter is not None else create_rate_limiter_from_env()
+        self.single_flight = SingleFlight()
+        if persistent_cache is None:
+            persistent_cache = open_persistent_cache_from_env()
+        if persistent_cache is not None and persistent_cache.on_refresh is None:
+            # 백그라운드 새로고침 결과를 메모리 캐시에도 반영
+            persistent_cache.on_refresh = self.cache.set
+        self.persistent_cache = persistent_cache
+        self.json_codec = json_codec if json_codec is not None else create_json_codec_from_env()
+        # 캐시 무효화를 전달받을 함수 (조회 결과로 만든 가격 색인 등)
+        self._invalidation_listeners: List[Callable[[Optional[str], Optional[str]], None]] = []
+    
+    def _create_client(self, factory: Callable[..., Any]) -> Any:
+        """설정한 연결 풀, 시간 제한, 엔드포인트로 Pricing 클라이언트를 생성합니다."""
+        return factory(
+            'pricing',
+            region_name=self.region_name,
+            endpoint_url=self.endpoint_url,
+            config=self.client_config
+        )
+    
+    @property
+    def client(self) -> Any:
+        """현재 스레드가 사용할 boto3 Pricing 클라이언트"""
+        if self._shared_client is not None:
+            return self._shared_client
+        client = getattr(self._thread_clients, 'client', None)
+        if client is None:
+            # boto3 세션은 스레드 안전하지 않으므로 스레드마다 새 세션에서 클라이언트 생성
+            with self._client_lock:
+                client = self._create_client(boto3.session.Session().client)
+            self._thread_clients.client = client
+        return client
+    
+    def _cached(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """
+        캐시를 먼저 조회하고, 캐시 미스 시 같은 키의 동시 요청을 하나로 합쳐 loader를 호출합니다.
+        
+        Args:
+            key (tuple): make_cache_key로 생성한 키
+            loader (Callable[[], Any]): 실제 조회 함수
+        
+        Returns:
+            Any: 조회 결과
+        """
+        def fly() -> Any:
+            while True:
+                try:
+                    return self.single_flight.do(key, loader)
+                except FetchStopped as e:
+                    if e.loader is loader:
+                        raise
+                    # 합쳐진 iter_products 호출이 중간에 멈춰 결과가 없으므로 다시 조회
+        
+        def load() -> Any:
+            if self.persistent_cache is not None and self.persistent_cache.handles(key):
+                return self.persistent_cache.get_or_load(key, fly)
+            return fly()
+        
+        return self.cache.get_or_load(key, load)
+    
+    def note_catalog_version(self, service_code: str, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        조회한 제품의 게시일로 영속 캐시의 카탈로그 버전을 갱신합니다.
+        
+        Args:
+            service_code (str): 서비스 코드
+            products (List[Dict[str, Any]]): 조회한 제품 정보 목록
+        
+        Returns:
+            List[Dict[str, Any]]: 입력한 제품 정보 목록 (그대로 반환)
+        """
+        if self.persistent_cache is not None and products:
+            publication_date = max(product.get('publicationDate') or '' for product in products)
+            self.persistent_cache.note_catalog_version(service_code, publication_date)
+        return products
+    
+    def _call(self, operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        """
+        속도 제한과 스로틀링 재시도를 적용하여 AWS API를 호출합니다.
+        
+        Args:
+            operation (Callable[..., Dict[str, Any]]): boto3 클라이언트 메서드
+            **kwargs: API 요청 인자
+        
+        Returns:
+            Dict[str, Any]: API 응답
+        
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시 (재시도 횟수 초과 포함)
+        """
+        operation_name = getattr(operation, '__name__', 'unknown')
+        
+        def invoke() -> Dict[str, Any]:
+            with self.pool_monitor.slot():
+                started = time.perf_counter()
+                response = operation(**kwargs)
+                elapsed = time.perf_counter() - started
+            if metrics.metrics_enabled():
+                metrics.UPSTREAM_SECONDS.observe(elapsed, operation=operation_name)
+                metrics.UPSTREAM_PAGES.inc(operation=operation_name)
+            metrics.record_span('upstream', elapsed)
+            return response
+        
+        return self.rate_limiter.call(invoke)
+    
+    def use_offer_store(self, service_code: Optional[str] = None) -> bool:
+        """
+        조회를 로컬 저장소에서 처리할지 여부를 반환합니다.
+        
+        Args:
+            service_code (Optional[str]): 조회할 서비스 코드
+        
+        Returns:
+            bool: 오프라인 모드이거나 서비스가 저장소에 적재되어 있으면 True
         """
-        self.client = boto3.client('pricing', region_name=region_name)
+        if self.offer_store is None:
+            return False
+        if self.offline:
+            return True
+        return service_code is not None and self.offer_store.has_service(service_code)
+    
+    def invalidate_cache(self, method: Optional[str] = None, service_code: Optional[str] = None) -> int:
+        """
+        캐시된 조회 결과를 무효화합니다 (메모리 캐시와 영속 캐시, 등록된 가격 색인 모두).
+        
+        Args:
+            method (Optional[str]): 무효화할 메서드 이름 (예: get_products, 생략 시 전체)
+            service_code (Optional[str]): 무효화할 서비스 코드 (예: AmazonEC2, 생략 시 전체)
+        
+        Returns:
+            int: 제거된 항목 수
+        """
+        removed = self.cache.invalidate(method=method, service_code=service_code)
+        if self.persistent_cache is not None:
+            removed += self.persistent_cache.invalidate(method=method, service_code=service_code)
+        for listener in list(self._invalidation_listeners):
+            listener(method, service_code)
+        return removed
+    
+    def add_invalidation_listener(self, listener: Callable[[Optional[str], Optional[str]], None]) -> None:
+        """
+        invalidate_cache가 호출될 때 같은 인자로 호출할 함수를 등록합니다.
+        
+        Args:
+            listener (Callable[[Optional[str], Optional[str]], None]): (method, service_code)를 받는 함수
+                                                                        (예: PriceIndex.on_cache_invalidated)
+        """
+        self._invalidation_listeners.append(listener)
+    
+    def after_fork(self) -> None:
+        """
+        fork로 만든 자식 프로세스에서 호출합니다 (gunicorn post_fork).
+        
+        로컬 저장소와 영속 캐시의 SQLite 연결과 Pricing API HTTP 연결을 자식 프로세스에서 새로 열도록 합니다.
+        """
+        # 부모의 연결 풀 소켓을 여러 워커가 함께 쓰지 않도록 클라이언트를 새로 생성
+        self._thread_clients = threading.local()
+        self._client_lock = threading.Lock()
+        if self._shared_client is not None:
+            self._shared_client = self._create_client(boto3.client)
+        self.pool_monitor = PoolMonitor(self.pool_monitor.size)
+        if self.offer_store is not None:
+            self.offer_store.after_fork()
+        if self.persistent_cache is not None:
+            self.persistent_cache.after_fork()
     
     def get_services(self) -> List[Dict[str, str]]:
         """
@@ -33,18 +280,35 @@ class AWSPricingClient:
         Raises:
             ClientError: AWS API 호출 중 오류 발생 시
         """
+        return list(self._cached(make_cache_key('get_services'), self.fetch_services))
+    
+    def fetch_services(self) -> List[Dict[str, str]]:
+        """
+        캐시를 거치지 않고 AWS Pricing API(또는 로컬 저장소)에서 서비스 목록을 페이지 단위로 가져옵니다.
+        
+        Returns:
+            List[Dict[str, str]]: 서비스 목록
+        
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시
+        """
+        if self.use_offer_store():
+            return self.offer_store.get_services()
+        
         services = []
         next_token = None
         
         try:
             while True:
                 if next_token:
-                    response = self.client.describe_services(
+                    response = self._call(
+                        self.client.describe_services,
                         FormatVersion='aws_v1',
                         NextToken=next_token
                     )
                 else:
-                    response = self.client.describe_services(
+                    response = self._call(
+                        self.client.describe_services,
                         FormatVersion='aws_v1'
                     )
                 
@@ -77,8 +341,19 @@ class AWSPricingClient:
         Raises:
             ClientError: AWS API 호출 중 오류 발생 시
         """
+        return list(self._cached(
+            make_cache_key('get_service_attributes', service_code),
+            lambda: self._fetch_service_attributes(service_code)
+        ))
+    
+    def _fetch_service_attributes(self, service_code: str) -> List[str]:
+        """AWS Pricing API에서 서비스 속성 목록을 가져옵니다."""
+        if self.use_offer_store(service_code):
+            return self.offer_store.get_service_attributes(service_code)
+        
         try:
-            response = self.client.describe_services(
+            response = self._call(
+                self.client.describe_services,
                 ServiceCode=service_code,
                 FormatVersion='aws_v1'
             )
@@ -106,19 +381,31 @@ class AWSPricingClient:
         Raises:
             ClientError: AWS API 호출 중 오류 발생 시
         """
+        return list(self._cached(
+            make_cache_key('get_attribute_values', service_code, attribute_name),
+            lambda: self._fetch_attribute_values(service_code, attribute_name)
+        ))
+    
+    def _fetch_attribute_values(self, service_code: str, attribute_name: str) -> List[str]:
+        """AWS Pricing API에서 속성 값 목록을 페이지 단위로 가져옵니다."""
+        if self.use_offer_store(service_code):
+            return self.offer_store.get_attribute_values(service_code, attribute_name)
+        
         values = []
         next_token = None
         
         try:
             while True:
                 if next_token:
-                    response = self.client.get_attribute_values(
+                    response = self._call(
+                        self.client.get_attribute_values,
                         ServiceCode=service_code,
                         AttributeName=attribute_name,
                         NextToken=next_token
                     )
                 else:
-                    response = self.client.get_attribute_values(
+                    response = self._call(
+                        self.client.get_attribute_values,
                         ServiceCode=service_code,
                         AttributeName=attribute_name
                     )
@@ -157,10 +444,110 @@ class AWSPricingClient:
         Raises:
             ClientError: AWS API 호출 중 오류 발생 시
         """
-        products = []
-        next_token = None
+        return list(self._cached(
+            make_cache_key('get_products', service_code, filters),
+            lambda: self.note_catalog_version(service_code, self.fetch_products(service_code, filters))
+        ))
+    
+    def iter_products(self, service_code: str, filters: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """
+        get_products와 같은 제품 정보를 페이지를 받는 대로 하나씩 반환합니다.
+        
+        캐시 미스이면 별도 스레드가 페이지를 가져오면서 받은 제품을 바로 반환합니다.
+        호출자가 중간에 반복을 멈추면 남은 페이지는 요청하지 않으며, 일부만 읽은 결과는 캐시하지 않습니다.
+        끝까지 읽은 결과만 캐시에 저장하고, 같은 조회가 이미 진행 중이면 그 결과를 함께 사용합니다
+        (진행 중인 조회가 중간에 멈추면 다시 조회).
         
-        # boto3 API에 맞게 필터 형식 변환
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록 (get_products와 같은 형식)
+        
+        Yields:
+            Dict[str, Any]: 제품 정보
+        
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시
+        """
+        key = make_cache_key('get_products', service_code, filters)
+        stream: queue.Queue = queue.Queue(self.PRODUCT_STREAM_BUFFER)
+        closed = threading.Event()
+        streamed = threading.Event()
+        
+        def put(item: Tuple[bool, Any]) -> None:
+            if closed.is_set():
+                raise FetchStopped(load)
+            stream.put(item)
+        
+        def load() -> List[Dict[str, Any]]:
+            if threading.current_thread() is not producer:
+                # 영속 캐시의 백그라운드 새로고침은 호출자에게 넘기지 않고 끝까지 가져옴
+                return self.note_catalog_version(service_code, self.fetch_products(service_code, filters))
+            streamed.set()
+            products = []
+            for product in self._iter_fetch_products(service_code, filters):
+                put((True, product))
+                products.append(product)
+            return self.note_catalog_version(service_code, products)
+        
+        def produce() -> None:
+            try:
+                products = self._cached(key, load)
+                if not streamed.is_set():
+                    # 캐시에 있었거나 진행 중인 같은 조회에 합쳐진 경우 결과를 한 번에 전달
+                    for product in products:
+                        put((True, product))
+                put((False, None))
+            except BaseException as e:
+                if not closed.is_set():
+                    stream.put((False, e))
+        
+        producer = threading.Thread(target=profiling.bind_profile(metrics.bind_context(produce)),
+                                    name='pricing-products', daemon=True)
+        producer.start()
+        try:
+            while True:
+                is_product, item = stream.get()
+                if not is_product:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            closed.set()
+            # 가득 찬 버퍼에 넣으려고 기다리는 스레드를 깨워 조회를 멈추게 함
+            while True:
+                try:
+                    stream.get_nowait()
+                except queue.Empty:
+                    break
+    
+    def fetch_products(self, service_code: str, filters: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        캐시를 거치지 않고 AWS Pricing API(또는 로컬 저장소)에서 제품 정보를 모든 페이지에 걸쳐 가져옵니다.
+        
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록 (get_products와 같은 형식)
+        
+        Returns:
+            List[Dict[str, Any]]: 제품 정보 목록
+        
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시
+        """
+        return list(self._iter_fetch_products(service_code, filters))
+    
+    @staticmethod
+    def format_filters(filters: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        boto3 API에 맞게 필터 형식을 변환합니다.
+        
+        Args:
+            filters (List[Dict[str, str]]): 필터 목록 (type, field, value)
+        
+        Returns:
+            List[Dict[str, str]]: boto3 필터 목록 (Type, Field, Value)
+        """
         formatted_filters = []
         for filter_item in filters:
             formatted_filters.append({
@@ -168,30 +555,55 @@ class AWSPricingClient:
                 'Field': filter_item.get('field', ''),
                 'Value': filter_item.get('value', '')
             })
+        return formatted_filters
+    
+    def _iter_fetch_products(self, service_code: str, filters: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """AWS Pricing API에서 제품 정보를 페이지 단위로 가져와 하나씩 반환합니다."""
+        if self.use_offer_store(service_code):
+            yield from self.offer_store.iter_products(service_code, filters)
+            return
+        
+        next_token = None
+        formatted_filters = self.format_filters(filters)
         
         try:
             while True:
                 if next_token:
-                    response = self.client.get_products(
+                    response = self._call(
+                        self.client.get_products,
                         ServiceCode=service_code,
                         Filters=formatted_filters,
                         FormatVersion='aws_v1',
                         NextToken=next_token
                     )
                 else:
-                    response = self.client.get_products(
+                    response = self._call(
+                        self.client.get_products,
                         ServiceCode=service_code,
                         Filters=formatted_filters,
                         FormatVersion='aws_v1'
                     )
                 
-                for price_list in response.get('PriceList', []):
-                    # PriceList는 JSON 문자열로 반환되므로 파싱 필요
-                    try:
-                        product = json.loads(price_list)
-                        products.append(product)
-                    except json.JSONDecodeError as e:
-                        print(f"Error parsing product JSON: {e}")
+                price_lists = response.get('PriceList', [])
+                if metrics.metrics_enabled():
+                    metrics.UPSTREAM_PAGE_BYTES.observe(sum(map(len, price_lists)), operation='get_products')
+                
+                # 페이지의 파싱 시간 합계 (소비 쪽이 중간에 멈춰도 기록)
+                parse_seconds = 0.0
+                try:
+                    for price_list in price_lists:
+                        # PriceList는 JSON 문자열로 반환되므로 파싱 필요
+                        started = time.perf_counter()
+                        try:
+                            product = self.json_codec.decode_product(price_list)
+                        except self.json_codec.decode_errors as e:
+                            print(f"Error parsing product JSON: {e}")
+                            continue
+                        finally:
+                            parse_seconds += time.perf_counter() - started
+                        yield product
+                finally:
+                    metrics.record_span('parse', parse_seconds)
                 
                 next_token = response.get('NextToken')
                 if not next_token:
@@ -200,21 +612,116 @@ class AWSPricingClient:
         except ClientError as e:
             print(f"Error getting products for {service_code}: {e}")
             raise
-        
-        return products
 
 
 class PricingCalculator:
     """AWS 리소스 정보를 기반으로 비용을 계산하는 계산기 클래스"""
     
-    def __init__(self, pricing_client: AWSPricingClient):
+    # calculate_price가 반환하는 최대 가격 정보 수
+    MAX_PRICE_INFOS = 10
+    
+    def __init__(self, pricing_client: AWSPricingClient, max_workers: Optional[int] = None,
+                 price_index: Optional[Any] = None, shared_table: Optional[Any] = None):
         """
         PricingCalculator 초기화
         
         Args:
             pricing_client (AWSPricingClient): AWS Pricing 클라이언트 인스턴스
+            max_workers (Optional[int]): 리소스별 가격 조회를 동시에 실행할 최대 스레드 수
+                                         모든 요청이 하나의 스레드 풀을 공유하므로 AWS API 동시 호출 수의 상한이 됨
+                                         지정하지 않으면 환경 변수 PRICING_MAX_WORKERS 값을 사용 (기본값: 8)
+            price_index (Optional[Any]): 자주 조회되는 속성 조합의 가격 색인 (PriceIndex)
+                                         지정하지 않으면 환경 변수 설정에 따라 생성
+            shared_table (Optional[Any]): 워커 프로세스가 공유하는 읽기 전용 가격표 (SharedPriceTable)
+                                          지정하지 않으면 환경 변수 PRICING_SHARED_PRICE_TABLE 경로를 사용
         """
         self.pricing_client = pricing_client
+        if max_workers is None:
+            max_workers = int(os.environ.get('PRICING_MAX_WORKERS', 8))
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.price_index = price_index if price_index is not None else create_price_index_from_env()
+        self.shared_table = shared_table if shared_table is not None else open_shared_price_table_from_env()
+        add_invalidation_listener = getattr(pricing_client, 'add_invalidation_listener', None)
+        if self.price_index is not None and add_invalidation_listener is not None:
+            # 제품 조회 캐시를 무효화하면 그 결과로 만든 색인 버킷도 함께 비움
+            add_invalidation_listener(self.price_index.on_cache_invalidated)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """공유 스레드 풀을 반환합니다 (처음 사용할 때 생성)."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='pricing'
+                    )
+        return self._executor
+    
+    def _map_concurrently(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterable[Any]:
+        """
+        항목마다 func를 스레드 풀에서 동시에 실행하고, 결과를 입력 순서대로 반환합니다.
+        
+        Args:
+            func (Callable[[Any], Any]): 각 항목에 적용할 함수
+            items (Iterable[Any]): 입력 항목 목록
+        
+        Returns:
+            Iterable[Any]: 입력 순서와 같은 순서의 결과
+        """
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return map(func, items)
+        return self._get_executor().map(profiling.bind_profile(metrics.bind_context(func)), items)
+    
+    def _iter_completed(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+        """
+        항목마다 func를 스레드 풀에서 동시에 실행하고, 끝나는 순서대로 (입력 위치, 결과)를 반환합니다.
+        
+        반복을 중간에 멈추면 아직 시작하지 않은 작업은 취소합니다.
+        
+        Args:
+            func (Callable[[Any], Any]): 각 항목에 적용할 함수
+            items (Iterable[Any]): 입력 항목 목록
+        
+        Yields:
+            Tuple[int, Any]: (입력 위치, 결과)
+        """
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            for position, item in enumerate(items):
+                yield position, func(item)
+            return
+        
+        executor = self._get_executor()
+        func = profiling.bind_profile(metrics.bind_context(func))
+        futures = {executor.submit(func, item): position for position, item in enumerate(items)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def after_fork(self) -> None:
+        """
+        fork로 만든 자식 프로세스에서 호출합니다 (gunicorn post_fork).
+        
+        부모 프로세스의 스레드 풀은 자식으로 복제되지 않으므로 처음 사용할 때 새로 만들도록 비우고,
+        가격 조회 클라이언트의 연결도 새로 열도록 합니다.
+        """
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        if hasattr(self.pricing_client, 'after_fork'):
+            self.pricing_client.after_fork()
+    
+    def shutdown(self) -> None:
+        """공유 스레드 풀을 종료합니다."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
     
     def _extract_price_from_product(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -241,20 +748,29 @@ class PricingCalculator:
             if not price_dimensions:
                 return None
             
-            # 첫 번째 가격 차원 사용
+            # 구간별 가격(beginRange/endRange)이면 첫 구간, 아니면 첫 번째 가격 차원 사용
+            tiers = parse_tiers(price_dimensions)
             dimension_key = list(price_dimensions.keys())[0]
+            if tiers:
+                dimension_key = min(
+                    price_dimensions,
+                    key=lambda key: float(price_dimensions[key].get('beginRange') or 'inf')
+                )
             price_dimension = price_dimensions[dimension_key]
             
             price_per_unit = float(price_dimension.get('pricePerUnit', {}).get('USD', 0))
             unit = price_dimension.get('unit', '')
             description = price_dimension.get('description', '')
             
-            return {
+            pricing = {
                 'currency': 'USD',
                 'pricePerUnit': price_per_unit,
                 'unit': unit,
                 'description': description
             }
+            if tiers:
+                pricing['tiers'] = tiers
+            return pricing
         
         except (KeyError, IndexError, ValueError) as e:
             print(f"Error extracting price from product: {e}")
@@ -268,6 +784,21 @@ class PricingCalculator:
             product (Dict[str, Any]): 제품 정보
             filters (List[Dict[str, str]]): 필터 목록
         
+        Returns:
+            Dict[str, str]: 리소스 상세 정보
+        """
+        product_attributes = product.get('product', {}).get('attributes', {})
+        return self._merge_resource_details(product_attributes, filters)
+    
+    @staticmethod
+    def _merge_resource_details(product_attributes: Dict[str, str], filters: List[Dict[str, str]]) -> Dict[str, str]:
+        """
+        필터의 필드/값과 제품 속성을 합쳐 리소스 상세 정보를 만듭니다 (필터 값 우선).
+        
+        Args:
+            product_attributes (Dict[str, str]): 제품 속성
+            filters (List[Dict[str, str]]): 필터 목록
+        
         Returns:
             Dict[str, str]: 리소스 상세 정보
         """
@@ -281,7 +812,6 @@ class PricingCalculator:
                 resource_details[field] = value
         
         # 제품 정보에서 추가 속성 추출
-        product_attributes = product.get('product', {}).get('attributes', {})
         for key, value in product_attributes.items():
             if key not in resource_details:
                 resource_details[key] = value
@@ -310,13 +840,16 @@ class PricingCalculator:
         
         return score
 
-    def calculate_price(self, service_code: str, filters: List[Dict[str, str]]) -> Dict[str, Any]:
+    def calculate_price(self, service_code: str, filters: List[Dict[str, str]],
+                        purchase_options: bool = False) -> Dict[str, Any]:
         """
         특정 서비스의 특정 필터 조건에 맞는 제품의 가격을 계산합니다.
         
         Args:
             service_code (str): 서비스 코드 (예: AmazonEC2)
             filters (List[Dict[str, str]]): 필터 목록
+            purchase_options (bool): True이면 가격 정보마다 온디맨드/예약 구매 옵션별 실질 월 비용을 추가
+                (이미 조회한 제품 정보의 약정에서 계산하므로 추가 API 호출 없음)
         
         Returns:
             Dict[str, Any]: 가격 정보 목록 (상위 10개)
@@ -324,52 +857,457 @@ class PricingCalculator:
         Raises:
             ValueError: 가격 정보를 찾을 수 없는 경우
         """
-        products = self.pricing_client.get_products(service_code, filters)
+        # 색인 키와 정확히 일치하는 필터는 네트워크 호출과 정렬 없이 색인에서 응답
+        indexed = self.lookup_price_index(service_code, filters, purchase_options)
+        if indexed is not None:
+            return indexed
         
-        if not products:
-            raise ValueError(f"No products found for {service_code} with the given filters")
+        return self.select_price_infos(
+            service_code, filters, self.pricing_client.iter_products(service_code, filters), purchase_options
+        )
+    
+    def lookup_price_index(self, service_code: str, filters: List[Dict[str, str]],
+                           purchase_options: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        가격 색인으로 calculate_price 결과를 만들 수 있으면 반환합니다.
         
-        # 각 제품에 대한 가격 정보와 일치 점수 계산
-        price_infos_with_scores = []
-        for product in products:
+        Args:
+            service_code (str): 서비스 코드
+            filters (List[Dict[str, str]]): 필터 목록
+            purchase_options (bool): 구매 옵션별 실질 월 비용 포함 여부
+        
+        Returns:
+            Optional[Dict[str, Any]]: 가격 정보 목록 (색인으로 답할 수 없으면 None)
+        
+        Raises:
+            ValueError: 색인에 해당 제품이 없는 경우
+        """
+        # 로더 프로세스가 만든 공유 가격표를 워커별 색인보다 먼저 조회
+        if self.shared_table is not None:
+            with metrics.span('shared_table'):
+                records = self.shared_table.lookup(service_code, filters)
+                if records is not None:
+                    return self._price_infos_from_records(service_code, filters, records, purchase_options)
+        if self.price_index is None:
+            return None
+        with metrics.span('index'):
+            records = self.price_index.lookup(service_code, filters)
+            if records is None:
+                return None
+            return self._price_infos_from_records(service_code, filters, records, purchase_options)
+    
+    def select_price_infos(self, service_code: str, filters: List[Dict[str, str]],
+                           products: Iterable[Dict[str, Any]], purchase_options: bool = False) -> Dict[str, Any]:
+        """
+        제품 정보에서 일치 점수가 높은 가격 정보를 골라 calculate_price 결과를 만듭니다.
+        
+        products가 지연 생성되는 경우, 결과가 더 바뀔 수 없으면 남은 제품을 읽지 않습니다.
+        가격 색인에 넣을 수 있는 조회는 버킷을 완전하게 채우도록 끝까지 읽습니다.
+        
+        Args:
+            service_code (str): 서비스 코드
+            filters (List[Dict[str, str]]): 필터 목록
+            products (Iterable[Dict[str, Any]]): 제품 정보 (get_products 결과 또는 iter_products)
+            purchase_options (bool): 구매 옵션별 실질 월 비용 포함 여부
+        
+        Returns:
+            Dict[str, Any]: 가격 정보 목록 (상위 10개)
+        
+        Raises:
+            ValueError: 가격 정보를 찾을 수 없는 경우
+        """
+        # 필터가 색인 키와 일치하면 조회 결과 전체를 해당 버킷으로 색인
+        index_key = None
+        if self.price_index is not None:
+            index_key = self.price_index.key_for_filters(service_code, filters)
+        
+        # 모든 필터와 일치하는 제품의 점수 (_calculate_match_score의 최댓값)
+        max_score = sum(1 for filter_item in filters if filter_item.get('field') and filter_item.get('value'))
+        
+        # 일치 점수 상위 MAX_PRICE_INFOS개만 최소 힙으로 유지
+        # (점수, -순번) 순서로 비교하므로 같은 점수에서는 먼저 나온 제품이 남음 (안정 정렬과 같은 결과)
+        top_candidates: List[Tuple[int, int, Dict[str, Any], Dict[str, Any]]] = []
+        product_count = 0
+        priced_count = 0
+        # 제품 조회(업스트림 호출, 파싱) 시간을 빼고 점수 계산 시간만 기록
+        products = metrics.TimedIterator(products)
+        started = time.perf_counter()
+        for sequence, product in enumerate(products):
+            product_count += 1
+            
             # 가격 정보 추출
             pricing = self._extract_price_from_product(product)
             if not pricing:
                 continue
+            priced_count += 1
             
-            # 리소스 상세 정보 추출
-            resource_details = self._extract_resource_details(product, filters)
-            
-            # 월별 예상 비용 계산 (시간당 가격 * 730시간)
-            estimated_monthly_cost = 0
-            if pricing['unit'].lower() == 'hrs':
-                estimated_monthly_cost = pricing['pricePerUnit'] * 730  # 한 달 평균 시간
+            # 가격 색인에 추가 (같은 조합의 다음 조회는 색인에서 응답)
+            if index_key is not None:
+                product_info = product.get('product', {})
+                attributes = product_info.get('attributes', {})
+                if self.price_index.key_for_attributes(service_code, attributes) == index_key:
+                    self.price_index.add(service_code, product_info.get('sku', ''), attributes, pricing,
+                                         TermTable.from_product(product))
+                else:
+                    # 필터와 속성 값이 다른 제품이 섞여 있으면 버킷을 완전하다고 볼 수 없음
+                    index_key = None
             
             # 일치 점수 계산
-            match_score = self._calculate_match_score(product, filters)
+            candidate = (self._calculate_match_score(product, filters), -sequence, product, pricing)
+            if len(top_candidates) < self.MAX_PRICE_INFOS:
+                heapq.heappush(top_candidates, candidate)
+            elif candidate[:2] > top_candidates[0][:2]:
+                heapq.heapreplace(top_candidates, candidate)
             
-            price_infos_with_scores.append({
+            # 힙이 모두 최고 점수로 찼으면 이후 제품은 결과를 바꿀 수 없으므로 남은 제품은 읽지 않음
+            # (색인할 수 있는 조회는 버킷을 완전하게 채우도록 끝까지 읽음)
+            if (index_key is None and len(top_candidates) == self.MAX_PRICE_INFOS
+                    and top_candidates[0][0] == max_score):
+                break
+        metrics.record_span('score', time.perf_counter() - started - products.seconds)
+        
+        if not product_count:
+            raise ValueError(f"No products found for {service_code} with the given filters")
+        
+        if index_key is not None and priced_count:
+            self.price_index.mark_complete(index_key)
+        
+        if not priced_count:
+            raise ValueError(f"No pricing information found for {service_code} with the given filters")
+        
+        # 남은 제품만 일치 점수 내림차순으로 정렬하고 리소스 상세 정보 생성
+        top_price_infos = []
+        with metrics.span('sort'):
+            for _, _, product, pricing in sorted(top_candidates, key=lambda item: item[:2], reverse=True):
+                price_info = {
+                    'serviceCode': service_code,
+                    'resourceDetails': self._extract_resource_details(product, filters),
+                    'pricing': pricing,
+                    # 월별 예상 비용 계산 (시간당 가격 * 730시간)
+                    'estimatedMonthlyCost': self._estimate_monthly_cost(pricing)
+                }
+                if purchase_options:
+                    price_info['purchaseOptions'] = self._purchase_options(TermTable.from_product(product))
+                top_price_infos.append(price_info)
+        
+        return {
+            'serviceCode': service_code,
+            'priceInfos': top_price_infos
+        }
+    
+    @staticmethod
+    def _estimate_monthly_cost(pricing: Dict[str, Any]) -> float:
+        """
+        시간당 가격이면 월별 예상 비용을 계산합니다 (그 외 단위는 0).
+        
+        Args:
+            pricing (Dict[str, Any]): 가격 정보
+        
+        Returns:
+            float: 월별 예상 비용 (시간당 가격 * 730시간)
+        """
+        if pricing['unit'].lower() == 'hrs':
+            return pricing['pricePerUnit'] * 730  # 한 달 평균 시간
+        return 0
+    
+    @staticmethod
+    def _purchase_options(terms: Optional[TermTable]) -> List[Dict[str, Any]]:
+        """
+        요금표를 구매 옵션 목록으로 펼칩니다.
+        
+        Args:
+            terms (Optional[TermTable]): 제품의 약정별 요금표
+        
+        Returns:
+            List[Dict[str, Any]]: 구매 옵션 목록 (요금표가 없으면 빈 목록)
+        """
+        if terms is None:
+            return []
+        return terms.purchase_options()
+    
+    def _price_infos_from_records(self, service_code: str, filters: List[Dict[str, str]],
+                                  records: Sequence[Any], purchase_options: bool = False) -> Dict[str, Any]:
+        """
+        색인 레코드로 calculate_price와 같은 형식의 결과를 만듭니다.
+        
+        색인 레코드는 모든 필터와 일치하므로 일치 점수가 모두 같아 정렬이 필요 없습니다.
+        
+        Args:
+            service_code (str): 서비스 코드
+            filters (List[Dict[str, str]]): 필터 목록
+            records (Sequence[Any]): 색인 레코드 목록 (CompactProduct 목록 또는 SharedRecordList)
+            purchase_options (bool): 구매 옵션별 실질 월 비용 포함 여부
+        
+        Returns:
+            Dict[str, Any]: 가격 정보 목록 (상위 10개)
+        
+        Raises:
+            ValueError: 가격 정보를 찾을 수 없는 경우
+        """
+        if not records:
+            raise ValueError(f"No products found for {service_code} with the given filters")
+        
+        price_infos = []
+        for record in records[:self.MAX_PRICE_INFOS]:
+            # 응답에 필요한 상위 레코드만 딕셔너리로 펼침
+            pricing = record.pricing
+            price_info = {
                 'serviceCode': service_code,
-                'resourceDetails': resource_details,
+                'resourceDetails': self._merge_resource_details(record.attributes, filters),
                 'pricing': pricing,
-                'estimatedMonthlyCost': estimated_monthly_cost,
-                'matchScore': match_score
-            })
+                'estimatedMonthlyCost': self._estimate_monthly_cost(pricing)
+            }
+            if purchase_options:
+                price_info['purchaseOptions'] = self._purchase_options(record.terms)
+            price_infos.append(price_info)
         
-        if not price_infos_with_scores:
-            raise ValueError(f"No pricing information found for {service_code} with the given filters")
+        return {
+            'serviceCode': service_code,
+            'priceInfos': price_infos
+        }
+    
+    def index_products(self, service_code: str, products: Iterable[Dict[str, Any]],
+                       filters: Optional[List[Dict[str, str]]] = None) -> int:
+        """
+        제품 정보를 가격 색인에 추가합니다 (같은 SKU는 교체).
+        
+        filters가 색인 키와 정확히 일치하면 해당 버킷을 완전한 것으로 표시합니다.
+        
+        Args:
+            service_code (str): 서비스 코드
+            products (Iterable[Dict[str, Any]]): 제품 정보 목록
+            filters (Optional[List[Dict[str, str]]]): products를 조회할 때 사용한 필터 목록
+        
+        Returns:
+            int: 색인에 추가된 레코드 수
+        """
+        if self.price_index is None:
+            return 0
+        
+        added = 0
+        for product in products:
+            pricing = self._extract_price_from_product(product)
+            if not pricing:
+                continue
+            product_info = product.get('product', {})
+            if self.price_index.add(service_code, product_info.get('sku', ''),
+                                    product_info.get('attributes', {}), pricing, TermTable.from_product(product)):
+                added += 1
+        
+        if filters is not None:
+            key = self.price_index.key_for_filters(service_code, filters)
+            if key is not None:
+                self.price_index.mark_complete(key)
+        return added
+    
+    def build_price_index(self, service_code: str) -> int:
+        """
+        오프라인 저장소에 적재된 서비스 전체 카탈로그로 가격 색인을 만듭니다.
+        
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+        
+        Returns:
+            int: 색인에 추가된 레코드 수
+        
+        Raises:
+            ValueError: 가격 색인이 비활성화되었거나 서비스가 오프라인 저장소에 없는 경우
+        """
+        offer_store = getattr(self.pricing_client, 'offer_store', None)
+        if self.price_index is None:
+            raise ValueError("Price index is disabled")
+        if offer_store is None or not offer_store.has_service(service_code):
+            raise ValueError(f"{service_code} is not ingested into the offer store")
+        
+        self.price_index.invalidate(service_code)
+        added = self.index_products(service_code, offer_store.iter_products(service_code))
+        self.price_index.mark_service_complete(service_code)
+        return added
+    
+    def build_shared_price_table(self, path: str, service_codes: List[str]) -> Dict[str, Any]:
+        """
+        오프라인 저장소에 적재된 서비스 전체 카탈로그로 워커가 공유하는 가격표 파일을 만듭니다.
         
-        # 일치 점수 기준으로 정렬하고 상위 10개 선택
-        sorted_price_infos = sorted(price_infos_with_scores, key=lambda x: x['matchScore'], reverse=True)
-        top_price_infos = sorted_price_infos[:10]
+        Args:
+            path (str): 가격표 파일 경로 (예: /dev/shm/pricing-price-table.bin)
+            service_codes (List[str]): 가격표에 넣을 서비스 코드 목록
         
-        # matchScore 필드 제거
-        for price_info in top_price_infos:
-            del price_info['matchScore']
+        Returns:
+            Dict[str, Any]: 서비스별 레코드 수, 파일 크기
+        
+        Raises:
+            ValueError: 서비스가 오프라인 저장소에 없거나 색인 키 필드가 정의되지 않은 경우
+        """
+        offer_store = getattr(self.pricing_client, 'offer_store', None)
+        writer = PriceTableWriter()
+        for service_code in service_codes:
+            if offer_store is None or not offer_store.has_service(service_code):
+                raise ValueError(f"{service_code} is not ingested into the offer store")
+            writer.add_service(service_code)
+            for product in offer_store.iter_products(service_code):
+                pricing = self._extract_price_from_product(product)
+                if not pricing:
+                    continue
+                product_info = product.get('product', {})
+                writer.add(service_code, product_info.get('sku', ''), product_info.get('attributes', {}),
+                           pricing, TermTable.from_product(product))
+        
+        result = writer.write(path)
+        if self.shared_table is not None and os.path.abspath(self.shared_table.path) == os.path.abspath(path):
+            self.shared_table.refresh()
+        return result
+    
+    def apply_product_delta(self, service_code: str, delta: Any) -> int:
+        """
+        백그라운드 새로고침에서 찾은 제품 변경분을 가격 색인에 반영합니다.
+    
+        이미 색인한 키의 레코드만 교체하거나 제거하며, 바뀌지 않은 레코드는 건드리지 않습니다.
+    
+        Args:
+            service_code (str): 서비스 코드
+            delta (Any): 이전 조회 결과와 새 조회 결과의 차이 (catalog_refresher.CatalogDelta)
+    
+        Returns:
+            int: 색인에서 추가, 교체, 제거된 레코드 수
+        """
+        if self.price_index is None:
+            return 0
+    
+        applied = 0
+        removed = list(delta.removed) + [previous for previous, _ in delta.changed]
+        for product in removed:
+            product_info = product.get('product', {})
+            if self.price_index.remove(service_code, product_info.get('sku', ''),
+                                       product_info.get('attributes', {})):
+                applied += 1
+    
+        upserted = list(delta.added) + [current for _, current in delta.changed]
+        for product in upserted:
+            pricing = self._extract_price_from_product(product)
+            if not pricing:
+                continue
+            product_info = product.get('product', {})
+            if self.price_index.update(service_code, product_info.get('sku', ''),
+                                       product_info.get('attributes', {}), pricing, TermTable.from_product(product)):
+                applied += 1
+        return applied
+    
+    def _resolve_price_info(self, resource: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        리소스 요청의 서비스 코드와 필터에 가장 잘 맞는 가격 정보를 조회합니다.
+        
+        Args:
+            resource (Dict[str, Any]): 리소스 요청 (calculate_total_cost의 resources 항목)
+        
+        Returns:
+            Optional[Dict[str, Any]]: 일치 점수가 가장 높은 가격 정보 (가격 정보를 찾을 수 없으면 None)
+        """
+        service_code = resource.get('serviceCode', '')
+        filters = resource.get('filters', [])
+        
+        try:
+            return self.calculate_price(service_code, filters)['priceInfos'][0]
+        
+        except ValueError as e:
+            print(f"Error calculating cost for {service_code}: {e}")
+            # 오류가 발생해도 다른 리소스는 계속 진행
+            return None
+    
+    def resolve_price_infos(self, specs: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        (서비스 코드, 필터) 조합마다 가장 잘 맞는 가격 정보를 공유 스레드 풀에서 동시에 조회합니다.
+        
+        Args:
+            specs (List[Dict[str, Any]]): 리소스 요청 목록 (group_resources가 반환한 조합 등)
+        
+        Returns:
+            List[Optional[Dict[str, Any]]]: 입력 순서의 가격 정보 (가격 정보를 찾을 수 없는 조합은 None)
+        """
+        return list(self._map_concurrently(self._resolve_price_info, specs))
+    
+    @staticmethod
+    def group_resources(resources: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[List[int]]]:
+        """
+        리소스 요청을 정규화한 (서비스 코드, 필터) 조합별로 묶습니다.
+        
+        필터 순서만 다르거나 수량/사용량만 다른 리소스는 같은 가격 정보를 사용하므로 한 번만 조회하면 됩니다.
+        
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], List[List[int]]]: (조합별 첫 리소스 요청 목록, 조합별 리소스 입력 위치 목록)
+        """
+        spec_indexes: Dict[Tuple[str, Tuple[Tuple[str, str, str], ...]], int] = {}
+        specs: List[Dict[str, Any]] = []
+        positions: List[List[int]] = []
+        
+        for position, resource in enumerate(resources):
+            key = (resource.get('serviceCode', ''), normalize_filters(resource.get('filters', [])))
+            spec_index = spec_indexes.get(key)
+            if spec_index is None:
+                spec_index = spec_indexes[key] = len(specs)
+                specs.append(resource)
+                positions.append([])
+            positions[spec_index].append(position)
+        
+        return specs, positions
+    
+    @classmethod
+    def build_resource_costs(cls, resources: List[Dict[str, Any]], price_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        같은 가격 정보를 쓰는 리소스 요청들의 비용 정보를 한 번에 만듭니다.
+        
+        구간별 가격이면 리소스마다 사용량 * 수량을 하나의 사용량으로 보고 구간 단가를 적용하며,
+        모든 리소스의 사용량을 한 번의 배열 연산(이진 탐색)으로 계산합니다.
+        
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록 (같은 서비스 코드와 필터 조합)
+            price_info (Dict[str, Any]): calculate_price 결과의 가격 정보 하나
+        
+        Returns:
+            List[Dict[str, Any]]: 리소스 비용 정보 목록 (resources 순서)
+        """
+        pricing = price_info['pricing']
+        if pricing.get('tiers'):
+            usages = [resource.get('usageValue', 0) * resource.get('quantity', 1) for resource in resources]
+            costs = TierSchedule.from_pricing(pricing).costs(usages).tolist()
+        else:
+            # 단위당 가격 * 사용량 * 수량 (시간당 가격이면 사용 시간)
+            costs = [
+                pricing['pricePerUnit'] * resource.get('usageValue', 0) * resource.get('quantity', 1)
+                for resource in resources
+            ]
+        
+        return [cls._build_resource_cost(resource, price_info, cost) for resource, cost in zip(resources, costs)]
+    
+    @staticmethod
+    def _build_resource_cost(resource: Dict[str, Any], price_info: Dict[str, Any], resource_cost: float) -> Dict[str, Any]:
+        """
+        리소스 요청과 가격 정보, 계산한 비용으로 리소스 비용 정보를 만듭니다.
+        
+        Args:
+            resource (Dict[str, Any]): 리소스 요청 (calculate_total_cost의 resources 항목)
+            price_info (Dict[str, Any]): calculate_price 결과의 가격 정보 하나
+            resource_cost (float): 리소스 비용
+        
+        Returns:
+            Dict[str, Any]: 리소스 비용 정보
+        """
+        service_code = resource.get('serviceCode', '')
+        quantity = resource.get('quantity', 1)
+        usage_type = resource.get('usageType', '')
+        usage_value = resource.get('usageValue', 0)
         
         return {
             'serviceCode': service_code,
-            'priceInfos': top_price_infos
+            'resourceDetails': price_info['resourceDetails'],
+            'quantity': quantity,
+            'usageDetails': {
+                'type': usage_type,
+                'value': usage_value
+            },
+            'cost': resource_cost
         }
     
     def calculate_total_cost(self, resources: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -394,50 +1332,47 @@ class PricingCalculator:
                     }
                 ]
         
+        Returns:
+            Dict[str, Any]: 총 비용 정보 (uniqueLookups: 실제로 가격을 조회한 (서비스 코드, 필터) 조합 수)
+        """
+        # 같은 (서비스 코드, 필터) 조합은 한 번만 조회하고, 조합별 조회는 서로 독립적이므로 동시에 실행
+        specs, positions = self.group_resources(resources)
+        resource_costs: List[Optional[Dict[str, Any]]] = [None] * len(resources)
+        for spec_positions, price_info in zip(positions, self.resolve_price_infos(specs)):
+            if price_info is None:
+                continue
+            # 조회한 가격을 조합의 리소스마다 수량과 사용량에 맞게 계산 (결과는 입력 순서 유지)
+            spec_costs = self.build_resource_costs([resources[position] for position in spec_positions], price_info)
+            for position, resource_cost in zip(spec_positions, spec_costs):
+                resource_costs[position] = resource_cost
+        
+        summary = self.summarize_total_cost(resource_costs)
+        summary['uniqueLookups'] = len(specs)
+        return summary
+    
+    @staticmethod
+    def summarize_total_cost(resource_costs: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        입력 순서의 리소스 비용 정보로 calculate_total_cost 결과를 만듭니다.
+        
+        Args:
+            resource_costs (Iterable[Optional[Dict[str, Any]]]): 리소스 비용 정보 (None은 가격을 찾지 못한 리소스)
+        
         Returns:
             Dict[str, Any]: 총 비용 정보
         """
         total_cost = 0
-        resource_costs = []
-        
-        for resource in resources:
-            service_code = resource.get('serviceCode', '')
-            filters = resource.get('filters', [])
-            quantity = resource.get('quantity', 1)
-            usage_type = resource.get('usageType', '')
-            usage_value = resource.get('usageValue', 0)
+        costs = []
+        
+        for resource_cost in resource_costs:
+            if resource_cost is None:
+                continue
             
-            try:
-                # 리소스 가격 계산
-                price_info = self.calculate_price(service_code, filters)
-                
-                # 리소스 비용 계산
-                resource_cost = 0
-                if price_info['pricing']['unit'].lower() == 'hrs' and usage_type.lower() == 'hours':
-                    # 시간당 가격 * 사용 시간 * 수량
-                    resource_cost = price_info['pricing']['pricePerUnit'] * usage_value * quantity
-                else:
-                    # 기본적으로 단위당 가격 * 사용량 * 수량
-                    resource_cost = price_info['pricing']['pricePerUnit'] * usage_value * quantity
-                
-                # 리소스 비용 정보 추가
-                resource_costs.append({
-                    'serviceCode': service_code,
-                    'resourceDetails': price_info['resourceDetails'],
-                    'quantity': quantity,
-                    'usageDetails': {
-                        'type': usage_type,
-                        'value': usage_value
-                    },
-                    'cost': resource_cost
-                })
-                
-                # 총 비용에 추가
-                total_cost += resource_cost
+            # 리소스 비용 정보 추가
+            costs.append(resource_cost)
             
-            except ValueError as e:
-                print(f"Error calculating cost for {service_code}: {e}")
-                # 오류가 발생해도 계속 진행
+            # 총 비용에 추가
+            total_cost += resource_cost['cost']
         
         return {
             'totalCost': {
@@ -445,7 +1380,51 @@ class PricingCalculator:
                 'amount': total_cost,
                 'timeUnit': 'monthly'
             },
-            'resourceCosts': resource_costs
+            'resourceCosts': costs
+        }
+    
+    def iter_total_cost(self, resources: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        calculate_total_cost와 같은 계산을 하면서 리소스 비용을 계산되는 순서대로 반환합니다.
+        
+        마지막 항목은 총 비용입니다. 스트리밍 응답(NDJSON, SSE)에서 첫 결과를 기다리지 않고
+        보낼 수 있도록 리소스 비용은 입력 순서가 아니라 계산이 끝난 순서로 반환하며,
+        index 필드로 입력 위치를 알려 줍니다. 가격 정보를 찾을 수 없는 리소스는 건너뜁니다.
+        
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록 (calculate_total_cost와 같은 형식)
+        
+        Yields:
+            Dict[str, Any]: 리소스 비용 이벤트
+                {'type': 'resourceCost', 'index': 0, 'resourceCost': {...}}
+                마지막에 총 비용 이벤트
+                {'type': 'totalCost', 'totalCost': {...}, 'resourceCount': 1, 'uniqueLookups': 1}
+        """
+        specs, positions = self.group_resources(resources)
+        resource_costs: List[Optional[Dict[str, Any]]] = [None] * len(resources)
+        
+        # 같은 조합의 리소스는 조합의 가격 조회가 끝나면 함께 전송
+        for spec_index, price_info in self._iter_completed(self._resolve_price_info, specs):
+            if price_info is None:
+                continue
+            
+            spec_positions = positions[spec_index]
+            spec_costs = self.build_resource_costs([resources[index] for index in spec_positions], price_info)
+            for index, resource_cost in zip(spec_positions, spec_costs):
+                resource_costs[index] = resource_cost
+                yield {
+                    'type': 'resourceCost',
+                    'index': index,
+                    'resourceCost': resource_cost
+                }
+        
+        # calculate_total_cost와 같은 값이 되도록 입력 순서대로 합산
+        summary = self.summarize_total_cost(resource_costs)
+        yield {
+            'type': 'totalCost',
+            'totalCost': summary['totalCost'],
+            'resourceCount': len(summary['resourceCosts']),
+            'uniqueLookups': len(specs)
         }
 
 
@@ -0,0 +1,229 @@
+"""
+API Benchmark
+
+로컬 Pricing API 대역 서버(fake_pricing_api)를 상대로 API 서버의 엔드포인트별 처리량과 지연 시간을
+동시 연결 수별로 측정하고, 결과를 JSON 파일로 저장하여 커밋 간 성능 변화를 비교하는 스크립트입니다.
+
+    # 현재 커밋 측정 (결과: benchmarks/results/<커밋>.json)
+    python benchmarks/bench_api.py --concurrency 1,8,32 --duration 5 --latency 0.05
+
+    # 기준 결과와 비교 (초당 요청 수 감소나 p95 증가가 10%를 넘으면 종료 코드 1)
+    python benchmarks/bench_api.py --compare benchmarks/results/<기준 커밋>.json --threshold 0.1
+
+API 서버는 같은 프로세스에서 스레드 방식 WSGI 서버로 실행하며, AWS 대신 대역 서버를 호출하도록
+PRICING_ENDPOINT_URL과 테스트용 자격 증명을 설정합니다. 기본값은 캐시와 가격 색인을 끄고
+매 요청이 대역 서버까지 가도록 하며, --cache를 지정하면 캐시를 켠 상태를 측정합니다.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_http_throughput import run  # noqa: E402
+from fake_pricing_api import FakePricingAPI, FakePricingCatalog  # noqa: E402
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+EC2_FILTERS = [
+    {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'},
+    {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'},
+    {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'},
+    {'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}
+]
+
+S3_FILTERS = [
+    {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'},
+    {'type': 'TERM_MATCH', 'field': 'volumeType', 'value': 'Standard'}
+]
+
+# (이름, 메서드, 경로, 요청 본문)
+SCENARIOS: List[Tuple[str, str, str, Optional[Dict[str, Any]]]] = [
+    ('services', 'GET', '/api/services', None),
+    ('attributes', 'GET', '/api/services/AmazonEC2/attributes', None),
+    ('attribute-values', 'GET', '/api/services/AmazonEC2/attributes/instanceType/values', None),
+    ('pricing', 'POST', '/api/pricing', {'serviceCode': 'AmazonEC2', 'filters': EC2_FILTERS}),
+    ('calculate', 'POST', '/api/calculate', {'resources': [
+        {'serviceCode': 'AmazonEC2', 'filters': EC2_FILTERS, 'quantity': 3, 'usageType': 'Hours', 'usageValue': 730},
+        {'serviceCode': 'AmazonEC2', 'filters': EC2_FILTERS[1:] + [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'c5.xlarge'}
+        ], 'quantity': 2, 'usageType': 'Hours', 'usageValue': 730},
+        {'serviceCode': 'AmazonS3', 'filters': S3_FILTERS, 'quantity': 1, 'usageType': 'GB-Mo', 'usageValue': 100000}
+    ]}),
+]
+
+# 비교할 지표와 방향 (1이면 클수록 좋음, -1이면 작을수록 좋음)
+COMPARED_METRICS = {'requestsPerSecond': 1, 'p50Ms': -1, 'p95Ms': -1, 'p99Ms': -1}
+
+
+def configure_environment(endpoint_url: str, cache: bool, rate_limit: float) -> None:
+    """API 서버가 대역 서버를 호출하도록 환경 변수를 설정합니다 (app_swagger를 가져오기 전에 호출)."""
+    os.environ.update({
+        'PRICING_ENDPOINT_URL': endpoint_url,
+        'AWS_ACCESS_KEY_ID': 'benchmark',
+        'AWS_SECRET_ACCESS_KEY': 'benchmark',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'PRICING_RATE_LIMIT': str(rate_limit),
+        'PRICING_CACHE_ENABLED': 'true' if cache else 'false',
+        'PRICING_PRICE_INDEX_ENABLED': 'true' if cache else 'false',
+        'PRICING_REFRESH_INTERVAL': '0'
+    })
+    for name in ('PRICING_OFFER_DB', 'PRICING_PERSISTENT_CACHE', 'PRICING_OFFLINE'):
+        os.environ.pop(name, None)
+
+
+def start_api_server() -> Tuple[Any, str]:
+    """API 서버를 같은 프로세스의 스레드 방식 WSGI 서버로 시작합니다."""
+    from werkzeug.serving import make_server
+    from app_swagger import app
+
+    # 요청마다 찍히는 접근 로그가 측정에 영향을 주지 않도록 끔
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='bench-api-server', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(base_url: str, concurrency_levels: List[int], duration: float,
+                   scenario_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """시나리오와 동시 연결 수 조합마다 처리량과 지연 시간을 측정합니다."""
+    results = []
+    for name, method, path, body in SCENARIOS:
+        if scenario_names and name not in scenario_names:
+            continue
+        for concurrency in concurrency_levels:
+            result = run(base_url + path, concurrency, duration, method, body)
+            result.update({'scenario': name, 'concurrency': concurrency})
+            results.append(result)
+            print(f"{name:<18}{concurrency:>6}{result['requestsPerSecond']:>10.1f}"
+                  f"{result['p50Ms']:>10.1f}{result['p95Ms']:>10.1f}{result['p99Ms']:>10.1f}{result['errors']:>8}")
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    기준 결과와 현재 결과를 (시나리오, 동시 연결 수)별로 비교합니다.
+
+    Args:
+        baseline (Dict[str, Any]): 기준 결과 파일 내용
+        current (Dict[str, Any]): 현재 결과
+        threshold (float): 허용하는 악화 비율 (예: 0.1 = 10%)
+
+    Returns:
+        List[Dict[str, Any]]: 허용 범위를 넘게 나빠진 지표 목록
+    """
+    baseline_rows = {(row['scenario'], row['concurrency']): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        previous = baseline_rows.get((row['scenario'], row['concurrency']))
+        if previous is None:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            before, after = previous.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change * direction < -threshold:
+                regressions.append({
+                    'scenario': row['scenario'],
+                    'concurrency': row['concurrency'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': change
+                })
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='로컬 Pricing API 대역 서버를 상대로 API 엔드포인트 성능 측정')
+    parser.add_argument('--concurrency', default='1,8,32', help='동시 연결 수 목록 (기본값: 1,8,32)')
+    parser.add_argument('--duration', type=float, default=5.0, help='조합당 측정 시간 (초, 기본값: 5)')
+    parser.add_argument('--latency', type=float, default=0.05, help='대역 서버의 요청당 지연 시간 (초, 기본값: 0.05)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='대역 서버 지연 시간에 더할 무작위 시간의 최댓값 (초)')
+    parser.add_argument('--page-size', type=int, default=100, help='대역 서버의 페이지당 최대 항목 수')
+    parser.add_argument('--recording', help='대역 서버가 응답할 get_products 녹화 파일')
+    parser.add_argument('--scenarios', help='측정할 시나리오 목록 (쉼표 구분, 기본값: 전체)')
+    parser.add_argument('--cache', action='store_true', help='캐시와 가격 색인을 켠 상태로 측정')
+    parser.add_argument('--rate-limit', type=float, default=10000, help='PRICING_RATE_LIMIT (기본값: 10000)')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: benchmarks/results/<커밋>.json)')
+    parser.add_argument('--compare', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=0.1, help='허용하는 악화 비율 (기본값: 0.1)')
+    args = parser.parse_args()
+
+    concurrency_levels = [int(value) for value in args.concurrency.split(',') if value]
+    scenario_names = [name for name in args.scenarios.split(',') if name] if args.scenarios else None
+
+    fake_api = FakePricingAPI(FakePricingCatalog.load(args.recording), latency=args.latency,
+                              jitter=args.jitter, page_size=args.page_size).start()
+    configure_environment(fake_api.endpoint_url, args.cache, args.rate_limit)
+    server, base_url = start_api_server()
+
+    commit = git_commit()
+    print(f"commit: {commit}, upstream latency: {args.latency * 1000:.0f}ms, cache: {args.cache}")
+    print(f"{'scenario':<18}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    try:
+        results = run_benchmarks(base_url, concurrency_levels, args.duration, scenario_names)
+    finally:
+        server.shutdown()
+        fake_api.stop()
+
+    report = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'duration': args.duration,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'pageSize': args.page_size,
+            'cache': args.cache,
+            'recording': args.recording,
+            'upstreamRequests': fake_api.requests
+        },
+        'results': results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['scenario']} x{regression['concurrency']} {regression['metric']}: "
+                  f"{regression['baseline']:.2f} -> {regression['current']:.2f} ({regression['change']:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {baseline.get('commit')} (threshold {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Cost Engine Benchmark
+
+리소스 항목 수와 시나리오 수에 따른 비용 계산 시간을 반복문 방식과 NumPy 배열 방식으로 비교하는 스크립트입니다.
+
+    python benchmarks/bench_cost_engine.py --items 100000 --scenarios 24
+
+가격 조회 시간은 제외하고 (단가는 미리 정해 둠) 단가 * 수량 * 사용량 계산과 서비스별 합계만 측정합니다.
+
+비교 대상:
+    - loop: 시나리오마다 항목을 하나씩 반복하며 계산 (calculate_total_cost와 같은 방식)
+    - vectorized: LineItems 열 배열과 (시나리오 x 항목) 행렬로 한 번에 계산
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cost_engine import LineItems, line_costs, summarize_costs  # noqa: E402
+
+
+SERVICES = ['AmazonEC2', 'AmazonRDS', 'AmazonS3', 'AmazonEBS', 'AWSLambda']
+
+
+def make_resources(count: int) -> List[Dict[str, Any]]:
+    """합성 리소스 요청 목록을 만듭니다."""
+    return [
+        {
+            'serviceCode': SERVICES[index % len(SERVICES)],
+            'filters': [],
+            'quantity': index % 7 + 1,
+            'usageValue': 730 - index % 200
+        }
+        for index in range(count)
+    ]
+
+
+def run_loop(resources: List[Dict[str, Any]], prices: List[float], scales: List[float]) -> List[Dict[str, float]]:
+    results = []
+    for scale in scales:
+        subtotals: Dict[str, float] = {}
+        for resource, price in zip(resources, prices):
+            cost = price * resource['usageValue'] * resource['quantity'] * scale
+            subtotals[resource['serviceCode']] = subtotals.get(resource['serviceCode'], 0.0) + cost
+        results.append(subtotals)
+    return results
+
+
+def run_vectorized(resources: List[Dict[str, Any]], prices: List[float], scales: List[float]) -> Any:
+    items = LineItems.from_resources(resources, prices)
+    quantity = items.quantity[np.newaxis, :] * np.array(scales)[:, np.newaxis]
+    costs = line_costs(items.price[np.newaxis, :], quantity, items.usage[np.newaxis, :])
+    return summarize_costs(costs, items.service_ids, len(items.services))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='반복문과 NumPy 배열 비용 계산 시간 비교')
+    parser.add_argument('--items', type=int, default=100000, help='리소스 항목 수 (기본값: 100000)')
+    parser.add_argument('--scenarios', type=int, default=24, help='시나리오 수 (기본값: 24)')
+    args = parser.parse_args()
+
+    resources = make_resources(args.items)
+    prices = [0.01 + (index % 1000) / 1000 for index in range(args.items)]
+    scales = [1 + index * 0.1 for index in range(args.scenarios)]
+
+    started = time.perf_counter()
+    loop_result = run_loop(resources, prices, scales)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    totals, _ = run_vectorized(resources, prices, scales)
+    vectorized_seconds = time.perf_counter() - started
+
+    np.testing.assert_allclose(totals, [sum(subtotals.values()) for subtotals in loop_result])
+
+    print(f"items: {args.items}, scenarios: {args.scenarios}")
+    print(f"{'engine':<12}{'seconds':>10}")
+    print(f"{'loop':<12}{loop_seconds:>10.3f}")
+    print(f"{'vectorized':<12}{vectorized_seconds:>10.3f}")
+    print(f"speedup: {loop_seconds / vectorized_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
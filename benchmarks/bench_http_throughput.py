@@ -0,0 +1,105 @@
+"""
+HTTP Throughput Benchmark
+
+실행 중인 API 서버에 여러 keep-alive 연결로 요청을 보내 처리량과 지연 시간을 측정하는 스크립트입니다.
+
+    gunicorn -c gunicorn.conf.py wsgi:app &
+    python benchmarks/bench_http_throughput.py --url http://127.0.0.1:7777/api/filter-documentation \
+        --concurrency 16 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+def run_client(url: str, method: str, body: Optional[bytes], headers: Dict[str, str],
+               deadline: float, latencies: List[float], errors: List[str]) -> None:
+    """deadline까지 하나의 keep-alive 연결로 요청을 반복합니다."""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(str(response.status))
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    connection.close()
+
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+def run(url: str, concurrency: int, duration: float, method: str = 'GET',
+        body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    동시 연결 concurrency개로 duration초 동안 요청을 보내고 결과를 집계합니다.
+
+    Returns:
+        Dict[str, Any]: 요청 수, 초당 요청 수, 지연 시간 백분위수 (ms), 오류 수
+    """
+    payload = json.dumps(body).encode('utf-8') if body is not None else None
+    headers = {'Content-Type': 'application/json'} if payload is not None else {}
+    deadline = time.perf_counter() + duration
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors: List[str] = []
+
+    threads = [
+        threading.Thread(target=run_client, args=(url, method, payload, headers, deadline, latencies[i], errors))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = sorted(latency for client in latencies for latency in client)
+    return {
+        'requests': len(merged),
+        'requestsPerSecond': len(merged) / elapsed,
+        'p50Ms': percentile(merged, 0.50) * 1000,
+        'p95Ms': percentile(merged, 0.95) * 1000,
+        'p99Ms': percentile(merged, 0.99) * 1000,
+        'errors': len(errors)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='API 서버 HTTP 처리량 측정')
+    parser.add_argument('--url', default='http://127.0.0.1:7777/api/filter-documentation', help='요청 URL')
+    parser.add_argument('--method', default='GET', help='HTTP 메서드 (기본값: GET)')
+    parser.add_argument('--body', help='JSON 요청 본문 (POST 요청 시)')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 연결 수 (기본값: 16)')
+    parser.add_argument('--duration', type=float, default=10.0, help='측정 시간 (초, 기본값: 10)')
+    args = parser.parse_args()
+
+    result = run(args.url, args.concurrency, args.duration, args.method,
+                 json.loads(args.body) if args.body else None)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
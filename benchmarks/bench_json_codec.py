@@ -0,0 +1,140 @@
+"""
+JSON Codec Benchmark
+
+PriceList 디코딩과 API 응답 인코딩 시간을 JSON 백엔드별로 비교하는 스크립트입니다.
+
+    python benchmarks/bench_json_codec.py --repeat 5
+
+디코딩은 합성 EC2 카탈로그(fake_pricing_api, 예약 약정 포함)의 PriceList 문자열 전체를 디코딩하는 시간과
+디코딩한 제품 목록을 보관하는 데 드는 메모리(tracemalloc)를 측정합니다.
+인코딩은 /api/pricing(구매 옵션 포함)과 /api/calculate 형식의 응답을 직렬화하는 시간을 측정하며,
+기준(json)은 Flask-RestX 기본 직렬화와 같은 json.dumps 기본 설정입니다.
+
+비교 대상:
+    - json / orjson / msgspec: 전체 제품 정보 디코딩
+    - json+select / orjson+select / msgspec+schema: 계산에 쓰는 필드만 남기는 디코딩
+      (msgspec은 JSONCodec 기본값, json/orjson은 PRICING_JSON_SELECTIVE=true)
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_pricing_api import build_synthetic_catalog  # noqa: E402
+from json_codec import JSONCodec, msgspec, orjson  # noqa: E402
+from term_table import TermTable  # noqa: E402
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """func를 repeat번 실행한 시간 중 가장 짧은 시간(초)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def retained_bytes(func: Callable[[], Any]) -> int:
+    """func 결과를 보관하는 데 드는 메모리(바이트)를 반환합니다."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def decoders() -> List[Tuple[str, Callable[[str], Any]]]:
+    """설치된 백엔드별 (이름, 디코딩 함수) 목록을 반환합니다."""
+    candidates = [('json', json.loads), ('json+select', JSONCodec('json', selective=True).decode_product)]
+    if orjson is not None:
+        candidates += [('orjson', orjson.loads), ('orjson+select', JSONCodec('orjson', selective=True).decode_product)]
+    if msgspec is not None:
+        candidates += [('msgspec', msgspec.json.decode), ('msgspec+schema', JSONCodec('msgspec').decode_product)]
+    return candidates
+
+
+def encoders() -> List[Tuple[str, Callable[[Any], Any]]]:
+    """설치된 백엔드별 (이름, 인코딩 함수) 목록을 반환합니다."""
+    candidates = [('json', json.dumps)]
+    if orjson is not None:
+        candidates.append(('orjson', JSONCodec('orjson').dumps))
+    if msgspec is not None:
+        candidates.append(('msgspec', msgspec.json.encode))
+    return candidates
+
+
+def make_responses(products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """/api/pricing과 /api/calculate 형식의 합성 응답을 만듭니다."""
+    price_infos = []
+    for product in products[:10]:
+        price_infos.append({
+            'serviceCode': 'AmazonEC2',
+            'resourceDetails': product['product']['attributes'],
+            'pricing': {'currency': 'USD', 'pricePerUnit': 0.096, 'unit': 'Hrs', 'description': 'On Demand'},
+            'estimatedMonthlyCost': 70.08,
+            'purchaseOptions': TermTable.from_product(product).purchase_options()
+        })
+    resource_costs = [{
+        'serviceCode': 'AmazonEC2',
+        'resourceDetails': products[index % len(products)]['product']['attributes'],
+        'quantity': 2,
+        'usageType': 'Hours',
+        'usageValue': 730,
+        'pricePerUnit': 0.096,
+        'unit': 'Hrs',
+        'cost': 140.16,
+        'currency': 'USD'
+    } for index in range(200)]
+    return {
+        'pricing': {'serviceCode': 'AmazonEC2', 'priceInfos': price_infos},
+        'calculate': {
+            'totalCost': {'amount': 140.16 * 200, 'currency': 'USD'},
+            'resourceCosts': resource_costs,
+            'uniqueLookups': 200
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='JSON 백엔드별 PriceList 디코딩과 응답 인코딩 시간 비교')
+    parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (가장 짧은 시간 사용, 기본값: 5)')
+    args = parser.parse_args()
+
+    products = build_synthetic_catalog()['AmazonEC2']
+    price_lists = [json.dumps(product) for product in products]
+    total_bytes = sum(map(len, price_lists))
+    print(f"decode: {len(price_lists)} EC2 products, {total_bytes / len(price_lists):.0f} bytes each")
+    print(f"{'backend':<16}{'ms':>10}{'us/item':>10}{'speedup':>9}{'retained KB':>13}")
+
+    baseline = None
+    for name, decode in decoders():
+        seconds = best_of(lambda: [decode(price_list) for price_list in price_lists], args.repeat)
+        retained = retained_bytes(lambda: [decode(price_list) for price_list in price_lists])
+        baseline = baseline or seconds
+        print(f"{name:<16}{seconds * 1000:>10.1f}{seconds / len(price_lists) * 1e6:>10.1f}"
+              f"{baseline / seconds:>8.1f}x{retained / 1024:>13.0f}")
+
+    for label, payload in make_responses(products).items():
+        size = len(json.dumps(payload))
+        print(f"\nencode: {label} response ({size / 1024:.0f} KB)")
+        print(f"{'backend':<16}{'us':>10}{'speedup':>9}")
+        baseline = None
+        for name, encode in encoders():
+            seconds = best_of(lambda: [encode(payload) for _ in range(100)], args.repeat) / 100
+            baseline = baseline or seconds
+            print(f"{name:<16}{seconds * 1e6:>10.1f}{baseline / seconds:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
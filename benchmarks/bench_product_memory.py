@@ -0,0 +1,164 @@
+"""
+Product Memory Benchmark
+
+제품 정보 표현 방식별 메모리 사용량을 tracemalloc으로 비교하는 스크립트입니다.
+
+    python benchmarks/bench_product_memory.py --count 20000
+
+비교 대상:
+    - full: get_products가 반환하는 중첩 딕셔너리 그대로 보관
+    - dict: 속성 딕셔너리 사본 + 가격 딕셔너리 보관 (이전 가격 색인 방식)
+    - compact: CompactProduct (공유 키 목록 + intern된 값 튜플 + float 가격)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_pricing_client import PricingCalculator  # noqa: E402
+from product_record import AttributeSchema, CompactProduct  # noqa: E402
+
+
+LOCATIONS = ['US East (N. Virginia)', 'US West (Oregon)', 'Asia Pacific (Seoul)', 'EU (Frankfurt)']
+INSTANCE_TYPES = [f'{family}.{size}' for family in ('t3', 'm5', 'c5', 'r5', 'm6i')
+                  for size in ('large', 'xlarge', '2xlarge', '4xlarge')]
+OPERATING_SYSTEMS = ['Linux', 'Windows', 'RHEL', 'SUSE']
+TENANCIES = ['Shared', 'Dedicated', 'Host']
+
+
+def make_product(index: int) -> Dict[str, Any]:
+    """
+    실제 EC2 제품과 비슷한 크기(속성 약 30개)의 합성 제품 정보를 만듭니다.
+
+    JSON으로 직렬화한 뒤 다시 읽어 API 응답처럼 문자열이 공유되지 않게 합니다.
+    """
+    sku = f'SKU{index:08d}'
+    instance_type = INSTANCE_TYPES[index % len(INSTANCE_TYPES)]
+    attributes = {
+        'servicecode': 'AmazonEC2',
+        'servicename': 'Amazon Elastic Compute Cloud',
+        'productFamily': 'Compute Instance',
+        'location': LOCATIONS[index % len(LOCATIONS)],
+        'locationType': 'AWS Region',
+        'regionCode': 'us-east-1',
+        'instanceType': instance_type,
+        'instanceFamily': 'General purpose',
+        'currentGeneration': 'Yes',
+        'vcpu': str(2 ** (index % 4 + 1)),
+        'physicalProcessor': 'Intel Xeon Platinum 8175',
+        'clockSpeed': '3.1 GHz',
+        'memory': f'{2 ** (index % 4 + 3)} GiB',
+        'storage': 'EBS only',
+        'networkPerformance': 'Up to 10 Gigabit',
+        'processorArchitecture': '64-bit',
+        'tenancy': TENANCIES[index % len(TENANCIES)],
+        'operatingSystem': OPERATING_SYSTEMS[index % len(OPERATING_SYSTEMS)],
+        'licenseModel': 'No License required',
+        'usagetype': f'BoxUsage:{instance_type}',
+        'operation': 'RunInstances',
+        'capacitystatus': 'Used',
+        'dedicatedEbsThroughput': 'Up to 4750 Mbps',
+        'ecu': '10',
+        'enhancedNetworkingSupported': 'Yes',
+        'intelAvxAvailable': 'Yes',
+        'intelAvx2Available': 'Yes',
+        'intelTurboAvailable': 'Yes',
+        'normalizationSizeFactor': '4',
+        'preInstalledSw': 'NA',
+        'processorFeatures': 'Intel AVX; Intel AVX2; Intel AVX512; Intel Turbo',
+        'vpcnetworkingsupport': 'true',
+    }
+    term_code = f'{sku}.JRTCKXETXF'
+    product = {
+        'product': {'productFamily': 'Compute Instance', 'sku': sku, 'attributes': attributes},
+        'serviceCode': 'AmazonEC2',
+        'publicationDate': '2025-01-01T00:00:00Z',
+        'version': '20250101000000',
+        'terms': {'OnDemand': {term_code: {
+            'offerTermCode': 'JRTCKXETXF',
+            'sku': sku,
+            'effectiveDate': '2025-01-01T00:00:00Z',
+            'termAttributes': {},
+            'priceDimensions': {f'{term_code}.6YS6EN2CT7': {
+                'rateCode': f'{term_code}.6YS6EN2CT7',
+                'description': f'$0.{index % 1000:03d} per On Demand Linux {instance_type} Instance Hour',
+                'beginRange': '0',
+                'endRange': 'Inf',
+                'unit': 'Hrs',
+                'appliesTo': [],
+                'pricePerUnit': {'USD': f'0.{index % 1000:03d}0000000'}
+            }}
+        }}}
+    }
+    return json.loads(json.dumps(product))
+
+
+def iter_products(count: int) -> Iterator[Dict[str, Any]]:
+    """합성 제품 정보를 하나씩 만듭니다 (원본은 변환 후 바로 해제됨)."""
+    for index in range(count):
+        yield make_product(index)
+
+
+def measure(build: Callable[[Iterator[Dict[str, Any]]], Any], count: int) -> Dict[str, float]:
+    """build가 만든 결과를 유지하는 데 드는 메모리와 시간을 측정합니다."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(iter_products(count))
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {'bytes': current, 'seconds': elapsed}
+
+
+def build_full(products: Iterator[Dict[str, Any]]) -> Any:
+    return list(products)
+
+
+def build_dict(products: Iterator[Dict[str, Any]]) -> Any:
+    return [
+        (product['product']['sku'], dict(product['product']['attributes']),
+         PricingCalculator._extract_price_from_product(None, product))
+        for product in products
+    ]
+
+
+def build_compact(products: Iterator[Dict[str, Any]]) -> Any:
+    schema = AttributeSchema()
+    return [
+        CompactProduct.from_parts(
+            product['product']['sku'],
+            product['product']['attributes'],
+            PricingCalculator._extract_price_from_product(None, product),
+            schema
+        )
+        for product in products
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='제품 정보 표현 방식별 메모리 사용량 비교')
+    parser.add_argument('--count', type=int, default=20000, help='제품 수 (기본값: 20000)')
+    args = parser.parse_args()
+
+    results = {
+        'full': measure(build_full, args.count),
+        'dict': measure(build_dict, args.count),
+        'compact': measure(build_compact, args.count),
+    }
+
+    print(f"products: {args.count}")
+    print(f"{'representation':<16}{'total MiB':>12}{'bytes/product':>16}{'build s':>10}")
+    for name, result in results.items():
+        print(f"{name:<16}{result['bytes'] / 1024 / 1024:>12.1f}"
+              f"{result['bytes'] / args.count:>16.0f}{result['seconds']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Shared Price Table Benchmark
+
+워커 프로세스마다 가격 색인(PriceIndex)을 만드는 방식과 공유 가격표(SharedPriceTable)를 매핑하는 방식의
+워커별 메모리와 조회 시간을 비교하는 스크립트입니다 (Linux /proc/self/smaps_rollup 사용).
+
+    python benchmarks/bench_shared_price_table.py --count 100000 --workers 4
+
+gunicorn처럼 fork한 워커 N개가 각자 같은 카탈로그를 색인하거나 같은 가격표 파일을 매핑한 뒤
+모든 색인 키를 조회하고, 워커마다 다음 값을 보고합니다.
+    - USS: 그 워커만 쓰는 메모리 (fork 이후 새로 쓴 페이지, 워커 수만큼 늘어남)
+    - PSS: 공유 페이지를 공유하는 프로세스 수로 나눠 더한 메모리
+    - lookup: calculate_price 한 번의 평균 시간 (색인/가격표 조회 + 응답 딕셔너리 생성)
+idle은 가격 데이터 없이 애플리케이션만 불러온 워커의 기준값입니다.
+가격표 생성과 필터 목록 준비는 별도 로더 프로세스에서 하므로 그 메모리는 워커에 상속되지 않습니다.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_product_memory import iter_products  # noqa: E402
+from aws_pricing_client import PricingCalculator  # noqa: E402
+from price_index import INDEX_FIELDS, PriceIndex  # noqa: E402
+from shared_price_table import SharedPriceTable  # noqa: E402
+
+
+class CatalogClient:
+    """합성 카탈로그를 오프라인 저장소처럼 제공하는 대역 클라이언트"""
+
+    def __init__(self, count: int):
+        self.offer_store = self
+        self.count = count
+
+    def has_service(self, service_code: str) -> bool:
+        return service_code == 'AmazonEC2'
+
+    def iter_products(self, service_code: str, filters: Any = None) -> Any:
+        return iter_products(self.count)
+
+
+def memory_kib() -> Dict[str, int]:
+    """현재 프로세스의 USS, PSS (KiB)를 반환합니다."""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in ('Pss', 'Private_Clean', 'Private_Dirty'):
+                values[name] = int(rest.split()[0])
+    return {'uss': values['Private_Clean'] + values['Private_Dirty'], 'pss': values['Pss']}
+
+
+def lookup_filters(count: int) -> List[List[Dict[str, str]]]:
+    """카탈로그의 모든 색인 키에 해당하는 필터 목록을 만듭니다."""
+    keys = {
+        tuple(product['product']['attributes'][field] for field in INDEX_FIELDS['AmazonEC2'])
+        for product in iter_products(count)
+    }
+    return [
+        [{'type': 'TERM_MATCH', 'field': field, 'value': value} for field, value in zip(INDEX_FIELDS['AmazonEC2'], key)]
+        for key in sorted(keys)
+    ]
+
+
+def run_worker(mode: str, count: int, path: str, filters: List[List[Dict[str, str]]],
+               barrier: Any, queue: Any) -> None:
+    """워커 하나에서 색인을 만들거나 가격표를 매핑한 뒤 모든 키를 조회합니다."""
+    client = CatalogClient(count)
+    if mode == 'idle':
+        barrier.wait()
+        queue.put({**memory_kib(), 'lookupUs': 0.0})
+        barrier.wait()
+        return
+    if mode == 'index':
+        calculator = PricingCalculator(client, max_workers=1, price_index=PriceIndex())
+        calculator.build_price_index('AmazonEC2')
+    else:
+        calculator = PricingCalculator(client, max_workers=1, price_index=PriceIndex(),
+                                       shared_table=SharedPriceTable(path))
+
+    started = time.perf_counter()
+    for filter_list in filters:
+        calculator.calculate_price('AmazonEC2', filter_list)
+    elapsed = time.perf_counter() - started
+
+    # 모든 워커가 조회를 마친 뒤 측정해야 PSS가 공유 프로세스 수로 나뉨
+    barrier.wait()
+    queue.put({**memory_kib(), 'lookupUs': elapsed / len(filters) * 1e6})
+    barrier.wait()
+
+
+def run_loader(count: int, path: str, queue: Any) -> None:
+    """로더 프로세스에서 가격표를 만들고 조회할 필터 목록을 준비합니다."""
+    started = time.perf_counter()
+    result = PricingCalculator(CatalogClient(count), max_workers=1).build_shared_price_table(path, ['AmazonEC2'])
+    queue.put((result, time.perf_counter() - started, lookup_filters(count)))
+
+
+def run_mode(mode: str, count: int, workers: int, path: str, filters: List[List[Dict[str, str]]]) -> List[Dict]:
+    """워커 workers개를 fork하여 결과를 모읍니다."""
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(workers)
+    queue = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(mode, count, path, filters, barrier, queue))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='워커별 가격 색인과 공유 가격표의 메모리, 조회 시간 비교')
+    parser.add_argument('--count', type=int, default=100000, help='EC2 제품 수 (기본값: 100000)')
+    parser.add_argument('--workers', type=int, default=4, help='워커 프로세스 수 (기본값: 4)')
+    args = parser.parse_args()
+
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(dir=directory) as tmpdir:
+        path = os.path.join(tmpdir, 'pricing-price-table.bin')
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        loader = context.Process(target=run_loader, args=(args.count, path, queue))
+        loader.start()
+        result, seconds, filters = queue.get()
+        loader.join()
+        print(f"products: {args.count}, keys: {len(filters)}, workers: {args.workers}")
+        print(f"shared table: {result['bytes'] / (1 << 20):.1f} MiB, built in {seconds:.1f}s")
+
+        print(f"{'mode':<10}{'USS MiB/worker':>16}{'PSS MiB/worker':>16}{'total PSS MiB':>15}{'lookup us':>11}")
+        for mode in ('idle', 'index', 'shared'):
+            results = run_mode(mode, args.count, args.workers, path, filters)
+            uss = sum(item['uss'] for item in results) / len(results) / 1024
+            pss = sum(item['pss'] for item in results) / 1024
+            lookup = sum(item['lookupUs'] for item in results) / len(results)
+            print(f"{mode:<10}{uss:>16.1f}{pss / len(results):>16.1f}{pss:>15.1f}{lookup:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+"""
+Fake Pricing API
+
+성능 측정용으로 AWS Pricing API(awsJson1.1)를 흉내 내는 로컬 HTTP 서버입니다.
+
+DescribeServices, GetAttributeValues, GetProducts를 실제 API처럼 페이지(NextToken) 단위로 응답하며,
+요청마다 지정한 지연 시간만큼 기다린 뒤 응답하여 네트워크 왕복 시간을 흉내 냅니다.
+제품 정보는 합성 카탈로그(EC2 온디맨드/예약, S3 구간별 가격)를 쓰거나,
+get_products 결과를 서비스 코드별로 저장한 JSON 파일(--recording)을 그대로 사용합니다.
+
+    python benchmarks/fake_pricing_api.py --port 8999 --latency 0.05
+    PRICING_ENDPOINT_URL=http://127.0.0.1:8999 AWS_ACCESS_KEY_ID=x AWS_SECRET_ACCESS_KEY=x python app_swagger.py
+
+녹화 파일 형식:
+    {"AmazonEC2": [<get_products 결과 항목>, ...], "AmazonS3": [...]}
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+LOCATIONS = ['US East (N. Virginia)', 'US West (Oregon)', 'Asia Pacific (Seoul)', 'EU (Frankfurt)']
+INSTANCE_TYPES = [f'{family}.{size}' for family in ('t3', 'm5', 'c5', 'r5')
+                  for size in ('large', 'xlarge', '2xlarge', '4xlarge')]
+OPERATING_SYSTEMS = ['Linux', 'Windows']
+TENANCIES = ['Shared', 'Dedicated']
+
+# 실제 응답처럼 약정마다 반복되는 적용 일자
+EFFECTIVE_DATE = '2025-01-01T00:00:00Z'
+
+# 실제 API의 GetProducts 페이지 크기 기본값
+DEFAULT_PAGE_SIZE = 100
+
+
+def _on_demand_term(sku: str, dimensions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    code = f'{sku}.JRTCKXETXF'
+    return {code: {
+        'offerTermCode': 'JRTCKXETXF',
+        'sku': sku,
+        'effectiveDate': EFFECTIVE_DATE,
+        'termAttributes': {},
+        'priceDimensions': {
+            f'{code}.{position}': {**dimension, 'rateCode': f'{code}.{position}', 'appliesTo': []}
+            for position, dimension in enumerate(dimensions)
+        }
+    }}
+
+
+def _reserved_terms(sku: str, hourly: float) -> Dict[str, Any]:
+    terms = {}
+    for lease, discount in (('1yr', 0.6), ('3yr', 0.4)):
+        for option, upfront_share in (('No Upfront', 0.0), ('Partial Upfront', 0.5), ('All Upfront', 1.0)):
+            code = f'{sku}.{lease}{option.split()[0].upper()}'
+            months = 12 if lease == '1yr' else 36
+            effective = hourly * discount
+            dimensions = {f'{code}.HRS': {
+                'unit': 'Hrs', 'description': 'Reserved hourly', 'rateCode': f'{code}.HRS', 'appliesTo': [],
+                'beginRange': '0', 'endRange': 'Inf',
+                'pricePerUnit': {'USD': f'{effective * (1 - upfront_share):.6f}'}
+            }}
+            if upfront_share:
+                dimensions[f'{code}.UPFRONT'] = {
+                    'unit': 'Quantity', 'description': 'Upfront Fee', 'rateCode': f'{code}.UPFRONT', 'appliesTo': [],
+                    'pricePerUnit': {'USD': f'{effective * upfront_share * 730 * months:.2f}'}
+                }
+            terms[code] = {
+                'offerTermCode': code.split('.')[1],
+                'sku': sku,
+                'effectiveDate': EFFECTIVE_DATE,
+                'termAttributes': {'LeaseContractLength': lease, 'OfferingClass': 'standard', 'PurchaseOption': option},
+                'priceDimensions': dimensions
+            }
+    return terms
+
+
+def build_synthetic_catalog() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    EC2 인스턴스(인스턴스 유형 x 리전 x OS x 테넌시)와 S3 스토리지(리전별 구간 가격) 합성 카탈로그를 만듭니다.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: 서비스 코드별 제품 정보 목록
+    """
+    ec2 = []
+    for index, (instance_type, location, operating_system, tenancy) in enumerate(
+            (i, l, o, t) for i in INSTANCE_TYPES for l in LOCATIONS for o in OPERATING_SYSTEMS for t in TENANCIES):
+        sku = f'EC2{index:06d}'
+        hourly = 0.05 * (1 + INSTANCE_TYPES.index(instance_type)) * (1.5 if operating_system == 'Windows' else 1)
+        ec2.append({
+            'product': {'productFamily': 'Compute Instance', 'sku': sku, 'attributes': {
+                'servicecode': 'AmazonEC2',
+                'location': location,
+                'instanceType': instance_type,
+                'operatingSystem': operating_system,
+                'tenancy': tenancy,
+                'vcpu': str(2 ** (INSTANCE_TYPES.index(instance_type) % 4 + 1)),
+                'usagetype': f'BoxUsage:{instance_type}',
+                'capacitystatus': 'Used',
+                'preInstalledSw': 'NA'
+            }},
+            'serviceCode': 'AmazonEC2',
+            'version': '20250101000000',
+            'publicationDate': '2025-01-01T00:00:00Z',
+            'terms': {
+                'OnDemand': _on_demand_term(sku, [{
+                    'unit': 'Hrs', 'description': f'{instance_type} {operating_system}',
+                    'beginRange': '0', 'endRange': 'Inf', 'pricePerUnit': {'USD': f'{hourly:.6f}'}
+                }]),
+                'Reserved': _reserved_terms(sku, hourly)
+            }
+        })
+
+    s3 = []
+    for index, location in enumerate(LOCATIONS):
+        sku = f'S3{index:06d}'
+        s3.append({
+            'product': {'productFamily': 'Storage', 'sku': sku, 'attributes': {
+                'servicecode': 'AmazonS3',
+                'location': location,
+                'storageClass': 'General Purpose',
+                'volumeType': 'Standard'
+            }},
+            'serviceCode': 'AmazonS3',
+            'publicationDate': '2025-01-01T00:00:00Z',
+            'terms': {'OnDemand': _on_demand_term(sku, [
+                {'unit': 'GB-Mo', 'description': 'first 50 TB', 'beginRange': '0', 'endRange': '51200',
+                 'pricePerUnit': {'USD': '0.023'}},
+                {'unit': 'GB-Mo', 'description': 'next 450 TB', 'beginRange': '51200', 'endRange': '512000',
+                 'pricePerUnit': {'USD': '0.022'}},
+                {'unit': 'GB-Mo', 'description': 'over 500 TB', 'beginRange': '512000', 'endRange': 'Inf',
+                 'pricePerUnit': {'USD': '0.021'}}
+            ])}
+        })
+
+    return {'AmazonEC2': ec2, 'AmazonS3': s3}
+
+
+class FakePricingCatalog:
+    """서비스 코드별 제품 정보와 직렬화된 PriceList 문자열"""
+
+    def __init__(self, products: Dict[str, List[Dict[str, Any]]]):
+        """
+        FakePricingCatalog 초기화
+
+        Args:
+            products (Dict[str, List[Dict[str, Any]]]): 서비스 코드별 제품 정보 목록
+        """
+        self.products = {
+            service_code: [(product['product'].get('attributes', {}), json.dumps(product)) for product in service_products]
+            for service_code, service_products in products.items()
+        }
+
+    @classmethod
+    def load(cls, recording: Optional[str] = None) -> 'FakePricingCatalog':
+        """녹화 파일이 있으면 읽고, 없으면 합성 카탈로그를 만듭니다."""
+        if recording:
+            with open(recording, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        return cls(build_synthetic_catalog())
+
+    def attribute_names(self, service_code: str) -> List[str]:
+        names = set()
+        for attributes, _ in self.products.get(service_code, []):
+            names.update(attributes)
+        return sorted(names)
+
+    def attribute_values(self, service_code: str, attribute_name: str) -> List[str]:
+        return sorted({
+            attributes[attribute_name]
+            for attributes, _ in self.products.get(service_code, []) if attribute_name in attributes
+        })
+
+    def matching_products(self, service_code: str, filters: List[Dict[str, str]]) -> List[str]:
+        conditions = [(item.get('Field'), item.get('Value')) for item in filters]
+        return [
+            price_list for attributes, price_list in self.products.get(service_code, [])
+            if all(attributes.get(field) == value for field, value in conditions)
+        ]
+
+
+def paginate(items: List[Any], token: Optional[str], page_size: int) -> Tuple[List[Any], Optional[str]]:
+    """NextToken(시작 위치 문자열)로 한 페이지를 자릅니다."""
+    start = int(token) if token else 0
+    end = start + page_size
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+class FakePricingHandler(BaseHTTPRequestHandler):
+    """X-Amz-Target 헤더로 Pricing API 작업을 구분하여 응답하는 핸들러"""
+
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘과 지연 ACK가 겹쳐 생기는 40ms 지연 방지
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        operation = self.headers.get('X-Amz-Target', '').rsplit('.', 1)[-1]
+        self.server.wait()
+
+        handler = getattr(self, f'_op_{operation}', None)
+        if handler is None:
+            self._send(400, {'__type': 'InvalidParameterException', 'message': f'Unknown operation {operation}'})
+            return
+        self._send(200, handler(request))
+
+    def _op_DescribeServices(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        catalog = self.server.catalog
+        service_code = request.get('ServiceCode')
+        if service_code:
+            services = [{'ServiceCode': service_code, 'AttributeNames': catalog.attribute_names(service_code)}]
+            return {'Services': services, 'FormatVersion': 'aws_v1'}
+        services, token = paginate(
+            [{'ServiceCode': code, 'AttributeNames': []} for code in sorted(catalog.products)],
+            request.get('NextToken'), self.server.page_size
+        )
+        return self._page({'Services': services, 'FormatVersion': 'aws_v1'}, token)
+
+    def _op_GetAttributeValues(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        values = self.server.catalog.attribute_values(request.get('ServiceCode', ''), request.get('AttributeName', ''))
+        page, token = paginate([{'Value': value} for value in values], request.get('NextToken'), self.server.page_size)
+        return self._page({'AttributeValues': page}, token)
+
+    def _op_GetProducts(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        products = self.server.catalog.matching_products(request.get('ServiceCode', ''), request.get('Filters', []))
+        page_size = min(int(request.get('MaxResults') or self.server.page_size), self.server.page_size)
+        page, token = paginate(products, request.get('NextToken'), page_size)
+        return self._page({'PriceList': page, 'FormatVersion': 'aws_v1'}, token)
+
+    @staticmethod
+    def _page(body: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+        if token:
+            body['NextToken'] = token
+        return body
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-amz-json-1.1')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.record()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePricingAPI(ThreadingHTTPServer):
+    """
+    로컬 Pricing API 대역 서버
+
+    Example:
+        api = FakePricingAPI(latency=0.05).start()
+        os.environ['PRICING_ENDPOINT_URL'] = api.endpoint_url
+        ...
+        api.stop()
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 catalog: Optional[FakePricingCatalog] = None,
+                 latency: float = 0.05,
+                 jitter: float = 0.0,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        """
+        FakePricingAPI 초기화
+
+        Args:
+            catalog (Optional[FakePricingCatalog]): 응답할 카탈로그 (기본값: 합성 카탈로그)
+            latency (float): 요청마다 응답 전에 기다리는 시간 (초)
+            jitter (float): 지연 시간에 더할 무작위 시간의 최댓값 (초)
+            page_size (int): 페이지당 최대 항목 수
+            host (str): 바인딩 주소
+            port (int): 바인딩 포트 (0이면 임의의 빈 포트)
+        """
+        super().__init__((host, port), FakePricingHandler)
+        self.catalog = catalog or FakePricingCatalog.load()
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def wait(self) -> None:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> 'FakePricingAPI':
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-pricing-api', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """서버를 멈추고 소켓을 닫습니다."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='로컬 Pricing API 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1', help='바인딩 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8999, help='포트 (기본값: 8999)')
+    parser.add_argument('--latency', type=float, default=0.05, help='요청당 지연 시간 (초, 기본값: 0.05)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연 시간에 더할 무작위 시간의 최댓값 (초)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='페이지당 최대 항목 수')
+    parser.add_argument('--recording', help='서비스 코드별 get_products 결과 JSON 파일')
+    args = parser.parse_args()
+
+    api = FakePricingAPI(FakePricingCatalog.load(args.recording), latency=args.latency, jitter=args.jitter,
+                         page_size=args.page_size, host=args.host, port=args.port)
+    print(f"Fake Pricing API listening on {api.endpoint_url}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server_close()
+
+
+if __name__ == '__main__':
+    main()
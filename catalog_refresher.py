@@ -0,0 +1,394 @@
+"""
+Catalog Refresher
+
+캐시된 서비스 목록과 제품 조회 결과를 백그라운드에서 주기적으로 다시 조회하고,
+이전 결과와 SKU/게시일 기준으로 비교하여 바뀐 레코드만 캐시와 가격 색인에 반영하는 모듈입니다.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# 기본적으로 새로고침할 캐시 메서드
+REFRESH_METHODS = ('get_services', 'get_products')
+
+
+def product_key(product: Dict[str, Any]) -> str:
+    """제품 정보의 비교 키 (SKU)"""
+    sku = product.get('product', {}).get('sku')
+    return sku if sku else json.dumps(product, sort_keys=True)
+
+
+def product_version(product: Dict[str, Any]) -> str:
+    """제품 정보의 버전 (게시일, 없으면 내용 전체)"""
+    return product.get('publicationDate') or json.dumps(product, sort_keys=True)
+
+
+def service_key(service: Dict[str, str]) -> str:
+    """서비스 정보의 비교 키 (서비스 코드)"""
+    return service.get('serviceCode', '')
+
+
+def service_version(service: Dict[str, str]) -> str:
+    """서비스 정보의 버전 (내용 전체)"""
+    return json.dumps(service, sort_keys=True)
+
+
+class CatalogDelta:
+    """이전 조회 결과와 새 조회 결과의 차이 (추가, 변경, 삭제된 레코드)"""
+
+    __slots__ = ('added', 'changed', 'removed')
+
+    def __init__(self,
+                 added: List[Dict[str, Any]],
+                 changed: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                 removed: List[Dict[str, Any]]):
+        """
+        CatalogDelta 초기화
+
+        Args:
+            added (List[Dict[str, Any]]): 새로 생긴 레코드
+            changed (List[Tuple[Dict[str, Any], Dict[str, Any]]]): (이전 레코드, 새 레코드) 목록
+            removed (List[Dict[str, Any]]): 없어진 레코드
+        """
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def counts(self) -> Dict[str, int]:
+        """추가, 변경, 삭제된 레코드 수를 반환합니다."""
+        return {'added': len(self.added), 'changed': len(self.changed), 'removed': len(self.removed)}
+
+
+def diff_records(old: Iterable[Dict[str, Any]], new: Iterable[Dict[str, Any]],
+                 key_func: Callable[[Dict[str, Any]], Hashable],
+                 version_func: Callable[[Dict[str, Any]], Any]) -> CatalogDelta:
+    """
+    두 조회 결과를 레코드 키와 버전으로 비교합니다.
+
+    Args:
+        old (Iterable[Dict[str, Any]]): 이전 조회 결과
+        new (Iterable[Dict[str, Any]]): 새 조회 결과
+        key_func (Callable): 레코드 키 함수 (예: product_key)
+        version_func (Callable): 레코드 버전 함수 (예: product_version)
+
+    Returns:
+        CatalogDelta: 추가, 변경, 삭제된 레코드
+    """
+    old_by_key = {key_func(record): record for record in old}
+    added = []
+    changed = []
+    seen = set()
+    for record in new:
+        key = key_func(record)
+        seen.add(key)
+        previous = old_by_key.get(key)
+        if previous is None:
+            added.append(record)
+        elif version_func(previous) != version_func(record):
+            changed.append((previous, record))
+    removed = [record for key, record in old_by_key.items() if key not in seen]
+    return CatalogDelta(added, changed, removed)
+
+
+def apply_delta(old: Iterable[Dict[str, Any]], delta: CatalogDelta,
+                key_func: Callable[[Dict[str, Any]], Hashable]) -> List[Dict[str, Any]]:
+    """
+    이전 조회 결과에 변경분을 적용한 새 목록을 만듭니다.
+
+    바뀌지 않은 레코드는 같은 객체를 같은 순서로 유지하고, 변경된 레코드는 제자리에서 교체하며,
+    추가된 레코드는 끝에 붙입니다.
+
+    Args:
+        old (Iterable[Dict[str, Any]]): 이전 조회 결과
+        delta (CatalogDelta): diff_records 결과
+        key_func (Callable): 레코드 키 함수
+
+    Returns:
+        List[Dict[str, Any]]: 변경분을 적용한 목록
+    """
+    replacements = {key_func(previous): current for previous, current in delta.changed}
+    removed = {key_func(record) for record in delta.removed}
+    records = []
+    for record in old:
+        key = key_func(record)
+        if key in removed:
+            continue
+        records.append(replacements.get(key, record))
+    records.extend(delta.added)
+    return records
+
+
+class CatalogRefresher:
+    """
+    캐시된 조회 결과를 백그라운드 스레드에서 주기적으로 새로고침하는 클래스
+
+    - 메모리 캐시에 있는 get_services / get_products 항목 중 지난 새로고침 이후 조회된 항목만 다시 조회하고,
+      조회되지 않은 항목은 연장하지 않아 TTL이 지나면 만료됩니다.
+    - 새 결과를 이전 결과와 비교하여 바뀐 레코드만 메모리 캐시, 영속 캐시, 가격 색인에 반영합니다.
+    - 새로고침은 별도 스레드에서만 실행되고 캐시 값은 한 번에 교체하므로 요청 스레드는 기다리지 않습니다.
+    - 오프라인 저장소에서 조회하는 서비스는 AWS 호출 없이 최신이므로 건너뜁니다.
+    """
+
+    def __init__(self,
+                 pricing_client: Any,
+                 pricing_calculator: Optional[Any] = None,
+                 interval: float = 30 * 60,
+                 methods: Iterable[str] = REFRESH_METHODS,
+                 clock: Callable[[], float] = time.time):
+        """
+        CatalogRefresher 초기화
+
+        Args:
+            pricing_client (Any): 캐시와 조회 메서드를 가진 AWSPricingClient
+            pricing_calculator (Optional[Any]): 변경분을 가격 색인에 반영할 PricingCalculator
+            interval (float): 새로고침 주기 (초). 캐시 TTL보다 짧으면 자주 쓰는 항목이 만료되지 않음
+            methods (Iterable[str]): 새로고침할 캐시 메서드 이름
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.pricing_client = pricing_client
+        self.pricing_calculator = pricing_calculator
+        self.interval = interval
+        self.methods = tuple(methods)
+        self._clock = clock
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._services: Dict[str, Dict[str, Any]] = {}
+        self._stats = {
+            'runs': 0,
+            'entriesChecked': 0,
+            'entriesChanged': 0,
+            'entriesSkipped': 0,
+            'errors': 0,
+            'recordsAdded': 0,
+            'recordsChanged': 0,
+            'recordsRemoved': 0,
+        }
+        self._last_run: Dict[str, Any] = {'startedAt': None, 'completedAt': None, 'seconds': None, 'error': None}
+
+    @property
+    def running(self) -> bool:
+        """백그라운드 스레드 실행 여부"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def ensure_started(self) -> None:
+        """
+        백그라운드 스레드가 실행 중이 아니면 시작합니다.
+
+        요청을 처리하는 프로세스에서 처음 호출될 때 시작하므로, gunicorn 마스터 프로세스에서는
+        스레드를 만들지 않고 fork된 워커마다 하나씩 실행됩니다.
+        """
+        if self.running:
+            return
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='catalog-refresher', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        백그라운드 스레드를 멈춥니다 (진행 중인 새로고침은 끝까지 실행).
+
+        Args:
+            timeout (Optional[float]): 스레드 종료를 기다릴 최대 시간 (초)
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        stop = self._stop
+        while not stop.wait(self.interval):
+            self.refresh_once()
+
+    def refresh_once(self) -> Dict[str, int]:
+        """
+        지난 새로고침 이후 조회되거나 저장된 캐시 항목을 한 번 새로고침합니다.
+
+        항목 하나의 조회가 실패해도 기존 값을 유지하고 다음 항목을 계속 새로고침합니다.
+
+        Returns:
+            Dict[str, int]: 확인한 항목 수, 바뀐 항목 수, 오류 수
+        """
+        started = self._clock()
+        result = {'checked': 0, 'changed': 0, 'errors': 0}
+        last_error = None
+        for method in self.methods:
+            for key, value in self.pricing_client.cache.take_used(method):
+                try:
+                    delta = self.refresh_entry(key, value)
+                except Exception as e:
+                    result['errors'] += 1
+                    last_error = f"{key}: {e}"
+                    print(f"Error refreshing cached catalog {key}: {e}")
+                    continue
+                if delta is None:
+                    continue
+                result['checked'] += 1
+                if delta:
+                    result['changed'] += 1
+
+        completed = self._clock()
+        with self._lock:
+            self._stats['runs'] += 1
+            self._stats['errors'] += result['errors']
+            self._last_run = {
+                'startedAt': started,
+                'completedAt': completed,
+                'seconds': completed - started,
+                'error': last_error
+            }
+        return result
+
+    def refresh_entry(self, key: Tuple[Hashable, ...], old: List[Dict[str, Any]]) -> Optional[CatalogDelta]:
+        """
+        캐시 항목 하나를 다시 조회하여 바뀐 레코드만 반영합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            old (List[Dict[str, Any]]): 현재 캐시된 값
+
+        Returns:
+            Optional[CatalogDelta]: 변경분 (새로고침 대상이 아닌 항목이면 None)
+
+        Raises:
+            ClientError: AWS API 호출 중 오류 발생 시
+        """
+        method = key[0]
+        client = self.pricing_client
+        if method == 'get_services':
+            if client.use_offer_store():
+                return self._skip()
+            new = client.fetch_services()
+            key_func, version_func = service_key, service_version
+            service_code = ''
+        elif method == 'get_products':
+            service_code = key[1]
+            if client.use_offer_store(service_code):
+                return self._skip()
+            filters = [{'type': type_, 'field': field, 'value': value} for type_, field, value in key[2]]
+            new = client.fetch_products(service_code, filters)
+            key_func, version_func = product_key, product_version
+        else:
+            return self._skip()
+
+        delta = diff_records(old, new, key_func, version_func)
+        persistent_cache = client.persistent_cache
+        persist = persistent_cache is not None and persistent_cache.handles(key)
+        if delta:
+            value = apply_delta(old, delta, key_func)
+            client.cache.refresh(key, value)
+            if method == 'get_products':
+                client.note_catalog_version(service_code, value)
+                if self.pricing_calculator is not None:
+                    self.pricing_calculator.apply_product_delta(service_code, delta)
+            if persist:
+                persistent_cache.set(key, value)
+        else:
+            # 바뀐 레코드가 없으면 값은 그대로 두고 만료 시각만 연장
+            client.cache.refresh(key, old)
+            if persist:
+                persistent_cache.touch(key)
+
+        self._record(service_code, new, delta)
+        return delta
+
+    def _skip(self) -> None:
+        with self._lock:
+            self._stats['entriesSkipped'] += 1
+        return None
+
+    def _record(self, service_code: str, records: List[Dict[str, Any]], delta: CatalogDelta) -> None:
+        """새로고침 결과를 서비스별 최신 상태와 누적 통계에 기록합니다."""
+        now = self._clock()
+        counts = delta.counts()
+        with self._lock:
+            self._stats['entriesChecked'] += 1
+            self._stats['recordsAdded'] += counts['added']
+            self._stats['recordsChanged'] += counts['changed']
+            self._stats['recordsRemoved'] += counts['removed']
+            service = self._services.setdefault(service_code, {
+                'lastCheckedAt': None,
+                'lastChangedAt': None,
+                'catalogVersion': None
+            })
+            service['lastCheckedAt'] = now
+            if delta:
+                self._stats['entriesChanged'] += 1
+                service['lastChangedAt'] = now
+            publication_date = max((record.get('publicationDate') or '' for record in records), default='')
+            if publication_date and publication_date > (service['catalogVersion'] or ''):
+                service['catalogVersion'] = publication_date
+
+    def status(self) -> Dict[str, Any]:
+        """
+        새로고침 상태와 캐시 항목의 신선도를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 실행 여부, 주기, 마지막 실행 결과, 누적 통계,
+                            서비스별 캐시 항목 수와 가장 오래된/최근 항목의 경과 시간(초)
+        """
+        cache = self.pricing_client.cache
+        ages: Dict[str, List[float]] = {}
+        for method in self.methods:
+            for key, _ in cache.items(method):
+                age = cache.age(key)
+                if age is not None:
+                    ages.setdefault(key[1] if method == 'get_products' else '', []).append(age)
+        services = {
+            service_code: {
+                'entries': len(values),
+                'oldestAgeSeconds': max(values),
+                'newestAgeSeconds': min(values)
+            }
+            for service_code, values in ages.items()
+        }
+
+        with self._lock:
+            for service_code, refreshed in self._services.items():
+                if service_code in services:
+                    services[service_code].update(refreshed)
+            return {
+                'enabled': True,
+                'running': self.running,
+                'intervalSeconds': self.interval,
+                'lastRun': dict(self._last_run),
+                **self._stats,
+                'services': services
+            }
+
+
+def create_catalog_refresher_from_env(pricing_client: Any,
+                                      pricing_calculator: Optional[Any] = None) -> Optional[CatalogRefresher]:
+    """
+    환경 변수 설정을 기반으로 카탈로그 새로고침 스케줄러를 생성합니다 (시작은 ensure_started로).
+
+    환경 변수:
+        PRICING_REFRESH_INTERVAL: 새로고침 주기 (초, 0이면 사용 안 함, 기본값: 0)
+                                  워커 프로세스마다 자기 캐시를 새로고침하므로 AWS 호출 수는 워커 수에 비례
+
+    Args:
+        pricing_client (Any): AWSPricingClient
+        pricing_calculator (Optional[Any]): 변경분을 가격 색인에 반영할 PricingCalculator
+
+    Returns:
+        Optional[CatalogRefresher]: 새로고침 스케줄러 (비활성화된 경우 None)
+    """
+    interval = float(os.environ.get('PRICING_REFRESH_INTERVAL', 0))
+    if interval <= 0:
+        return None
+    return CatalogRefresher(pricing_client, pricing_calculator, interval=interval)
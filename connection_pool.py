@@ -0,0 +1,118 @@
+"""
+Connection Pool
+
+AWS Pricing API 호출에 사용하는 botocore 연결 풀 설정과 사용량 지표를 관리하는 모듈입니다.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from botocore.config import Config
+
+
+def create_client_config_from_env(**overrides: Any) -> Config:
+    """
+    환경 변수 설정을 기반으로 Pricing 클라이언트의 botocore 설정을 생성합니다.
+
+    botocore standard 모드는 스로틀링도 재시도하여 AdaptiveRateLimiter가 속도를 줄이지 못하므로
+    botocore 자체 재시도는 끄고, 스로틀링과 일시적 오류(5xx, 연결 끊김, 시간 초과) 재시도를 모두
+    AdaptiveRateLimiter가 담당합니다.
+
+    환경 변수:
+        PRICING_MAX_POOL_CONNECTIONS: 클라이언트 연결 풀 크기 (기본값: max(10, PRICING_MAX_WORKERS))
+        PRICING_CONNECT_TIMEOUT: 연결 시간 제한 (초, 기본값: 5)
+        PRICING_READ_TIMEOUT: 응답 읽기 시간 제한 (초, 기본값: 30)
+        PRICING_TCP_KEEPALIVE: 'false'이면 TCP keep-alive 사용 안 함 (기본값: true)
+
+    Args:
+        **overrides: Config 인자 덮어쓰기 (예: max_pool_connections=4)
+
+    Returns:
+        Config: botocore 클라이언트 설정
+    """
+    default_pool_size = max(10, int(os.environ.get('PRICING_MAX_WORKERS', 8)))
+    options = {
+        'retries': {'total_max_attempts': 1, 'mode': 'standard'},
+        'max_pool_connections': int(os.environ.get('PRICING_MAX_POOL_CONNECTIONS', default_pool_size)),
+        'connect_timeout': float(os.environ.get('PRICING_CONNECT_TIMEOUT', 5)),
+        'read_timeout': float(os.environ.get('PRICING_READ_TIMEOUT', 30)),
+        'tcp_keepalive': os.environ.get('PRICING_TCP_KEEPALIVE', 'true').lower() not in ('0', 'false', 'no'),
+    }
+    options.update(overrides)
+    return Config(**options)
+
+
+class PoolMonitor:
+    """
+    연결 풀 사용량을 측정하는 클래스
+
+    botocore(urllib3)는 풀이 가득 차면 연결을 기다리지 않고 새 연결을 만든 뒤 버리므로
+    풀 크기와 같은 세마포어로 동시 호출 수를 제한하여 연결 재사용을 보장하고,
+    세마포어를 기다린 시간을 풀 대기 시간으로 기록합니다.
+    """
+
+    def __init__(self, size: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        PoolMonitor 초기화
+
+        Args:
+            size (Optional[int]): 동시에 사용할 수 있는 최대 연결 수 (None이면 제한 없이 사용량만 측정)
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+        """
+        self.size = size
+        self._clock = clock
+        self._semaphore = threading.BoundedSemaphore(size) if size else None
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._metrics = {
+            'acquisitions': 0,
+            'waits': 0,
+            'waitSeconds': 0.0,
+            'maxWaitSeconds': 0.0,
+            'peakInUse': 0,
+        }
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        연결 하나를 사용하는 동안 유지하는 컨텍스트 (풀이 가득 차면 빈 연결이 생길 때까지 대기)
+        """
+        waited = 0.0
+        if self._semaphore is not None and not self._semaphore.acquire(blocking=False):
+            started = self._clock()
+            self._semaphore.acquire()
+            waited = self._clock() - started
+
+        with self._lock:
+            self._in_use += 1
+            self._metrics['acquisitions'] += 1
+            self._metrics['peakInUse'] = max(self._metrics['peakInUse'], self._in_use)
+            if waited:
+                self._metrics['waits'] += 1
+                self._metrics['waitSeconds'] += waited
+                self._metrics['maxWaitSeconds'] = max(self._metrics['maxWaitSeconds'], waited)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        연결 풀 사용량 지표를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 풀 크기, 사용 중인 연결 수, 사용률, 대기 횟수/시간, 최대 동시 사용 수
+        """
+        with self._lock:
+            return {
+                **self._metrics,
+                'size': self.size,
+                'inUse': self._in_use,
+                'utilization': self._in_use / self.size if self.size else None,
+            }
@@ -0,0 +1,331 @@
+"""
+Cost Engine
+
+리소스 비용을 열(column) 단위 NumPy 배열로 한 번에 계산하는 모듈입니다.
+
+수만 개의 리소스 항목과 여러 가정(수량 배율, 사용 시간, 리전 변경 등)을 평가할 때
+리소스마다 Python 반복문으로 단가 * 사용량 * 수량을 계산하는 대신,
+단가/수량/사용량 배열과 (시나리오 x 항목) 행렬로 총 비용과 서비스별 소계를 계산합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pricing_cache import normalize_filters
+from tier_engine import TierSchedule
+
+
+# 시나리오에서 지정할 수 있는 필드
+SCENARIO_FIELDS = ('name', 'quantityScale', 'usageScale', 'usageValue', 'priceScale', 'filterOverrides')
+
+
+class LineItems:
+    """비용 계산 항목의 열 배열 (항목마다 단가, 수량, 사용량, 서비스 번호)"""
+
+    __slots__ = ('price', 'quantity', 'usage', 'service_ids', 'services')
+
+    def __init__(self,
+                 price: Optional[np.ndarray],
+                 quantity: np.ndarray,
+                 usage: np.ndarray,
+                 service_ids: np.ndarray,
+                 services: List[str]):
+        """
+        LineItems 초기화
+
+        Args:
+            price (Optional[np.ndarray]): 단위당 가격 (float64, 가격을 찾지 못한 항목은 NaN)
+                                          시나리오처럼 가격을 조합별로 따로 다루면 None
+            quantity (np.ndarray): 수량 (float64)
+            usage (np.ndarray): 사용량 (float64, 예: 730시간)
+            service_ids (np.ndarray): services 목록에서의 서비스 위치 (int64)
+            services (List[str]): 서비스 코드 목록
+        """
+        if not ((price is None or len(price) == len(quantity)) and len(quantity) == len(usage) == len(service_ids)):
+            raise ValueError("Line item columns must have the same length")
+
+        self.price = price
+        self.quantity = quantity
+        self.usage = usage
+        self.service_ids = service_ids
+        self.services = services
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+    @classmethod
+    def from_resources(cls, resources: Sequence[Dict[str, Any]],
+                       prices: Optional[Sequence[Optional[float]]] = None) -> 'LineItems':
+        """
+        리소스 요청 목록(calculate_total_cost 형식)을 열 배열로 변환합니다.
+
+        Args:
+            resources (Sequence[Dict[str, Any]]): 리소스 요청 목록
+            prices (Optional[Sequence[Optional[float]]]): 리소스별 단위당 가격 (None 또는 NaN은 가격을 찾지 못한 항목)
+                                                          생략하면 가격 열 없이 (price는 None) 변환
+
+        Returns:
+            LineItems: 열 배열
+        """
+        count = len(resources)
+        services: List[str] = []
+        service_positions: Dict[str, int] = {}
+
+        def service_id(resource: Dict[str, Any]) -> int:
+            service_code = resource.get('serviceCode', '')
+            position = service_positions.get(service_code)
+            if position is None:
+                position = service_positions[service_code] = len(services)
+                services.append(service_code)
+            return position
+
+        if prices is None:
+            price = None
+        elif isinstance(prices, np.ndarray):
+            price = prices.astype(np.float64)
+        else:
+            price = np.fromiter((np.nan if value is None else value for value in prices), dtype=np.float64, count=count)
+
+        return cls(
+            price=price,
+            quantity=np.fromiter((resource.get('quantity', 1) for resource in resources), dtype=np.float64, count=count),
+            usage=np.fromiter((resource.get('usageValue', 0) for resource in resources), dtype=np.float64, count=count),
+            service_ids=np.fromiter((service_id(resource) for resource in resources), dtype=np.int64, count=count),
+            services=services
+        )
+
+
+def line_costs(price: np.ndarray, quantity: np.ndarray, usage: np.ndarray) -> np.ndarray:
+    """
+    항목별 비용 (단위당 가격 * 사용량 * 수량)을 계산합니다.
+
+    배열 모양이 달라도 NumPy 브로드캐스팅 규칙에 따라 계산하므로
+    (시나리오 수, 항목 수) 행렬과 (항목 수,) 배열을 섞어 쓸 수 있습니다.
+    가격을 찾지 못한 항목(NaN)의 비용은 0입니다.
+
+    Returns:
+        np.ndarray: 항목별 비용
+    """
+    costs = price * usage * quantity
+    return np.nan_to_num(costs, nan=0.0, copy=False)
+
+
+def summarize_costs(costs: np.ndarray, service_ids: np.ndarray, service_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (시나리오 수, 항목 수) 비용 행렬의 시나리오별 총 비용과 서비스별 소계를 계산합니다.
+
+    Args:
+        costs (np.ndarray): 비용 행렬 (1차원이면 시나리오 하나로 간주)
+        service_ids (np.ndarray): 항목별 서비스 번호
+        service_count (int): 서비스 수
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (시나리오별 총 비용 (S,), 시나리오별 서비스 소계 (S, 서비스 수))
+    """
+    costs = np.atleast_2d(costs)
+    scenario_count = costs.shape[0]
+    # 시나리오마다 서비스 번호를 겹치지 않게 이어 붙여 bincount 한 번으로 소계 계산
+    bins = service_ids[np.newaxis, :] + (np.arange(scenario_count) * service_count)[:, np.newaxis]
+    subtotals = np.bincount(bins.ravel(), weights=costs.ravel(), minlength=scenario_count * service_count)
+    return costs.sum(axis=1), subtotals.reshape(scenario_count, service_count)
+
+
+def _override_filters(filters: List[Dict[str, str]], overrides: Dict[str, str]) -> List[Dict[str, str]]:
+    """필터 값을 바꾸거나 (없는 필드는) 추가한 필터 목록을 만듭니다 (예: 리전 변경)."""
+    replaced = [
+        dict(filter_item, value=overrides[filter_item.get('field', '')])
+        if filter_item.get('field', '') in overrides else filter_item
+        for filter_item in filters
+    ]
+    existing = {filter_item.get('field', '') for filter_item in filters}
+    replaced.extend(
+        {'type': 'TERM_MATCH', 'field': field, 'value': value}
+        for field, value in overrides.items() if field not in existing
+    )
+    return replaced
+
+
+def validate_scenarios(scenarios: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    시나리오 목록을 검증하고 기본값을 채웁니다.
+
+    Args:
+        scenarios (Optional[List[Dict[str, Any]]]): 시나리오 목록 (생략하면 기준 시나리오 하나)
+
+    Returns:
+        List[Dict[str, Any]]: 기본값을 채운 시나리오 목록
+
+    Raises:
+        ValueError: 알 수 없는 필드나 잘못된 값이 있는 경우
+    """
+    if not scenarios:
+        scenarios = [{'name': 'baseline'}]
+
+    validated = []
+    for position, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict):
+            raise ValueError(f"Scenario {position} must be an object")
+        unknown = set(scenario) - set(SCENARIO_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown scenario fields: {', '.join(sorted(unknown))}")
+
+        values = {}
+        for field in ('quantityScale', 'usageScale', 'priceScale'):
+            value = scenario.get(field, 1)
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"{field} must be a non-negative number")
+            values[field] = float(value)
+
+        usage_value = scenario.get('usageValue')
+        if usage_value is not None and (not isinstance(usage_value, (int, float)) or isinstance(usage_value, bool)
+                                        or usage_value < 0):
+            raise ValueError("usageValue must be a non-negative number")
+
+        overrides = scenario.get('filterOverrides') or {}
+        if not isinstance(overrides, dict) or not all(isinstance(v, str) for v in overrides.values()):
+            raise ValueError("filterOverrides must map field names to string values")
+
+        validated.append({
+            'name': str(scenario.get('name') or f'scenario-{position}'),
+            **values,
+            'usageValue': None if usage_value is None else float(usage_value),
+            'filterOverrides': overrides
+        })
+    return validated
+
+
+class ScenarioCalculator:
+    """
+    여러 가정(시나리오)에 대한 비용을 한 번에 계산하는 클래스
+
+    가격 조회는 PricingCalculator와 같은 방식(같은 조합은 한 번만, 공유 스레드 풀에서 동시에)으로 하고,
+    비용 계산은 (시나리오 수, 항목 수) 행렬 연산으로 처리합니다.
+    """
+
+    def __init__(self, calculator: Any):
+        """
+        ScenarioCalculator 초기화
+
+        Args:
+            calculator (Any): 가격 조회에 사용할 PricingCalculator
+        """
+        self.calculator = calculator
+
+    def _resolve_prices(self, specs: List[Dict[str, Any]]) -> Tuple[np.ndarray, Dict[int, TierSchedule]]:
+        """조합별 단위당 가격 배열 (가격을 찾지 못한 조합은 NaN)과 구간별 가격 조합의 요금표"""
+        price_infos = self.calculator.resolve_price_infos(specs)
+        prices = np.fromiter(
+            (np.nan if price_info is None else price_info['pricing']['pricePerUnit'] for price_info in price_infos),
+            dtype=np.float64, count=len(specs)
+        )
+        schedules = {
+            spec_index: TierSchedule.from_pricing(price_info['pricing'])
+            for spec_index, price_info in enumerate(price_infos)
+            if price_info is not None and price_info['pricing'].get('tiers')
+        }
+        return prices, schedules
+
+    def calculate_scenarios(self, resources: List[Dict[str, Any]],
+                            scenarios: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        리소스 목록의 비용을 시나리오마다 계산합니다.
+
+        Args:
+            resources (List[Dict[str, Any]]): 리소스 요청 목록 (calculate_total_cost와 같은 형식)
+            scenarios (Optional[List[Dict[str, Any]]]): 시나리오 목록
+                예: [
+                    {'name': 'baseline'},
+                    {'name': 'double', 'quantityScale': 2},
+                    {'name': 'business-hours', 'usageValue': 220},
+                    {'name': 'frankfurt', 'filterOverrides': {'location': 'EU (Frankfurt)'}}
+                ]
+
+        Returns:
+            Dict[str, Any]: 시나리오별 총 비용, 서비스별 소계, 가격을 찾지 못한 항목 수, 첫 시나리오 대비 차이
+
+        Raises:
+            ValueError: 시나리오 형식이 잘못된 경우
+        """
+        scenarios = validate_scenarios(scenarios)
+        specs, positions = self.calculator.group_resources(resources)
+
+        # 항목별 기준 조합 번호
+        spec_ids = np.empty(len(resources), dtype=np.int64)
+        for spec_index, spec_positions in enumerate(positions):
+            spec_ids[spec_positions] = spec_index
+
+        # 필터를 바꾸는 시나리오의 조합을 추가 (같은 조합은 한 번만 조회)
+        all_specs = list(specs)
+        spec_keys = {
+            (spec.get('serviceCode', ''), normalize_filters(spec.get('filters', []))): index
+            for index, spec in enumerate(specs)
+        }
+        scenario_spec_ids = []
+        for scenario in scenarios:
+            overrides = scenario['filterOverrides']
+            if not overrides:
+                scenario_spec_ids.append(spec_ids)
+                continue
+            mapping = np.empty(len(specs), dtype=np.int64)
+            for index, spec in enumerate(specs):
+                filters = _override_filters(spec.get('filters', []), overrides)
+                key = (spec.get('serviceCode', ''), normalize_filters(filters))
+                if key not in spec_keys:
+                    spec_keys[key] = len(all_specs)
+                    all_specs.append(dict(spec, filters=filters))
+                mapping[index] = spec_keys[key]
+            scenario_spec_ids.append(mapping[spec_ids])
+
+        spec_prices, schedules = self._resolve_prices(all_specs)
+        # 단가는 시나리오별 조합 번호로 spec_prices에서 가져오므로 항목별 가격 열은 만들지 않음
+        items = LineItems.from_resources(resources)
+
+        # (시나리오 수, 항목 수) 행렬
+        scenario_specs = np.stack(scenario_spec_ids)
+        price = spec_prices[scenario_specs]
+        price_scale = np.array([scenario['priceScale'] for scenario in scenarios])[:, np.newaxis]
+        quantity_scale = np.array([scenario['quantityScale'] for scenario in scenarios])[:, np.newaxis]
+        usage_scale = np.array([scenario['usageScale'] for scenario in scenarios])[:, np.newaxis]
+        usage = np.where(
+            np.array([scenario['usageValue'] is not None for scenario in scenarios])[:, np.newaxis],
+            np.array([scenario['usageValue'] or 0.0 for scenario in scenarios])[:, np.newaxis],
+            items.usage[np.newaxis, :]
+        ) * usage_scale
+
+        quantity = items.quantity[np.newaxis, :] * quantity_scale
+        costs = line_costs(price * price_scale, quantity, usage)
+
+        # 구간별 가격 조합은 항목마다 사용량 * 수량에 구간 단가를 적용 (조합별로 한 번에 계산)
+        if schedules:
+            usage_total = np.broadcast_to(usage * quantity, costs.shape)
+            price_scale_full = np.broadcast_to(price_scale, costs.shape)
+            for spec_index, schedule in schedules.items():
+                mask = scenario_specs == spec_index
+                if mask.any():
+                    costs[mask] = schedule.costs(usage_total[mask]) * price_scale_full[mask]
+        totals, subtotals = summarize_costs(costs, items.service_ids, len(items.services))
+        unpriced = np.isnan(price).sum(axis=1)
+
+        results = []
+        for index, scenario in enumerate(scenarios):
+            results.append({
+                'name': scenario['name'],
+                'totalCost': {
+                    'currency': 'USD',
+                    'amount': float(totals[index]),
+                    'timeUnit': 'monthly'
+                },
+                'serviceSubtotals': {
+                    service_code: float(amount)
+                    for service_code, amount in zip(items.services, subtotals[index])
+                },
+                'unpricedCount': int(unpriced[index]),
+                'deltaFromBaseline': float(totals[index] - totals[0])
+            })
+
+        return {
+            'lineItemCount': len(items),
+            'uniqueLookups': len(all_specs),
+            'scenarios': results
+        }
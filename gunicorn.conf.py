@@ -0,0 +1,109 @@
+"""
+Gunicorn 설정
+
+운영 환경에서 API 서버를 실행하기 위한 gunicorn 설정 파일입니다.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+가격 조회는 대부분 AWS API 응답을 기다리는 I/O 작업이므로 프로세스마다 여러 스레드를 두는
+gthread 워커를 사용합니다. preload_app으로 마스터 프로세스에서 애플리케이션을 한 번만 불러오고
+워커는 fork로 만들어 boto3 클라이언트 모델, 가격 색인 등 읽기 위주 데이터를 copy-on-write로 공유합니다.
+
+환경 변수:
+    PORT: 수신 포트 (기본값: 7777)
+    GUNICORN_BIND: 수신 주소 (기본값: 0.0.0.0:$PORT)
+    GUNICORN_WORKERS: 워커 프로세스 수 (기본값: CPU 코어 수 * 2 + 1)
+    GUNICORN_THREADS: 워커당 스레드 수 (기본값: 4)
+    GUNICORN_TIMEOUT: 응답이 없는 워커를 재시작하기까지의 시간 (초, 기본값: 60)
+    GUNICORN_GRACEFUL_TIMEOUT: 재시작/종료 시 처리 중인 요청을 기다리는 시간 (초, 기본값: 30)
+    GUNICORN_KEEPALIVE: keep-alive 연결 유지 시간 (초, 기본값: 5)
+    GUNICORN_MAX_REQUESTS: 워커가 이 수만큼 요청을 처리하면 재시작 (0이면 사용 안 함, 기본값: 0)
+    GUNICORN_PRELOAD: 'false'이면 워커마다 애플리케이션을 따로 불러옴 (기본값: true)
+    GUNICORN_LOG_LEVEL: 로그 레벨 (기본값: info)
+
+공유 가격표 (shared_price_table):
+    PRICING_SHARED_PRICE_TABLE과 PRICING_SHARED_PRICE_TABLE_SERVICES, PRICING_OFFER_DB가 설정되어 있으면
+    마스터 프로세스가 워커를 만들기 전에 오프라인 저장소의 카탈로그로 가격표 파일을 한 번 만들고,
+    모든 워커는 같은 파일을 mmap으로 읽어 워커별 가격 색인 없이 조회합니다.
+
+워커 지표 합산 (metrics):
+    PRICING_METRICS_DIR이 설정되어 있으면 마스터 프로세스가 시작할 때 이전 실행의 워커 지표 파일을 지우고,
+    /metrics는 어느 워커가 응답하든 모든 워커의 카운터와 히스토그램 합계를 반환합니다.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import sys
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 7777)}")
+
+# 워커 / 스레드
+worker_class = 'gthread'
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4)
+
+# 마스터에서 한 번 불러온 애플리케이션을 워커가 공유 (copy-on-write)
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() not in ('0', 'false', 'no')
+
+# 시간 제한 / keep-alive
+# 느린 AWS Pricing API 페이지 조회가 timeout에 걸리지 않도록 기본값보다 길게 설정
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# 메모리 증가에 대비한 주기적 워커 재시작 (지터로 모든 워커가 동시에 재시작되지 않게 함)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = max_requests // 10
+
+# 로그는 표준 출력/오류로 (Docker 로그 수집)
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# 컨테이너의 /tmp가 디스크일 때 하트비트 파일 쓰기로 워커가 멈추지 않도록 메모리 파일 시스템 사용
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+
+def on_starting(server):
+    """
+    마스터 프로세스가 워커를 만들기 전에 한 번 호출됩니다.
+
+    이전 실행의 워커 지표 파일을 지우고, 설정되어 있으면 워커가 공유할 가격표 파일을 만듭니다.
+    워커는 처음 조회할 때 파일을 매핑하므로 preload_app으로 애플리케이션을 먼저 불러왔어도 새 파일을 읽습니다.
+    """
+    import metrics
+    import shared_price_table
+
+    try:
+        metrics.clear_multiprocess_dir()
+    except OSError as e:
+        server.log.error(f"Error clearing metrics directory: {e}")
+
+    try:
+        result = shared_price_table.build_shared_price_table_from_env()
+    except (OSError, ValueError, sqlite3.Error) as e:
+        # 가격표가 없으면 (저장소 파일이 잠겼거나 손상된 경우 포함) 워커별 가격 색인과 AWS API로 조회하므로
+        # 서버는 그대로 시작
+        server.log.error(f"Error building shared price table: {e}")
+        return
+    if result is not None:
+        server.log.info(f"Built shared price table: {result['services']} ({result['bytes']} bytes)")
+
+
+def post_fork(server, worker):
+    """
+    워커 생성 직후 호출됩니다.
+
+    마스터에서 불러온 애플리케이션의 스레드 풀과 SQLite 연결은 fork된 워커에서 쓸 수 없으므로
+    워커마다 새로 만들도록 합니다 (preload_app을 사용하지 않으면 아직 불러오지 않았으므로 건너뜀).
+    """
+    app_module = sys.modules.get('app_swagger')
+    if app_module is not None:
+        app_module.pricing_calculator.after_fork()
@@ -0,0 +1,208 @@
+"""
+JSON Codec
+
+PriceList JSON 문자열 디코딩과 API 응답 JSON 인코딩을 담당하는 모듈입니다.
+
+설치된 라이브러리에 따라 백엔드를 고릅니다.
+    - 디코딩: msgspec (필요한 필드만 정의한 스키마로 디코딩) > orjson > 표준 json
+    - 인코딩: orjson > msgspec > 표준 json
+
+제품 정보는 선택적 추출을 켜면 계산에 쓰는 필드만 남깁니다.
+    - product: sku, productFamily, attributes
+    - terms: 약정 유형별 offerTermCode, termAttributes,
+      priceDimensions(unit, description, pricePerUnit, beginRange, endRange)
+    - serviceCode, publicationDate
+EC2 제품은 약정마다 rateCode, appliesTo, effectiveDate 같은 필드가 반복되므로
+이를 버리면 캐시에 보관하는 제품 목록의 메모리가 줄어듭니다.
+msgspec은 스키마에 없는 필드를 만들지 않으므로 전체 디코딩보다 빨라 기본으로 켜고,
+orjson과 표준 json은 전체를 디코딩한 뒤 필드를 지우는 추가 작업이라 더 느려지므로
+메모리를 줄여야 할 때만 켭니다 (PRICING_JSON_SELECTIVE=true).
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec 미설치 시 orjson 또는 표준 json 사용
+    msgspec = None
+
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+# 선택적 추출에서 남길 필드
+PRODUCT_FIELDS = frozenset(('sku', 'productFamily', 'attributes'))
+TERM_FIELDS = frozenset(('offerTermCode', 'termAttributes', 'priceDimensions'))
+PRICE_DIMENSION_FIELDS = frozenset(('unit', 'description', 'pricePerUnit', 'beginRange', 'endRange'))
+ITEM_FIELDS = frozenset(('product', 'terms', 'serviceCode', 'publicationDate'))
+
+
+if msgspec is not None:
+    class _PriceDimension(msgspec.Struct, omit_defaults=True):
+        unit: Optional[str] = None
+        description: Optional[str] = None
+        pricePerUnit: Optional[Dict[str, str]] = None
+        beginRange: Optional[str] = None
+        endRange: Optional[str] = None
+
+    class _Term(msgspec.Struct, omit_defaults=True):
+        offerTermCode: Optional[str] = None
+        termAttributes: Optional[Dict[str, str]] = None
+        priceDimensions: Optional[Dict[str, _PriceDimension]] = None
+
+    class _Product(msgspec.Struct, omit_defaults=True):
+        sku: Optional[str] = None
+        productFamily: Optional[str] = None
+        attributes: Optional[Dict[str, str]] = None
+
+    class _PriceListItem(msgspec.Struct, omit_defaults=True):
+        product: Optional[_Product] = None
+        terms: Optional[Dict[str, Dict[str, _Term]]] = None
+        serviceCode: Optional[str] = None
+        publicationDate: Optional[str] = None
+
+
+def _keep_fields(source: Dict[str, Any], fields: frozenset) -> None:
+    for field in source.keys() - fields:
+        del source[field]
+
+
+def select_product_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    전체 디코딩한 PriceList 항목에서 계산에 쓰는 필드만 남깁니다 (msgspec 스키마와 같은 필드).
+
+    새 딕셔너리를 만드는 것보다 빠르도록 불필요한 필드를 제자리에서 삭제합니다.
+
+    Args:
+        item (Dict[str, Any]): PriceList 항목 (json.loads 결과, 변경됨)
+
+    Returns:
+        Dict[str, Any]: product, terms, serviceCode, publicationDate만 남긴 item
+    """
+    _keep_fields(item, ITEM_FIELDS)
+    product = item.get('product')
+    if product is not None:
+        _keep_fields(product, PRODUCT_FIELDS)
+    for terms in (item.get('terms') or {}).values():
+        for term in terms.values():
+            _keep_fields(term, TERM_FIELDS)
+            for dimension in (term.get('priceDimensions') or {}).values():
+                _keep_fields(dimension, PRICE_DIMENSION_FIELDS)
+    return item
+
+
+class JSONCodec:
+    """백엔드를 골라 PriceList 디코딩과 응답 인코딩을 수행하는 클래스"""
+
+    def __init__(self, backend: Optional[str] = None, selective: Optional[bool] = None):
+        """
+        JSONCodec 초기화
+
+        Args:
+            backend (Optional[str]): 'msgspec', 'orjson', 'json' 중 하나 (생략 시 설치된 가장 빠른 백엔드)
+            selective (Optional[bool]): 제품 정보에서 계산에 쓰는 필드만 남길지 여부
+                (생략 시 msgspec 백엔드에서만 사용, orjson/json은 디코딩이 느려지는 대신 메모리를 줄임)
+
+        Raises:
+            ValueError: 백엔드 이름이 올바르지 않거나 설치되지 않은 경우
+        """
+        if backend is None or backend == 'auto':
+            backend = 'msgspec' if msgspec is not None else 'orjson' if orjson is not None else 'json'
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid JSON backend: {backend}")
+        if (backend == 'msgspec' and msgspec is None) or (backend == 'orjson' and orjson is None):
+            raise ValueError(f"JSON backend is not installed: {backend}")
+        self.backend = backend
+        self.selective = backend == 'msgspec' if selective is None else selective
+
+        # 디코딩 오류 유형 (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스)
+        self.decode_errors: Tuple[type, ...] = (ValueError,)
+        if backend == 'msgspec':
+            self.decode_errors = (ValueError, msgspec.DecodeError)
+            self._product_decoder = msgspec.json.Decoder(_PriceListItem if self.selective else Any)
+            self._decoder = msgspec.json.Decoder()
+
+        # 인코딩은 설치되어 있으면 numpy 값도 직접 직렬화하는 orjson 사용
+        if orjson is not None and backend != 'json':
+            self.encoder = 'orjson'
+        elif backend == 'msgspec':
+            self.encoder = 'msgspec'
+            self._encoder = msgspec.json.Encoder()
+        else:
+            self.encoder = 'json'
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        JSON 문자열을 디코딩합니다.
+
+        Raises:
+            ValueError: JSON 형식이 올바르지 않은 경우 (msgspec 백엔드는 msgspec.DecodeError)
+        """
+        if self.backend == 'msgspec':
+            return self._decoder.decode(data)
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def decode_product(self, price_list: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        PriceList 항목 하나를 제품 정보로 디코딩합니다.
+
+        Args:
+            price_list (Union[str, bytes]): get_products 응답의 PriceList 문자열
+
+        Returns:
+            Dict[str, Any]: 제품 정보 (선택적 추출을 켜면 계산에 쓰는 필드만)
+
+        Raises:
+            ValueError: JSON 형식이 올바르지 않은 경우 (self.decode_errors 참고)
+        """
+        if self.backend == 'msgspec':
+            product = self._product_decoder.decode(price_list)
+            return msgspec.to_builtins(product) if self.selective else product
+        product = self.loads(price_list)
+        return select_product_fields(product) if self.selective else product
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        값을 UTF-8 JSON으로 인코딩합니다 (한글 등은 이스케이프하지 않음).
+
+        Args:
+            obj (Any): 인코딩할 값 (dict, list, 숫자, 문자열; orjson 백엔드는 numpy 값 포함)
+
+        Returns:
+            bytes: 공백 없는 JSON
+        """
+        if self.encoder == 'orjson':
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        if self.encoder == 'msgspec':
+            return self._encoder.encode(obj)
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def __repr__(self) -> str:
+        return f"JSONCodec(backend={self.backend!r}, encoder={self.encoder!r}, selective={self.selective})"
+
+
+def create_json_codec_from_env() -> JSONCodec:
+    """
+    환경 변수 설정을 기반으로 JSON 코덱을 생성합니다.
+
+    환경 변수:
+        PRICING_JSON_BACKEND: 'msgspec', 'orjson', 'json', 'auto' 중 하나 (기본값: auto, 설치된 가장 빠른 백엔드)
+        PRICING_JSON_SELECTIVE: 'true'이면 계산에 쓰는 필드만, 'false'이면 제품 정보 전체를 보관
+            (기본값: msgspec 백엔드에서만 필드 선택)
+
+    Returns:
+        JSONCodec: JSON 코덱
+    """
+    backend = os.environ.get('PRICING_JSON_BACKEND', 'auto').lower()
+    selective = os.environ.get('PRICING_JSON_SELECTIVE')
+    if selective is not None:
+        selective = selective.lower() not in ('0', 'false', 'no')
+    return JSONCodec(backend, selective)
@@ -0,0 +1,586 @@
+"""
+Metrics
+
+요청 처리 구간별 소요 시간을 측정하여 Prometheus 텍스트 형식으로 내보내는 모듈입니다.
+
+span()으로 감싼 구간(업스트림 호출, PriceList JSON 파싱, 일치 점수 계산/정렬, 응답 직렬화 등)의
+소요 시간은 pricing_span_seconds 히스토그램에 누적되고, 요청 처리 중이면 요청별 측정(RequestTiming)에도
+더해져 Server-Timing 응답 헤더로 내보낼 수 있습니다. 요청별 측정은 ContextVar에 보관하므로
+스레드 풀에서 실행하는 작업은 contextvars.copy_context()로 실행해야 같은 요청에 합산됩니다.
+
+지표는 프로세스마다 집계되므로, gunicorn처럼 워커가 여러 개이면 PRICING_METRICS_DIR을 설정합니다.
+각 워커가 카운터와 히스토그램 값을 그 디렉터리에 주기적으로 파일로 쓰고, /metrics 응답은
+모든 워커의 파일을 합산합니다 (prometheus_client의 multiprocess 모드와 같은 방식).
+"""
+
+import atexit
+import contextvars
+import glob
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 지연 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 응답 크기 히스토그램 구간 (바이트)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (레이블, 값) 목록
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """레이블별로 누적되는 카운터"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """
+        카운터를 증가시킵니다.
+
+        Args:
+            amount (float): 증가량 (기본값: 1)
+            **labels: 레이블 값 (예: operation='get_products')
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def dump(self) -> Dict[Tuple[str, ...], float]:
+        """레이블 값별 현재 값의 복사본을 반환합니다."""
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(values: Dict[Tuple[str, ...], float], key: Tuple[str, ...], value: float) -> None:
+        """다른 프로세스의 값을 더합니다."""
+        values[key] = values.get(key, 0) + value
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], float]] = None) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for key, value in sorted((values if values is not None else self.dump()).items()):
+            lines.append(f'{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """레이블별로 구간 누적 개수, 합계, 개수를 기록하는 히스토그램"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 값 -> [구간별 개수..., 합계, 개수]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        관측값을 기록합니다.
+
+        Args:
+            value (float): 관측값 (예: 소요 시간(초), 바이트 수)
+            **labels: 레이블 값
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[position] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def snapshot(self, **labels: Any) -> Optional[Dict[str, float]]:
+        """
+        레이블 값의 합계와 개수를 반환합니다.
+
+        Returns:
+            Optional[Dict[str, float]]: {'sum': 합계, 'count': 개수} (관측값이 없으면 None)
+        """
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            counts = self._values.get(key)
+            return {'sum': counts[-2], 'count': counts[-1]} if counts else None
+
+    def dump(self) -> Dict[Tuple[str, ...], List[float]]:
+        """레이블 값별 [구간별 개수..., 합계, 개수]의 복사본을 반환합니다."""
+        with self._lock:
+            return {key: list(counts) for key, counts in self._values.items()}
+
+    @staticmethod
+    def merge(values: Dict[Tuple[str, ...], List[float]], key: Tuple[str, ...], counts: List[float]) -> None:
+        """다른 프로세스의 구간별 개수, 합계, 개수를 더합니다."""
+        existing = values.get(key)
+        if existing is None:
+            values[key] = list(counts)
+        else:
+            values[key] = [a + b for a, b in zip(existing, counts)]
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], List[float]]] = None) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for key, counts in sorted((values if values is not None else self.dump()).items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts[:-2] + [counts[-1] - sum(counts[:-2])]):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, 'le': _format_value(bound)})
+                lines.append(f'{self.name}_bucket{bucket_labels} {_format_value(cumulative)}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(counts[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {_format_value(counts[-1])}')
+        return lines
+
+
+class MetricsRegistry:
+    """지표 목록과 내보낼 때 값을 읽는 수집 함수를 관리하는 클래스"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """카운터를 등록합니다 (같은 이름이 이미 있으면 기존 카운터를 반환)."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """히스토그램을 등록합니다 (같은 이름이 이미 있으면 기존 히스토그램을 반환)."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Samples]]]) -> None:
+        """
+        내보낼 때마다 호출할 수집 함수를 등록합니다.
+
+        Args:
+            collector (Callable): (이름, 유형(gauge/counter), 설명, [(레이블, 값), ...]) 목록을 반환하는 함수
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def dump(self) -> Dict[str, List[Any]]:
+        """
+        카운터와 히스토그램의 현재 값을 JSON으로 쓸 수 있는 형식으로 반환합니다.
+
+        Returns:
+            Dict[str, List[Any]]: 지표 이름 -> [[레이블 값 목록, 값], ...]
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: [[list(key), value] for key, value in metric.dump().items()] for metric in metrics}
+
+    def write_snapshot(self, directory: str, pid: Optional[int] = None) -> None:
+        """
+        현재 프로세스의 지표 값을 directory/metrics-<pid>.json 파일로 씁니다 (다른 워커가 합산할 수 있도록).
+
+        Args:
+            directory (str): 워커들이 공유하는 지표 디렉터리 (PRICING_METRICS_DIR)
+            pid (Optional[int]): 파일 이름에 쓸 프로세스 ID (기본값: 현재 프로세스)
+        """
+        path = os.path.join(directory, f'metrics-{pid or os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.dump(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _merged_values(self, metrics: List[Any], directory: str) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+        """현재 프로세스의 값에 다른 워커 파일의 값을 더합니다 (종료한 워커의 누적 값 포함)."""
+        merged = {metric.name: metric.dump() for metric in metrics}
+        by_name = {metric.name: metric for metric in metrics}
+        own_path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            if path == own_path:
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading metrics snapshot {path}: {e}")
+                continue
+            for name, values in snapshot.items():
+                metric = by_name.get(name)
+                if metric is None:
+                    continue
+                for key, value in values:
+                    metric.merge(merged[name], tuple(key), value)
+        return merged
+
+    def render(self) -> str:
+        """
+        모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 반환합니다.
+
+        PRICING_METRICS_DIR이 설정되어 있으면 카운터와 히스토그램은 모든 워커의 합계이고,
+        수집 함수의 게이지는 응답한 워커의 값이므로 pid 레이블을 붙입니다.
+
+        Returns:
+            str: 지표 텍스트
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        directory = multiprocess_dir()
+        merged = self._merged_values(metrics, directory) if directory else {}
+        extra_labels = {'pid': str(os.getpid())} if directory else {}
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(merged.get(metric.name)))
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels({**labels, **extra_labels})} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def gauges_from_stats(prefix: str, stats: Optional[Dict[str, Any]],
+                      documentation: str) -> List[Tuple[str, str, str, Samples]]:
+    """
+    통계 dict의 숫자 값을 게이지로 변환합니다 (수집 함수에서 사용).
+
+    Args:
+        prefix (str): 지표 이름 접두사 (예: pricing_connection_pool)
+        stats (Optional[Dict[str, Any]]): metrics()/stats() 결과 (예: {'inUse': 2, 'waitSeconds': 0.1})
+        documentation (str): 설명에 붙일 구성 요소 이름
+
+    Returns:
+        List[Tuple[str, str, str, Samples]]: 값마다 하나의 게이지 (예: pricing_connection_pool_in_use)
+    """
+    families = []
+    for key, value in (stats or {}).items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{re.sub(r'(?<!^)(?=[A-Z])', '_', key).lower()}"
+        families.append((name, 'gauge', f'{documentation} {key}', [({}, value)]))
+    return families
+
+
+registry = MetricsRegistry()
+
+# 구간별 소요 시간 (upstream, parse, score, sort, index, serialize 등)
+SPAN_SECONDS = registry.histogram(
+    'pricing_span_seconds', 'Time spent in instrumented hot-path spans', ('span',)
+)
+
+# AWS Pricing API 호출 (페이지 단위)
+UPSTREAM_SECONDS = registry.histogram(
+    'pricing_upstream_request_seconds', 'AWS Pricing API request latency per page', ('operation',)
+)
+UPSTREAM_PAGES = registry.counter(
+    'pricing_upstream_pages_total', 'AWS Pricing API response pages received', ('operation',)
+)
+UPSTREAM_PAGE_BYTES = registry.histogram(
+    'pricing_upstream_page_bytes', 'PriceList bytes per get_products page', ('operation',), BYTE_BUCKETS
+)
+
+# HTTP 요청 처리 시간
+HTTP_REQUEST_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency', ('method', 'endpoint', 'status')
+)
+
+
+def metrics_enabled() -> bool:
+    """
+    지표 수집 여부를 반환합니다.
+
+    환경 변수:
+        PRICING_METRICS_ENABLED: 'false'이면 구간 측정과 /metrics 비활성화 (기본값: true)
+    """
+    return os.environ.get('PRICING_METRICS_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+
+
+def multiprocess_dir() -> Optional[str]:
+    """
+    워커들이 지표 값을 공유하는 디렉터리를 반환합니다.
+
+    환경 변수:
+        PRICING_METRICS_DIR: 워커마다 지표 파일을 쓰고 /metrics에서 합산할 디렉터리
+                             (gunicorn 시작 시 clear_multiprocess_dir로 비움, 기본값: 사용 안 함)
+    """
+    return os.environ.get('PRICING_METRICS_DIR') or None
+
+
+def clear_multiprocess_dir() -> None:
+    """
+    이전 실행에서 남은 워커 지표 파일을 지웁니다 (gunicorn on_starting에서 호출).
+
+    Raises:
+        OSError: 디렉터리를 만들거나 파일을 지울 수 없는 경우
+    """
+    directory = multiprocess_dir()
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json*')):
+        os.remove(path)
+
+
+# 워커 지표 파일을 쓰는 주기 (초)
+SNAPSHOT_INTERVAL = 1.0
+
+_snapshot_pid: Optional[int] = None
+_snapshot_lock = threading.Lock()
+
+
+def _write_snapshot(directory: str) -> None:
+    try:
+        registry.write_snapshot(directory)
+    except OSError as e:
+        print(f"Error writing metrics snapshot: {e}")
+
+
+def _run_snapshot_writer(directory: str, pid: int) -> None:
+    while _snapshot_pid == pid:
+        time.sleep(SNAPSHOT_INTERVAL)
+        _write_snapshot(directory)
+
+
+def ensure_snapshot_writer() -> None:
+    """
+    PRICING_METRICS_DIR이 설정되어 있으면 현재 프로세스의 지표 파일을 주기적으로 쓰는 스레드를 시작합니다.
+
+    요청마다 호출하며, fork된 워커에서 처음 호출될 때 한 번만 시작됩니다 (종료 시에도 마지막 값을 씀).
+    """
+    global _snapshot_pid
+    pid = os.getpid()
+    if _snapshot_pid == pid:
+        return
+    directory = multiprocess_dir()
+    if not directory:
+        return
+    with _snapshot_lock:
+        if _snapshot_pid == pid:
+            return
+        _snapshot_pid = pid
+        threading.Thread(target=_run_snapshot_writer, args=(directory, pid),
+                         name='metrics-snapshot', daemon=True).start()
+        atexit.register(_write_snapshot, directory)
+
+
+def server_timing_enabled() -> bool:
+    """
+    Server-Timing 응답 헤더 사용 여부를 반환합니다.
+
+    환경 변수:
+        PRICING_SERVER_TIMING: 'true'이면 응답에 구간별 소요 시간을 Server-Timing 헤더로 추가 (기본값: false)
+    """
+    return os.environ.get('PRICING_SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+
+
+class RequestTiming:
+    """요청 하나의 구간별 소요 시간 합계"""
+
+    __slots__ = ('started_at', 'spans', '_lock')
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        # 구간 이름 -> [합계(초), 횟수] (처음 기록된 순서 유지)
+        self.spans: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [seconds, 1]
+            else:
+                span[0] += seconds
+                span[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing 헤더 값을 반환합니다.
+
+        Returns:
+            str: 구간별 합계와 전체 소요 시간 (예: 'upstream;dur=120.5;desc="3", parse;dur=4.2, total;dur=130.1')
+        """
+        with self._lock:
+            spans = [(name, seconds, count) for name, (seconds, count) in self.spans.items()]
+        entries = []
+        for name, seconds, count in spans:
+            entry = f'{name};dur={seconds * 1000:.1f}'
+            if count > 1:
+                entry += f';desc="{int(count)}"'
+            entries.append(entry)
+        entries.append(f'total;dur={self.elapsed() * 1000:.1f}')
+        return ', '.join(entries)
+
+
+_current_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar(
+    'pricing_request_timing', default=None
+)
+
+
+def begin_request() -> contextvars.Token:
+    """
+    현재 컨텍스트에서 요청별 측정을 시작합니다.
+
+    Returns:
+        contextvars.Token: end_request에 전달할 토큰
+    """
+    ensure_snapshot_writer()
+    return _current_timing.set(RequestTiming())
+
+
+def current_request() -> Optional[RequestTiming]:
+    """현재 요청의 측정 정보를 반환합니다 (요청 처리 중이 아니면 None)."""
+    return _current_timing.get()
+
+
+def end_request(token: contextvars.Token, method: str, endpoint: str, status: int) -> Optional[RequestTiming]:
+    """
+    요청별 측정을 끝내고 요청 처리 시간을 기록합니다.
+
+    Args:
+        token (contextvars.Token): begin_request가 반환한 토큰
+        method (str): HTTP 메서드
+        endpoint (str): 경로 규칙 (예: /api/services/<string:service_code>/attributes)
+        status (int): 응답 상태 코드
+
+    Returns:
+        Optional[RequestTiming]: 요청의 측정 정보
+    """
+    timing = _current_timing.get()
+    _current_timing.reset(token)
+    if timing is not None and metrics_enabled():
+        HTTP_REQUEST_SECONDS.observe(timing.elapsed(), method=method, endpoint=endpoint, status=status)
+    return timing
+
+
+def record_span(name: str, seconds: float) -> None:
+    """
+    구간 소요 시간을 기록합니다 (히스토그램과 현재 요청의 측정 정보).
+
+    Args:
+        name (str): 구간 이름 (예: parse)
+        seconds (float): 소요 시간 (초)
+    """
+    if not metrics_enabled():
+        return
+    SPAN_SECONDS.observe(seconds, span=name)
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    with 블록의 소요 시간을 구간으로 기록합니다.
+
+    Args:
+        name (str): 구간 이름 (예: sort)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+class TimedIterator:
+    """
+    반복자가 다음 항목을 만드는 데 걸린 시간을 누적하는 래퍼
+
+    지연 생성되는 제품 목록을 소비하는 쪽에서, 전체 반복 시간에서 seconds를 빼면
+    항목 조회(업스트림 호출, 파싱)를 제외한 소비 쪽 처리 시간을 알 수 있습니다.
+    """
+
+    __slots__ = ('_iterator', 'seconds')
+
+    def __init__(self, iterable: Iterable[Any]):
+        self._iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self) -> 'TimedIterator':
+        return self
+
+    def __next__(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def bind_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    현재 컨텍스트(요청별 측정 포함)에서 실행되도록 함수를 감쌉니다 (스레드 풀에 제출할 때 사용).
+
+    Args:
+        func (Callable[..., Any]): 실행할 함수
+
+    Returns:
+        Callable[..., Any]: 호출 시점이 아닌 감싼 시점의 컨텍스트에서 실행되는 함수
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        return func
+
+    # 같은 함수가 여러 스레드에서 동시에 실행될 수 있으므로 Context 대신 측정 정보만 전달
+    def run(*args: Any, **kwargs: Any) -> Any:
+        token = _current_timing.set(timing)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_timing.reset(token)
+    return run
@@ -0,0 +1,452 @@
+"""
+Offer Store
+
+AWS 벌크 가격 파일(offer file)을 로컬 SQLite 저장소에 적재하고,
+AWSPricingClient와 같은 형식으로 조회할 수 있게 해 주는 모듈입니다.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from offer_stream import OfferStreamReader
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    service_code TEXT PRIMARY KEY,
+    version TEXT,
+    publication_date TEXT,
+    ingested_at REAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    sku TEXT PRIMARY KEY,
+    service_code TEXT NOT NULL,
+    product_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    sku TEXT NOT NULL,
+    service_code TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    sku TEXT NOT NULL,
+    term_type TEXT NOT NULL,
+    terms_json TEXT NOT NULL,
+    PRIMARY KEY (sku, term_type)
+);
+CREATE INDEX IF NOT EXISTS idx_products_service ON products (service_code);
+CREATE INDEX IF NOT EXISTS idx_attributes_lookup ON attributes (service_code, name, value, sku);
+CREATE INDEX IF NOT EXISTS idx_attributes_sku ON attributes (sku);
+"""
+
+# 적재 중인 파일의 SKU와 리전, 삭제할 SKU (연결별 임시 테이블)
+INGEST_SCHEMA = """
+CREATE TEMP TABLE IF NOT EXISTS ingest_skus (sku TEXT PRIMARY KEY);
+CREATE TEMP TABLE IF NOT EXISTS ingest_regions (region TEXT PRIMARY KEY);
+CREATE TEMP TABLE IF NOT EXISTS ingest_stale (sku TEXT PRIMARY KEY);
+DELETE FROM temp.ingest_skus;
+DELETE FROM temp.ingest_regions;
+"""
+
+# 제품 속성 외에 필터로 사용할 수 있는 제품 필드
+PRODUCT_FIELDS = ('productFamily', 'sku')
+
+# 한 번에 읽고 삽입할 레코드 수
+BATCH_SIZE = 1000
+
+# SQLite IN 절 하나에 넣을 최대 SKU 수
+SKU_CHUNK_SIZE = 500
+
+
+def product_region(attributes: Dict[str, str]) -> str:
+    """
+    제품 속성에서 리전을 반환합니다 (적재 시 교체 범위를 정하는 데 사용).
+
+    Args:
+        attributes (Dict[str, str]): 제품 속성
+
+    Returns:
+        str: regionCode (없으면 location, 둘 다 없으면 빈 문자열)
+    """
+    return attributes.get('regionCode') or attributes.get('location') or ''
+
+
+class OfferStore:
+    """AWS 벌크 가격 파일을 적재한 로컬 SQLite 저장소 클래스"""
+
+    def __init__(self, db_path: str):
+        """
+        OfferStore 초기화
+
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+                           (스레드마다 별도 연결을 사용하므로 ':memory:'는 지원하지 않음)
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 SQLite 연결을 반환합니다."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def after_fork(self) -> None:
+        """
+        fork로 만든 자식 프로세스에서 호출합니다 (gunicorn post_fork).
+
+        부모 프로세스의 SQLite 연결은 자식에서 사용하거나 닫으면 안 되므로 (파일 잠금 공유)
+        닫지 않고 버린 뒤 새 연결을 쓰도록 합니다.
+        """
+        self._local = threading.local()
+
+    def close(self) -> None:
+        """현재 스레드의 SQLite 연결을 닫습니다."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def ingest(self,
+               fp: BinaryIO,
+               service_code: Optional[str] = None,
+               term_types: Optional[Iterable[str]] = OfferStreamReader.DEFAULT_TERM_TYPES,
+               progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        offer 파일을 스트리밍으로 읽어 저장소에 적재합니다.
+
+        레코드는 BATCH_SIZE 단위로 읽고 삽입하므로 메모리 사용량은 파일 크기와 무관합니다.
+        제품은 SKU 단위로 교체하고, 파일이 다루는 리전(regionCode, 없으면 location)의 기존 제품 중
+        파일에 없는 제품만 삭제하므로 리전별 offer 파일을 차례로 적재해도 다른 리전 데이터는 남습니다.
+        교체는 하나의 트랜잭션 안에서 이루어지므로 적재 중에도 다른 연결은 이전 데이터를 계속 조회할 수 있습니다.
+
+        Args:
+            fp (BinaryIO): 바이너리 모드로 열린 offer 파일 객체 (index.json 등)
+            service_code (Optional[str]): 서비스 코드 (생략 시 파일의 offerCode 사용)
+            term_types (Optional[Iterable[str]]): 적재할 약정 유형 (기본값: OnDemand, Reserved / None이면 전체)
+            progress_callback (Optional[Callable]): 진행 상황과 처리량을 받을 함수
+
+        Returns:
+            Dict[str, Any]: 적재 결과 (서비스 코드, 제품 수, 약정 수, 소요 시간, 처리량)
+
+        Raises:
+            ValueError: 서비스 코드를 알 수 없거나 파일 형식이 잘못된 경우
+        """
+        connection = self._connection()
+        reader = OfferStreamReader(fp, batch_size=BATCH_SIZE, term_types=term_types,
+                                   progress_callback=progress_callback)
+        connection.executescript(INGEST_SCHEMA)
+
+        try:
+            for kind, records in reader.iter_batches():
+                service_code = service_code or reader.service_code
+                if not service_code:
+                    raise ValueError("Service code is required (offerCode not found in offer file)")
+
+                if kind == 'products':
+                    self._insert_products(connection, service_code, records)
+                else:
+                    self._insert_terms(connection, records)
+
+            service_code = service_code or reader.service_code
+            if not service_code:
+                raise ValueError("Service code is required (offerCode not found in offer file)")
+            self._delete_stale_products(connection, service_code)
+
+            connection.execute(
+                'INSERT OR REPLACE INTO offers (service_code, version, publication_date, ingested_at) '
+                'VALUES (?, ?, ?, ?)',
+                (service_code, reader.meta.get('version'), reader.meta.get('publicationDate'), time.time())
+            )
+            connection.commit()
+
+        except Exception:
+            connection.rollback()
+            raise
+
+        return {'serviceCode': service_code, **reader.stats.to_dict()}
+
+    @staticmethod
+    def _insert_products(connection: sqlite3.Connection, service_code: str,
+                         records: List[Dict[str, Any]]) -> None:
+        """제품 레코드 배치와 속성 인덱스 행을 삽입합니다."""
+        product_rows = []
+        attribute_rows = []
+        regions = set()
+        for record in records:
+            product = record['product']
+            sku = product.get('sku', '')
+            product_rows.append((sku, service_code, json.dumps(product, separators=(',', ':'))))
+            regions.add(product_region(product.get('attributes', {})))
+            for name in PRODUCT_FIELDS:
+                if product.get(name):
+                    attribute_rows.append((sku, service_code, name, product[name]))
+            for name, value in product.get('attributes', {}).items():
+                attribute_rows.append((sku, service_code, name, value))
+
+        # 다시 적재하는 SKU의 이전 속성과 약정 행을 지우고 새 행으로 교체
+        sku_rows = [(row[0],) for row in product_rows]
+        connection.executemany('DELETE FROM attributes WHERE sku = ?', sku_rows)
+        connection.executemany('DELETE FROM terms WHERE sku = ?', sku_rows)
+        connection.executemany('INSERT OR IGNORE INTO temp.ingest_skus (sku) VALUES (?)', sku_rows)
+        connection.executemany('INSERT OR IGNORE INTO temp.ingest_regions (region) VALUES (?)',
+                               [(region,) for region in regions])
+        connection.executemany(
+            'INSERT OR REPLACE INTO products (sku, service_code, product_json) VALUES (?, ?, ?)',
+            product_rows
+        )
+        connection.executemany(
+            'INSERT INTO attributes (sku, service_code, name, value) VALUES (?, ?, ?, ?)',
+            attribute_rows
+        )
+
+    @staticmethod
+    def _insert_terms(connection: sqlite3.Connection, records: List[Dict[str, Any]]) -> None:
+        """약정 레코드 배치를 삽입합니다."""
+        connection.executemany(
+            'INSERT OR REPLACE INTO terms (sku, term_type, terms_json) VALUES (?, ?, ?)',
+            [
+                (record['product']['sku'], term_type, json.dumps(terms, separators=(',', ':')))
+                for record in records
+                for term_type, terms in record['terms'].items()
+            ]
+        )
+
+    def ingest_file(self, path: str, service_code: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        """
+        로컬 디스크의 offer 파일을 적재합니다.
+
+        Args:
+            path (str): offer 파일 경로
+            service_code (Optional[str]): 서비스 코드 (생략 시 파일의 offerCode 사용)
+            **kwargs: ingest에 전달할 추가 인자 (term_types, progress_callback)
+
+        Returns:
+            Dict[str, Any]: 적재 결과
+        """
+        with open(path, 'rb') as fp:
+            return self.ingest(fp, service_code=service_code, **kwargs)
+
+    @staticmethod
+    def _delete_stale_products(connection: sqlite3.Connection, service_code: str) -> None:
+        """이번 파일이 다루는 리전의 기존 제품 중 파일에 없는 제품을 삭제합니다."""
+        connection.execute('DELETE FROM temp.ingest_stale')
+        connection.execute(
+            'INSERT INTO temp.ingest_stale (sku) '
+            'SELECT p.sku FROM products p WHERE p.service_code = ? '
+            'AND p.sku NOT IN (SELECT sku FROM temp.ingest_skus) '
+            'AND COALESCE('
+            "NULLIF((SELECT a.value FROM attributes a WHERE a.sku = p.sku AND a.name = 'regionCode'), ''), "
+            "NULLIF((SELECT a.value FROM attributes a WHERE a.sku = p.sku AND a.name = 'location'), ''), "
+            "'') IN (SELECT region FROM temp.ingest_regions)",
+            (service_code,)
+        )
+        for table in ('terms', 'attributes', 'products'):
+            connection.execute(f'DELETE FROM {table} WHERE sku IN (SELECT sku FROM temp.ingest_stale)')
+
+    def has_service(self, service_code: str) -> bool:
+        """
+        서비스가 저장소에 적재되어 있는지 확인합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+
+        Returns:
+            bool: 적재 여부
+        """
+        row = self._connection().execute(
+            'SELECT 1 FROM offers WHERE service_code = ?', (service_code,)
+        ).fetchone()
+        return row is not None
+
+    def get_offer_info(self, service_code: str) -> Optional[Dict[str, Any]]:
+        """
+        적재된 offer 파일의 버전 정보를 조회합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+
+        Returns:
+            Optional[Dict[str, Any]]: 버전, 게시일, 적재 시각 (적재되지 않았으면 None)
+        """
+        row = self._connection().execute(
+            'SELECT version, publication_date, ingested_at FROM offers WHERE service_code = ?',
+            (service_code,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'version': row[0], 'publicationDate': row[1], 'ingestedAt': row[2]}
+
+    def get_services(self) -> List[Dict[str, str]]:
+        """
+        적재된 서비스 목록을 조회합니다.
+
+        Returns:
+            List[Dict[str, str]]: 서비스 목록 (AWSPricingClient.get_services와 같은 형식)
+        """
+        rows = self._connection().execute('SELECT service_code FROM offers ORDER BY service_code')
+        return [{'serviceCode': row[0], 'serviceName': row[0]} for row in rows]
+
+    def get_service_attributes(self, service_code: str) -> List[str]:
+        """
+        적재된 서비스의 속성 목록을 조회합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+
+        Returns:
+            List[str]: 속성 이름 목록
+        """
+        rows = self._connection().execute(
+            'SELECT DISTINCT name FROM attributes WHERE service_code = ? ORDER BY name',
+            (service_code,)
+        )
+        return [row[0] for row in rows]
+
+    def get_attribute_values(self, service_code: str, attribute_name: str) -> List[str]:
+        """
+        적재된 서비스의 특정 속성에 대한 값 목록을 조회합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            attribute_name (str): 속성 이름 (예: instanceType)
+
+        Returns:
+            List[str]: 속성 값 목록
+        """
+        rows = self._connection().execute(
+            'SELECT DISTINCT value FROM attributes WHERE service_code = ? AND name = ? ORDER BY value',
+            (service_code, attribute_name)
+        )
+        return [row[0] for row in rows]
+
+    def get_products(self, service_code: str, filters: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        필터 조건에 맞는 제품 정보를 조회합니다.
+
+        모든 필터는 TERM_MATCH(값 완전 일치)로 처리합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록 (AWSPricingClient.get_products와 같은 형식)
+
+        Returns:
+            List[Dict[str, Any]]: 제품 정보 목록 (AWS Pricing API PriceList와 같은 형식)
+        """
+        return list(self.iter_products(service_code, filters))
+
+    def iter_products(self,
+                      service_code: str,
+                      filters: Optional[List[Dict[str, str]]] = None,
+                      batch_size: int = SKU_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        필터 조건에 맞는 제품 정보를 batch_size개씩 읽어 하나씩 반환합니다.
+
+        서비스 전체 카탈로그처럼 결과가 큰 경우에도 메모리 사용량이 batch_size에 비례합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (Optional[List[Dict[str, str]]]): 필터 목록 (생략 시 서비스 전체)
+            batch_size (int): 한 번에 읽을 제품 수 (SQLite IN 절 크기 제한 이하)
+
+        Yields:
+            Dict[str, Any]: 제품 정보 (AWS Pricing API PriceList와 같은 형식)
+        """
+        connection = self._connection()
+        offer_info = self.get_offer_info(service_code) or {}
+
+        query = 'SELECT p.sku, p.product_json FROM products p WHERE p.service_code = ?'
+        params: List[Any] = [service_code]
+        for filter_item in filters or []:
+            query += (
+                ' AND EXISTS (SELECT 1 FROM attributes a WHERE a.service_code = p.service_code'
+                ' AND a.name = ? AND a.value = ? AND a.sku = p.sku)'
+            )
+            params.extend([filter_item.get('field', ''), filter_item.get('value', '')])
+        query += ' ORDER BY p.rowid'
+
+        cursor = connection.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            products_by_sku: Dict[str, Dict[str, Any]] = {}
+            for sku, product_json in rows:
+                products_by_sku[sku] = {
+                    'product': json.loads(product_json),
+                    'serviceCode': service_code,
+                    'terms': {},
+                    'version': offer_info.get('version'),
+                    'publicationDate': offer_info.get('publicationDate')
+                }
+
+            skus = list(products_by_sku)
+            placeholders = ','.join('?' * len(skus))
+            term_rows = connection.execute(
+                f'SELECT sku, term_type, terms_json FROM terms WHERE sku IN ({placeholders})',
+                skus
+            )
+            for sku, term_type, terms_json in term_rows:
+                products_by_sku[sku]['terms'][term_type] = json.loads(terms_json)
+
+            yield from products_by_sku.values()
+
+
+def open_offer_store_from_env() -> Optional[OfferStore]:
+    """
+    환경 변수 PRICING_OFFER_DB가 설정되어 있으면 해당 경로의 저장소를 엽니다.
+
+    Returns:
+        Optional[OfferStore]: 저장소 (설정되지 않았으면 None)
+    """
+    db_path = os.environ.get('PRICING_OFFER_DB')
+    if not db_path:
+        return None
+    return OfferStore(db_path)
+
+
+def main() -> None:
+    """offer 파일 적재 명령줄 도구"""
+    parser = argparse.ArgumentParser(description='AWS 벌크 가격 파일을 로컬 SQLite 저장소에 적재합니다.')
+    parser.add_argument('offer_files', nargs='+', help='offer 파일 경로 (예: AmazonEC2/index.json)')
+    parser.add_argument('--db', default=os.environ.get('PRICING_OFFER_DB', 'pricing_offers.db'),
+                        help='SQLite 데이터베이스 파일 경로')
+    parser.add_argument('--service-code', help='서비스 코드 (생략 시 파일의 offerCode 사용)')
+    parser.add_argument('--all-terms', action='store_true',
+                        help='OnDemand, Reserved 외의 약정 유형도 적재')
+    args = parser.parse_args()
+
+    def report_progress(stats: Dict[str, Any]) -> None:
+        progress = f"{stats['progress'] * 100:.1f}% " if stats['progress'] is not None else ''
+        print(f"  {progress}레코드 {stats['records']}개, "
+              f"{stats['recordsPerSecond']:.0f} records/s, "
+              f"{stats['bytesPerSecond'] / (1 << 20):.1f} MiB/s", file=sys.stderr)
+
+    store = OfferStore(args.db)
+    for path in args.offer_files:
+        result = store.ingest_file(
+            path,
+            service_code=args.service_code,
+            term_types=None if args.all_terms else OfferStreamReader.DEFAULT_TERM_TYPES,
+            progress_callback=report_progress
+        )
+        print(f"{path}: {result['serviceCode']} 제품 {result['products']}개, "
+              f"약정 {result['terms']}개 적재 ({result['seconds']:.1f}초, "
+              f"{result['recordsPerSecond']:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
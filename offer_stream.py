@@ -0,0 +1,406 @@
+"""
+Offer File Stream
+
+AWS 벌크 가격 파일(offer file)을 전체 메모리에 올리지 않고 항목 단위로 읽는 모듈입니다.
+
+offer 파일의 구조는 다음과 같습니다.
+    {
+        "offerCode": "AmazonEC2",
+        "version": "...",
+        "publicationDate": "...",
+        "products": {"<sku>": {...}, ...},
+        "terms": {"OnDemand": {"<sku>": {...}, ...}, "Reserved": {...}}
+    }
+
+`products`와 `terms`의 각 SKU 항목만 개별적으로 디코딩하므로,
+메모리 사용량은 파일 크기가 아니라 가장 큰 단일 항목 크기에 비례합니다.
+"""
+
+import codecs
+import json
+import os
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class JSONStreamScanner:
+    """파일 객체에서 JSON 토큰을 필요한 만큼만 읽어 들이는 스캐너 클래스"""
+
+    WHITESPACE = ' \t\r\n'
+
+    def __init__(self, fp: BinaryIO, chunk_size: int = 1 << 16):
+        """
+        JSONStreamScanner 초기화
+
+        Args:
+            fp (BinaryIO): 바이너리 모드로 열린 JSON 파일 객체
+            chunk_size (int): 한 번에 읽을 바이트 수
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """버퍼에 데이터를 더 읽어 옵니다. 더 읽을 데이터가 없으면 False를 반환합니다."""
+        if self._eof:
+            return False
+
+        # 이미 읽은 부분은 버퍼에서 제거
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+        # 큰 항목을 읽는 중이면 읽기 크기를 늘려 재시도 횟수를 줄임
+        chunk = self.fp.read(max(self.chunk_size, len(self._buf)))
+        if not chunk:
+            self._eof = True
+            self._buf += self._text_decoder.decode(b'', final=True)
+            return False
+
+        self.bytes_read += len(chunk)
+        self._buf += self._text_decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """
+        공백을 건너뛰고 다음 문자를 반환합니다 (소비하지 않음).
+
+        Returns:
+            str: 다음 문자 (파일 끝이면 빈 문자열)
+        """
+        while True:
+            buf = self._buf
+            pos = self._pos
+            length = len(buf)
+            while pos < length and buf[pos] in self.WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """
+        다음 문자가 char인지 확인하고 소비합니다.
+
+        Raises:
+            ValueError: 다음 문자가 char가 아닌 경우
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at byte {self.bytes_read}, found {found!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """
+        다음 JSON 값 하나를 디코딩하여 반환합니다.
+
+        Returns:
+            Any: 디코딩된 값
+
+        Raises:
+            ValueError: JSON 형식이 잘못된 경우
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 버퍼 끝에서 끝난 숫자 등은 잘렸을 수 있으므로 더 읽은 뒤 다시 디코딩
+            if end >= len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        현재 위치의 JSON 객체 키를 하나씩 반환합니다.
+
+        호출자는 키를 받은 뒤 다음 키를 요청하기 전에 해당 값을
+        read_value, iter_object, iter_array, skip_value 중 하나로 소비해야 합니다.
+
+        Yields:
+            str: 객체 키
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key at byte {self.bytes_read}")
+            self.expect(':')
+            yield key
+
+            separator = self.peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' at byte {self.bytes_read}, found {separator!r}")
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        현재 위치의 JSON 배열 인덱스를 하나씩 반환합니다.
+
+        iter_object와 마찬가지로 호출자가 각 요소를 직접 소비해야 합니다.
+
+        Yields:
+            int: 배열 인덱스
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            separator = self.peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' at byte {self.bytes_read}, found {separator!r}")
+
+    def skip_value(self) -> None:
+        """다음 JSON 값을 메모리에 올리지 않고 건너뜁니다."""
+        char = self.peek()
+        if char == '{':
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == '[':
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+
+def iter_offer_entries(fp: BinaryIO,
+                       chunk_size: int = 1 << 16,
+                       term_types: Optional[Iterable[str]] = None,
+                       scanner: Optional[JSONStreamScanner] = None) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    offer 파일을 스트리밍으로 읽어 항목을 하나씩 반환합니다.
+
+    Args:
+        fp (BinaryIO): 바이너리 모드로 열린 offer 파일 객체
+        chunk_size (int): 한 번에 읽을 바이트 수
+        term_types (Optional[Iterable[str]]): 읽을 약정 유형 (예: ['OnDemand'], 생략 시 전체)
+                                              나머지 약정 유형은 디코딩하지 않고 건너뜀
+        scanner (Optional[JSONStreamScanner]): 사용할 스캐너 (읽은 바이트 수를 추적할 때 지정)
+
+    Yields:
+        Tuple[str, Any, Any]: 다음 중 하나
+            ('meta', 키, 값): offerCode, version, publicationDate 등 최상위 스칼라 값
+            ('product', sku, 제품 정보): products 섹션의 항목
+            ('term', (약정 유형, sku), 약정 정보): terms 섹션의 항목 (예: ('OnDemand', 'ABC123'))
+    """
+    if scanner is None:
+        scanner = JSONStreamScanner(fp, chunk_size=chunk_size)
+    wanted_terms = set(term_types) if term_types is not None else None
+
+    for key in scanner.iter_object():
+        if key == 'products':
+            for sku in scanner.iter_object():
+                yield 'product', sku, scanner.read_value()
+        elif key == 'terms':
+            for term_type in scanner.iter_object():
+                if wanted_terms is not None and term_type not in wanted_terms:
+                    scanner.skip_value()
+                    continue
+                for sku in scanner.iter_object():
+                    yield 'term', (term_type, sku), scanner.read_value()
+        elif scanner.peek() in ('{', '['):
+            scanner.skip_value()
+        else:
+            yield 'meta', key, scanner.read_value()
+
+
+class OfferStreamStats:
+    """offer 파일 스트리밍 진행 상황과 처리량을 기록하는 클래스"""
+
+    def __init__(self, total_bytes: Optional[int] = None):
+        """
+        OfferStreamStats 초기화
+
+        Args:
+            total_bytes (Optional[int]): 전체 파일 크기 (알 수 없으면 None)
+        """
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.products = 0
+        self.terms = 0
+        self.batches = 0
+        self.started_at = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def records(self) -> int:
+        """지금까지 반환한 레코드 수 (제품 + 약정)"""
+        return self.products + self.terms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        진행 상황을 딕셔너리로 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 레코드 수, 읽은 바이트 수, 진행률, 초당 레코드/바이트 처리량
+        """
+        elapsed = self.elapsed or 1e-9
+        return {
+            'products': self.products,
+            'terms': self.terms,
+            'records': self.records,
+            'batches': self.batches,
+            'bytesRead': self.bytes_read,
+            'totalBytes': self.total_bytes,
+            'progress': (self.bytes_read / self.total_bytes) if self.total_bytes else None,
+            'seconds': self.elapsed,
+            'recordsPerSecond': self.records / elapsed,
+            'bytesPerSecond': self.bytes_read / elapsed
+        }
+
+
+class OfferStreamReader:
+    """
+    offer 파일을 스트리밍으로 읽어 제품 레코드를 배치 단위로 반환하는 클래스
+
+    offer 파일은 products 섹션 다음에 terms 섹션이 오므로, 한 SKU의 제품 정보와 약정 정보는
+    서로 다른 배치에 담깁니다. 각 레코드는 AWSPricingClient.get_products가 반환하는 제품과
+    같은 형식이며, 같은 SKU의 레코드를 merge_product_records로 합치면 완전한 제품이 됩니다.
+        제품 레코드: {'product': {...}, 'serviceCode', 'terms': {}, 'version', 'publicationDate'}
+        약정 레코드: {'product': {'sku': sku}, 'serviceCode', 'terms': {'OnDemand': {...}}}
+    """
+
+    DEFAULT_TERM_TYPES = ('OnDemand', 'Reserved')
+
+    def __init__(self,
+                 fp: BinaryIO,
+                 batch_size: int = 1000,
+                 term_types: Optional[Iterable[str]] = DEFAULT_TERM_TYPES,
+                 chunk_size: int = 1 << 16,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 progress_interval: float = 5.0):
+        """
+        OfferStreamReader 초기화
+
+        Args:
+            fp (BinaryIO): 바이너리 모드로 열린 offer 파일 객체
+            batch_size (int): 배치당 최대 레코드 수 (메모리 사용량 상한)
+            term_types (Optional[Iterable[str]]): 읽을 약정 유형 (None이면 전체)
+            chunk_size (int): 한 번에 읽을 바이트 수
+            progress_callback (Optional[Callable]): 진행 상황(OfferStreamStats.to_dict)을 받을 함수
+            progress_interval (float): progress_callback 호출 간격 (초)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.fp = fp
+        self.batch_size = batch_size
+        self.term_types = term_types
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.meta: Dict[str, Any] = {}
+        self.stats = OfferStreamStats(_file_size(fp))
+        self._scanner = JSONStreamScanner(fp, chunk_size=chunk_size)
+        self._last_progress_at = self.stats.started_at
+
+    @property
+    def service_code(self) -> Optional[str]:
+        """offer 파일의 서비스 코드 (offerCode)"""
+        return self.meta.get('offerCode')
+
+    def _update_stats(self, force: bool = False) -> None:
+        now = time.monotonic()
+        self.stats.bytes_read = self._scanner.bytes_read
+        self.stats.elapsed = now - self.stats.started_at
+        if self.progress_callback and (force or now - self._last_progress_at >= self.progress_interval):
+            self._last_progress_at = now
+            self.progress_callback(self.stats.to_dict())
+
+    def iter_batches(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        제품 레코드를 배치 단위로 반환합니다.
+
+        Yields:
+            Tuple[str, List[Dict[str, Any]]]: ('products' 또는 'terms', 레코드 목록)
+        """
+        batch: List[Dict[str, Any]] = []
+        batch_kind = None
+
+        for kind, key, value in iter_offer_entries(self.fp, term_types=self.term_types,
+                                                   scanner=self._scanner):
+            if kind == 'meta':
+                self.meta[key] = value
+                continue
+
+            record_kind = 'products' if kind == 'product' else 'terms'
+            if batch and (record_kind != batch_kind or len(batch) >= self.batch_size):
+                yield self._emit(batch_kind, batch)
+                batch = []
+            batch_kind = record_kind
+
+            if kind == 'product':
+                batch.append({
+                    'product': value,
+                    'serviceCode': self.service_code,
+                    'terms': {},
+                    'version': self.meta.get('version'),
+                    'publicationDate': self.meta.get('publicationDate')
+                })
+                self.stats.products += 1
+            else:
+                term_type, sku = key
+                batch.append({
+                    'product': {'sku': sku},
+                    'serviceCode': self.service_code,
+                    'terms': {term_type: value}
+                })
+                self.stats.terms += 1
+
+        if batch:
+            yield self._emit(batch_kind, batch)
+        self._update_stats(force=True)
+
+    def _emit(self, kind: str, batch: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+        self.stats.batches += 1
+        self._update_stats()
+        return kind, batch
+
+
+def merge_product_records(product_record: Dict[str, Any], term_record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    같은 SKU의 제품 레코드에 약정 레코드를 합칩니다.
+
+    Args:
+        product_record (Dict[str, Any]): OfferStreamReader의 제품 레코드 (직접 수정됨)
+        term_record (Dict[str, Any]): OfferStreamReader의 약정 레코드
+
+    Returns:
+        Dict[str, Any]: 약정 정보가 합쳐진 제품 레코드
+    """
+    product_record.setdefault('terms', {}).update(term_record.get('terms', {}))
+    return product_record
+
+
+def _file_size(fp: BinaryIO) -> Optional[int]:
+    """파일 객체의 전체 크기를 반환합니다 (알 수 없으면 None)."""
+    try:
+        return os.fstat(fp.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        getbuffer = getattr(fp, 'getbuffer', None)
+        return getbuffer().nbytes if getbuffer else None
@@ -0,0 +1,355 @@
+"""
+Persistent Catalog Cache
+
+서비스 목록, 속성, 속성 값 카탈로그를 SQLite 파일에 저장하여
+프로세스 재시작 후에도 유지하고, 같은 노드의 모든 워커 프로세스가 공유하는 캐시 모듈입니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_cache (
+    cache_key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    service_code TEXT NOT NULL,
+    value_json TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    refresh_lease REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    service_code TEXT PRIMARY KEY,
+    publication_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_catalog_cache_service ON catalog_cache (service_code);
+"""
+
+# 기본적으로 영속 캐시에 저장할 메서드 (카탈로그 조회)
+CATALOG_METHODS = ('get_services', 'get_service_attributes', 'get_attribute_values')
+
+# 다른 프로세스가 새로고침 중인 항목을 다시 새로고침하지 않을 시간 (초)
+REFRESH_LEASE_SECONDS = 60
+
+
+class PersistentCatalogCache:
+    """
+    SQLite 기반의 프로세스 간 공유 카탈로그 캐시 클래스
+
+    - 항목은 저장 당시의 카탈로그 버전(게시일)과 함께 저장됩니다.
+    - TTL이 지났거나 서비스의 카탈로그 버전이 바뀐 항목은 오래된(stale) 항목으로 간주합니다.
+    - 오래된 항목은 즉시 반환하고, 새로고침은 백그라운드 스레드에서 실행합니다.
+      여러 프로세스가 같은 항목을 동시에 새로고침하지 않도록 새로고침 임대(lease)를 사용합니다.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 ttl: float = 24 * 60 * 60,
+                 methods: Iterable[str] = CATALOG_METHODS,
+                 on_refresh: Optional[Callable[[Tuple[Hashable, ...], Any], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        PersistentCatalogCache 초기화
+
+        Args:
+            db_path (str): SQLite 데이터베이스 파일 경로
+            ttl (float): 항목을 새로고침할 때까지의 시간 (초)
+            methods (Iterable[str]): 영속 캐시에 저장할 메서드 이름
+            on_refresh (Optional[Callable]): 백그라운드 새로고침이 끝났을 때 (키, 새 값)으로 호출할 함수
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용, 프로세스 간 공유를 위해 벽시계 사용)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.methods = frozenset(methods)
+        self.on_refresh = on_refresh
+        self._clock = clock
+        self._local = threading.local()
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='catalog-refresh')
+        self._stats = {'hits': 0, 'staleHits': 0, 'misses': 0, 'refreshes': 0, 'refreshErrors': 0}
+        self._stats_lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 SQLite 연결을 반환합니다."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    def after_fork(self) -> None:
+        """
+        fork로 만든 자식 프로세스에서 호출합니다 (gunicorn post_fork).
+
+        부모 프로세스의 SQLite 연결과 새로고침 스레드는 자식으로 복제되지 않으므로 새로 만듭니다.
+        """
+        self._local = threading.local()
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='catalog-refresh')
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _serialize_key(key: Tuple[Hashable, ...]) -> str:
+        return json.dumps(key, separators=(',', ':'))
+
+    @staticmethod
+    def _service_code_of(key: Tuple[Hashable, ...]) -> str:
+        return key[1] if len(key) > 1 and isinstance(key[1], str) else ''
+
+    def handles(self, key: Tuple[Hashable, ...]) -> bool:
+        """
+        키가 영속 캐시 대상 메서드의 키인지 확인합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+
+        Returns:
+            bool: 영속 캐시 대상 여부
+        """
+        return key[0] in self.methods
+
+    def get_catalog_version(self, service_code: str) -> str:
+        """
+        서비스의 현재 카탈로그 버전(게시일)을 반환합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (서비스 목록은 빈 문자열)
+
+        Returns:
+            str: 카탈로그 게시일 (알 수 없으면 빈 문자열)
+        """
+        row = self._connection().execute(
+            'SELECT publication_date FROM catalog_versions WHERE service_code = ?', (service_code,)
+        ).fetchone()
+        return row[0] if row else ''
+
+    def note_catalog_version(self, service_code: str, publication_date: Optional[str]) -> bool:
+        """
+        서비스의 카탈로그 게시일을 기록합니다.
+
+        기존보다 새로운 게시일이면 해당 서비스의 캐시 항목은 다음 조회 시 새로고침됩니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            publication_date (Optional[str]): 카탈로그 게시일 (ISO 8601 문자열)
+
+        Returns:
+            bool: 버전이 새로 바뀌었으면 True
+        """
+        if not publication_date:
+            return False
+
+        connection = self._connection()
+        cursor = connection.execute(
+            'INSERT INTO catalog_versions (service_code, publication_date) VALUES (?, ?) '
+            'ON CONFLICT(service_code) DO UPDATE SET publication_date = excluded.publication_date '
+            'WHERE excluded.publication_date > catalog_versions.publication_date',
+            (service_code, publication_date)
+        )
+        connection.commit()
+        return cursor.rowcount > 0
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, bool, Any]:
+        """
+        캐시에서 값을 조회합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+
+        Returns:
+            Tuple[bool, bool, Any]: (존재 여부, 오래된 항목 여부, 값)
+        """
+        row = self._connection().execute(
+            'SELECT value_json, version, fetched_at FROM catalog_cache WHERE cache_key = ?',
+            (self._serialize_key(key),)
+        ).fetchone()
+        if row is None:
+            return False, False, None
+
+        value_json, version, fetched_at = row
+        stale = (
+            self._clock() - fetched_at >= self.ttl
+            or version < self.get_catalog_version(self._service_code_of(key))
+        )
+        return True, stale, json.loads(value_json)
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """
+        캐시에 값을 저장합니다. 현재 카탈로그 버전이 함께 기록됩니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            value (Any): JSON으로 직렬화할 수 있는 값
+        """
+        service_code = self._service_code_of(key)
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO catalog_cache '
+            '(cache_key, method, service_code, value_json, version, fetched_at, refresh_lease) '
+            'VALUES (?, ?, ?, ?, ?, ?, 0)',
+            (
+                self._serialize_key(key), key[0], service_code,
+                json.dumps(value, separators=(',', ':')),
+                self.get_catalog_version(service_code), self._clock()
+            )
+        )
+        connection.commit()
+
+    def touch(self, key: Tuple[Hashable, ...]) -> bool:
+        """
+        값이 바뀌지 않은 항목의 저장 시각과 카탈로그 버전만 갱신합니다 (값은 다시 쓰지 않음).
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+
+        Returns:
+            bool: 항목이 있어 갱신했으면 True
+        """
+        connection = self._connection()
+        cursor = connection.execute(
+            'UPDATE catalog_cache SET version = ?, fetched_at = ? WHERE cache_key = ?',
+            (self.get_catalog_version(self._service_code_of(key)), self._clock(), self._serialize_key(key))
+        )
+        connection.commit()
+        return cursor.rowcount > 0
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """
+        저장된 값이 있으면 반환하고, 없으면 loader를 호출하여 저장한 뒤 반환합니다.
+
+        저장된 값이 오래되었으면 그대로 반환하면서 백그라운드에서 loader로 새로고침합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            loader (Callable[[], Any]): 값을 새로 가져오는 함수
+
+        Returns:
+            Any: 저장된 값 또는 새로 가져온 값
+        """
+        found, stale, value = self.get(key)
+        if found:
+            if stale:
+                self._count('staleHits')
+                self._schedule_refresh(key, loader)
+            else:
+                self._count('hits')
+            return value
+
+        self._count('misses')
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def _acquire_refresh_lease(self, key: Tuple[Hashable, ...]) -> bool:
+        """다른 프로세스가 새로고침 중이 아니면 새로고침 임대를 얻습니다."""
+        now = self._clock()
+        connection = self._connection()
+        cursor = connection.execute(
+            'UPDATE catalog_cache SET refresh_lease = ? WHERE cache_key = ? AND refresh_lease < ?',
+            (now + REFRESH_LEASE_SECONDS, self._serialize_key(key), now)
+        )
+        connection.commit()
+        return cursor.rowcount > 0
+
+    def _schedule_refresh(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> None:
+        """백그라운드 새로고침을 예약합니다 (같은 키는 한 번만)."""
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        if not self._acquire_refresh_lease(key):
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
+            return
+
+        self._executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> None:
+        """loader로 값을 새로 가져와 저장합니다."""
+        try:
+            value = loader()
+            self.set(key, value)
+            self._count('refreshes')
+            if self.on_refresh is not None:
+                self.on_refresh(key, value)
+        except Exception as e:
+            self._count('refreshErrors')
+            print(f"Error refreshing catalog cache for {key}: {e}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
+
+    def wait_for_refreshes(self) -> None:
+        """예약된 백그라운드 새로고침이 모두 끝날 때까지 기다립니다."""
+        self._executor.submit(lambda: None).result()
+
+    def invalidate(self, method: Optional[str] = None, service_code: Optional[str] = None) -> int:
+        """
+        조건에 맞는 캐시 항목을 삭제합니다 (인자를 모두 생략하면 전체 삭제).
+
+        Args:
+            method (Optional[str]): 삭제할 메서드 이름
+            service_code (Optional[str]): 삭제할 서비스 코드
+
+        Returns:
+            int: 삭제된 항목 수
+        """
+        query = 'DELETE FROM catalog_cache WHERE 1 = 1'
+        params = []
+        if method is not None:
+            query += ' AND method = ?'
+            params.append(method)
+        if service_code is not None:
+            query += ' AND service_code = ?'
+            params.append(service_code)
+
+        connection = self._connection()
+        cursor = connection.execute(query, params)
+        connection.commit()
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 적중/오래된 항목 적중/미스/새로고침 횟수와 저장된 항목 수
+        """
+        size = self._connection().execute('SELECT COUNT(*) FROM catalog_cache').fetchone()[0]
+        with self._stats_lock:
+            return {**self._stats, 'size': size, 'refreshing': len(self._refreshing)}
+
+
+def open_persistent_cache_from_env(**kwargs: Any) -> Optional[PersistentCatalogCache]:
+    """
+    환경 변수 PRICING_PERSISTENT_CACHE가 설정되어 있으면 해당 경로의 영속 캐시를 엽니다.
+
+    환경 변수:
+        PRICING_PERSISTENT_CACHE: SQLite 파일 경로
+        PRICING_PERSISTENT_CACHE_TTL: 새로고침 주기 (초, 기본값: 86400)
+
+    Args:
+        **kwargs: PersistentCatalogCache에 전달할 추가 인자
+
+    Returns:
+        Optional[PersistentCatalogCache]: 영속 캐시 (설정되지 않았으면 None)
+    """
+    db_path = os.environ.get('PRICING_PERSISTENT_CACHE')
+    if not db_path:
+        return None
+    ttl = float(os.environ.get('PRICING_PERSISTENT_CACHE_TTL', 24 * 60 * 60))
+    return PersistentCatalogCache(db_path, ttl=ttl, **kwargs)
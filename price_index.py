@@ -0,0 +1,315 @@
+"""
+Price Index
+
+자주 조회되는 (서비스, 리전, 인스턴스 유형, OS, 테넌시) 조합을 해시 맵으로 색인하여
+네트워크 호출과 정렬 없이 가격 정보를 찾을 수 있게 해 주는 모듈입니다.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from product_record import AttributeSchema, CompactProduct
+from term_table import TermTable
+
+
+# 서비스별 색인 키 필드
+INDEX_FIELDS = {
+    'AmazonEC2': ('location', 'instanceType', 'operatingSystem', 'tenancy'),
+    'AmazonRDS': ('location', 'instanceType', 'databaseEngine', 'deploymentOption'),
+}
+
+
+def filter_key(fields: Optional[Tuple[str, ...]], filters: List[Dict[str, str]]) -> Optional[Tuple[str, ...]]:
+    """
+    필터 목록이 색인 키 필드와 정확히 일치하면 키 필드 순서의 값 튜플을 반환합니다.
+
+    Args:
+        fields (Optional[Tuple[str, ...]]): 색인 키 필드 (INDEX_FIELDS 값)
+        filters (List[Dict[str, str]]): 필터 목록
+
+    Returns:
+        Optional[Tuple[str, ...]]: 키 값 튜플 (색인할 수 없는 필터 조합이면 None)
+    """
+    if not fields or len(filters) != len(fields):
+        return None
+
+    values = {}
+    for filter_item in filters:
+        field = filter_item.get('field', '')
+        value = filter_item.get('value', '')
+        if filter_item.get('type', 'TERM_MATCH') != 'TERM_MATCH' or not value or field in values:
+            return None
+        values[field] = value
+
+    if set(values) != set(fields):
+        return None
+    return tuple(values[field] for field in fields)
+
+
+def attribute_key(fields: Optional[Tuple[str, ...]], attributes: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+    """
+    제품 속성에서 키 필드 순서의 값 튜플을 만듭니다.
+
+    Args:
+        fields (Optional[Tuple[str, ...]]): 색인 키 필드 (INDEX_FIELDS 값)
+        attributes (Dict[str, str]): 제품 속성 (product.attributes)
+
+    Returns:
+        Optional[Tuple[str, ...]]: 키 값 튜플 (키 필드가 빠진 제품이면 None)
+    """
+    if not fields:
+        return None
+
+    values = []
+    for field in fields:
+        value = attributes.get(field)
+        if not value:
+            return None
+        values.append(value)
+    return tuple(values)
+
+
+class PriceIndex:
+    """
+    정규화된 속성 튜플에서 가격 레코드(CompactProduct) 목록으로의 해시 맵 색인 클래스
+
+    색인 키에 해당하는 제품을 모두 알고 있는 경우(완전한 버킷)에만 조회 결과를 반환합니다.
+    버킷은 다음 두 가지 경우에 완전한 것으로 표시됩니다.
+        - 색인 키와 정확히 같은 필터로 get_products를 호출한 결과로 채운 경우 (ttl 동안 유효)
+        - 오프라인 저장소 등 서비스 전체 카탈로그로 색인을 만든 경우 (무효화 전까지 유효)
+    """
+
+    def __init__(self,
+                 index_fields: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 ttl: float = 60 * 60,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        PriceIndex 초기화
+
+        Args:
+            index_fields (Optional[Dict[str, Tuple[str, ...]]]): 서비스별 색인 키 필드 (기본값: INDEX_FIELDS)
+            ttl (float): 조회 결과로 채운 버킷이 완전한 것으로 유지되는 시간 (초)
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+        """
+        self.index_fields = dict(index_fields if index_fields is not None else INDEX_FIELDS)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, ...], Dict[str, CompactProduct]] = {}
+        self._schemas: Dict[str, AttributeSchema] = {}
+        self._complete_until: Dict[Tuple[str, ...], float] = {}
+        self._complete_services = set()
+        self._stats = {'hits': 0, 'misses': 0, 'records': 0}
+
+    def key_for_filters(self, service_code: str, filters: List[Dict[str, str]]) -> Optional[Tuple[str, ...]]:
+        """
+        필터 목록이 색인 키 필드와 정확히 일치하면 색인 키를 반환합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록
+
+        Returns:
+            Optional[Tuple[str, ...]]: 색인 키 (색인할 수 없는 필터 조합이면 None)
+        """
+        values = filter_key(self.index_fields.get(service_code), filters)
+        return (service_code,) + values if values is not None else None
+
+    def key_for_attributes(self, service_code: str, attributes: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+        """
+        제품 속성으로 색인 키를 만듭니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            attributes (Dict[str, str]): 제품 속성 (product.attributes)
+
+        Returns:
+            Optional[Tuple[str, ...]]: 색인 키 (키 필드가 빠진 제품이면 None)
+        """
+        values = attribute_key(self.index_fields.get(service_code), attributes)
+        return (service_code,) + values if values is not None else None
+
+    def add(self, service_code: str, sku: str, attributes: Dict[str, str], pricing: Dict[str, Any],
+            terms: Optional[TermTable] = None) -> bool:
+        """
+        가격 레코드 하나를 색인에 추가하거나 같은 SKU의 레코드를 교체합니다.
+
+        Args:
+            service_code (str): 서비스 코드
+            sku (str): 제품 SKU
+            attributes (Dict[str, str]): 제품 속성
+            pricing (Dict[str, Any]): 가격 정보 (PricingCalculator._extract_price_from_product 결과)
+            terms (Optional[TermTable]): 모든 약정의 요금표
+
+        Returns:
+            bool: 색인에 추가되었으면 True
+        """
+        key = self.key_for_attributes(service_code, attributes)
+        if key is None:
+            return False
+
+        with self._lock:
+            schema = self._schemas.setdefault(service_code, AttributeSchema())
+            record = CompactProduct.from_parts(sku, attributes, pricing, schema, terms)
+            bucket = self._buckets.setdefault(key, {})
+            if sku not in bucket:
+                self._stats['records'] += 1
+            bucket[sku] = record
+        return True
+
+    def update(self, service_code: str, sku: str, attributes: Dict[str, str], pricing: Dict[str, Any],
+               terms: Optional[TermTable] = None) -> bool:
+        """
+        이미 색인한 키의 가격 레코드만 추가하거나 교체합니다 (백그라운드 새로고침의 변경분 반영용).
+
+        색인하지 않은 키의 제품은 버킷을 새로 만들지 않고 건너뜁니다.
+
+        Args:
+            service_code (str): 서비스 코드
+            sku (str): 제품 SKU
+            attributes (Dict[str, str]): 제품 속성
+            pricing (Dict[str, Any]): 가격 정보
+            terms (Optional[TermTable]): 모든 약정의 요금표
+
+        Returns:
+            bool: 색인에 반영되었으면 True
+        """
+        key = self.key_for_attributes(service_code, attributes)
+        if key is None:
+            return False
+
+        with self._lock:
+            if key not in self._buckets and service_code not in self._complete_services:
+                return False
+        return self.add(service_code, sku, attributes, pricing, terms)
+
+    def remove(self, service_code: str, sku: str, attributes: Dict[str, str]) -> bool:
+        """
+        가격 레코드 하나를 색인에서 제거합니다.
+
+        Args:
+            service_code (str): 서비스 코드
+            sku (str): 제품 SKU
+            attributes (Dict[str, str]): 색인할 때 사용한 제품 속성
+
+        Returns:
+            bool: 제거된 레코드가 있으면 True
+        """
+        key = self.key_for_attributes(service_code, attributes)
+        if key is None:
+            return False
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.pop(sku, None) is None:
+                return False
+            self._stats['records'] -= 1
+        return True
+
+    def mark_complete(self, key: Tuple[str, ...]) -> None:
+        """
+        버킷이 해당 키의 모든 제품을 담고 있다고 표시합니다 (ttl 동안 유효).
+
+        Args:
+            key (Tuple[str, ...]): 색인 키
+        """
+        with self._lock:
+            self._buckets.setdefault(key, {})
+            self._complete_until[key] = self._clock() + self.ttl
+
+    def mark_service_complete(self, service_code: str) -> None:
+        """
+        서비스 전체 카탈로그가 색인되었다고 표시합니다.
+
+        이후 색인에 없는 키는 해당 제품이 없는 것으로 간주합니다.
+
+        Args:
+            service_code (str): 서비스 코드
+        """
+        with self._lock:
+            self._complete_services.add(service_code)
+
+    def lookup(self, service_code: str, filters: List[Dict[str, str]]) -> Optional[List[CompactProduct]]:
+        """
+        필터 조건에 해당하는 가격 레코드 목록을 조회합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록
+
+        Returns:
+            Optional[List[CompactProduct]]: 가격 레코드 목록 (색인으로 답할 수 없으면 None)
+        """
+        key = self.key_for_filters(service_code, filters)
+        if key is None:
+            return None
+
+        with self._lock:
+            complete = (
+                service_code in self._complete_services
+                or self._complete_until.get(key, 0) > self._clock()
+            )
+            if not complete:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            return list(self._buckets.get(key, {}).values())
+
+    def invalidate(self, service_code: Optional[str] = None) -> None:
+        """
+        색인을 비웁니다.
+
+        Args:
+            service_code (Optional[str]): 비울 서비스 코드 (생략 시 전체)
+        """
+        with self._lock:
+            if service_code is None:
+                self._buckets.clear()
+                self._complete_until.clear()
+                self._complete_services.clear()
+                self._stats['records'] = 0
+                return
+
+            for key in [key for key in self._buckets if key[0] == service_code]:
+                self._stats['records'] -= len(self._buckets.pop(key))
+                self._complete_until.pop(key, None)
+            self._complete_services.discard(service_code)
+
+    def on_cache_invalidated(self, method: Optional[str] = None, service_code: Optional[str] = None) -> None:
+        """
+        AWSPricingClient.invalidate_cache에서 호출되어, 제품 조회 캐시가 무효화되면 색인도 비웁니다.
+
+        Args:
+            method (Optional[str]): 무효화된 메서드 이름 (get_products 또는 None일 때만 색인을 비움)
+            service_code (Optional[str]): 무효화된 서비스 코드 (생략 시 전체)
+        """
+        if method in (None, 'get_products'):
+            self.invalidate(service_code)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        색인 통계를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 적중/미스 횟수, 버킷 수, 레코드 수
+        """
+        with self._lock:
+            return {**self._stats, 'buckets': len(self._buckets)}
+
+
+def create_price_index_from_env() -> Optional[PriceIndex]:
+    """
+    환경 변수 설정을 기반으로 가격 색인을 생성합니다.
+
+    환경 변수:
+        PRICING_PRICE_INDEX_ENABLED: 'false'이면 색인 사용 안 함 (기본값: true)
+        PRICING_CACHE_TTL_GET_PRODUCTS: 조회 결과로 채운 버킷의 유효 시간 (초, 기본값: 3600)
+
+    Returns:
+        Optional[PriceIndex]: 가격 색인 (비활성화된 경우 None)
+    """
+    if os.environ.get('PRICING_PRICE_INDEX_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    return PriceIndex(ttl=float(os.environ.get('PRICING_CACHE_TTL_GET_PRODUCTS', 60 * 60)))
@@ -0,0 +1,370 @@
+"""
+Pricing Cache
+
+AWSPricingClient 조회 결과를 메모리에 보관하는 TTL + LRU 캐시 모듈입니다.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# 메서드별 기본 TTL (초). 가격 카탈로그는 하루에 몇 번만 변경됩니다.
+DEFAULT_TTLS = {
+    'get_services': 6 * 60 * 60,
+    'get_service_attributes': 6 * 60 * 60,
+    'get_attribute_values': 6 * 60 * 60,
+    'get_products': 60 * 60,
+}
+
+
+def normalize_filters(filters: List[Dict[str, str]]) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    필터 목록을 순서와 무관한 정규화된 튜플로 변환합니다.
+
+    Args:
+        filters (List[Dict[str, str]]): 필터 목록
+
+    Returns:
+        Tuple[Tuple[str, str, str], ...]: (type, field, value) 튜플을 정렬한 결과
+    """
+    return tuple(sorted(
+        (
+            filter_item.get('type', 'TERM_MATCH'),
+            filter_item.get('field', ''),
+            filter_item.get('value', '')
+        )
+        for filter_item in filters or []
+    ))
+
+
+def make_cache_key(method: str, *args: Any) -> Tuple[Hashable, ...]:
+    """
+    메서드 이름과 인자로 캐시 키를 생성합니다.
+
+    리스트 인자는 필터 목록으로 간주하여 순서와 무관하게 정규화합니다.
+
+    Args:
+        method (str): AWSPricingClient 메서드 이름 (예: get_products)
+        *args: 메서드 인자
+
+    Returns:
+        Tuple[Hashable, ...]: 캐시 키 (첫 번째 요소는 메서드 이름, 두 번째 요소는 서비스 코드)
+    """
+    return (method,) + tuple(
+        normalize_filters(arg) if isinstance(arg, list) else arg
+        for arg in args
+    )
+
+
+class PricingCache:
+    """메서드별 TTL과 최대 크기를 가지는 스레드 안전한 LRU 캐시 클래스"""
+
+    def __init__(self,
+                 max_size: int = 1024,
+                 ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 60 * 60,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        PricingCache 초기화
+
+        Args:
+            max_size (int): 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttls (Optional[Dict[str, float]]): 메서드별 TTL (초). 지정하지 않은 메서드는 DEFAULT_TTLS를 사용
+            default_ttl (float): DEFAULT_TTLS에도 없는 메서드의 TTL (초)
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self._clock = clock
+        # 항목: (만료 시각, 저장 시각, 값)
+        self._entries: 'OrderedDict[Hashable, Tuple[float, float, Any]]' = OrderedDict()
+        # 마지막 take_used 호출 이후 조회(적중)되거나 저장된 키
+        self._used: set = set()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        self._method_stats: Dict[str, Dict[str, int]] = {}
+
+    def _ttl_for(self, method: str) -> float:
+        return self.ttls.get(method, self.default_ttl)
+
+    def _count(self, method: str, name: str) -> None:
+        self._stats[name] += 1
+        method_stats = self._method_stats.setdefault(method, {'hits': 0, 'misses': 0})
+        if name in method_stats:
+            method_stats[name] += 1
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        """
+        캐시에서 값을 조회합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+
+        Returns:
+            Tuple[bool, Any]: (적중 여부, 값)
+        """
+        method = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._used.add(key)
+                    self._count(method, 'hits')
+                    return True, value
+                # 만료된 항목 제거
+                del self._entries[key]
+                self._used.discard(key)
+                self._stats['expirations'] += 1
+            self._count(method, 'misses')
+            return False, None
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """
+        캐시에 값을 저장합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            value (Any): 저장할 값
+        """
+        ttl = self._ttl_for(key[0])
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (now + ttl, now, value)
+            self._entries.move_to_end(key)
+            self._used.add(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._used.discard(evicted)
+                self._stats['evictions'] += 1
+
+    def refresh(self, key: Tuple[Hashable, ...], value: Any) -> bool:
+        """
+        아직 캐시에 있는 항목의 값을 교체하고 만료 시각을 연장합니다.
+
+        백그라운드 새로고침용으로, 최근 사용 순서는 바꾸지 않으므로
+        더 이상 조회되지 않는 항목은 평소처럼 LRU 순서에 따라 제거됩니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            value (Any): 새 값
+
+        Returns:
+            bool: 항목이 있어 교체했으면 True (이미 제거되었거나 만료되었으면 False)
+        """
+        ttl = self._ttl_for(key[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self._clock()
+            if entry is None or entry[0] <= now:
+                return False
+            self._entries[key] = (now + ttl, now, value)
+            return True
+
+    def items(self, method: Optional[str] = None) -> List[Tuple[Tuple[Hashable, ...], Any]]:
+        """
+        만료되지 않은 항목의 (키, 값) 목록을 반환합니다 (적중 통계와 사용 순서는 바꾸지 않음).
+
+        Args:
+            method (Optional[str]): 조회할 메서드 이름 (생략 시 전체)
+
+        Returns:
+            List[Tuple[Tuple[Hashable, ...], Any]]: (캐시 키, 값) 목록
+        """
+        with self._lock:
+            now = self._clock()
+            return [
+                (key, value)
+                for key, (expires_at, _, value) in self._entries.items()
+                if expires_at > now and (method is None or key[0] == method)
+            ]
+
+    def take_used(self, method: Optional[str] = None) -> List[Tuple[Tuple[Hashable, ...], Any]]:
+        """
+        마지막 호출 이후 조회(적중)되거나 저장된 만료되지 않은 항목의 (키, 값) 목록을 반환하고 표시를 지웁니다.
+
+        백그라운드 새로고침이 실제로 쓰이는 항목만 다시 조회하도록 사용하며,
+        refresh는 사용 표시를 남기지 않으므로 더 이상 조회되지 않는 항목은 TTL이 지나면 만료됩니다.
+
+        Args:
+            method (Optional[str]): 조회할 메서드 이름 (생략 시 전체)
+
+        Returns:
+            List[Tuple[Tuple[Hashable, ...], Any]]: (캐시 키, 값) 목록
+        """
+        with self._lock:
+            now = self._clock()
+            keys = [key for key in self._used if method is None or key[0] == method]
+            self._used.difference_update(keys)
+            result = []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    result.append((key, entry[2]))
+            return result
+
+    def age(self, key: Tuple[Hashable, ...]) -> Optional[float]:
+        """
+        항목이 저장(또는 새로고침)된 뒤 지난 시간을 반환합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+
+        Returns:
+            Optional[float]: 경과 시간 (초, 항목이 없으면 None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return self._clock() - entry[1] if entry is not None else None
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """
+        캐시에 값이 있으면 반환하고, 없으면 loader를 호출하여 저장한 뒤 반환합니다.
+
+        loader 실행 중에는 잠금을 잡지 않으므로 느린 AWS 호출이 다른 조회를 막지 않습니다.
+        loader에서 발생한 예외는 캐시하지 않고 그대로 전파합니다.
+
+        Args:
+            key (Tuple[Hashable, ...]): make_cache_key로 생성한 캐시 키
+            loader (Callable[[], Any]): 캐시 미스 시 값을 가져오는 함수
+
+        Returns:
+            Any: 캐시된 값 또는 새로 가져온 값
+        """
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, method: Optional[str] = None, service_code: Optional[str] = None) -> int:
+        """
+        조건에 맞는 캐시 항목을 무효화합니다.
+
+        인자를 모두 생략하면 전체 캐시를 비웁니다.
+
+        Args:
+            method (Optional[str]): 무효화할 메서드 이름 (예: get_products)
+            service_code (Optional[str]): 무효화할 서비스 코드 (예: AmazonEC2)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        with self._lock:
+            if method is None and service_code is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._used.clear()
+                return removed
+
+            keys = [
+                key for key in self._entries
+                if (method is None or key[0] == method)
+                and (service_code is None or (len(key) > 1 and key[1] == service_code))
+            ]
+            for key in keys:
+                del self._entries[key]
+                self._used.discard(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """캐시 항목과 통계를 모두 초기화합니다."""
+        with self._lock:
+            self._entries.clear()
+            self._used.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+            self._method_stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 적중/미스/제거 횟수, 현재 크기, 메서드별 통계
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'maxSize': self.max_size,
+                'methods': {method: dict(counts) for method, counts in self._method_stats.items()}
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NullCache:
+    """캐시를 사용하지 않을 때 PricingCache 대신 사용하는 클래스 (항상 loader 호출)"""
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        return False, None
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        return loader()
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        pass
+
+    def refresh(self, key: Tuple[Hashable, ...], value: Any) -> bool:
+        return False
+
+    def items(self, method: Optional[str] = None) -> List[Tuple[Tuple[Hashable, ...], Any]]:
+        return []
+
+    def take_used(self, method: Optional[str] = None) -> List[Tuple[Tuple[Hashable, ...], Any]]:
+        return []
+
+    def age(self, key: Tuple[Hashable, ...]) -> Optional[float]:
+        return None
+
+    def invalidate(self, method: Optional[str] = None, service_code: Optional[str] = None) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': False}
+
+
+def create_cache_from_env() -> Any:
+    """
+    환경 변수 설정을 기반으로 캐시를 생성합니다.
+
+    환경 변수:
+        PRICING_CACHE_ENABLED: 'false'이면 캐시 비활성화 (기본값: true)
+        PRICING_CACHE_MAX_SIZE: 최대 항목 수 (기본값: 1024)
+        PRICING_CACHE_TTL_<METHOD>: 메서드별 TTL (초, 예: PRICING_CACHE_TTL_GET_PRODUCTS=600)
+
+    Returns:
+        Any: PricingCache 또는 NullCache 인스턴스
+    """
+    if os.environ.get('PRICING_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return NullCache()
+
+    ttls = {}
+    for method in DEFAULT_TTLS:
+        value = os.environ.get(f'PRICING_CACHE_TTL_{method.upper()}')
+        if value is not None:
+            ttls[method] = float(value)
+
+    return PricingCache(
+        max_size=int(os.environ.get('PRICING_CACHE_MAX_SIZE', 1024)),
+        ttls=ttls
+    )
@@ -0,0 +1,174 @@
+"""
+Product Record
+
+가격 색인과 캐시에 보관하는 제품 정보를 작은 메모리로 표현하는 모듈입니다.
+
+AWS Pricing API의 제품 정보는 terms, product.attributes 등 중첩된 딕셔너리로 되어 있어
+제품 하나에 수 KB를 차지합니다. CompactProduct는 필요한 값만 __slots__ 필드에 담고,
+속성은 서비스별로 공유하는 키 목록(AttributeSchema)과 값 튜플로 저장하며,
+반복되는 문자열은 intern하여 같은 객체를 공유합니다.
+응답을 만들 때만 attributes / pricing 속성으로 원래 딕셔너리 형태로 펼칩니다.
+예약 인스턴스 등 모든 약정의 요금은 TermTable(약정마다 튜플 하나)로 함께 보관합니다.
+"""
+
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from term_table import TermTable
+
+
+class AttributeSchema:
+    """서비스별 속성 키 목록 (속성 이름 → 값 튜플의 위치)"""
+
+    __slots__ = ('keys', '_positions', '_lock')
+
+    def __init__(self):
+        """AttributeSchema 초기화"""
+        self.keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _position(self, key: str) -> int:
+        position = self._positions.get(key)
+        if position is None:
+            with self._lock:
+                position = self._positions.get(key)
+                if position is None:
+                    position = len(self.keys)
+                    self.keys.append(sys.intern(key))
+                    self._positions[self.keys[position]] = position
+        return position
+
+    def encode(self, attributes: Dict[str, str]) -> Tuple[Optional[str], ...]:
+        """
+        속성 딕셔너리를 값 튜플로 변환합니다. 처음 보는 속성 이름은 키 목록에 추가됩니다.
+
+        Args:
+            attributes (Dict[str, str]): 제품 속성
+
+        Returns:
+            Tuple[Optional[str], ...]: 키 목록 순서의 값 튜플 (없는 속성은 None)
+        """
+        positions = [(self._position(key), value) for key, value in attributes.items()]
+        values: List[Optional[str]] = [None] * (max(position for position, _ in positions) + 1 if positions else 0)
+        for position, value in positions:
+            values[position] = sys.intern(value) if isinstance(value, str) else value
+        return tuple(values)
+
+    def decode(self, values: Tuple[Optional[str], ...]) -> Dict[str, str]:
+        """
+        값 튜플을 속성 딕셔너리로 변환합니다.
+
+        Args:
+            values (Tuple[Optional[str], ...]): encode로 만든 값 튜플
+
+        Returns:
+            Dict[str, str]: 제품 속성
+        """
+        return {key: value for key, value in zip(self.keys, values) if value is not None}
+
+    def get(self, values: Tuple[Optional[str], ...], key: str) -> Optional[str]:
+        """
+        값 튜플에서 속성 하나를 꺼냅니다 (딕셔너리로 펼치지 않음).
+
+        Args:
+            values (Tuple[Optional[str], ...]): encode로 만든 값 튜플
+            key (str): 속성 이름
+
+        Returns:
+            Optional[str]: 속성 값 (없으면 None)
+        """
+        position = self._positions.get(key)
+        if position is None or position >= len(values):
+            return None
+        return values[position]
+
+
+class CompactProduct:
+    """가격 계산에 필요한 값만 담은 제품 레코드"""
+
+    __slots__ = ('sku', 'schema', 'values', 'price_per_unit', 'unit', 'description', 'tiers', 'terms')
+
+    def __init__(self,
+                 sku: str,
+                 schema: AttributeSchema,
+                 values: Tuple[Optional[str], ...],
+                 price_per_unit: float,
+                 unit: str,
+                 description: str,
+                 terms: Optional[TermTable] = None,
+                 tiers: Optional[Tuple[Tuple[float, Optional[float], float], ...]] = None):
+        self.sku = sku
+        self.schema = schema
+        self.values = values
+        self.price_per_unit = price_per_unit
+        self.unit = unit
+        self.description = description
+        self.terms = terms
+        self.tiers = tiers
+
+    @classmethod
+    def from_parts(cls, sku: str, attributes: Dict[str, str], pricing: Dict[str, Any],
+                   schema: AttributeSchema, terms: Optional[TermTable] = None) -> 'CompactProduct':
+        """
+        제품 속성과 가격 정보로 레코드를 만듭니다.
+
+        Args:
+            sku (str): 제품 SKU
+            attributes (Dict[str, str]): 제품 속성 (product.attributes)
+            pricing (Dict[str, Any]): 가격 정보 (PricingCalculator._extract_price_from_product 결과)
+            schema (AttributeSchema): 서비스별 속성 키 목록
+            terms (Optional[TermTable]): 모든 약정의 요금표 (TermTable.from_product 결과)
+
+        Returns:
+            CompactProduct: 제품 레코드
+        """
+        return cls(
+            sku,
+            schema,
+            schema.encode(attributes),
+            float(pricing.get('pricePerUnit', 0)),
+            sys.intern(pricing.get('unit', '')),
+            pricing.get('description', ''),
+            terms,
+            # 구간별 가격은 (beginRange, endRange, pricePerUnit) 튜플로 보관
+            tuple(
+                (tier['beginRange'], tier['endRange'], tier['pricePerUnit']) for tier in pricing['tiers']
+            ) if pricing.get('tiers') else None
+        )
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """제품 속성 딕셔너리 (호출할 때마다 새로 만듦)"""
+        return self.schema.decode(self.values)
+
+    def get_attribute(self, key: str) -> Optional[str]:
+        """
+        속성 하나를 딕셔너리로 펼치지 않고 조회합니다.
+
+        Args:
+            key (str): 속성 이름
+
+        Returns:
+            Optional[str]: 속성 값 (없으면 None)
+        """
+        return self.schema.get(self.values, key)
+
+    @property
+    def pricing(self) -> Dict[str, Any]:
+        """가격 정보 딕셔너리 (_extract_price_from_product와 같은 형식)"""
+        pricing = {
+            'currency': 'USD',
+            'pricePerUnit': self.price_per_unit,
+            'unit': self.unit,
+            'description': self.description
+        }
+        if self.tiers:
+            pricing['tiers'] = [
+                {'beginRange': begin, 'endRange': end, 'pricePerUnit': price} for begin, end, price in self.tiers
+            ]
+        return pricing
+
+    def __repr__(self) -> str:
+        return f"CompactProduct(sku={self.sku!r}, pricePerUnit={self.price_per_unit!r}, unit={self.unit!r})"
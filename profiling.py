@@ -0,0 +1,245 @@
+"""
+Profiling
+
+느린 요청을 운영 환경에서 그대로 재현하여 원인을 찾기 위한 요청 단위 프로파일링 모듈입니다.
+
+PRICING_PROFILE_TOKEN이 설정된 경우에만 사용할 수 있으며, 요청에 ?profile=1 (또는 X-Profile: 1) 과
+X-Profile-Token 헤더를 함께 보내면 해당 요청을 cProfile로 실행하고 함수별 소요 시간과
+tracemalloc 메모리 할당 통계를 응답에 포함합니다. 계산기의 스레드 풀에서 실행되는 작업도
+bind_profile로 감싸 같은 결과에 합산합니다. 프로파일링을 요청하지 않은 요청에는
+ContextVar 조회 외의 추가 비용이 없습니다.
+"""
+
+import contextvars
+import cProfile
+import hmac
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROFILE_HEADER = 'X-Profile'
+TOKEN_HEADER = 'X-Profile-Token'
+
+# 할당 통계에 포함할 소스 파일 (이 저장소의 모듈)
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ProfilerBusyError(RuntimeError):
+    """다른 요청을 프로파일링하는 중인 경우 발생하는 예외"""
+
+
+def profile_token() -> Optional[str]:
+    """
+    프로파일링 인증 토큰을 반환합니다.
+
+    환경 변수:
+        PRICING_PROFILE_TOKEN: 프로파일링 요청에 필요한 토큰 (설정하지 않으면 프로파일링 사용 안 함)
+    """
+    return os.environ.get('PRICING_PROFILE_TOKEN') or None
+
+
+def profile_requested(query_value: Optional[str], header_value: Optional[str]) -> bool:
+    """
+    요청이 프로파일링을 요청했는지 반환합니다.
+
+    Args:
+        query_value (Optional[str]): profile 쿼리 매개변수 값
+        header_value (Optional[str]): X-Profile 헤더 값
+
+    Returns:
+        bool: 두 값 중 하나가 '1', 'true', 'yes'이면 True
+    """
+    return any(value is not None and value.lower() in ('1', 'true', 'yes') for value in (query_value, header_value))
+
+
+def authorize(token: Optional[str]) -> Optional[str]:
+    """
+    프로파일링 요청의 토큰을 확인합니다.
+
+    Args:
+        token (Optional[str]): X-Profile-Token 헤더 값
+
+    Returns:
+        Optional[str]: 거부 사유 (허용하면 None)
+    """
+    expected = profile_token()
+    if expected is None:
+        return 'Profiling is not enabled'
+    if token is None or not hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8')):
+        return 'Invalid profiling token'
+    return None
+
+
+class ProfileSession:
+    """요청 하나를 실행하는 동안 스레드별 프로파일러를 모으는 클래스"""
+
+    def __init__(self):
+        self.profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.profilers.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        """모든 스레드의 프로파일 결과를 합친 통계를 반환합니다."""
+        with self._lock:
+            profilers = list(self.profilers)
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+
+_current_session: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    'pricing_profile_session', default=None
+)
+
+# tracemalloc과 프로파일러는 프로세스 전역이므로 한 번에 한 요청만 프로파일링
+_profile_lock = threading.Lock()
+
+
+def bind_profile(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    프로파일링 중인 요청에서 스레드 풀에 제출하는 함수를 같은 세션에서 프로파일링되도록 감쌉니다.
+
+    Args:
+        func (Callable[..., Any]): 실행할 함수
+
+    Returns:
+        Callable[..., Any]: 프로파일링 중이 아니면 func 그대로
+    """
+    session = _current_session.get()
+    if session is None:
+        return func
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 프로파일러가 인터프리터 전역인 Python 버전에서는 요청 스레드의 프로파일러가 이미 측정 중
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            session.add(profiler)
+    return run
+
+
+def _function_stats(stats: pstats.Stats, limit: int) -> List[Dict[str, Any]]:
+    """누적 시간 상위 함수 목록을 반환합니다."""
+    rows = []
+    for (filename, lineno, name), (primitive_calls, calls, total_time, cumulative_time, _) in stats.stats.items():
+        rows.append({
+            'function': f'{os.path.basename(filename)}:{lineno}({name})' if lineno else name,
+            'calls': calls,
+            'primitiveCalls': primitive_calls,
+            'totalTimeMs': round(total_time * 1000, 3),
+            'cumulativeTimeMs': round(cumulative_time * 1000, 3)
+        })
+    rows.sort(key=lambda row: row['cumulativeTimeMs'], reverse=True)
+    return rows[:limit]
+
+
+def _allocation_stats(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """
+    할당을 호출 스택에서 가장 안쪽에 있는 이 저장소의 소스 줄로 묶어 반환합니다.
+
+    json.loads처럼 표준 라이브러리 안에서 일어난 할당도 이를 호출한 저장소 코드 줄로 집계됩니다.
+    """
+    totals: Dict[Tuple[str, int], List[int]] = {}
+    for trace in snapshot.traces:
+        for frame in reversed(trace.traceback):
+            if frame.filename.startswith(SOURCE_DIR):
+                key = (frame.filename, frame.lineno)
+                total = totals.setdefault(key, [0, 0])
+                total[0] += trace.size
+                total[1] += 1
+                break
+    rows = [
+        {'location': f'{os.path.relpath(filename, SOURCE_DIR)}:{lineno}', 'sizeBytes': size, 'count': count}
+        for (filename, lineno), (size, count) in totals.items()
+    ]
+    rows.sort(key=lambda row: row['sizeBytes'], reverse=True)
+    return rows[:limit]
+
+
+def profile_call(func: Callable[..., Any], *args: Any, name: str = 'request',
+                 limit: Optional[int] = None, **kwargs: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    함수를 cProfile과 tracemalloc으로 측정하며 실행합니다.
+
+    환경 변수:
+        PRICING_PROFILE_TOP: 보고할 함수와 할당 위치 수 (기본값: 30)
+        PRICING_PROFILE_FRAMES: tracemalloc이 기록할 호출 스택 깊이 (기본값: 25)
+        PRICING_PROFILE_DIR: 설정하면 합친 pstats 파일(.prof)을 이 디렉터리에 저장
+
+    Args:
+        func (Callable[..., Any]): 실행할 함수 (예: pricing_calculator.calculate_total_cost)
+        *args: func 인자
+        name (str): 저장할 파일 이름 접두사 (예: calculate)
+        limit (Optional[int]): 보고할 항목 수 (생략 시 PRICING_PROFILE_TOP)
+        **kwargs: func 키워드 인자
+
+    Returns:
+        Tuple[Any, Dict[str, Any]]: (func 결과, 프로파일 보고서)
+
+    Raises:
+        ProfilerBusyError: 다른 요청을 프로파일링하는 중인 경우
+    """
+    if limit is None:
+        limit = int(os.environ.get('PRICING_PROFILE_TOP', 30))
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError('Another request is being profiled')
+
+    try:
+        session = ProfileSession()
+        token = _current_session.set(session)
+        # 이미 다른 도구가 tracemalloc을 사용 중이면 그대로 두고 끝난 뒤에도 멈추지 않음
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(int(os.environ.get('PRICING_PROFILE_FRAMES', 25)))
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            result = profiler.runcall(func, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_session.reset(token)
+            session.add(profiler)
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(True, os.path.join(SOURCE_DIR, '*'), all_frames=True)
+            ])
+            if started_tracemalloc:
+                tracemalloc.stop()
+    finally:
+        _profile_lock.release()
+
+    stats = session.stats()
+    report = {
+        'durationMs': round(elapsed * 1000, 3),
+        'threads': len(session.profilers),
+        'functions': _function_stats(stats, limit),
+        'allocations': {
+            'currentBytes': current_bytes,
+            'peakBytes': peak_bytes,
+            'top': _allocation_stats(snapshot, limit)
+        }
+    }
+
+    profile_dir = os.environ.get('PRICING_PROFILE_DIR')
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        filename = f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+        stats.dump_stats(os.path.join(profile_dir, filename))
+        report['profileFile'] = filename
+
+    return result, report
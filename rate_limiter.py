@@ -0,0 +1,353 @@
+"""
+Rate Limiter
+
+AWS Pricing API 호출 속도를 제한하고, 스로틀링과 일시적 오류 발생 시 재시도하는 모듈입니다.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+
+
+# 재시도 대상 스로틀링 오류 코드
+THROTTLING_ERROR_CODES = frozenset([
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'SlowDown',
+])
+
+# 재시도 대상 일시적 서버 오류 코드 (5xx 응답은 코드와 관계없이 재시도)
+TRANSIENT_ERROR_CODES = frozenset([
+    'InternalError',
+    'InternalFailure',
+    'InternalServerError',
+    'ServiceUnavailable',
+    'ServiceUnavailableException',
+    'RequestTimeout',
+    'RequestTimeoutException',
+])
+
+# 호출 중 발생할 수 있는 AWS 오류 (ClientError 외에 연결 끊김, 시간 초과)
+RETRYABLE_EXCEPTIONS = (ClientError, HTTPClientError, BotoConnectionError)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """
+    예외가 AWS 스로틀링 오류인지 확인합니다.
+
+    Args:
+        error (Exception): 확인할 예외
+
+    Returns:
+        bool: 스로틀링 오류 여부
+    """
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    예외가 재시도하면 성공할 수 있는 일시적 오류(5xx 응답, 연결 끊김, 시간 초과)인지 확인합니다.
+
+    Args:
+        error (Exception): 확인할 예외
+
+    Returns:
+        bool: 일시적 오류 여부 (스로틀링 오류는 제외)
+    """
+    if isinstance(error, (HTTPClientError, BotoConnectionError)):
+        return True
+    if not isinstance(error, ClientError) or is_throttling_error(error):
+        return False
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+    return status >= 500 or error.response.get('Error', {}).get('Code') in TRANSIENT_ERROR_CODES
+
+
+class AdaptiveRateLimiter:
+    """
+    토큰 버킷 기반의 적응형 호출 속도 제한기 클래스
+
+    모든 AWSPricingClient 메서드가 하나의 제한기를 공유합니다.
+    스로틀링 오류가 발생하면 허용 속도를 줄이고(곱셈 감소), 성공하면 천천히 늘려(덧셈 증가)
+    AWS 할당량 근처에서 처리량을 유지합니다.
+    botocore 자체 재시도는 끄므로 5xx 응답, 연결 끊김, 시간 초과 같은 일시적 오류도
+    허용 속도를 줄이지 않고 백오프 후 재시도합니다.
+    """
+
+    def __init__(self,
+                 rate: float = 10.0,
+                 burst: Optional[float] = None,
+                 min_rate: float = 0.5,
+                 max_retries: int = 5,
+                 max_transient_retries: int = 2,
+                 base_delay: float = 0.1,
+                 max_delay: float = 10.0,
+                 decrease_factor: float = 0.5,
+                 increase_step: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        AdaptiveRateLimiter 초기화
+
+        Args:
+            rate (float): 초당 최대 호출 수 (스로틀링이 없을 때의 상한)
+            burst (Optional[float]): 버킷 크기 (순간 최대 호출 수, 기본값: rate)
+            min_rate (float): 스로틀링 시 줄어들 수 있는 최소 초당 호출 수
+            max_retries (int): 스로틀링 오류 시 최대 재시도 횟수
+            max_transient_retries (int): 일시적 오류 시 최대 재시도 횟수 (botocore standard 모드와 같은 2회)
+            base_delay (float): 지수 백오프 기본 대기 시간 (초)
+            max_delay (float): 지수 백오프 최대 대기 시간 (초)
+            decrease_factor (float): 스로틀링 시 허용 속도에 곱할 값
+            increase_step (Optional[float]): 성공 시 허용 속도에 더할 값 (기본값: rate의 5%)
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+            sleep (Callable[[float], None]): 대기 함수 (테스트용)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst if burst is not None else rate
+        self.max_retries = max_retries
+        self.max_transient_retries = max_transient_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step is not None else rate * 0.05
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = self.burst
+        self._updated_at = clock()
+        self._metrics = {
+            'calls': 0,
+            'retries': 0,
+            'throttles': 0,
+            'transientErrors': 0,
+            'failures': 0,
+            'rateLimitWaitSeconds': 0.0,
+            'backoffWaitSeconds': 0.0,
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+            self._updated_at = now
+
+    def _try_acquire(self) -> float:
+        """
+        토큰이 있으면 하나를 사용합니다.
+
+        Returns:
+            float: 토큰을 얻었으면 0, 아니면 다시 시도하기 전에 기다릴 시간 (초)
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._rate
+
+    def _record_wait(self, waited: float) -> float:
+        with self._lock:
+            self._metrics['rateLimitWaitSeconds'] += waited
+        return waited
+
+    def acquire(self) -> float:
+        """
+        토큰 하나를 얻을 때까지 대기합니다.
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            delay = self._try_acquire()
+            if delay <= 0:
+                return self._record_wait(waited)
+            self._sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """
+        acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            delay = self._try_acquire()
+            if delay <= 0:
+                return self._record_wait(waited)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def _on_throttle(self) -> None:
+        with self._lock:
+            self._metrics['throttles'] += 1
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        재시도 대기 시간을 계산합니다 (full jitter 지수 백오프).
+
+        Args:
+            attempt (int): 재시도 횟수 (0부터 시작)
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self._metrics['calls'] += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        실패한 호출을 재시도할지 결정합니다.
+
+        Args:
+            error (Exception): 호출 중 발생한 오류 (RETRYABLE_EXCEPTIONS 중 하나)
+            attempt (int): 지금까지의 재시도 횟수
+
+        Returns:
+            Optional[float]: 재시도 전 대기 시간 (초, 재시도하지 않으면 None)
+        """
+        if is_throttling_error(error):
+            self._on_throttle()
+            max_retries = self.max_retries
+        elif is_transient_error(error):
+            with self._lock:
+                self._metrics['transientErrors'] += 1
+            max_retries = self.max_transient_retries
+        else:
+            return None
+        if attempt >= max_retries:
+            with self._lock:
+                self._metrics['failures'] += 1
+            return None
+
+        delay = self.backoff_delay(attempt)
+        with self._lock:
+            self._metrics['retries'] += 1
+            self._metrics['backoffWaitSeconds'] += delay
+        return delay
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """
+        속도 제한을 적용하여 func를 호출하고, 스로틀링이나 일시적 오류 시 백오프 후 재시도합니다.
+
+        Args:
+            func (Callable[[], Any]): AWS API 호출 함수
+
+        Returns:
+            Any: func의 반환값
+
+        Raises:
+            ClientError: 재시도 대상이 아닌 오류가 발생했거나 재시도 횟수를 초과한 경우
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            self._count_call()
+            try:
+                result = func()
+            except RETRYABLE_EXCEPTIONS as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                attempt += 1
+                continue
+
+            self._on_success()
+            return result
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        call의 비동기 버전 (동기 호출과 같은 토큰 버킷과 허용 속도를 공유)
+
+        Args:
+            func (Callable[[], Awaitable[Any]]): AWS API 호출 코루틴 함수
+
+        Returns:
+            Any: func의 반환값
+
+        Raises:
+            ClientError: 재시도 대상이 아닌 오류가 발생했거나 재시도 횟수를 초과한 경우
+        """
+        attempt = 0
+        while True:
+            await self.acquire_async()
+            self._count_call()
+            try:
+                result = await func()
+            except RETRYABLE_EXCEPTIONS as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self._on_success()
+            return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        제한기 상태와 누적 지표를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 호출/재시도/스로틀링 횟수, 대기 시간, 현재 토큰 수, 현재 허용 속도
+        """
+        with self._lock:
+            self._refill(self._clock())
+            return {
+                **self._metrics,
+                'currentTokens': self._tokens,
+                'currentRate': self._rate,
+                'maxRate': self.max_rate,
+            }
+
+
+def create_rate_limiter_from_env() -> AdaptiveRateLimiter:
+    """
+    환경 변수 설정을 기반으로 속도 제한기를 생성합니다.
+
+    환경 변수:
+        PRICING_RATE_LIMIT: 초당 최대 호출 수 (기본값: 10)
+        PRICING_RATE_BURST: 순간 최대 호출 수 (기본값: PRICING_RATE_LIMIT)
+        PRICING_MAX_RETRIES: 스로틀링 오류 시 최대 재시도 횟수 (기본값: 5)
+        PRICING_MAX_TRANSIENT_RETRIES: 5xx, 연결 끊김, 시간 초과 시 최대 재시도 횟수 (기본값: 2)
+
+    Returns:
+        AdaptiveRateLimiter: 속도 제한기
+    """
+    rate = float(os.environ.get('PRICING_RATE_LIMIT', 10))
+    burst = os.environ.get('PRICING_RATE_BURST')
+    return AdaptiveRateLimiter(
+        rate=rate,
+        burst=float(burst) if burst else None,
+        max_retries=int(os.environ.get('PRICING_MAX_RETRIES', 5)),
+        max_transient_retries=int(os.environ.get('PRICING_MAX_TRANSIENT_RETRIES', 2))
+    )
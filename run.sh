@@ -1,12 +1,23 @@
 #!/bin/bash
 
 # AWS Pricing API 서버 실행 스크립트
+#
+# 사용법:
+#   ./run.sh        운영 모드 (gunicorn, 설정: gunicorn.conf.py)
+#   ./run.sh dev    개발 모드 (Flask 개발 서버, 디버그/자동 재시작)
 
 # 환경 변수 설정 (필요한 경우)
 # export AWS_ACCESS_KEY_ID=your_access_key
 # export AWS_SECRET_ACCESS_KEY=your_secret_key
 # export AWS_REGION=us-east-1
+# export GUNICORN_WORKERS=4
+# export GUNICORN_THREADS=8
 
 # 서버 실행
-echo "AWS Pricing API 서버를 실행합니다..."
-python3 app_swagger.py
+if [ "$1" = "dev" ]; then
+    echo "AWS Pricing API 서버를 개발 모드로 실행합니다..."
+    python3 app_swagger.py
+else
+    echo "AWS Pricing API 서버를 실행합니다..."
+    exec gunicorn -c gunicorn.conf.py wsgi:app
+fi
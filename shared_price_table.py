@@ -0,0 +1,742 @@
+"""
+Shared Price Table
+
+gunicorn 워커 프로세스가 모두 같은 메모리를 읽는 읽기 전용 가격표 모듈입니다.
+
+워커마다 가격 색인(PriceIndex)을 따로 만들면 메모리가 워커 수만큼 늘어나고 워커마다 따로 데워야 합니다.
+공유 가격표는 로더 프로세스(명령줄 도구 또는 gunicorn 마스터)가 오프라인 저장소의 서비스 전체 카탈로그로
+한 번 만든 열(column) 단위 배열 파일이며, 워커는 이 파일을 mmap으로 읽기 전용 매핑하여
+numpy 배열 뷰로 복사 없이 조회합니다. 파일 페이지는 운영체제 페이지 캐시에 한 번만 올라가므로
+워커가 몇 개든 메모리는 가격표 하나 크기입니다 (/dev/shm에 두면 디스크도 읽지 않음).
+
+    python shared_price_table.py --db pricing_offers.db --out /dev/shm/pricing-price-table.bin AmazonEC2 AmazonRDS
+
+파일 형식 (리틀 엔디언):
+    - 매직 바이트(8) + 헤더 길이(uint64) + 헤더 JSON (서비스별 키 필드, 속성 키, 배열 위치)
+    - 64바이트 단위로 정렬한 배열
+        - 문자열 표: 정렬한 고유 문자열의 UTF-8 바이트와 오프셋 (문자열 코드 = 정렬 순서)
+        - 서비스별 버킷 키(색인 키 필드 값의 문자열 코드, 사전순 정렬)와 버킷별 레코드 범위
+        - 서비스별 레코드 열: SKU, 단위당 가격, 단위, 설명, 속성 값 코드(레코드 x 속성 키), 구간 가격, 약정 행
+
+조회는 필터 값을 문자열 표에서 이진 탐색하여 코드로 바꾸고, 버킷 키를 이진 탐색하여 레코드 범위를 찾습니다.
+응답에 필요한 상위 레코드만 딕셔너리로 펼칩니다.
+
+가격표를 다시 만들면 임시 파일에 쓴 뒤 이름을 바꾸므로(os.replace) 워커는 조회 중인 매핑을 그대로 쓰고,
+check_interval마다 파일이 바뀌었는지 확인하여 새 파일을 다시 매핑합니다.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from price_index import INDEX_FIELDS, attribute_key, filter_key
+from term_table import TermTable
+
+
+MAGIC = b'PRCTABLE'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# 값이 없는 문자열 코드 (속성, 약정의 계약 기간 등)
+MISSING = -1
+
+# 워커마다 디코딩한 문자열을 보관하는 최대 수
+STRING_CACHE_SIZE = 65536
+
+_PREFIX = struct.Struct('<8sQ')
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class PriceTableWriter:
+    """가격 레코드를 모아 공유 가격표 파일을 쓰는 클래스 (로더 프로세스에서 사용)"""
+
+    def __init__(self, index_fields: Optional[Dict[str, Tuple[str, ...]]] = None):
+        """
+        PriceTableWriter 초기화
+
+        Args:
+            index_fields (Optional[Dict[str, Tuple[str, ...]]]): 서비스별 색인 키 필드 (기본값: INDEX_FIELDS)
+        """
+        self.index_fields = dict(index_fields if index_fields is not None else INDEX_FIELDS)
+        # 문자열 → 임시 코드 (쓸 때 정렬 순서로 바꿈)
+        self._strings: Dict[str, int] = {}
+        # 서비스 → 버킷 키(임시 코드 튜플) → SKU → 레코드
+        self._services: Dict[str, Dict[Tuple[int, ...], Dict[str, Tuple[Any, ...]]]] = {}
+        self._attribute_keys: Dict[str, Dict[str, int]] = {}
+
+    def _code(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._strings.get(value)
+        if code is None:
+            code = self._strings[value] = len(self._strings)
+        return code
+
+    def add_service(self, service_code: str) -> None:
+        """
+        서비스를 가격표에 포함합니다 (제품이 하나도 없어도 서비스 전체 카탈로그로 간주).
+
+        Args:
+            service_code (str): 서비스 코드
+
+        Raises:
+            ValueError: 색인 키 필드가 정의되지 않은 서비스인 경우
+        """
+        if service_code not in self.index_fields:
+            raise ValueError(f"No index fields for {service_code}")
+        self._services.setdefault(service_code, {})
+        self._attribute_keys.setdefault(service_code, {})
+
+    def add(self, service_code: str, sku: str, attributes: Dict[str, str], pricing: Dict[str, Any],
+            terms: Optional[TermTable] = None) -> bool:
+        """
+        가격 레코드 하나를 추가하거나 같은 SKU의 레코드를 교체합니다 (PriceIndex.add와 같은 인자).
+
+        Args:
+            service_code (str): 서비스 코드
+            sku (str): 제품 SKU
+            attributes (Dict[str, str]): 제품 속성
+            pricing (Dict[str, Any]): 가격 정보 (PricingCalculator._extract_price_from_product 결과)
+            terms (Optional[TermTable]): 모든 약정의 요금표
+
+        Returns:
+            bool: 추가되었으면 True (키 필드가 빠진 제품이면 False)
+        """
+        values = attribute_key(self.index_fields.get(service_code), attributes)
+        if values is None:
+            return False
+
+        self.add_service(service_code)
+        attribute_keys = self._attribute_keys[service_code]
+        record = (
+            self._code(sku),
+            tuple(
+                (attribute_keys.setdefault(key, len(attribute_keys)), self._code(value))
+                for key, value in attributes.items() if isinstance(value, str)
+            ),
+            float(pricing.get('pricePerUnit', 0)),
+            self._code(pricing.get('unit', '')),
+            self._code(pricing.get('description', '')),
+            tuple(
+                (tier['beginRange'], tier['endRange'], tier['pricePerUnit']) for tier in pricing['tiers']
+            ) if pricing.get('tiers') else (),
+            tuple(
+                (self._code(term_type), self._code(lease), self._code(purchase_option), self._code(offering_class),
+                 self._code(unit), upfront, recurring)
+                for term_type, lease, purchase_option, offering_class, upfront, recurring, unit in terms.rows
+            ) if terms is not None else ()
+        )
+        key = tuple(self._code(value) for value in values)
+        self._services[service_code].setdefault(key, {})[sku] = record
+        return True
+
+    def _service_arrays(self, service_code: str,
+                        remap: np.ndarray) -> Tuple[Dict[str, Any], List[Tuple[str, np.ndarray]]]:
+        """서비스 하나의 헤더 정보와 배열 목록을 만듭니다 (문자열 코드는 정렬 순서로 변환)."""
+        def codes(values: Iterable[int]) -> np.ndarray:
+            array = np.fromiter(values, dtype=np.int64)
+            return np.where(array == MISSING, MISSING, remap[np.maximum(array, 0)]).astype(np.int32)
+
+        fields = self.index_fields[service_code]
+        attribute_keys = self._attribute_keys[service_code]
+        buckets = sorted(
+            (tuple(int(code) for code in remap[list(key)]), bucket)
+            for key, bucket in self._services[service_code].items()
+        )
+        records = [record for _, bucket in buckets for record in bucket.values()]
+        count = len(records)
+
+        bucket_offsets = np.zeros(len(buckets) + 1, dtype=np.int64)
+        np.cumsum([len(bucket) for _, bucket in buckets], out=bucket_offsets[1:])
+
+        attributes = np.full((count, len(attribute_keys)), MISSING, dtype=np.int32)
+        for row, record in enumerate(records):
+            for position, code in record[1]:
+                attributes[row, position] = code
+        attributes[attributes != MISSING] = remap[attributes[attributes != MISSING]]
+
+        tier_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(record[5]) for record in records], out=tier_offsets[1:])
+        tiers = np.array(
+            [[begin, np.nan if end is None else end, price] for record in records for begin, end, price in record[5]],
+            dtype=np.float64
+        ).reshape(-1, 3)
+
+        term_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum([len(record[6]) for record in records], out=term_offsets[1:])
+        term_rows = [row for record in records for row in record[6]]
+        term_codes = codes(code for row in term_rows for code in row[:5]).reshape(-1, 5)
+        term_prices = np.array([row[5:] for row in term_rows], dtype=np.float64).reshape(-1, 2)
+
+        arrays = [
+            ('bucket_keys', np.array([key for key, _ in buckets], dtype=np.int32).reshape(-1, len(fields))),
+            ('bucket_offsets', bucket_offsets),
+            ('sku', codes(record[0] for record in records)),
+            ('price', np.fromiter((record[2] for record in records), dtype=np.float64, count=count)),
+            ('unit', codes(record[3] for record in records)),
+            ('description', codes(record[4] for record in records)),
+            ('attributes', attributes),
+            ('tier_offsets', tier_offsets),
+            ('tiers', tiers),
+            ('term_offsets', term_offsets),
+            ('term_codes', term_codes),
+            ('term_prices', term_prices),
+        ]
+        info = {
+            'indexFields': list(fields),
+            'attributeKeys': list(attribute_keys),
+            'records': count,
+            'buckets': len(buckets)
+        }
+        return info, [(f'{service_code}/{name}', array) for name, array in arrays]
+
+    def write(self, path: str) -> Dict[str, Any]:
+        """
+        가격표 파일을 씁니다. 임시 파일에 쓴 뒤 이름을 바꾸므로 이미 매핑한 워커는 이전 파일을 계속 읽습니다.
+
+        Args:
+            path (str): 가격표 파일 경로 (예: /dev/shm/pricing-price-table.bin)
+
+        Returns:
+            Dict[str, Any]: 서비스별 레코드 수, 파일 크기
+        """
+        strings = sorted(self._strings)
+        remap = np.empty(len(strings), dtype=np.int64)
+        for rank, value in enumerate(strings):
+            remap[self._strings[value]] = rank
+
+        encoded = [value.encode('utf-8') for value in strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+        arrays = [
+            ('strings/offsets', string_offsets),
+            ('strings/data', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+        ]
+        services = {}
+        for service_code in sorted(self._services):
+            services[service_code], service_arrays = self._service_arrays(service_code, remap)
+            arrays += service_arrays
+
+        layout = {}
+        offset = 0
+        for name, array in arrays:
+            layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            offset = _align(offset + array.nbytes)
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'createdAt': time.time(),
+            'strings': len(strings),
+            'services': services,
+            'arrays': layout
+        }).encode('utf-8')
+        data_start = _align(_PREFIX.size + len(header))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_PREFIX.pack(MAGIC, len(header)))
+                f.write(header)
+                for name, array in arrays:
+                    f.seek(data_start + layout[name]['offset'])
+                    f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate(data_start + offset)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return {
+            'services': {service_code: info['records'] for service_code, info in services.items()},
+            'bytes': data_start + offset
+        }
+
+
+class MappedPriceTable:
+    """가격표 파일 하나를 읽기 전용으로 매핑한 클래스 (배열은 모두 매핑한 메모리의 뷰)"""
+
+    def __init__(self, path: str):
+        """
+        MappedPriceTable 초기화
+
+        Args:
+            path (str): 가격표 파일 경로
+
+        Raises:
+            OSError: 파일을 열 수 없는 경우
+            ValueError: 가격표 파일 형식이 아니거나 버전이 다른 경우
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _PREFIX.size:
+            raise ValueError(f"Not a price table file: {path}")
+        magic, header_length = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a price table file: {path}")
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_length])
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported price table version: {header.get('version')}")
+
+        self.path = path
+        self.size = len(self._mmap)
+        self.created_at = header['createdAt']
+        self.services: Dict[str, Dict[str, Any]] = header['services']
+        data_start = _align(_PREFIX.size + header_length)
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            shape = tuple(spec['shape'])
+            count = int(np.prod(shape))
+            if count == 0:
+                self._arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            self._arrays[name] = np.frombuffer(
+                self._mmap, dtype=dtype, count=count, offset=data_start + spec['offset']
+            ).reshape(shape)
+
+        self._string_offsets = self._arrays['strings/offsets']
+        self._string_base = data_start + header['arrays']['strings/data']['offset']
+        self._string_count = header['strings']
+        self._string_cache: Dict[int, str] = {}
+        self._code_cache: Dict[str, Optional[int]] = {}
+
+    def array(self, service_code: str, name: str) -> np.ndarray:
+        """서비스의 배열 하나를 반환합니다 (예: price)."""
+        return self._arrays[f'{service_code}/{name}']
+
+    def string(self, code: int) -> Optional[str]:
+        """
+        문자열 코드를 문자열로 바꿉니다.
+
+        Args:
+            code (int): 문자열 코드
+
+        Returns:
+            Optional[str]: 문자열 (MISSING이면 None)
+        """
+        if code == MISSING:
+            return None
+        value = self._string_cache.get(code)
+        if value is None:
+            start = self._string_base + int(self._string_offsets[code])
+            end = self._string_base + int(self._string_offsets[code + 1])
+            value = sys.intern(self._mmap[start:end].decode('utf-8'))
+            if len(self._string_cache) >= STRING_CACHE_SIZE:
+                self._string_cache.clear()
+            self._string_cache[code] = value
+        return value
+
+    def strings(self, codes: List[int]) -> List[Optional[str]]:
+        """
+        문자열 코드 목록을 문자열 목록으로 바꿉니다 (속성 값처럼 한 번에 여러 개를 읽을 때 사용).
+
+        Args:
+            codes (List[int]): 문자열 코드 목록
+
+        Returns:
+            List[Optional[str]]: 문자열 목록 (MISSING은 None)
+        """
+        cache = self._string_cache
+        string = self.string
+        return [cache.get(code) or string(code) for code in codes]
+
+    def code(self, value: str) -> Optional[int]:
+        """
+        문자열 표를 이진 탐색하여 문자열 코드를 찾습니다 (워커마다 결과를 보관).
+
+        Args:
+            value (str): 문자열
+
+        Returns:
+            Optional[int]: 문자열 코드 (가격표에 없는 문자열이면 None)
+        """
+        try:
+            return self._code_cache[value]
+        except KeyError:
+            pass
+        code = self._search(value.encode('utf-8'))
+        if len(self._code_cache) >= STRING_CACHE_SIZE:
+            self._code_cache.clear()
+        self._code_cache[value] = code
+        return code
+
+    def _search(self, target: bytes) -> Optional[int]:
+        low, high = 0, self._string_count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._string_base + int(self._string_offsets[middle])
+            end = self._string_base + int(self._string_offsets[middle + 1])
+            current = self._mmap[start:end]
+            if current == target:
+                return middle
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def bucket(self, service_code: str, values: Tuple[str, ...]) -> range:
+        """
+        색인 키 값에 해당하는 레코드 범위를 찾습니다.
+
+        Args:
+            service_code (str): 서비스 코드
+            values (Tuple[str, ...]): 키 필드 순서의 값 튜플
+
+        Returns:
+            range: 레코드 행 번호 범위 (해당 제품이 없으면 빈 범위)
+        """
+        key = []
+        for value in values:
+            code = self.code(value)
+            if code is None:
+                return range(0)
+            key.append(code)
+
+        bucket_keys = self.array(service_code, 'bucket_keys')
+        low, high = 0, len(bucket_keys)
+        while low < high:
+            middle = (low + high) // 2
+            current = bucket_keys[middle].tolist()
+            if current == key:
+                offsets = self.array(service_code, 'bucket_offsets')
+                return range(int(offsets[middle]), int(offsets[middle + 1]))
+            if current < key:
+                low = middle + 1
+            else:
+                high = middle
+        return range(0)
+
+
+class SharedProductRecord:
+    """공유 가격표의 레코드 하나 (CompactProduct와 같은 조회 인터페이스, 값은 요청할 때 읽음)"""
+
+    __slots__ = ('table', 'service_code', 'row')
+
+    def __init__(self, table: MappedPriceTable, service_code: str, row: int):
+        self.table = table
+        self.service_code = service_code
+        self.row = row
+
+    def _codes(self, name: str) -> np.ndarray:
+        return self.table.array(self.service_code, name)
+
+    @property
+    def sku(self) -> str:
+        return self.table.string(int(self._codes('sku')[self.row]))
+
+    @property
+    def price_per_unit(self) -> float:
+        return float(self._codes('price')[self.row])
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """제품 속성 딕셔너리 (호출할 때마다 새로 만듦)"""
+        keys = self.table.services[self.service_code]['attributeKeys']
+        values = self.table.strings(self._codes('attributes')[self.row].tolist())
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def get_attribute(self, key: str) -> Optional[str]:
+        """
+        속성 하나를 딕셔너리로 펼치지 않고 조회합니다.
+
+        Args:
+            key (str): 속성 이름
+
+        Returns:
+            Optional[str]: 속성 값 (없으면 None)
+        """
+        keys = self.table.services[self.service_code]['attributeKeys']
+        if key not in keys:
+            return None
+        return self.table.string(int(self._codes('attributes')[self.row, keys.index(key)]))
+
+    @property
+    def tiers(self) -> Optional[Tuple[Tuple[float, Optional[float], float], ...]]:
+        offsets = self._codes('tier_offsets')
+        rows = self._codes('tiers')[offsets[self.row]:offsets[self.row + 1]].tolist()
+        if not rows:
+            return None
+        return tuple((begin, None if end != end else end, price) for begin, end, price in rows)
+
+    @property
+    def pricing(self) -> Dict[str, Any]:
+        """가격 정보 딕셔너리 (_extract_price_from_product와 같은 형식)"""
+        pricing = {
+            'currency': 'USD',
+            'pricePerUnit': self.price_per_unit,
+            'unit': self.table.string(int(self._codes('unit')[self.row])),
+            'description': self.table.string(int(self._codes('description')[self.row]))
+        }
+        tiers = self.tiers
+        if tiers:
+            pricing['tiers'] = [
+                {'beginRange': begin, 'endRange': end, 'pricePerUnit': price} for begin, end, price in tiers
+            ]
+        return pricing
+
+    @property
+    def terms(self) -> Optional[TermTable]:
+        """모든 약정의 요금표 (약정이 없으면 None)"""
+        offsets = self._codes('term_offsets')
+        start, end = int(offsets[self.row]), int(offsets[self.row + 1])
+        if start == end:
+            return None
+        string = self.table.string
+        return TermTable(tuple(
+            (string(term_type), string(lease), string(purchase_option), string(offering_class),
+             upfront, recurring, string(unit))
+            for (term_type, lease, purchase_option, offering_class, unit), (upfront, recurring) in zip(
+                self._codes('term_codes')[start:end].tolist(), self._codes('term_prices')[start:end].tolist()
+            )
+        ))
+
+    def __repr__(self) -> str:
+        return f"SharedProductRecord(sku={self.sku!r}, pricePerUnit={self.price_per_unit!r})"
+
+
+class SharedRecordList(Sequence):
+    """
+    버킷 하나의 레코드 목록 (색인 결과 목록처럼 쓰되 레코드 객체는 꺼낼 때 만듦)
+
+    EC2처럼 버킷이 큰 경우에도 응답에 필요한 상위 레코드만 객체로 만듭니다.
+    """
+
+    __slots__ = ('table', 'service_code', 'rows')
+
+    def __init__(self, table: MappedPriceTable, service_code: str, rows: range):
+        self.table = table
+        self.service_code = service_code
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [SharedProductRecord(self.table, self.service_code, row) for row in self.rows[index]]
+        return SharedProductRecord(self.table, self.service_code, self.rows[index])
+
+    def __repr__(self) -> str:
+        return f"SharedRecordList(service_code={self.service_code!r}, records={len(self.rows)})"
+
+
+class SharedPriceTable:
+    """
+    로더 프로세스가 만든 공유 가격표를 조회하는 클래스 (PriceIndex.lookup과 같은 조회 인터페이스)
+
+    가격표에 있는 서비스는 서비스 전체 카탈로그로 간주하여, 색인 키와 정확히 일치하는 필터는
+    가격표에 없으면 해당 제품이 없는 것으로 응답합니다. 파일은 처음 조회할 때 매핑하므로
+    gunicorn 마스터에서 애플리케이션을 불러온 뒤 가격표를 만들어도 워커가 새 파일을 읽습니다.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        """
+        SharedPriceTable 초기화
+
+        Args:
+            path (str): 가격표 파일 경로
+            check_interval (float): 파일이 바뀌었는지 확인하는 간격 (초)
+            clock (Callable[[], float]): 현재 시각 함수 (테스트용)
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._table: Optional[MappedPriceTable] = None
+        self._identity: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'reloads': 0}
+
+    def refresh(self) -> bool:
+        """
+        파일이 바뀌었으면 다시 매핑합니다.
+
+        이전 매핑은 조회 중인 레코드가 참조하지 않게 되면 해제됩니다.
+
+        Returns:
+            bool: 새 파일을 매핑했으면 True
+        """
+        with self._lock:
+            self._next_check = self._clock() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return False
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity == self._identity:
+                return False
+            self._identity = identity
+            try:
+                self._table = MappedPriceTable(self.path)
+            except (OSError, ValueError) as e:
+                print(f"Error opening shared price table {self.path}: {e}")
+                return False
+            self._stats['reloads'] += 1
+            return True
+
+    def _current(self) -> Optional[MappedPriceTable]:
+        if self._clock() >= self._next_check:
+            self.refresh()
+        return self._table
+
+    def has_service(self, service_code: str) -> bool:
+        """
+        서비스가 가격표에 있는지 확인합니다.
+
+        Args:
+            service_code (str): 서비스 코드
+
+        Returns:
+            bool: 가격표에 있으면 True
+        """
+        table = self._current()
+        return table is not None and service_code in table.services
+
+    def lookup(self, service_code: str, filters: List[Dict[str, str]]) -> Optional[SharedRecordList]:
+        """
+        필터 조건에 해당하는 가격 레코드 목록을 조회합니다.
+
+        Args:
+            service_code (str): 서비스 코드 (예: AmazonEC2)
+            filters (List[Dict[str, str]]): 필터 목록
+
+        Returns:
+            Optional[SharedRecordList]: 가격 레코드 목록 (가격표로 답할 수 없으면 None)
+        """
+        table = self._current()
+        if table is None or service_code not in table.services:
+            return None
+        values = filter_key(tuple(table.services[service_code]['indexFields']), filters)
+        if values is None:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+
+        rows = table.bucket(service_code, values)
+        with self._lock:
+            self._stats['hits'] += 1
+        return SharedRecordList(table, service_code, rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        가격표 통계를 반환합니다.
+
+        Returns:
+            Dict[str, Any]: 적중/미스 횟수, 다시 매핑한 횟수, 서비스 수, 레코드 수, 파일 크기
+        """
+        table = self._table
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'services': len(table.services) if table is not None else 0,
+            'records': sum(info['records'] for info in table.services.values()) if table is not None else 0,
+            'bytes': table.size if table is not None else 0,
+            'createdAt': table.created_at if table is not None else None
+        })
+        return stats
+
+
+def open_shared_price_table_from_env() -> Optional[SharedPriceTable]:
+    """
+    환경 변수 PRICING_SHARED_PRICE_TABLE이 설정되어 있으면 해당 경로의 공유 가격표를 엽니다.
+
+    환경 변수:
+        PRICING_SHARED_PRICE_TABLE: 가격표 파일 경로 (예: /dev/shm/pricing-price-table.bin)
+        PRICING_SHARED_PRICE_TABLE_CHECK_INTERVAL: 파일이 바뀌었는지 확인하는 간격 (초, 기본값: 5)
+
+    Returns:
+        Optional[SharedPriceTable]: 공유 가격표 (설정되지 않았으면 None)
+    """
+    path = os.environ.get('PRICING_SHARED_PRICE_TABLE')
+    if not path:
+        return None
+    return SharedPriceTable(path, float(os.environ.get('PRICING_SHARED_PRICE_TABLE_CHECK_INTERVAL', 5)))
+
+
+def build_shared_price_table(path: str, db_path: str, service_codes: List[str]) -> Dict[str, Any]:
+    """
+    오프라인 저장소의 서비스 전체 카탈로그로 공유 가격표 파일을 만듭니다 (로더 프로세스에서 호출).
+
+    Args:
+        path (str): 가격표 파일 경로
+        db_path (str): 오프라인 저장소 SQLite 파일 경로
+        service_codes (List[str]): 가격표에 넣을 서비스 코드 목록
+
+    Returns:
+        Dict[str, Any]: 서비스별 레코드 수, 파일 크기
+
+    Raises:
+        ValueError: 서비스가 오프라인 저장소에 없는 경우
+    """
+    # aws_pricing_client가 이 모듈을 불러오므로 로더에서만 불러옴
+    from aws_pricing_client import AWSPricingClient, PricingCalculator
+    from offer_store import OfferStore
+
+    store = OfferStore(db_path)
+    try:
+        calculator = PricingCalculator(AWSPricingClient(offer_store=store, offline=True), max_workers=1)
+        return calculator.build_shared_price_table(path, service_codes)
+    finally:
+        store.close()
+
+
+def build_shared_price_table_from_env() -> Optional[Dict[str, Any]]:
+    """
+    환경 변수 설정에 따라 공유 가격표를 만듭니다 (gunicorn 마스터의 on_starting에서 호출).
+
+    환경 변수:
+        PRICING_SHARED_PRICE_TABLE: 가격표 파일 경로
+        PRICING_SHARED_PRICE_TABLE_SERVICES: 가격표에 넣을 서비스 코드 (쉼표로 구분, 예: AmazonEC2,AmazonRDS)
+        PRICING_OFFER_DB: 오프라인 저장소 경로
+
+    Returns:
+        Optional[Dict[str, Any]]: 서비스별 레코드 수, 파일 크기 (설정되지 않았으면 None)
+    """
+    path = os.environ.get('PRICING_SHARED_PRICE_TABLE')
+    db_path = os.environ.get('PRICING_OFFER_DB')
+    service_codes = [
+        service_code.strip()
+        for service_code in os.environ.get('PRICING_SHARED_PRICE_TABLE_SERVICES', '').split(',')
+        if service_code.strip()
+    ]
+    if not path or not db_path or not service_codes:
+        return None
+    return build_shared_price_table(path, db_path, service_codes)
+
+
+def main() -> None:
+    """공유 가격표 생성 명령줄 도구"""
+    parser = argparse.ArgumentParser(description='오프라인 저장소의 카탈로그로 워커가 공유하는 가격표 파일을 만듭니다.')
+    parser.add_argument('service_codes', nargs='+', help='서비스 코드 (예: AmazonEC2 AmazonRDS)')
+    parser.add_argument('--db', default=os.environ.get('PRICING_OFFER_DB', 'pricing_offers.db'),
+                        help='SQLite 데이터베이스 파일 경로')
+    parser.add_argument('--out', default=os.environ.get('PRICING_SHARED_PRICE_TABLE', 'pricing-price-table.bin'),
+                        help='가격표 파일 경로 (예: /dev/shm/pricing-price-table.bin)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = build_shared_price_table(args.out, args.db, args.service_codes)
+    for service_code, records in result['services'].items():
+        print(f"{service_code}: 레코드 {records}개")
+    print(f"{args.out}: {result['bytes'] / (1 << 20):.1f} MiB ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Single Flight
+
+같은 키로 동시에 들어온 조회 요청을 하나의 실제 호출로 합치는 모듈입니다.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Flight:
+    """진행 중인 호출 하나의 상태"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    동일한 키의 동시 호출을 합치는 클래스
+
+    첫 번째 호출자만 func를 실행하고, 실행 중에 같은 키로 들어온 호출자는
+    그 결과(또는 예외)를 함께 받습니다. 호출이 끝나면 키는 제거되므로 결과를 캐시하지는 않습니다.
+    """
+
+    def __init__(self):
+        """SingleFlight 초기화"""
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        key에 대해 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 func를 실행합니다.
+
+        Args:
+            key (Hashable): 호출을 구분하는 키 (예: make_cache_key 결과)
+            func (Callable[[], Any]): 실제 조회 함수
+
+        Returns:
+            Any: func의 반환값 (합쳐진 호출자는 같은 객체를 공유)
+
+        Raises:
+            Exception: func에서 발생한 예외 (합쳐진 호출자에게도 전파)
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        호출 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: 전체 호출 수, 실제 실행 수, 합쳐진 호출 수, 현재 진행 중인 키 수
+        """
+        with self._lock:
+            return {**self._stats, 'inFlight': len(self._flights)}
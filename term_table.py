@@ -0,0 +1,165 @@
+"""
+Term Table
+
+제품 정보의 모든 약정(terms.OnDemand, terms.Reserved)을 한 번에 읽어 작은 요금표로 만드는 모듈입니다.
+
+AWS Pricing API의 제품 정보에는 온디맨드 요금과 함께 예약 인스턴스(1년/3년 x 선결제 없음/부분/전체) 요금이
+이미 들어 있습니다. TermTable은 약정마다 (약정 유형, 계약 기간, 구매 옵션, 제공 클래스, 선결제 금액,
+단위당 반복 요금, 단위) 튜플 하나만 보관하고, 응답을 만들 때 구매 옵션별 실질 월 비용으로 펼칩니다.
+따라서 구매 옵션을 비교하기 위해 API를 다시 호출할 필요가 없습니다.
+"""
+
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 한 달 평균 시간 (PricingCalculator._estimate_monthly_cost와 같은 값)
+HOURS_PER_MONTH = 730
+
+# 계약 기간 → 개월 수
+LEASE_MONTHS = {'1yr': 12, '3yr': 36}
+
+# 응답 정렬 순서
+PURCHASE_OPTION_ORDER = {'No Upfront': 0, 'Partial Upfront': 1, 'All Upfront': 2}
+
+# 약정 행: (약정 유형, 계약 기간, 구매 옵션, 제공 클래스, 선결제 금액, 단위당 반복 요금, 단위)
+TermRow = Tuple[str, Optional[str], Optional[str], Optional[str], float, float, str]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _parse_term(term_type: str, term: Dict[str, Any]) -> TermRow:
+    """
+    약정 하나의 가격 차원을 선결제 금액과 단위당 반복 요금으로 나눕니다.
+
+    Args:
+        term_type (str): 약정 유형 (OnDemand 또는 Reserved)
+        term (Dict[str, Any]): 약정 정보 (termAttributes, priceDimensions)
+
+    Returns:
+        TermRow: 약정 행
+
+    Raises:
+        ValueError: 가격을 숫자로 읽을 수 없는 경우
+    """
+    attributes = term.get('termAttributes') or {}
+    upfront = 0.0
+    recurring = None
+    unit = ''
+    for dimension in (term.get('priceDimensions') or {}).values():
+        price = float(dimension.get('pricePerUnit', {}).get('USD', 0))
+        if dimension.get('unit') == 'Quantity':
+            # 선결제 금액 (Upfront Fee)
+            upfront += price
+        elif recurring is None:
+            # 첫 번째 반복 요금 차원 사용 (_extract_price_from_product와 같은 기준)
+            recurring = price
+            unit = dimension.get('unit', '')
+    return (
+        _intern(term_type),
+        _intern(attributes.get('LeaseContractLength')),
+        _intern(attributes.get('PurchaseOption')),
+        _intern(attributes.get('OfferingClass')),
+        upfront,
+        recurring or 0.0,
+        sys.intern(unit)
+    )
+
+
+def _sort_key(row: TermRow) -> Tuple[Any, ...]:
+    term_type, lease, purchase_option, offering_class = row[:4]
+    return (
+        term_type != 'OnDemand',
+        LEASE_MONTHS.get(lease or '', 0),
+        (offering_class or '').lower(),
+        PURCHASE_OPTION_ORDER.get(purchase_option or '', len(PURCHASE_OPTION_ORDER))
+    )
+
+
+class TermTable:
+    """제품 하나의 약정별 요금표"""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows: Tuple[TermRow, ...]):
+        """
+        TermTable 초기화
+
+        Args:
+            rows (Tuple[TermRow, ...]): 정렬된 약정 행 (온디맨드가 먼저)
+        """
+        self.rows = rows
+
+    @classmethod
+    def from_product(cls, product: Dict[str, Any]) -> Optional['TermTable']:
+        """
+        제품 정보의 모든 약정을 한 번에 읽어 요금표를 만듭니다.
+
+        Args:
+            product (Dict[str, Any]): 제품 정보 (get_products 결과 항목)
+
+        Returns:
+            Optional[TermTable]: 요금표 (약정이 없거나 읽을 수 없으면 None)
+        """
+        try:
+            rows = [
+                _parse_term(term_type, term)
+                for term_type, terms in (product.get('terms') or {}).items()
+                for term in terms.values()
+            ]
+        except (AttributeError, TypeError, ValueError) as e:
+            print(f"Error extracting terms from product: {e}")
+            return None
+
+        if not rows:
+            return None
+        return cls(tuple(sorted(rows, key=_sort_key)))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def _monthly_cost(row: TermRow) -> float:
+        """약정 행의 실질 월 비용 (시간당 반복 요금 * 730시간 + 선결제 금액 / 계약 개월 수)"""
+        _, lease, _, _, upfront, recurring, unit = row
+        monthly = recurring * HOURS_PER_MONTH if unit.lower() == 'hrs' else 0.0
+        months = LEASE_MONTHS.get(lease or '')
+        if months:
+            monthly += upfront / months
+        return monthly
+
+    def purchase_options(self) -> List[Dict[str, Any]]:
+        """
+        약정별 실질 월 비용과 온디맨드 대비 절감률을 계산합니다.
+
+        Returns:
+            List[Dict[str, Any]]: 구매 옵션 목록 (온디맨드, 계약 기간, 제공 클래스, 구매 옵션 순)
+        """
+        on_demand_monthly = next(
+            (self._monthly_cost(row) for row in self.rows if row[0] == 'OnDemand'), None
+        )
+
+        options = []
+        for row in self.rows:
+            term_type, lease, purchase_option, offering_class, upfront, recurring, unit = row
+            monthly = self._monthly_cost(row)
+            savings = None
+            if on_demand_monthly:
+                savings = round(1 - monthly / on_demand_monthly, 4)
+            options.append({
+                'termType': term_type,
+                'leaseContractLength': lease,
+                'purchaseOption': purchase_option,
+                'offeringClass': offering_class,
+                'upfrontFee': upfront,
+                'recurringPricePerUnit': recurring,
+                'unit': unit,
+                'effectiveMonthlyCost': monthly,
+                'savingsVsOnDemand': savings
+            })
+        return options
+
+    def __repr__(self) -> str:
+        return f"TermTable(rows={len(self.rows)})"
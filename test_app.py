@@ -7,7 +7,7 @@ AWS Pricing API 서버의 기능을 테스트하는 모듈입니다.
 import unittest
 import json
 from unittest.mock import patch, MagicMock
-from app import app
+from app_swagger import app
 
 
 class TestAWSPricingAPIServer(unittest.TestCase):
@@ -18,7 +18,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.app = app.test_client()
         self.app.testing = True
 
-    @patch('app.pricing_client.get_services')
+    @patch('app_swagger.pricing_client.get_services')
     def test_get_services(self, mock_get_services):
         """서비스 목록 조회 API 테스트"""
         # 목 데이터 설정
@@ -44,7 +44,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.assertEqual(len(data['services']), 2)
         self.assertEqual(data['services'][0]['serviceCode'], 'AmazonEC2')
 
-    @patch('app.pricing_client.get_service_attributes')
+    @patch('app_swagger.pricing_client.get_service_attributes')
     def test_get_service_attributes(self, mock_get_service_attributes):
         """서비스 속성 조회 API 테스트"""
         # 목 데이터 설정
@@ -62,7 +62,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.assertEqual(len(data['attributes']), 4)
         self.assertIn('instanceType', data['attributes'])
 
-    @patch('app.pricing_client.get_attribute_values')
+    @patch('app_swagger.pricing_client.get_attribute_values')
     def test_get_attribute_values(self, mock_get_attribute_values):
         """속성 값 조회 API 테스트"""
         # 목 데이터 설정
@@ -81,7 +81,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.assertEqual(len(data['values']), 3)
         self.assertIn('t2.micro', data['values'])
 
-    @patch('app.pricing_calculator.calculate_price')
+    @patch('app_swagger.pricing_calculator.calculate_price')
     def test_get_pricing(self, mock_calculate_price):
         """가격 조회 API 테스트"""
         # 목 데이터 설정
@@ -151,7 +151,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.assertEqual(data['priceInfos'][1]['pricing']['pricePerUnit'], 0.0232)
         self.assertEqual(data['priceInfos'][1]['estimatedMonthlyCost'], 16.94)
 
-    @patch('app.pricing_calculator.calculate_total_cost')
+    @patch('app_swagger.pricing_calculator.calculate_total_cost')
     def test_calculate_cost(self, mock_calculate_total_cost):
         """비용 계산 API 테스트"""
         # 목 데이터 설정
@@ -250,7 +250,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
     def test_index(self):
         """루트 엔드포인트 테스트"""
         # API 호출
-        response = self.app.get('/')
+        response = self.app.get('/api/')
         data = json.loads(response.data)
 
         # 응답 검증
@@ -259,7 +259,7 @@ class TestAWSPricingAPIServer(unittest.TestCase):
         self.assertIn('version', data)
         self.assertIn('description', data)
         self.assertIn('endpoints', data)
-        self.assertEqual(len(data['endpoints']), 5)
+        self.assertEqual(len(data['endpoints']), 9)
 
 
 class TestIntegration(unittest.TestCase):
@@ -273,7 +273,7 @@ class TestIntegration(unittest.TestCase):
     def test_integration_flow(self):
         """통합 테스트 흐름 - 단순화된 버전"""
         # 루트 엔드포인트만 테스트
-        response = self.app.get('/')
+        response = self.app.get('/api/')
         data = json.loads(response.data)
         
         # 응답 검증
@@ -0,0 +1,240 @@
+"""
+Async Pricing Client 테스트
+
+비동기 가격 조회 클라이언트, 비동기 계산기, ASGI 애플리케이션을 테스트하는 모듈입니다.
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+import async_pricing_client
+from async_pricing_client import AsyncAWSPricingClient, AsyncPricingCalculator
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from pricing_cache import PricingCache
+from rate_limiter import AdaptiveRateLimiter
+from test_pricing_calculator import make_pages, make_product
+
+
+FILTERS = [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'}]
+
+
+class FakeAioClient:
+    """aiobotocore Pricing 클라이언트 대역 (페이지마다 이벤트 루프에 제어를 넘김)"""
+
+    def __init__(self, pages):
+        self.get_page = make_pages(pages)
+        self.calls = 0
+
+    async def get_products(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.get_page(**kwargs)
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestAsyncAWSPricingClient(unittest.TestCase):
+    """AsyncAWSPricingClient 테스트 클래스"""
+
+    def make_client(self):
+        return AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+
+    def test_thread_fallback_shares_cache(self, mock_boto_client):
+        """aiobotocore 없이 동기 클라이언트로 조회하고 같은 캐시를 사용하는지 테스트"""
+        mock_boto_client.return_value.get_products.side_effect = make_pages([[make_product('SKU1', 0.1)]])
+        pricing_client = self.make_client()
+        client = AsyncAWSPricingClient(pricing_client, use_aiobotocore=False)
+
+        async def run():
+            first = await client.get_products('AmazonEC2', FILTERS)
+            second = await client.get_products('AmazonEC2', FILTERS)
+            await client.close()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first, second)
+        self.assertEqual(pricing_client.get_products('AmazonEC2', FILTERS), first)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 1)
+
+    def test_aiobotocore_pagination_coalesced(self, mock_boto_client):
+        """aiobotocore 경로에서 페이지를 이어 받고 동시 조회를 한 번의 AWS 호출로 합치는지 테스트"""
+        fake_client = FakeAioClient([[make_product(f'SKU{page}', 0.1)] for page in range(3)])
+
+        @asynccontextmanager
+        async def create_client(*args, **kwargs):
+            yield fake_client
+
+        session = MagicMock()
+        session.create_client.side_effect = create_client
+        with patch.object(async_pricing_client, 'get_session', return_value=session), \
+                patch.object(async_pricing_client, 'AioConfig', MagicMock()):
+            client = AsyncAWSPricingClient(self.make_client(), use_aiobotocore=True)
+
+            async def run():
+                results = await asyncio.gather(*(client.get_products('AmazonEC2', FILTERS) for _ in range(5)))
+                await client.close()
+                return results
+
+            results = asyncio.run(run())
+
+        self.assertEqual(fake_client.calls, 3)
+        self.assertEqual([len(result) for result in results], [3] * 5)
+        mock_boto_client.return_value.get_products.assert_not_called()
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestAsyncPricingCalculator(unittest.TestCase):
+    """AsyncPricingCalculator 테스트 클래스"""
+
+    def test_same_result_as_sync(self, mock_boto_client):
+        """비동기 계산 결과가 동기 계산기와 같은지 테스트"""
+        prices = {'t2.micro': 0.0116, 'm5.large': 0.096}
+
+        def get_products(**kwargs):
+            instance_type = kwargs['Filters'][0]['Value']
+            if instance_type not in prices:
+                return {'PriceList': []}
+            return {'PriceList': [json.dumps(make_product(instance_type, prices[instance_type],
+                                                          instanceType=instance_type))]}
+
+        mock_boto_client.return_value.get_products.side_effect = get_products
+        pricing_client = AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+        calculator = PricingCalculator(pricing_client, max_workers=1)
+        client = AsyncAWSPricingClient(pricing_client, use_aiobotocore=False)
+        async_calculator = AsyncPricingCalculator(calculator, client)
+        resources = [
+            {'serviceCode': 'AmazonEC2', 'quantity': 2, 'usageType': 'Hours', 'usageValue': 730,
+             'filters': [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': name}]}
+            for name in ['m5.large', 'unknown', 't2.micro']
+        ]
+
+        async def run():
+            total = await async_calculator.calculate_total_cost(resources)
+            events = [event async for event in async_calculator.iter_total_cost(resources)]
+            await client.close()
+            return total, events
+
+        total, events = asyncio.run(run())
+
+        self.assertEqual(total, calculator.calculate_total_cost(resources))
+        self.assertEqual(events[-1]['totalCost'], total['totalCost'])
+        self.assertEqual(sorted(event['index'] for event in events[:-1]), [0, 2])
+
+    def test_selection_runs_off_event_loop(self, mock_boto_client):
+        """가격 선택(점수 계산, 정렬)을 이벤트 루프 스레드가 아닌 스레드 풀에서 실행하는지 테스트"""
+        mock_boto_client.return_value.get_products.return_value = {
+            'PriceList': [json.dumps(make_product('m5.large', 0.096, instanceType='m5.large'))]
+        }
+        pricing_client = AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+        calculator = PricingCalculator(pricing_client, max_workers=1)
+        client = AsyncAWSPricingClient(pricing_client, use_aiobotocore=False)
+        async_calculator = AsyncPricingCalculator(calculator, client)
+        select_price_infos = calculator.select_price_infos
+        threads = []
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return select_price_infos(*args)
+
+        calculator.select_price_infos = record_thread
+        filters = [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'}]
+
+        async def run():
+            result = await async_calculator.calculate_price('AmazonEC2', filters)
+            await client.close()
+            return result, threading.current_thread()
+
+        result, loop_thread = asyncio.run(run())
+
+        self.assertEqual(result['priceInfos'][0]['pricing']['pricePerUnit'], 0.096)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], loop_thread)
+
+
+class TestASGIApp(unittest.TestCase):
+    """app_asgi ASGI 애플리케이션 테스트 클래스"""
+
+    @classmethod
+    def setUpClass(cls):
+        """ASGI 애플리케이션 로드"""
+        import app_asgi
+        cls.app_asgi = app_asgi
+
+    def request(self, method, path, body=None, headers=None):
+        """ASGI 애플리케이션을 직접 호출하고 (상태 코드, 헤더, 본문)을 반환합니다."""
+        scope = {
+            'type': 'http',
+            'method': method,
+            'path': path,
+            'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+        }
+        messages = [{'type': 'http.request', 'body': json.dumps(body).encode() if body is not None else b''}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.app_asgi.app(scope, receive, send))
+        start = sent[0]
+        return start['status'], dict(start['headers']), b''.join(message.get('body', b'') for message in sent[1:])
+
+    def test_pricing(self):
+        """/api/pricing이 비동기 계산기 결과를 JSON으로 반환하고 오류를 같은 상태 코드로 반환하는지 테스트"""
+        result = {'serviceCode': 'AmazonEC2', 'priceInfos': [{'pricing': {'pricePerUnit': 0.0116}}]}
+        with patch.object(self.app_asgi.async_pricing_calculator, 'calculate_price', AsyncMock(return_value=result)):
+            status, _, body = self.request('POST', '/api/pricing', {'serviceCode': 'AmazonEC2', 'filters': []})
+        self.assertEqual((status, json.loads(body)), (200, result))
+
+        with patch.object(self.app_asgi.async_pricing_calculator, 'calculate_price',
+                          AsyncMock(side_effect=ValueError('No products found'))):
+            status, _, _ = self.request('POST', '/api/pricing', {'serviceCode': 'AmazonEC2'})
+        self.assertEqual(status, 404)
+
+        status, _, _ = self.request('POST', '/api/pricing', {'filters': []})
+        self.assertEqual(status, 400)
+
+    def test_calculate_ndjson(self):
+        """/api/calculate가 Accept: application/x-ndjson 요청에 이벤트를 한 줄씩 전송하는지 테스트"""
+        async def iter_total_cost(resources):
+            yield {'type': 'resourceCost', 'index': 0, 'resourceCost': {'cost': 1.0}}
+            yield {'type': 'totalCost', 'totalCost': {'amount': 1.0}, 'resourceCount': 1}
+
+        with patch.object(self.app_asgi.async_pricing_calculator, 'iter_total_cost', iter_total_cost):
+            status, headers, body = self.request(
+                'POST', '/api/calculate', {'resources': [{'serviceCode': 'AmazonEC2'}]},
+                headers={'Accept': 'application/x-ndjson'}
+            )
+
+        self.assertEqual(headers[b'content-type'], b'application/x-ndjson')
+        self.assertEqual([json.loads(line)['type'] for line in body.decode().splitlines()], ['resourceCost', 'totalCost'])
+
+    def test_swagger_and_routes(self):
+        """Swagger 문서가 같은 모델을 포함하고 없는 경로는 404를 반환하는지 테스트"""
+        status, _, body = self.request('GET', '/swagger.json')
+        schema = json.loads(body)
+
+        self.assertEqual(status, 200)
+        self.assertIn('CalculationRequest', schema['definitions'])
+        self.assertIn('/api/calculate', schema['paths'])
+        self.assertEqual(self.request('GET', '/api/unknown')[0], 404)
+        self.assertEqual(self.request('GET', '/api/pricing')[0], 405)
+
+    def test_metrics(self):
+        """/metrics가 Prometheus 텍스트 형식과 경로 규칙별 요청 처리 시간을 반환하는지 테스트"""
+        self.request('GET', '/api/cache/status')
+
+        status, headers, body = self.request('GET', '/metrics')
+
+        self.assertEqual(status, 200)
+        self.assertTrue(headers[b'content-type'].startswith(b'text/plain; version=0.0.4'))
+        self.assertIn('endpoint="/api/cache/status"', body.decode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+Catalog Refresher 테스트
+
+캐시된 카탈로그의 백그라운드 새로고침, 변경분 비교/적용, 캐시 상태 엔드포인트를 테스트하는 모듈입니다.
+"""
+
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from app_swagger import app
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from catalog_refresher import (CatalogRefresher, apply_delta, create_catalog_refresher_from_env, diff_records,
+                               product_key, product_version)
+from price_index import PriceIndex
+from pricing_cache import PricingCache, make_cache_key
+from rate_limiter import AdaptiveRateLimiter
+from test_price_index import EC2_ATTRIBUTES, EC2_FILTERS, make_product
+
+
+def make_dated_product(sku, price, publication_date, attributes=EC2_ATTRIBUTES):
+    """게시일이 있는 테스트용 제품 정보를 생성합니다."""
+    product = make_product(sku, price, attributes)
+    product['publicationDate'] = publication_date
+    return product
+
+
+class TestDiffRecords(unittest.TestCase):
+    """diff_records / apply_delta 테스트 클래스"""
+
+    def test_diff_by_sku_and_publication_date(self):
+        """SKU와 게시일로 추가, 변경, 삭제된 레코드를 구분하는지 테스트"""
+        unchanged = make_dated_product('A', 0.1, '2024-01-01')
+        old = [unchanged, make_dated_product('B', 0.2, '2024-01-01'), make_dated_product('C', 0.3, '2024-01-01')]
+        new = [
+            make_dated_product('A', 0.1, '2024-01-01'),
+            make_dated_product('B', 0.25, '2024-02-01'),
+            make_dated_product('D', 0.4, '2024-02-01')
+        ]
+
+        delta = diff_records(old, new, product_key, product_version)
+
+        self.assertEqual([product_key(p) for p in delta.added], ['D'])
+        self.assertEqual([(product_key(a), product_key(b)) for a, b in delta.changed], [('B', 'B')])
+        self.assertEqual([product_key(p) for p in delta.removed], ['C'])
+        self.assertEqual(delta.counts(), {'added': 1, 'changed': 1, 'removed': 1})
+
+        value = apply_delta(old, delta, product_key)
+        self.assertEqual([product_key(p) for p in value], ['A', 'B', 'D'])
+        # 바뀌지 않은 레코드는 같은 객체를 유지
+        self.assertIs(value[0], unchanged)
+        self.assertEqual(value[1]['publicationDate'], '2024-02-01')
+
+    def test_no_changes(self):
+        """내용이 같으면 빈 변경분을 반환하는지 테스트"""
+        old = [make_dated_product('A', 0.1, '2024-01-01')]
+
+        delta = diff_records(old, [make_dated_product('A', 0.1, '2024-01-01')], product_key, product_version)
+
+        self.assertFalse(delta)
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestCatalogRefresher(unittest.TestCase):
+    """CatalogRefresher 테스트 클래스"""
+
+    def make_refresher(self):
+        self.now = 1000.0
+        client = AWSPricingClient(
+            cache=PricingCache(clock=lambda: self.now),
+            offer_store=None,
+            persistent_cache=None,
+            rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000)
+        )
+        calculator = PricingCalculator(client, max_workers=1, price_index=PriceIndex(clock=lambda: self.now))
+        self.key = make_cache_key('get_products', 'AmazonEC2', EC2_FILTERS)
+        return CatalogRefresher(client, calculator, interval=60, clock=lambda: self.now)
+
+    def test_applies_changed_records(self, mock_boto_client):
+        """바뀐 레코드만 캐시와 가격 색인에 반영하는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        calculator = refresher.pricing_calculator
+        old = [make_dated_product('A', 0.1, '2024-01-01'), make_dated_product('B', 0.2, '2024-01-01')]
+        calculator.index_products('AmazonEC2', old, EC2_FILTERS)
+        client.cache.set(self.key, old)
+
+        new = [make_dated_product('A', 0.1, '2024-01-01'), make_dated_product('B', 0.5, '2024-03-01')]
+        self.now += 30
+        with patch.object(client, 'fetch_products', return_value=new) as mock_fetch:
+            result = refresher.refresh_once()
+
+        # 캐시 키의 정규화된 필터로 다시 조회
+        service_code, filters = mock_fetch.call_args.args
+        self.assertEqual(make_cache_key('get_products', service_code, filters), self.key)
+        self.assertEqual(result, {'checked': 1, 'changed': 1, 'errors': 0})
+        hit, value = client.cache.get(self.key)
+        self.assertTrue(hit)
+        self.assertIs(value[0], old[0])
+        self.assertEqual(value[1]['publicationDate'], '2024-03-01')
+        self.assertEqual(client.cache.age(self.key), 0)
+
+        prices = sorted(record.price_per_unit for record in calculator.price_index.lookup('AmazonEC2', EC2_FILTERS))
+        self.assertEqual(prices, [0.1, 0.5])
+
+        status = refresher.status()
+        self.assertEqual(status['recordsChanged'], 1)
+        self.assertEqual(status['services']['AmazonEC2']['catalogVersion'], '2024-03-01')
+        self.assertEqual(status['services']['AmazonEC2']['lastChangedAt'], self.now)
+
+    def test_unchanged_entry_extends_ttl(self, mock_boto_client):
+        """바뀐 레코드가 없으면 같은 값을 유지한 채 만료 시각만 연장하는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        old = [make_dated_product('A', 0.1, '2024-01-01')]
+        client.cache.set(self.key, old)
+
+        self.now += 3000
+        with patch.object(client, 'fetch_products', return_value=[make_dated_product('A', 0.1, '2024-01-01')]):
+            refresher.refresh_once()
+        self.now += 3000
+
+        hit, value = client.cache.get(self.key)
+        self.assertTrue(hit)
+        self.assertIs(value, old)
+        self.assertEqual(refresher.status()['entriesChanged'], 0)
+
+    def test_refreshes_service_list(self, mock_boto_client):
+        """서비스 목록 캐시를 캐시를 거치지 않는 fetch_services로 다시 조회해 반영하는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        key = make_cache_key('get_services')
+        client.cache.set(key, [{'serviceCode': 'AmazonEC2', 'attributeNames': ['instanceType']}])
+
+        new = [{'serviceCode': 'AmazonEC2', 'attributeNames': ['instanceType']},
+               {'serviceCode': 'AmazonRDS', 'attributeNames': ['databaseEngine']}]
+        self.now += 30
+        with patch.object(client, 'fetch_services', return_value=new) as mock_fetch:
+            result = refresher.refresh_once()
+
+        mock_fetch.assert_called_once_with()
+        self.assertEqual(result, {'checked': 1, 'changed': 1, 'errors': 0})
+        self.assertEqual([service['serviceCode'] for service in client.cache.get(key)[1]], ['AmazonEC2', 'AmazonRDS'])
+
+    def test_unused_entry_expires(self, mock_boto_client):
+        """지난 새로고침 이후 조회되지 않은 항목은 다시 조회하지 않고 TTL이 지나면 만료되는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        client.cache.set(self.key, [make_dated_product('A', 0.1, '2024-01-01')])
+        fetched = [make_dated_product('A', 0.1, '2024-01-01')]
+
+        with patch.object(client, 'fetch_products', return_value=fetched) as mock_fetch:
+            self.assertEqual(refresher.refresh_once()['checked'], 1)
+            self.now += 3000
+            self.assertEqual(refresher.refresh_once()['checked'], 0)
+
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.now += 3000
+        self.assertEqual(client.cache.get(self.key), (False, None))
+
+    def test_disabled_by_default(self, mock_boto_client):
+        """PRICING_REFRESH_INTERVAL을 설정하지 않으면 새로고침을 사용하지 않는지 테스트"""
+        with patch.dict(os.environ, {}):
+            os.environ.pop('PRICING_REFRESH_INTERVAL', None)
+            self.assertIsNone(create_catalog_refresher_from_env(self.make_refresher().pricing_client))
+        with patch.dict(os.environ, {'PRICING_REFRESH_INTERVAL': '600'}):
+            self.assertEqual(create_catalog_refresher_from_env(self.make_refresher().pricing_client).interval, 600)
+
+    def test_error_keeps_cached_value(self, mock_boto_client):
+        """다시 조회하다 실패하면 기존 값을 유지하고 오류를 기록하는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        old = [make_dated_product('A', 0.1, '2024-01-01')]
+        client.cache.set(self.key, old)
+
+        with patch.object(client, 'fetch_products', side_effect=RuntimeError('throttled')):
+            result = refresher.refresh_once()
+
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(client.cache.get(self.key), (True, old))
+        self.assertIn('throttled', refresher.status()['lastRun']['error'])
+
+    def test_requests_do_not_wait_for_refresh(self, mock_boto_client):
+        """새로고침 중에도 요청은 캐시된 값을 바로 받는지 테스트"""
+        refresher = self.make_refresher()
+        client = refresher.pricing_client
+        old = [make_dated_product('A', 0.1, '2024-01-01')]
+        client.cache.set(self.key, old)
+        fetching = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(service_code, filters):
+            fetching.set()
+            release.wait(5)
+            return [make_dated_product('A', 0.2, '2024-02-01')]
+
+        with patch.object(client, 'fetch_products', side_effect=slow_fetch):
+            thread = threading.Thread(target=refresher.refresh_once)
+            thread.start()
+            fetching.wait(5)
+            self.assertEqual(client.get_products('AmazonEC2', EC2_FILTERS), old)
+            release.set()
+            thread.join()
+
+        self.assertEqual(client.get_products('AmazonEC2', EC2_FILTERS)[0]['publicationDate'], '2024-02-01')
+
+    def test_background_thread(self, mock_boto_client):
+        """ensure_started로 시작한 스레드가 주기마다 새로고침하고 stop으로 멈추는지 테스트"""
+        refresher = self.make_refresher()
+        refresher.interval = 0.01
+        refreshed = threading.Event()
+
+        with patch.object(refresher, 'refresh_once', side_effect=lambda: refreshed.set()):
+            refresher.ensure_started()
+            refresher.ensure_started()
+            self.assertTrue(refreshed.wait(5))
+            refresher.stop(timeout=5)
+
+        self.assertFalse(refresher.running)
+
+
+class TestCacheStatusEndpoint(unittest.TestCase):
+    """/api/cache/status 엔드포인트 테스트 클래스"""
+
+    def test_cache_status(self):
+        """캐시 상태 엔드포인트가 새로고침 상태와 캐시 통계를 반환하는지 테스트"""
+        response = app.test_client().get('/api/cache/status')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertIn('refresher', data)
+        self.assertIn('memoryCache', data)
+        self.assertIn('priceIndex', data)
+        self.assertEqual(set(data['singleFlight']), {'calls', 'executions', 'coalesced', 'inFlight'})
+
+
+if __name__ == '__main__':
+    unittest.main()
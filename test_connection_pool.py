@@ -0,0 +1,225 @@
+"""
+Connection Pool 테스트
+
+botocore 연결 풀 설정과 풀 사용량 측정을 로컬 Pricing API 대역 서버로 테스트하는 모듈입니다.
+"""
+
+import json
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from aws_pricing_client import AWSPricingClient
+from connection_pool import PoolMonitor, create_client_config_from_env
+from pricing_cache import NullCache
+from rate_limiter import AdaptiveRateLimiter
+
+
+class FakePricingHandler(BaseHTTPRequestHandler):
+    """GetProducts 요청에 고정된 페이지를 응답하는 Pricing API(awsJson1.1) 대역"""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.05
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.record(self.headers.get('X-Amz-Target'), self.client_address)
+        time.sleep(self.delay)
+
+        product = {
+            'product': {'sku': request['ServiceCode'], 'attributes': {'instanceType': 'm5.large'}},
+            'terms': {}
+        }
+        body = json.dumps({'PriceList': [json.dumps(product)], 'FormatVersion': 'aws_v1'}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.1')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePricingServer(ThreadingHTTPServer):
+    """요청 대상과 클라이언트 연결(포트)을 기록하는 대역 서버"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakePricingHandler)
+        self.lock = threading.Lock()
+        self.targets = []
+        self.connections = set()
+
+    def record(self, target, client_address):
+        with self.lock:
+            self.targets.append(target)
+            self.connections.add(client_address)
+
+
+class TestPoolMonitor(unittest.TestCase):
+    """PoolMonitor 테스트 클래스"""
+
+    def test_slot_counts_usage(self):
+        """사용 중인 연결 수와 최대 동시 사용 수를 기록하는지 테스트"""
+        monitor = PoolMonitor(2)
+
+        with monitor.slot():
+            with monitor.slot():
+                metrics = monitor.metrics()
+                self.assertEqual(metrics['inUse'], 2)
+                self.assertEqual(metrics['utilization'], 1.0)
+
+        metrics = monitor.metrics()
+        self.assertEqual(metrics['acquisitions'], 2)
+        self.assertEqual(metrics['inUse'], 0)
+        self.assertEqual(metrics['peakInUse'], 2)
+        self.assertEqual(metrics['waits'], 0)
+
+    def test_slot_waits_when_pool_is_full(self):
+        """풀이 가득 차면 연결이 반환될 때까지 기다리고 대기 시간을 기록하는지 테스트"""
+        monitor = PoolMonitor(1)
+        entered = threading.Event()
+
+        def hold():
+            with monitor.slot():
+                entered.set()
+                time.sleep(0.05)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait()
+        with monitor.slot():
+            pass
+        thread.join()
+
+        metrics = monitor.metrics()
+        self.assertEqual(metrics['waits'], 1)
+        self.assertGreater(metrics['maxWaitSeconds'], 0)
+        self.assertEqual(metrics['peakInUse'], 1)
+
+    def test_unbounded_monitor(self):
+        """크기가 없으면 대기 없이 사용량만 측정하는지 테스트"""
+        monitor = PoolMonitor()
+
+        with monitor.slot():
+            self.assertIsNone(monitor.metrics()['utilization'])
+        self.assertEqual(monitor.metrics()['acquisitions'], 1)
+
+
+class TestClientConfig(unittest.TestCase):
+    """create_client_config_from_env 테스트 클래스"""
+
+    def test_config_from_env(self):
+        """환경 변수로 풀 크기, 시간 제한, keep-alive를 설정하는지 테스트"""
+        env = {
+            'PRICING_MAX_POOL_CONNECTIONS': '3',
+            'PRICING_CONNECT_TIMEOUT': '1.5',
+            'PRICING_READ_TIMEOUT': '7',
+            'PRICING_TCP_KEEPALIVE': 'false'
+        }
+        with patch.dict(os.environ, env):
+            config = create_client_config_from_env()
+
+        self.assertEqual(config.max_pool_connections, 3)
+        self.assertEqual(config.connect_timeout, 1.5)
+        self.assertEqual(config.read_timeout, 7.0)
+        self.assertFalse(config.tcp_keepalive)
+        self.assertEqual(config.retries['total_max_attempts'], 1)
+
+    def test_default_pool_size_follows_workers(self):
+        """풀 크기 기본값이 동시 조회 스레드 수보다 작지 않은지 테스트"""
+        with patch.dict(os.environ, {'PRICING_MAX_WORKERS': '24'}):
+            os.environ.pop('PRICING_MAX_POOL_CONNECTIONS', None)
+            self.assertEqual(create_client_config_from_env().max_pool_connections, 24)
+
+
+class TestPooledClient(unittest.TestCase):
+    """로컬 대역 서버에 대한 AWSPricingClient 연결 풀 테스트 클래스"""
+
+    POOL_SIZE = 2
+
+    def setUp(self):
+        self.server = FakePricingServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        credentials = {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_SESSION_TOKEN': 'testing'
+        }
+        env_patcher = patch.dict(os.environ, credentials)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_client(self, client_mode):
+        return AWSPricingClient(
+            cache=NullCache(),
+            offer_store=None,
+            persistent_cache=None,
+            rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+            client_config=create_client_config_from_env(max_pool_connections=self.POOL_SIZE),
+            endpoint_url=self.endpoint_url,
+            client_mode=client_mode
+        )
+
+    def run_concurrently(self, client, count=8):
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lambda i: client.get_products(f'Service{i}', []), range(count)))
+
+    def test_shared_client_limits_concurrency_to_pool(self):
+        """공유 클라이언트가 풀 크기만큼만 동시에 호출하고 연결을 재사용하는지 테스트"""
+        client = self.make_client('shared')
+
+        results = self.run_concurrently(client)
+
+        self.assertEqual([products[0]['product']['sku'] for products in results],
+                         [f'Service{i}' for i in range(8)])
+        self.assertEqual(self.server.targets, ['AWSPriceListService.GetProducts'] * 8)
+        metrics = client.pool_monitor.metrics()
+        self.assertEqual(metrics['acquisitions'], 8)
+        self.assertEqual(metrics['peakInUse'], self.POOL_SIZE)
+        self.assertGreater(metrics['waits'], 0)
+        self.assertGreater(metrics['waitSeconds'], 0)
+        # 풀에 반환된 keep-alive 연결을 재사용하므로 풀 크기보다 많은 연결을 열지 않음
+        self.assertLessEqual(len(self.server.connections), self.POOL_SIZE)
+
+    def test_per_thread_clients(self):
+        """스레드별 클라이언트 모드에서 스레드마다 다른 클라이언트를 사용하는지 테스트"""
+        client = self.make_client('per-thread')
+        barrier = threading.Barrier(2)
+
+        def get_client():
+            # 두 작업이 서로 다른 스레드에서 실행되도록 대기
+            barrier.wait()
+            return client.client, client.client
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            (first, first_again), (second, _) = executor.map(lambda _: get_client(), range(2))
+
+        self.assertIs(first, first_again)
+        self.assertIsNot(first, second)
+
+        results = self.run_concurrently(client, count=4)
+
+        self.assertEqual(len(results), 4)
+        self.assertIsNone(client.pool_monitor.metrics()['size'])
+        self.assertEqual(client.pool_monitor.metrics()['waits'], 0)
+
+    def test_invalid_client_mode(self):
+        """잘못된 클라이언트 모드는 ValueError를 발생시키는지 테스트"""
+        with self.assertRaises(ValueError):
+            self.make_client('pooled')
+
+
+if __name__ == '__main__':
+    unittest.main()
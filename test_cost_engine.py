@@ -0,0 +1,184 @@
+"""
+Cost Engine 테스트
+
+NumPy 배열 기반 비용 계산과 시나리오 계산, /api/calculate/scenarios 엔드포인트를 테스트하는 모듈입니다.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from app_swagger import app
+from aws_pricing_client import PricingCalculator
+from cost_engine import LineItems, ScenarioCalculator, line_costs, summarize_costs, validate_scenarios
+from test_pricing_calculator import PRICES, make_product, make_resource
+
+
+FRANKFURT = 'EU (Frankfurt)'
+
+
+def make_pricing_client():
+    """instanceType과 location 필터에 따라 가격을 돌려주는 테스트용 클라이언트를 생성합니다."""
+    pricing_client = MagicMock()
+
+    def iter_products(service_code, filters):
+        values = {f['field']: f['value'] for f in filters}
+        instance_type = values.get('instanceType')
+        if instance_type not in PRICES:
+            return []
+        price = PRICES[instance_type] * (1.2 if values.get('location') == FRANKFURT else 1)
+        return [make_product(instance_type, price, instanceType=instance_type)]
+
+    pricing_client.iter_products.side_effect = iter_products
+    return pricing_client
+
+
+class TestArrayCosts(unittest.TestCase):
+    """line_costs / summarize_costs / LineItems 테스트 클래스"""
+
+    def test_matches_loop(self):
+        """배열 계산 결과가 항목별 반복문 계산과 같은지 테스트"""
+        rng = np.random.default_rng(0)
+        count = 1000
+        price = rng.uniform(0, 2, count)
+        price[::7] = np.nan
+        quantity = rng.integers(1, 10, count).astype(np.float64)
+        usage = rng.uniform(0, 730, count)
+        service_ids = rng.integers(0, 3, count)
+
+        costs = line_costs(price, quantity, usage)
+        totals, subtotals = summarize_costs(costs[np.newaxis, :], service_ids, 3)
+
+        expected = [0.0, 0.0, 0.0]
+        for i in range(count):
+            if not np.isnan(price[i]):
+                expected[service_ids[i]] += price[i] * quantity[i] * usage[i]
+        np.testing.assert_allclose(subtotals[0], expected)
+        self.assertAlmostEqual(totals[0], sum(expected), places=6)
+
+    def test_from_resources(self):
+        """리소스 목록을 열 배열로 변환하는지 테스트"""
+        resources = [
+            make_resource('t2.micro', quantity=2),
+            dict(make_resource('m5.large', usage_value=100), serviceCode='AmazonRDS'),
+            make_resource('c5.xlarge')
+        ]
+
+        items = LineItems.from_resources(resources, [0.5, None, 0.25])
+
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items.services, ['AmazonEC2', 'AmazonRDS'])
+        self.assertEqual(items.service_ids.tolist(), [0, 1, 0])
+        self.assertEqual(items.quantity.tolist(), [2.0, 1.0, 1.0])
+        self.assertEqual(items.usage.tolist(), [730.0, 100.0, 730.0])
+        self.assertTrue(np.isnan(items.price[1]))
+        self.assertIsNone(LineItems.from_resources(resources).price)
+
+
+class TestValidateScenarios(unittest.TestCase):
+    """validate_scenarios 테스트 클래스"""
+
+    def test_defaults(self):
+        """시나리오를 생략하면 기준 시나리오 하나를 사용하는지 테스트"""
+        scenarios = validate_scenarios(None)
+
+        self.assertEqual(len(scenarios), 1)
+        self.assertEqual(scenarios[0]['name'], 'baseline')
+        self.assertEqual(scenarios[0]['quantityScale'], 1.0)
+        self.assertIsNone(scenarios[0]['usageValue'])
+
+    def test_invalid(self):
+        """잘못된 시나리오에 ValueError를 발생시키는지 테스트"""
+        for scenario in ({'unknown': 1}, {'quantityScale': -1}, {'usageValue': 'a'},
+                         {'filterOverrides': {'location': 1}}):
+            with self.assertRaises(ValueError):
+                validate_scenarios([scenario])
+
+
+class TestScenarioCalculator(unittest.TestCase):
+    """ScenarioCalculator 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.pricing_client = make_pricing_client()
+        self.calculator = PricingCalculator(self.pricing_client, max_workers=2)
+        self.scenario_calculator = ScenarioCalculator(self.calculator)
+
+    def tearDown(self):
+        self.calculator.shutdown()
+
+    def test_baseline_matches_total_cost(self):
+        """기준 시나리오의 총 비용이 calculate_total_cost와 같은지 테스트"""
+        resources = [make_resource('t2.micro', quantity=5), make_resource('m5.large', usage_value=100),
+                     make_resource('unknown')]
+
+        result = self.scenario_calculator.calculate_scenarios(resources)
+
+        expected = self.calculator.calculate_total_cost(resources)['totalCost']['amount']
+        baseline = result['scenarios'][0]
+        self.assertAlmostEqual(baseline['totalCost']['amount'], expected)
+        self.assertAlmostEqual(baseline['serviceSubtotals']['AmazonEC2'], expected)
+        self.assertEqual(baseline['unpricedCount'], 1)
+        self.assertEqual(baseline['deltaFromBaseline'], 0)
+        self.assertEqual(result['lineItemCount'], 3)
+
+    def test_scenarios(self):
+        """배율, 사용량 변경, 필터 변경 시나리오를 계산하는지 테스트"""
+        resources = [make_resource('m5.large', quantity=quantity) for quantity in range(1, 101)]
+        resources.append(make_resource('t2.micro', usage_value=100))
+        baseline = 0.096 * 730 * sum(range(1, 101)) + 0.0116 * 100
+
+        result = self.scenario_calculator.calculate_scenarios(resources, [
+            {'name': 'baseline'},
+            {'name': 'double', 'quantityScale': 2},
+            {'name': 'business-hours', 'usageValue': 220},
+            {'name': 'discount', 'priceScale': 0.9, 'usageScale': 0.5},
+            {'name': 'frankfurt', 'filterOverrides': {'location': FRANKFURT}}
+        ])
+
+        amounts = {scenario['name']: scenario['totalCost']['amount'] for scenario in result['scenarios']}
+        self.assertAlmostEqual(amounts['baseline'], baseline)
+        self.assertAlmostEqual(amounts['double'], baseline * 2)
+        self.assertAlmostEqual(amounts['business-hours'], (0.096 * sum(range(1, 101)) + 0.0116) * 220)
+        self.assertAlmostEqual(amounts['discount'], baseline * 0.45)
+        self.assertAlmostEqual(amounts['frankfurt'], baseline * 1.2)
+        self.assertAlmostEqual(result['scenarios'][1]['deltaFromBaseline'], baseline)
+        # 기준 조합 2개와 리전을 바꾼 조합 2개만 조회
+        self.assertEqual(result['uniqueLookups'], 4)
+        self.assertEqual(self.pricing_client.iter_products.call_count, 4)
+
+
+class TestScenariosEndpoint(unittest.TestCase):
+    """/api/calculate/scenarios 엔드포인트 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.client = app.test_client()
+
+    def test_scenarios(self):
+        """시나리오별 비용을 반환하는지 테스트"""
+        calculator = PricingCalculator(make_pricing_client(), max_workers=1)
+        with patch('app_swagger.scenario_calculator', ScenarioCalculator(calculator)):
+            response = self.client.post('/api/calculate/scenarios', json={
+                'resources': [make_resource('t2.micro', quantity=2)],
+                'scenarios': [{'name': 'baseline'}, {'name': 'triple', 'quantityScale': 3}]
+            })
+        calculator.shutdown()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([scenario['name'] for scenario in data['scenarios']], ['baseline', 'triple'])
+        self.assertAlmostEqual(data['scenarios'][1]['totalCost']['amount'], 0.0116 * 730 * 6)
+
+    def test_bad_requests(self):
+        """리소스가 없거나 시나리오가 잘못되면 400을 반환하는지 테스트"""
+        self.assertEqual(self.client.post('/api/calculate/scenarios', json={'resources': []}).status_code, 400)
+        response = self.client.post('/api/calculate/scenarios', json={
+            'resources': [make_resource('t2.micro')],
+            'scenarios': [{'quantityScale': 'x'}]
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('quantityScale', response.get_json()['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+JSON Codec 테스트
+
+JSON 백엔드 선택, PriceList 선택적 추출, 응답 인코딩을 테스트하는 모듈입니다.
+"""
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+import numpy as np
+from aws_pricing_client import AWSPricingClient
+from json_codec import JSONCodec, create_json_codec_from_env, msgspec, orjson, select_product_fields
+from pricing_cache import PricingCache
+from rate_limiter import AdaptiveRateLimiter
+from test_term_table import make_product_with_terms
+
+
+def make_price_list_item():
+    """계산에 쓰지 않는 필드(version, effectiveDate, rateCode, appliesTo)가 섞인 PriceList 항목을 생성합니다."""
+    item = make_product_with_terms()
+    item.update({'serviceCode': 'AmazonEC2', 'version': '20250101000000', 'publicationDate': '2025-01-01T00:00:00Z'})
+    item['product']['productFamily'] = 'Compute Instance'
+    for terms in item['terms'].values():
+        for code, term in terms.items():
+            term.update({'sku': 'M5', 'effectiveDate': '2025-01-01T00:00:00Z'})
+            for key, dimension in term['priceDimensions'].items():
+                dimension.update({'rateCode': key, 'appliesTo': []})
+    return item
+
+
+def available_backends():
+    """설치된 백엔드 목록을 반환합니다."""
+    return [backend for backend, module in (('json', json), ('orjson', orjson), ('msgspec', msgspec)) if module]
+
+
+class TestDecodeProduct(unittest.TestCase):
+    """PriceList 디코딩 테스트 클래스"""
+
+    def test_selective_fields(self):
+        """모든 백엔드가 계산에 쓰는 필드만 같은 구조로 남기는지 테스트"""
+        item = make_price_list_item()
+        price_list = json.dumps(item)
+        expected = make_product_with_terms()
+        expected.update({'serviceCode': 'AmazonEC2', 'publicationDate': '2025-01-01T00:00:00Z'})
+        expected['product']['productFamily'] = 'Compute Instance'
+
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(JSONCodec(backend, selective=True).decode_product(price_list), expected)
+
+    def test_full(self):
+        """선택적 추출을 끄면 제품 정보 전체를 반환하는지 테스트"""
+        item = make_price_list_item()
+
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(JSONCodec(backend, selective=False).decode_product(json.dumps(item)), item)
+
+    def test_selective_default(self):
+        """선택적 추출은 msgspec 백엔드에서만 기본으로 켜고 환경 변수로 바꿀 수 있는지 테스트"""
+        self.assertFalse(JSONCodec('json').selective)
+        if orjson is not None:
+            self.assertFalse(JSONCodec('orjson').selective)
+        if msgspec is not None:
+            self.assertTrue(JSONCodec('msgspec').selective)
+
+        with patch.dict(os.environ, {'PRICING_JSON_BACKEND': 'json', 'PRICING_JSON_SELECTIVE': 'true'}):
+            self.assertTrue(create_json_codec_from_env().selective)
+        with patch.dict(os.environ, {'PRICING_JSON_BACKEND': 'json'}):
+            os.environ.pop('PRICING_JSON_SELECTIVE', None)
+            self.assertFalse(create_json_codec_from_env().selective)
+
+    def test_select_in_place(self):
+        """select_product_fields가 전달한 딕셔너리에서 필드를 삭제하는지 테스트"""
+        item = make_price_list_item()
+
+        selected = select_product_fields(item)
+
+        self.assertIs(selected, item)
+        self.assertNotIn('version', item)
+        term = next(iter(item['terms']['Reserved'].values()))
+        self.assertEqual(set(term), {'offerTermCode', 'termAttributes', 'priceDimensions'})
+
+    def test_decode_errors(self):
+        """잘못된 JSON은 decode_errors에 포함된 예외를 발생시키는지 테스트"""
+        for backend in available_backends():
+            codec = JSONCodec(backend)
+            with self.subTest(backend=backend), self.assertRaises(codec.decode_errors):
+                codec.decode_product('{"product": ')
+
+    def test_invalid_backend(self):
+        """알 수 없거나 설치되지 않은 백엔드는 ValueError가 발생하는지 테스트"""
+        with self.assertRaises(ValueError):
+            JSONCodec('simdjson')
+        if msgspec is None:
+            with self.assertRaises(ValueError):
+                JSONCodec('msgspec')
+
+
+class TestEncode(unittest.TestCase):
+    """응답 인코딩 테스트 클래스"""
+
+    def test_dumps(self):
+        """모든 백엔드가 한글을 이스케이프하지 않는 같은 JSON을 만드는지 테스트"""
+        payload = {'name': '서울', 'cost': 1.5, 'items': [1, None, True]}
+
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                encoded = JSONCodec(backend).dumps(payload)
+                self.assertIn('서울'.encode('utf-8'), encoded)
+                self.assertEqual(json.loads(encoded), payload)
+
+    @unittest.skipUnless(orjson, 'orjson is not installed')
+    def test_numpy_values(self):
+        """orjson 인코더가 numpy 값을 직렬화하는지 테스트"""
+        encoded = JSONCodec('orjson').dumps({'costs': np.array([1.5, 2.0]), 'total': np.float64(3.5)})
+
+        self.assertEqual(json.loads(encoded), {'costs': [1.5, 2.0], 'total': 3.5})
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestClientDecoding(unittest.TestCase):
+    """AWSPricingClient PriceList 디코딩 테스트 클래스"""
+
+    def test_get_products_uses_codec(self, mock_boto_client):
+        """get_products가 코덱으로 디코딩하여 불필요한 필드를 보관하지 않는지 테스트"""
+        mock_boto_client.return_value.get_products.return_value = {
+            'PriceList': [json.dumps(make_price_list_item()), 'not json']
+        }
+        client = AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000),
+                                  json_codec=JSONCodec('json', selective=True))
+
+        products = client.get_products('AmazonEC2', [])
+
+        self.assertEqual(len(products), 1)
+        self.assertNotIn('version', products[0])
+        self.assertEqual(products[0]['product']['sku'], 'M5')
+
+
+if __name__ == '__main__':
+    unittest.main()
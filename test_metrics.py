@@ -0,0 +1,196 @@
+"""
+Metrics 테스트
+
+구간 측정, Prometheus 텍스트 형식, 워커 지표 합산, Server-Timing 헤더, /metrics 엔드포인트를 테스트하는 모듈입니다.
+"""
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import metrics
+from app_swagger import app
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from metrics import Histogram, MetricsRegistry
+from pricing_cache import PricingCache
+from rate_limiter import AdaptiveRateLimiter
+from test_pricing_calculator import make_pages, make_product
+
+
+FILTERS = [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'}]
+
+
+def span_count(name):
+    """pricing_span_seconds에 기록된 구간 횟수를 반환합니다."""
+    snapshot = metrics.SPAN_SECONDS.snapshot(span=name)
+    return snapshot['count'] if snapshot else 0
+
+
+class TestPrometheusFormat(unittest.TestCase):
+    """지표 텍스트 형식 테스트 클래스"""
+
+    def test_histogram(self):
+        """히스토그램 구간이 누적 개수로 출력되는지 테스트"""
+        histogram = Histogram('latency_seconds', 'Latency', ('span',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, span='parse')
+
+        lines = histogram.render()
+
+        self.assertIn('# TYPE latency_seconds histogram', lines)
+        self.assertIn('latency_seconds_bucket{span="parse",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{span="parse",le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{span="parse",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_count{span="parse"} 4', lines)
+        self.assertEqual(histogram.snapshot(span='parse')['sum'], 6.05)
+
+    def test_counter_and_collector(self):
+        """카운터 레이블 값을 이스케이프하고 수집 함수의 게이지를 함께 출력하는지 테스트"""
+        registry = MetricsRegistry()
+        counter = registry.counter('pages_total', 'Pages', ('operation',))
+        counter.inc(operation='get "products"')
+        counter.inc(2, operation='get "products"')
+        registry.register_collector(
+            lambda: metrics.gauges_from_stats('pool', {'inUse': 2, 'waitSeconds': 0.5, 'enabled': True}, 'Pool')
+        )
+
+        text = registry.render()
+
+        self.assertIn('pages_total{operation="get \\"products\\""} 3', text)
+        self.assertIn('pool_in_use 2', text)
+        self.assertIn('pool_wait_seconds 0.5', text)
+        self.assertNotIn('pool_enabled', text)
+        self.assertIs(registry.counter('pages_total', 'Pages', ('operation',)), counter)
+
+    def test_multiprocess_aggregation(self):
+        """PRICING_METRICS_DIR이 있으면 다른 워커가 쓴 카운터와 히스토그램 값을 합산하는지 테스트"""
+        def make_registry():
+            registry = MetricsRegistry()
+            registry.counter('pages_total', 'Pages', ('operation',))
+            registry.histogram('latency_seconds', 'Latency', ('span',), buckets=(0.1, 1.0))
+            return registry
+
+        worker = make_registry()
+        worker.counter('pages_total', 'Pages', ('operation',)).inc(2, operation='get_products')
+        worker.histogram('latency_seconds', 'Latency', ('span',)).observe(0.5, span='parse')
+        local = make_registry()
+        local.counter('pages_total', 'Pages', ('operation',)).inc(operation='get_products')
+        local.histogram('latency_seconds', 'Latency', ('span',)).observe(0.05, span='parse')
+        local.register_collector(lambda: metrics.gauges_from_stats('pool', {'inUse': 2}, 'Pool'))
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(os.environ, {'PRICING_METRICS_DIR': tmpdir}):
+            worker.write_snapshot(tmpdir, pid=1)
+            # 자기 프로세스의 파일은 현재 값으로 대신하므로 중복 합산하지 않음
+            local.write_snapshot(tmpdir)
+            text = local.render()
+            metrics.clear_multiprocess_dir()
+            self.assertEqual(os.listdir(tmpdir), [])
+
+        self.assertIn('pages_total{operation="get_products"} 3', text)
+        self.assertIn('latency_seconds_bucket{span="parse",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{span="parse",le="1"} 2', text)
+        self.assertIn('latency_seconds_count{span="parse"} 2', text)
+        self.assertIn(f'pool_in_use{{pid="{os.getpid()}"}} 2', text)
+
+
+class TestRequestTiming(unittest.TestCase):
+    """요청별 구간 측정 테스트 클래스"""
+
+    def test_server_timing(self):
+        """같은 이름의 구간을 합산하여 Server-Timing 형식으로 반환하는지 테스트"""
+        token = metrics.begin_request()
+        metrics.record_span('upstream', 0.1)
+        metrics.record_span('upstream', 0.05)
+        metrics.record_span('parse', 0.002)
+        timing = metrics.end_request(token, 'GET', '/api/services', 200)
+
+        header = timing.server_timing()
+
+        self.assertTrue(header.startswith('upstream;dur=150.0;desc="2", parse;dur=2.0, total;dur='))
+        self.assertIsNone(metrics.current_request())
+
+    def test_bind_context(self):
+        """스레드 풀에서 기록한 구간도 요청의 측정 정보에 합산되는지 테스트"""
+        token = metrics.begin_request()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(metrics.bind_context(lambda _: metrics.record_span('upstream', 0.01)), range(8)))
+        timing = metrics.end_request(token, 'POST', '/api/calculate', 200)
+
+        self.assertEqual(timing.spans['upstream'][1], 8)
+
+    @patch.dict(os.environ, {'PRICING_METRICS_ENABLED': 'false'})
+    def test_disabled(self):
+        """지표를 끄면 구간을 기록하지 않는지 테스트"""
+        before = span_count('disabled')
+
+        with metrics.span('disabled'):
+            pass
+
+        self.assertEqual(span_count('disabled'), before)
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestHotPathSpans(unittest.TestCase):
+    """가격 조회 구간 측정 테스트 클래스"""
+
+    def test_pagination_parse_and_score(self, mock_boto_client):
+        """업스트림 페이지 수/바이트/시간, 파싱, 점수 계산, 정렬 구간을 기록하는지 테스트"""
+        pages = [[make_product(f'SKU{page}{index}', 0.1, instanceType='m5.large') for index in range(3)]
+                 for page in range(2)]
+        mock_boto_client.return_value.get_products.side_effect = make_pages(pages)
+        mock_boto_client.return_value.get_products.__name__ = 'get_products'
+        client = AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+        calculator = PricingCalculator(client, max_workers=1, price_index=None)
+        pages_before = metrics.UPSTREAM_PAGES.value(operation='get_products')
+        bytes_before = metrics.UPSTREAM_PAGE_BYTES.snapshot(operation='get_products') or {'count': 0}
+
+        token = metrics.begin_request()
+        calculator.calculate_price('AmazonEC2', FILTERS)
+        timing = metrics.end_request(token, 'POST', '/api/pricing', 200)
+
+        self.assertEqual(metrics.UPSTREAM_PAGES.value(operation='get_products') - pages_before, 2)
+        self.assertEqual(metrics.UPSTREAM_PAGE_BYTES.snapshot(operation='get_products')['count'] - bytes_before['count'], 2)
+        self.assertEqual(timing.spans['upstream'][1], 2)
+        self.assertEqual(timing.spans['parse'][1], 2)
+        self.assertEqual(list(timing.spans)[-2:], ['score', 'sort'])
+        calculator.shutdown()
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """/metrics 엔드포인트와 Server-Timing 헤더 테스트 클래스"""
+
+    def test_metrics(self):
+        """/metrics가 요청 처리 시간과 구성 요소 상태를 Prometheus 형식으로 반환하는지 테스트"""
+        client = app.test_client()
+        client.get('/api/cache/status')
+
+        response = client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('http_request_duration_seconds_count{method="GET",endpoint="/api/cache/status",status="200"}',
+                      text)
+        self.assertIn('pricing_span_seconds_count{span="serialize"}', text)
+        self.assertIn('pricing_connection_pool_in_use', text)
+        self.assertIn('pricing_rate_limiter_calls', text)
+        self.assertIn('pricing_single_flight_coalesced', text)
+        self.assertIn('pricing_single_flight_in_flight', text)
+
+    def test_server_timing_header(self):
+        """PRICING_SERVER_TIMING을 켠 경우에만 Server-Timing 헤더를 추가하는지 테스트"""
+        client = app.test_client()
+        with patch('app_swagger.pricing_client') as pricing_client:
+            pricing_client.get_services.return_value = ['AmazonEC2']
+            self.assertNotIn('Server-Timing', client.get('/api/services').headers)
+
+            with patch.dict(os.environ, {'PRICING_SERVER_TIMING': 'true'}):
+                response = client.get('/api/services')
+
+        self.assertIn('serialize;dur=', response.headers['Server-Timing'])
+        self.assertIn('total;dur=', response.headers['Server-Timing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Offer Store 테스트
+
+offer 파일 스트리밍 파싱과 로컬 저장소 적재/조회 기능을 테스트하는 모듈입니다.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from offer_stream import iter_offer_entries, OfferStreamReader, merge_product_records
+from offer_store import OfferStore
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from pricing_cache import NullCache
+
+
+def make_offer_file():
+    """테스트용 offer 파일 데이터를 생성합니다."""
+    def product(sku, instance_type, operating_system):
+        return {
+            'sku': sku,
+            'productFamily': 'Compute Instance',
+            'attributes': {
+                'instanceType': instance_type,
+                'operatingSystem': operating_system,
+                'location': 'US East (N. Virginia)'
+            }
+        }
+
+    def on_demand(sku, price):
+        return {
+            f'{sku}.JRTCKXETXF': {
+                'offerTermCode': 'JRTCKXETXF',
+                'sku': sku,
+                'priceDimensions': {
+                    f'{sku}.JRTCKXETXF.6YS6EN2CT7': {
+                        'unit': 'Hrs',
+                        'description': f'{sku} hourly',
+                        'pricePerUnit': {'USD': price}
+                    }
+                },
+                'termAttributes': {}
+            }
+        }
+
+    return {
+        'formatVersion': 'v1.0',
+        'disclaimer': 'test',
+        'offerCode': 'AmazonEC2',
+        'version': '20250101000000',
+        'publicationDate': '2025-01-01T00:00:00Z',
+        'products': {
+            'SKU1': product('SKU1', 't2.micro', 'Linux'),
+            'SKU2': product('SKU2', 't2.micro', 'Windows'),
+            'SKU3': product('SKU3', 'm5.large', 'Linux')
+        },
+        'terms': {
+            'OnDemand': {
+                'SKU1': on_demand('SKU1', '0.0116'),
+                'SKU2': on_demand('SKU2', '0.0162'),
+                'SKU3': on_demand('SKU3', '0.0960')
+            }
+        }
+    }
+
+
+class TestOfferStream(unittest.TestCase):
+    """offer 파일 스트리밍 파싱 테스트 클래스"""
+
+    def test_entries_with_small_chunks(self):
+        """작은 청크 크기로 읽어도 항목이 올바르게 파싱되는지 테스트"""
+        offer = make_offer_file()
+        data = json.dumps(offer, indent=2).encode('utf-8')
+
+        entries = list(iter_offer_entries(io.BytesIO(data), chunk_size=7))
+
+        meta = {key: value for kind, key, value in entries if kind == 'meta'}
+        products = {key: value for kind, key, value in entries if kind == 'product'}
+        terms = {key: value for kind, key, value in entries if kind == 'term'}
+
+        self.assertEqual(meta['offerCode'], 'AmazonEC2')
+        self.assertEqual(products, offer['products'])
+        self.assertEqual(terms[('OnDemand', 'SKU2')], offer['terms']['OnDemand']['SKU2'])
+
+    def test_reader_batches_and_progress(self):
+        """배치 크기, 약정 유형 선택, 진행 상황 보고 테스트"""
+        offer = make_offer_file()
+        offer['terms']['Reserved'] = {'SKU1': {'SKU1.4NA7Y494T4': {'priceDimensions': {}}}}
+        offer['terms']['Spot'] = {'SKU1': {'SKU1.SPOT': {'priceDimensions': {}}}}
+        data = json.dumps(offer).encode('utf-8')
+        progress = []
+
+        reader = OfferStreamReader(io.BytesIO(data), batch_size=2, chunk_size=16,
+                                   progress_callback=progress.append, progress_interval=0)
+        batches = list(reader.iter_batches())
+
+        self.assertEqual([(kind, len(records)) for kind, records in batches],
+                         [('products', 2), ('products', 1), ('terms', 2), ('terms', 2)])
+        self.assertEqual(reader.stats.products, 3)
+        self.assertEqual(reader.stats.terms, 4)
+        self.assertEqual(progress[-1]['bytesRead'], len(data))
+        self.assertEqual(progress[-1]['progress'], 1.0)
+        self.assertGreater(progress[-1]['recordsPerSecond'], 0)
+
+    def test_records_match_calculator_shape(self):
+        """합친 레코드를 PricingCalculator가 그대로 처리할 수 있는지 테스트"""
+        data = json.dumps(make_offer_file()).encode('utf-8')
+        records = {}
+        for kind, batch in OfferStreamReader(io.BytesIO(data)).iter_batches():
+            for record in batch:
+                sku = record['product']['sku']
+                if kind == 'products':
+                    records[sku] = record
+                else:
+                    merge_product_records(records[sku], record)
+
+        calculator = PricingCalculator(pricing_client=None)
+        pricing = calculator._extract_price_from_product(records['SKU1'])
+        details = calculator._extract_resource_details(records['SKU1'], [])
+
+        self.assertEqual(pricing['pricePerUnit'], 0.0116)
+        self.assertEqual(pricing['unit'], 'Hrs')
+        self.assertEqual(details['instanceType'], 't2.micro')
+
+
+class TestOfferStore(unittest.TestCase):
+    """OfferStore 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = OfferStore(os.path.join(self.tmpdir.name, 'offers.db'))
+        self.store.ingest(io.BytesIO(json.dumps(make_offer_file()).encode('utf-8')))
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_get_products(self):
+        """필터 조건에 맞는 제품 조회 테스트"""
+        products = self.store.get_products('AmazonEC2', [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'},
+            {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'}
+        ])
+
+        self.assertEqual(len(products), 1)
+        self.assertEqual(products[0]['product']['sku'], 'SKU1')
+        self.assertEqual(products[0]['serviceCode'], 'AmazonEC2')
+        on_demand = products[0]['terms']['OnDemand']
+        self.assertIn('SKU1.JRTCKXETXF', on_demand)
+
+    def test_get_attribute_values(self):
+        """속성 값 조회 테스트"""
+        self.assertEqual(
+            self.store.get_attribute_values('AmazonEC2', 'instanceType'),
+            ['m5.large', 't2.micro']
+        )
+
+    def test_reingest_replaces_service(self):
+        """같은 서비스를 다시 적재하면 기존 데이터가 교체되는지 테스트"""
+        offer = make_offer_file()
+        del offer['products']['SKU3']
+        del offer['terms']['OnDemand']['SKU3']
+        self.store.ingest(io.BytesIO(json.dumps(offer).encode('utf-8')))
+
+        self.assertEqual(self.store.get_attribute_values('AmazonEC2', 'instanceType'), ['t2.micro'])
+
+    def test_regional_files_keep_other_regions(self):
+        """리전별 offer 파일을 차례로 적재하면 다른 리전 제품은 남고 같은 리전 제품만 교체되는지 테스트"""
+        def regional_offer(region, location, skus):
+            offer = make_offer_file()
+            offer['products'] = {
+                f'{region}-{sku}': dict(product, sku=f'{region}-{sku}',
+                                        attributes={**product['attributes'], 'regionCode': region,
+                                                    'location': location})
+                for sku, product in offer['products'].items() if sku in skus
+            }
+            offer['terms']['OnDemand'] = {
+                f'{region}-{sku}': {code: dict(term, sku=f'{region}-{sku}') for code, term in terms.items()}
+                for sku, terms in offer['terms']['OnDemand'].items() if sku in skus
+            }
+            return io.BytesIO(json.dumps(offer).encode('utf-8'))
+
+        store = OfferStore(os.path.join(self.tmpdir.name, 'regional.db'))
+        store.ingest(regional_offer('us-east-1', 'US East (N. Virginia)', ('SKU1', 'SKU2', 'SKU3')))
+        store.ingest(regional_offer('eu-west-1', 'EU (Ireland)', ('SKU1', 'SKU3')))
+
+        self.assertEqual(len(store.get_products('AmazonEC2', [])), 5)
+        self.assertEqual(store.get_attribute_values('AmazonEC2', 'regionCode'), ['eu-west-1', 'us-east-1'])
+
+        # us-east-1을 다시 적재하면 빠진 제품만 그 리전에서 삭제
+        store.ingest(regional_offer('us-east-1', 'US East (N. Virginia)', ('SKU1',)))
+        skus = sorted(product['product']['sku'] for product in store.get_products('AmazonEC2', []))
+        self.assertEqual(skus, ['eu-west-1-SKU1', 'eu-west-1-SKU3', 'us-east-1-SKU1'])
+        product = store.get_products('AmazonEC2', [{'field': 'sku', 'value': 'us-east-1-SKU1'}])[0]
+        self.assertIn('SKU1.JRTCKXETXF', product['terms']['OnDemand'])
+        store.close()
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_client_serves_from_store(self, mock_boto_client):
+        """적재된 서비스는 AWS API 호출 없이 저장소에서 조회되는지 테스트"""
+        client = AWSPricingClient(cache=NullCache(), offer_store=self.store)
+
+        products = client.get_products('AmazonEC2', [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'}
+        ])
+
+        self.assertEqual(len(products), 1)
+        mock_boto_client.return_value.get_products.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Persistent Catalog Cache 테스트
+
+카탈로그 영속 캐시의 재시작 후 재사용, 버전 관리, 백그라운드 새로고침 기능을 테스트하는 모듈입니다.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from persistent_cache import PersistentCatalogCache
+from pricing_cache import make_cache_key, NullCache
+from aws_pricing_client import AWSPricingClient
+
+
+class TestPersistentCatalogCache(unittest.TestCase):
+    """PersistentCatalogCache 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'catalog.db')
+        self.now = 1000.0
+        self.key = make_cache_key('get_attribute_values', 'AmazonEC2', 'instanceType')
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.tmpdir.cleanup()
+
+    def make_cache(self, **kwargs):
+        return PersistentCatalogCache(self.db_path, ttl=100, clock=lambda: self.now, **kwargs)
+
+    def test_survives_restart(self):
+        """다른 인스턴스(재시작한 프로세스)에서도 저장된 값을 사용하는지 테스트"""
+        self.make_cache().get_or_load(self.key, lambda: ['t2.micro', 'm5.large'])
+
+        loader = MagicMock()
+        value = self.make_cache().get_or_load(self.key, loader)
+
+        self.assertEqual(value, ['t2.micro', 'm5.large'])
+        loader.assert_not_called()
+
+    def test_stale_value_served_while_refreshing(self):
+        """TTL이 지난 항목은 즉시 반환하고 백그라운드에서 새로고침하는지 테스트"""
+        on_refresh = MagicMock()
+        cache = self.make_cache(on_refresh=on_refresh)
+        cache.get_or_load(self.key, lambda: ['old'])
+
+        self.now += 200
+        value = cache.get_or_load(self.key, lambda: ['new'])
+        cache.wait_for_refreshes()
+
+        self.assertEqual(value, ['old'])
+        self.assertEqual(cache.get(self.key), (True, False, ['new']))
+        on_refresh.assert_called_once_with(self.key, ['new'])
+        self.assertEqual(cache.stats()['staleHits'], 1)
+
+    def test_new_catalog_version_marks_stale(self):
+        """카탈로그 게시일이 바뀌면 해당 서비스 항목이 오래된 항목이 되는지 테스트"""
+        cache = self.make_cache()
+        cache.note_catalog_version('AmazonEC2', '2025-01-01T00:00:00Z')
+        cache.set(self.key, ['old'])
+
+        self.assertFalse(cache.note_catalog_version('AmazonEC2', '2024-12-01T00:00:00Z'))
+        self.assertFalse(cache.get(self.key)[1])
+
+        self.assertTrue(cache.note_catalog_version('AmazonEC2', '2025-02-01T00:00:00Z'))
+        self.assertTrue(cache.get(self.key)[1])
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_client_uses_persistent_cache(self, mock_boto_client):
+        """AWSPricingClient가 재시작 후에도 AWS 호출 없이 카탈로그를 반환하는지 테스트"""
+        mock_boto_client.return_value.get_attribute_values.return_value = {
+            'AttributeValues': [{'Value': 't2.micro'}]
+        }
+
+        first = AWSPricingClient(cache=NullCache(), persistent_cache=self.make_cache())
+        first.get_attribute_values('AmazonEC2', 'instanceType')
+        second = AWSPricingClient(cache=NullCache(), persistent_cache=self.make_cache())
+        values = second.get_attribute_values('AmazonEC2', 'instanceType')
+
+        self.assertEqual(values, ['t2.micro'])
+        self.assertEqual(mock_boto_client.return_value.get_attribute_values.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
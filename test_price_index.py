@@ -0,0 +1,159 @@
+"""
+Price Index 테스트
+
+가격 색인 조회와 PricingCalculator 색인 연동 기능을 테스트하는 모듈입니다.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from price_index import PriceIndex
+from offer_store import OfferStore
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from pricing_cache import PricingCache
+from test_offer_store import make_offer_file
+
+
+EC2_ATTRIBUTES = {
+    'location': 'US East (N. Virginia)',
+    'instanceType': 'm5.large',
+    'operatingSystem': 'Linux',
+    'tenancy': 'Shared'
+}
+
+EC2_FILTERS = [
+    {'type': 'TERM_MATCH', 'field': field, 'value': value}
+    for field, value in EC2_ATTRIBUTES.items()
+]
+
+
+def make_product(sku, price, attributes):
+    """테스트용 제품 정보를 생성합니다."""
+    return {
+        'product': {'sku': sku, 'attributes': attributes},
+        'terms': {'OnDemand': {f'{sku}.TERM': {'priceDimensions': {
+            f'{sku}.TERM.DIM': {'unit': 'Hrs', 'description': sku, 'pricePerUnit': {'USD': str(price)}}
+        }}}}
+    }
+
+
+class TestPriceIndex(unittest.TestCase):
+    """PriceIndex 테스트 클래스"""
+
+    def test_key_ignores_filter_order(self):
+        """필터 순서와 무관하게 같은 색인 키를 만드는지 테스트"""
+        index = PriceIndex()
+
+        self.assertEqual(
+            index.key_for_filters('AmazonEC2', EC2_FILTERS),
+            index.key_for_filters('AmazonEC2', list(reversed(EC2_FILTERS)))
+        )
+        self.assertEqual(
+            index.key_for_filters('AmazonEC2', EC2_FILTERS),
+            index.key_for_attributes('AmazonEC2', EC2_ATTRIBUTES)
+        )
+        self.assertIsNone(index.key_for_filters('AmazonEC2', EC2_FILTERS[:2]))
+
+    def test_lookup_requires_complete_bucket(self):
+        """완전한 버킷만 조회 결과를 반환하는지 테스트"""
+        now = [0.0]
+        index = PriceIndex(ttl=10, clock=lambda: now[0])
+        index.add('AmazonEC2', 'SKU1', EC2_ATTRIBUTES, {'pricePerUnit': 0.096, 'unit': 'Hrs'})
+
+        self.assertIsNone(index.lookup('AmazonEC2', EC2_FILTERS))
+
+        index.mark_complete(index.key_for_filters('AmazonEC2', EC2_FILTERS))
+        self.assertEqual([record.sku for record in index.lookup('AmazonEC2', EC2_FILTERS)], ['SKU1'])
+
+        now[0] = 11
+        self.assertIsNone(index.lookup('AmazonEC2', EC2_FILTERS))
+
+
+class TestCalculatorPriceIndex(unittest.TestCase):
+    """PricingCalculator 가격 색인 연동 테스트 클래스"""
+
+    def test_second_lookup_served_from_index(self):
+        """같은 필터의 두 번째 가격 조회가 색인에서 같은 결과로 응답되는지 테스트"""
+        pricing_client = MagicMock()
+        pricing_client.iter_products.return_value = [
+            make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES)),
+            make_product('SKU2', 0.100, dict(EC2_ATTRIBUTES))
+        ]
+        calculator = PricingCalculator(pricing_client, price_index=PriceIndex())
+
+        first = calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+        second = calculator.calculate_price('AmazonEC2', list(reversed(EC2_FILTERS)))
+
+        self.assertEqual(pricing_client.iter_products.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_mismatched_products_not_marked_complete(self):
+        """필터와 속성이 다른 제품이 섞이면 색인을 사용하지 않는지 테스트"""
+        pricing_client = MagicMock()
+        pricing_client.iter_products.return_value = [
+            make_product('SKU1', 0.096, {**EC2_ATTRIBUTES, 'tenancy': 'Dedicated'})
+        ]
+        calculator = PricingCalculator(pricing_client, price_index=PriceIndex())
+
+        calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+        calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+
+        self.assertEqual(pricing_client.iter_products.call_count, 2)
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_invalidate_cache_clears_index(self, mock_boto_client):
+        """클라이언트 캐시를 무효화하면 제품 조회로 만든 색인 버킷도 비워 다시 조회하는지 테스트"""
+        mock_boto_client.return_value.get_products.return_value = {
+            'PriceList': [json.dumps(make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES)))]
+        }
+        pricing_client = AWSPricingClient(cache=PricingCache(), persistent_cache=None, offer_store=None)
+        calculator = PricingCalculator(pricing_client, price_index=PriceIndex())
+        calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+
+        # 제품 조회와 관계없는 캐시 무효화는 색인을 유지
+        pricing_client.invalidate_cache(method='get_services')
+        self.assertIsNotNone(calculator.price_index.lookup('AmazonEC2', EC2_FILTERS))
+
+        pricing_client.invalidate_cache(service_code='AmazonEC2')
+        self.assertIsNone(calculator.price_index.lookup('AmazonEC2', EC2_FILTERS))
+        calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 2)
+
+    def test_build_from_offer_store(self):
+        """오프라인 저장소 전체 카탈로그로 색인을 만들고 조회하는지 테스트"""
+        offer = make_offer_file()
+        for product in offer['products'].values():
+            product['attributes']['tenancy'] = 'Shared'
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OfferStore(os.path.join(tmpdir, 'offers.db'))
+            store.ingest(io.BytesIO(json.dumps(offer).encode('utf-8')))
+            pricing_client = MagicMock()
+            pricing_client.offer_store = store
+            calculator = PricingCalculator(pricing_client, price_index=PriceIndex())
+
+            self.assertEqual(calculator.build_price_index('AmazonEC2'), 3)
+            result = calculator.calculate_price('AmazonEC2', [
+                {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'},
+                {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'},
+                {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Windows'},
+                {'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}
+            ])
+            with self.assertRaises(ValueError):
+                calculator.calculate_price('AmazonEC2', [
+                    {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'},
+                    {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'c5.xlarge'},
+                    {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'},
+                    {'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}
+                ])
+            store.close()
+
+        self.assertEqual(result['priceInfos'][0]['pricing']['pricePerUnit'], 0.0162)
+        pricing_client.iter_products.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Pricing Cache 테스트
+
+PricingCache와 AWSPricingClient 캐시 연동 기능을 테스트하는 모듈입니다.
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+from pricing_cache import PricingCache, make_cache_key
+from aws_pricing_client import AWSPricingClient
+
+
+class FakeClock:
+    """테스트용 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPricingCache(unittest.TestCase):
+    """PricingCache 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.clock = FakeClock()
+        self.cache = PricingCache(max_size=2, ttls={'get_products': 10}, clock=self.clock)
+
+    def test_key_ignores_filter_order(self):
+        """필터 순서와 무관한 캐시 키 테스트"""
+        filters = [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'},
+            {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'}
+        ]
+        self.assertEqual(
+            make_cache_key('get_products', 'AmazonEC2', filters),
+            make_cache_key('get_products', 'AmazonEC2', list(reversed(filters)))
+        )
+
+    def test_ttl_expiration(self):
+        """TTL 만료 테스트"""
+        key = make_cache_key('get_products', 'AmazonEC2', [])
+        loader = MagicMock(return_value=['product'])
+
+        self.cache.get_or_load(key, loader)
+        self.cache.get_or_load(key, loader)
+        self.assertEqual(loader.call_count, 1)
+
+        self.clock.now = 11
+        self.cache.get_or_load(key, loader)
+        self.assertEqual(loader.call_count, 2)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['expirations'], 1)
+
+    def test_lru_eviction(self):
+        """LRU 제거 테스트"""
+        key_a = make_cache_key('get_products', 'AmazonEC2', [])
+        key_b = make_cache_key('get_products', 'AmazonRDS', [])
+        key_c = make_cache_key('get_products', 'AmazonS3', [])
+
+        self.cache.set(key_a, 'a')
+        self.cache.set(key_b, 'b')
+        self.cache.get(key_a)
+        self.cache.set(key_c, 'c')
+
+        self.assertTrue(self.cache.get(key_a)[0])
+        self.assertFalse(self.cache.get(key_b)[0])
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_invalidate_by_service(self):
+        """서비스별 무효화 테스트"""
+        self.cache.set(make_cache_key('get_products', 'AmazonEC2', []), 'a')
+        self.cache.set(make_cache_key('get_products', 'AmazonRDS', []), 'b')
+
+        removed = self.cache.invalidate(service_code='AmazonEC2')
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(len(self.cache), 1)
+
+
+class TestAWSPricingClientCache(unittest.TestCase):
+    """AWSPricingClient 캐시 연동 테스트 클래스"""
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_get_products_cached(self, mock_boto_client):
+        """동일한 필터 조합의 get_products 호출 캐시 테스트"""
+        mock_boto_client.return_value.get_products.return_value = {
+            'PriceList': ['{"product": {"sku": "ABC"}}']
+        }
+        client = AWSPricingClient(cache=PricingCache())
+        filters = [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'},
+            {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'}
+        ]
+
+        first = client.get_products('AmazonEC2', filters)
+        second = client.get_products('AmazonEC2', list(reversed(filters)))
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 1)
+
+        client.invalidate_cache(service_code='AmazonEC2')
+        client.get_products('AmazonEC2', filters)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,356 @@
+"""
+Pricing Calculator 테스트
+
+PricingCalculator의 가격 계산과 비용 계산 기능을 테스트하는 모듈입니다.
+"""
+
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from price_index import PriceIndex
+from pricing_cache import PricingCache
+from rate_limiter import AdaptiveRateLimiter
+
+
+def make_product(sku, price, unit='Hrs', **attributes):
+    """테스트용 제품 정보를 생성합니다."""
+    return {
+        'product': {
+            'sku': sku,
+            'productFamily': 'Compute Instance',
+            'attributes': attributes
+        },
+        'terms': {
+            'OnDemand': {
+                f'{sku}.JRTCKXETXF': {
+                    'priceDimensions': {
+                        f'{sku}.JRTCKXETXF.6YS6EN2CT7': {
+                            'unit': unit,
+                            'description': f'{sku} price',
+                            'pricePerUnit': {'USD': str(price)}
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+def make_resource(instance_type, quantity=1, usage_value=730):
+    """테스트용 리소스 요청을 생성합니다."""
+    return {
+        'serviceCode': 'AmazonEC2',
+        'filters': [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': instance_type}],
+        'quantity': quantity,
+        'usageType': 'Hours',
+        'usageValue': usage_value
+    }
+
+
+PRICES = {'t2.micro': 0.0116, 'm5.large': 0.096, 'c5.xlarge': 0.17}
+
+
+class TestCalculateTotalCost(unittest.TestCase):
+    """calculate_total_cost 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.pricing_client = MagicMock()
+
+        def iter_products(service_code, filters):
+            instance_type = next(f['value'] for f in filters if f['field'] == 'instanceType')
+            if instance_type not in PRICES:
+                return []
+            return [make_product(instance_type, PRICES[instance_type], instanceType=instance_type)]
+
+        self.pricing_client.iter_products.side_effect = iter_products
+
+    def test_total_cost(self):
+        """총 비용 계산 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1)
+
+        result = calculator.calculate_total_cost([make_resource('t2.micro', quantity=5)])
+
+        self.assertAlmostEqual(result['totalCost']['amount'], 0.0116 * 730 * 5)
+        self.assertEqual(result['resourceCosts'][0]['resourceDetails']['instanceType'], 't2.micro')
+
+    def test_concurrent_results_keep_input_order(self):
+        """동시 실행 결과가 입력 순서를 유지하고 실패한 리소스만 제외되는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=4)
+        resources = [make_resource(name) for name in ['c5.xlarge', 'unknown', 't2.micro', 'm5.large']]
+
+        result = calculator.calculate_total_cost(resources)
+
+        self.assertEqual(
+            [cost['resourceDetails']['instanceType'] for cost in result['resourceCosts']],
+            ['c5.xlarge', 't2.micro', 'm5.large']
+        )
+        calculator.shutdown()
+
+    def test_iter_total_cost_matches_total(self):
+        """스트리밍 계산이 리소스 비용을 모두 전송하고 calculate_total_cost와 같은 총 비용으로 끝나는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=4)
+        resources = [make_resource(name, quantity=2) for name in ['c5.xlarge', 'unknown', 't2.micro', 'm5.large']]
+
+        events = list(calculator.iter_total_cost(resources))
+        expected = calculator.calculate_total_cost(resources)
+
+        self.assertEqual(sorted(event['index'] for event in events[:-1]), [0, 2, 3])
+        self.assertEqual(events[-1]['type'], 'totalCost')
+        self.assertEqual(events[-1]['totalCost'], expected['totalCost'])
+        self.assertEqual(events[-1]['resourceCount'], 3)
+        calculator.shutdown()
+
+    def test_concurrency_limit(self):
+        """동시 실행 수가 max_workers를 넘지 않는지 테스트"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+        iter_products = self.pricing_client.iter_products.side_effect
+
+        def slow_iter_products(service_code, filters):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return iter_products(service_code, filters)
+
+        self.pricing_client.iter_products.side_effect = slow_iter_products
+        calculator = PricingCalculator(self.pricing_client, max_workers=2)
+
+        # 조합이 모두 다르도록 리전 필터를 추가 (같은 조합은 한 번만 조회하므로)
+        resources = [make_resource('t2.micro') for _ in range(6)]
+        for number, resource in enumerate(resources):
+            resource['filters'].append({'type': 'TERM_MATCH', 'field': 'location', 'value': f'region-{number}'})
+
+        result = calculator.calculate_total_cost(resources)
+
+        self.assertEqual(len(result['resourceCosts']), 6)
+        self.assertEqual(result['uniqueLookups'], 6)
+        self.assertLessEqual(max(peak), 2)
+        calculator.shutdown()
+
+    def test_identical_specs_are_resolved_once(self):
+        """같은 (서비스 코드, 필터) 조합은 한 번만 조회하고 수량과 사용량을 리소스마다 적용하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=4)
+        resources = [make_resource('m5.large', quantity=quantity) for quantity in range(1, 301)]
+        resources.append(make_resource('t2.micro', usage_value=100))
+        reordered = make_resource('m5.large', quantity=2, usage_value=24)
+        reordered['filters'] = list(reversed(reordered['filters'] + [
+            {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'}
+        ]))
+        resources.append(reordered)
+        resources.append(dict(reordered, filters=list(reversed(reordered['filters']))))
+
+        result = calculator.calculate_total_cost(resources)
+
+        self.assertEqual(result['uniqueLookups'], 3)
+        self.assertEqual(self.pricing_client.iter_products.call_count, 3)
+        self.assertEqual(len(result['resourceCosts']), 303)
+        self.assertEqual([cost['quantity'] for cost in result['resourceCosts'][:300]], list(range(1, 301)))
+        expected = (0.096 * 730 * sum(range(1, 301)) + 0.0116 * 100 + 2 * 0.096 * 24 * 2)
+        self.assertAlmostEqual(result['totalCost']['amount'], expected)
+
+        events = list(calculator.iter_total_cost(resources))
+        self.assertEqual(events[-1]['uniqueLookups'], 3)
+        self.assertEqual(events[-1]['resourceCount'], 303)
+        self.assertEqual(events[-1]['totalCost'], result['totalCost'])
+        calculator.shutdown()
+
+
+class TestCalculatePrice(unittest.TestCase):
+    """calculate_price 테스트 클래스"""
+
+    def test_top_k_matches_full_sort(self):
+        """상위 K개 선택 결과가 전체 정렬 후 10개를 자른 결과와 같은지 테스트 (같은 점수는 입력 순서 유지)"""
+        filters = [
+            {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'},
+            {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Linux'},
+            {'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}
+        ]
+        products = [
+            make_product(
+                f'SKU{index}', 0.01 * index,
+                instanceType='m5.large' if index % 2 else 't2.micro',
+                operatingSystem='Linux' if index % 3 else 'Windows',
+                tenancy='Shared' if index % 5 else 'Dedicated'
+            )
+            for index in range(200)
+        ]
+        pricing_client = MagicMock()
+        pricing_client.iter_products.return_value = products
+        calculator = PricingCalculator(pricing_client)
+
+        result = calculator.calculate_price('AmazonEC2', filters)
+
+        expected = sorted(
+            products,
+            key=lambda product: calculator._calculate_match_score(product, filters),
+            reverse=True
+        )[:10]
+        self.assertEqual(
+            [info['pricing']['description'] for info in result['priceInfos']],
+            [f"{product['product']['sku']} price" for product in expected]
+        )
+        self.assertEqual(
+            result['priceInfos'][0]['resourceDetails'],
+            calculator._extract_resource_details(expected[0], filters)
+        )
+
+
+
+def make_pages(pages):
+    """제품 목록의 목록을 NextToken으로 이어지는 get_products 응답 함수로 만듭니다."""
+    def get_products(**kwargs):
+        index = int(kwargs.get('NextToken', 0))
+        response = {'PriceList': [json.dumps(product) for product in pages[index]]}
+        if index + 1 < len(pages):
+            response['NextToken'] = str(index + 1)
+        return response
+    return get_products
+
+
+@patch('aws_pricing_client.boto3.client')
+class TestStreamingProducts(unittest.TestCase):
+    """iter_products 스트리밍 조회와 조기 종료 테스트 클래스"""
+
+    filters = [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 'm5.large'}]
+
+    def make_client(self):
+        return AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+
+    def wait_for_producers(self):
+        """iter_products의 페이지 조회 스레드가 끝날 때까지 기다립니다."""
+        for thread in threading.enumerate():
+            if thread.name == 'pricing-products':
+                thread.join(5)
+
+    def test_stops_paginating_after_caller_stops(self, mock_boto_client):
+        """호출자가 반복을 멈추면 남은 페이지를 요청하지 않고 일부 결과를 캐시하지 않는지 테스트"""
+        pages = [[make_product(f'SKU{page}{index}', 0.1, instanceType='m5.large') for index in range(3)]
+                 for page in range(3)]
+        mock_boto_client.return_value.get_products.side_effect = make_pages(pages)
+        client = self.make_client()
+        client.PRODUCT_STREAM_BUFFER = 1
+
+        products = client.iter_products('AmazonEC2', self.filters)
+        self.assertEqual(next(products)['product']['sku'], 'SKU00')
+        products.close()
+        self.wait_for_producers()
+
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 1)
+        self.assertEqual(client.cache.stats()['size'], 0)
+        # 다음 조회는 처음부터 모든 페이지를 가져와 캐시
+        self.assertEqual(len(client.get_products('AmazonEC2', self.filters)), 9)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 4)
+
+    def test_cache_lookup_counted_once(self, mock_boto_client):
+        """끝까지 읽은 결과를 캐시하고 조회마다 적중/미스를 한 번만 세는지 테스트"""
+        pages = [[make_product(f'SKU{page}{index}', 0.1, instanceType='m5.large') for index in range(2)]
+                 for page in range(3)]
+        mock_boto_client.return_value.get_products.side_effect = make_pages(pages)
+        client = self.make_client()
+
+        self.assertEqual(len(list(client.iter_products('AmazonEC2', self.filters))), 6)
+        self.assertEqual(len(list(client.iter_products('AmazonEC2', self.filters))), 6)
+
+        stats = client.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 3)
+
+    def test_calculate_price_stops_after_exact_matches(self, mock_boto_client):
+        """상위 결과가 모두 정확히 일치하면 남은 페이지를 기다리지 않고 조회를 멈추는지 테스트"""
+        pages = [[make_product(f'SKU{page}{index}', 0.1 * index, instanceType='m5.large') for index in range(10)]
+                 for page in range(3)]
+        get_products = make_pages(pages)
+        release = threading.Event()
+
+        def blocking_get_products(**kwargs):
+            if kwargs.get('NextToken'):
+                release.wait(5)
+            return get_products(**kwargs)
+
+        mock_boto_client.return_value.get_products.side_effect = blocking_get_products
+        client = self.make_client()
+        calculator = PricingCalculator(client)
+
+        # 두 번째 페이지 응답이 막혀 있어도 첫 페이지만으로 응답
+        result = calculator.calculate_price('AmazonEC2', self.filters)
+        release.set()
+        self.wait_for_producers()
+
+        self.assertEqual(
+            [info['pricing']['description'] for info in result['priceInfos']],
+            [f'SKU0{index} price' for index in range(10)]
+        )
+        # 이미 요청한 두 번째 페이지 이후로는 요청하지 않음
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 2)
+        self.assertEqual(client.cache.stats()['size'], 0)
+
+    def test_repeated_indexable_calls_paginate_once(self, mock_boto_client):
+        """색인할 수 있는 같은 조회를 반복하면 한 번만 페이지를 가져오고 이후에는 색인에서 응답하는지 테스트"""
+        attributes = {'location': 'US East (N. Virginia)', 'instanceType': 'm5.large',
+                      'operatingSystem': 'Linux', 'tenancy': 'Shared'}
+        filters = [{'type': 'TERM_MATCH', 'field': field, 'value': value} for field, value in attributes.items()]
+        pages = [[make_product(f'SKU{page}{index}', 0.1 * index, **attributes) for index in range(10)]
+                 for page in range(3)]
+        mock_boto_client.return_value.get_products.side_effect = make_pages(pages)
+        calculator = PricingCalculator(self.make_client(), price_index=PriceIndex())
+
+        results = [calculator.calculate_price('AmazonEC2', filters) for _ in range(3)]
+
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 3)
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+        self.assertEqual(calculator.price_index.stats()['hits'], 2)
+
+    def test_concurrent_calls_are_coalesced(self, mock_boto_client):
+        """끝까지 읽는 같은 조회가 동시에 들어오면 페이지를 한 번만 가져오는지 테스트"""
+        pages = [[make_product(f'SKU{page}{index}', 0.1, instanceType='m5.large') for index in range(10)]
+                 for page in range(3)]
+        get_products = make_pages(pages)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get_products(**kwargs):
+            started.set()
+            release.wait(5)
+            return get_products(**kwargs)
+
+        mock_boto_client.return_value.get_products.side_effect = slow_get_products
+        client = self.make_client()
+        calculator = PricingCalculator(client)
+        results = []
+        # 제품에 없는 속성 필터가 있어 정확히 일치하는 제품이 없으므로 모든 페이지를 읽음
+        filters = self.filters + [{'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}]
+
+        def calculate():
+            results.append(calculator.calculate_price('AmazonEC2', filters))
+
+        threads = [threading.Thread(target=calculate) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # 나머지 요청이 진행 중인 조회에 합쳐질 때까지 대기
+        for _ in range(100):
+            if client.single_flight.stats()['coalesced'] == 4:
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 3)
+        self.assertEqual(client.single_flight.stats()['coalesced'], 4)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
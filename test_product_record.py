@@ -0,0 +1,80 @@
+"""
+Product Record 테스트
+
+CompactProduct의 속성 인코딩, 문자열 공유, 가격 정보 복원 기능을 테스트하는 모듈입니다.
+"""
+
+import unittest
+from product_record import AttributeSchema, CompactProduct
+from price_index import PriceIndex
+
+
+ATTRIBUTES = {
+    'location': 'US East (N. Virginia)',
+    'instanceType': 'm5.large',
+    'operatingSystem': 'Linux',
+    'tenancy': 'Shared',
+    'vcpu': '2'
+}
+
+PRICING = {
+    'currency': 'USD',
+    'pricePerUnit': 0.096,
+    'unit': 'Hrs',
+    'description': '$0.096 per On Demand Linux m5.large Instance Hour'
+}
+
+
+class TestAttributeSchema(unittest.TestCase):
+    """AttributeSchema 테스트 클래스"""
+
+    def test_round_trip(self):
+        """인코딩한 값 튜플이 같은 속성 딕셔너리로 복원되는지 테스트"""
+        schema = AttributeSchema()
+        first = schema.encode(ATTRIBUTES)
+        second = schema.encode({'instanceType': 't2.micro', 'memory': '1 GiB'})
+
+        self.assertEqual(schema.decode(first), ATTRIBUTES)
+        self.assertEqual(schema.decode(second), {'instanceType': 't2.micro', 'memory': '1 GiB'})
+        self.assertEqual(schema.get(first, 'vcpu'), '2')
+        self.assertIsNone(schema.get(first, 'memory'))
+
+    def test_values_are_shared(self):
+        """같은 속성 값이 레코드 간에 같은 문자열 객체를 공유하는지 테스트"""
+        schema = AttributeSchema()
+        first = schema.encode({'location': ''.join(['US East ', '(N. Virginia)'])})
+        second = schema.encode({'location': ''.join(['US East ', '(N. Virginia)'])})
+
+        self.assertIs(first[0], second[0])
+
+
+class TestCompactProduct(unittest.TestCase):
+    """CompactProduct 테스트 클래스"""
+
+    def test_pricing_and_attributes(self):
+        """가격 정보와 속성이 원래 형식 그대로 복원되는지 테스트"""
+        record = CompactProduct.from_parts('SKU1', ATTRIBUTES, PRICING, AttributeSchema())
+
+        self.assertEqual(record.pricing, PRICING)
+        self.assertEqual(record.attributes, ATTRIBUTES)
+        self.assertEqual(record.get_attribute('instanceType'), 'm5.large')
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_price_index_stores_compact_records(self):
+        """가격 색인이 CompactProduct로 레코드를 보관하는지 테스트"""
+        index = PriceIndex()
+        index.add('AmazonEC2', 'SKU1', ATTRIBUTES, PRICING)
+        key = index.key_for_attributes('AmazonEC2', ATTRIBUTES)
+        index.mark_complete(key)
+
+        records = index.lookup('AmazonEC2', [
+            {'type': 'TERM_MATCH', 'field': field, 'value': ATTRIBUTES[field]}
+            for field in ('location', 'instanceType', 'operatingSystem', 'tenancy')
+        ])
+
+        self.assertIsInstance(records[0], CompactProduct)
+        self.assertEqual(records[0].pricing, PRICING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Profiling 테스트
+
+요청 단위 프로파일링 인증, 스레드 풀 작업 합산, 메모리 할당 통계, /api/calculate 연동을 테스트하는 모듈입니다.
+"""
+
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import profiling
+from app_swagger import app
+from aws_pricing_client import AWSPricingClient, PricingCalculator
+from pricing_cache import PricingCache
+from rate_limiter import AdaptiveRateLimiter
+from test_pricing_calculator import make_pages, make_product
+
+
+def make_resources(count):
+    """인스턴스 타입이 모두 다른 테스트용 리소스 목록을 생성합니다."""
+    return [
+        {'serviceCode': 'AmazonEC2', 'quantity': 1, 'usageType': 'Hours', 'usageValue': 730,
+         'filters': [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': f'type{index}'}]}
+        for index in range(count)
+    ]
+
+
+def make_calculator(max_workers=4):
+    """필터의 인스턴스 타입으로 제품을 만들어 반환하는 테스트용 계산기를 생성합니다."""
+    pricing_client = MagicMock()
+    pricing_client.iter_products.side_effect = lambda service_code, filters: iter(
+        [make_product(filters[0]['value'], 0.1, instanceType=filters[0]['value'])]
+    )
+    return PricingCalculator(pricing_client, max_workers=max_workers, price_index=None)
+
+
+class TestAuthorization(unittest.TestCase):
+    """프로파일링 요청과 인증 테스트 클래스"""
+
+    def test_profile_requested(self):
+        """쿼리 매개변수나 헤더 중 하나로 프로파일링을 요청할 수 있는지 테스트"""
+        self.assertTrue(profiling.profile_requested('1', None))
+        self.assertTrue(profiling.profile_requested(None, 'true'))
+        self.assertFalse(profiling.profile_requested(None, None))
+        self.assertFalse(profiling.profile_requested('0', None))
+
+    def test_authorize(self):
+        """토큰이 설정되지 않았거나 다르면 거부하는지 테스트"""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('PRICING_PROFILE_TOKEN', None)
+            self.assertEqual(profiling.authorize('secret'), 'Profiling is not enabled')
+
+        with patch.dict(os.environ, {'PRICING_PROFILE_TOKEN': 'secret'}):
+            self.assertEqual(profiling.authorize('wrong'), 'Invalid profiling token')
+            self.assertEqual(profiling.authorize(None), 'Invalid profiling token')
+            self.assertIsNone(profiling.authorize('secret'))
+
+
+class TestProfileCall(unittest.TestCase):
+    """profile_call 테스트 클래스"""
+
+    def test_no_overhead_without_session(self):
+        """프로파일링 중이 아니면 스레드 풀 작업을 감싸지 않는지 테스트"""
+        func = lambda item: item  # noqa: E731
+        self.assertIs(profiling.bind_profile(func), func)
+
+    def test_merges_worker_threads(self):
+        """스레드 풀 작업의 프로파일과 계산기 코드의 할당 통계를 보고하는지 테스트"""
+        calculator = make_calculator()
+
+        result, report = profiling.profile_call(calculator.calculate_total_cost, make_resources(8))
+
+        self.assertEqual(len(result['resourceCosts']), 8)
+        self.assertGreater(report['threads'], 1)
+        functions = [row['function'] for row in report['functions']]
+        self.assertTrue(any('select_price_infos' in function for function in functions))
+        self.assertGreater(report['allocations']['peakBytes'], 0)
+        self.assertTrue(any(row['location'].startswith('aws_pricing_client.py:')
+                            for row in report['allocations']['top']))
+        calculator.shutdown()
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_includes_product_fetch_thread(self, mock_boto_client):
+        """iter_products의 페이지 조회 스레드에서 호출한 AWS 호출과 디코딩도 보고하는지 테스트"""
+        mock_boto_client.return_value.get_products.side_effect = make_pages(
+            [[make_product('SKU1', 0.1, instanceType='type0')], [make_product('SKU2', 0.2, instanceType='type0')]]
+        )
+        pricing_client = AWSPricingClient(cache=PricingCache(), rate_limiter=AdaptiveRateLimiter(rate=1000))
+        calculator = PricingCalculator(pricing_client, max_workers=1, price_index=None)
+
+        _, report = profiling.profile_call(calculator.calculate_total_cost, make_resources(1), limit=1000)
+
+        functions = [row['function'] for row in report['functions']]
+        for name in ('_iter_fetch_products', 'decode_product', '_call', 'select_price_infos'):
+            self.assertTrue(any(name in function for function in functions), name)
+        calculator.shutdown()
+
+    def test_busy(self):
+        """다른 요청을 프로파일링하는 중이면 ProfilerBusyError가 발생하는지 테스트"""
+        with profiling._profile_lock:
+            with self.assertRaises(profiling.ProfilerBusyError):
+                profiling.profile_call(lambda: None)
+
+    def test_store_pstats(self):
+        """PRICING_PROFILE_DIR을 설정하면 pstats 파일을 저장하는지 테스트"""
+        calculator = make_calculator(max_workers=1)
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with patch.dict(os.environ, {'PRICING_PROFILE_DIR': profile_dir}):
+                _, report = profiling.profile_call(calculator.calculate_total_cost, make_resources(2), name='calculate')
+
+            self.assertTrue(report['profileFile'].startswith('calculate-'))
+            stats = pstats.Stats(os.path.join(profile_dir, report['profileFile']))
+            self.assertTrue(any(name == 'calculate_total_cost' for _, _, name in stats.stats))
+        calculator.shutdown()
+
+
+class TestCalculateEndpointProfiling(unittest.TestCase):
+    """/api/calculate 프로파일링 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.calculator = make_calculator()
+        self.client = app.test_client()
+        self.body = {'resources': make_resources(3)}
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.calculator.shutdown()
+
+    def test_profile(self):
+        """토큰이 맞으면 계산 결과와 함께 프로파일 보고서를 반환하는지 테스트"""
+        with patch('app_swagger.pricing_calculator', self.calculator), \
+                patch.dict(os.environ, {'PRICING_PROFILE_TOKEN': 'secret'}):
+            response = self.client.post('/api/calculate?profile=1', json=self.body,
+                                        headers={'X-Profile-Token': 'secret'})
+            normal = self.client.post('/api/calculate', json=self.body)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['resourceCosts']), 3)
+        self.assertIn('functions', data['profile'])
+        self.assertNotIn('profile', normal.get_json())
+
+    def test_forbidden(self):
+        """토큰이 없거나 다르면 403을 반환하는지 테스트"""
+        with patch('app_swagger.pricing_calculator', self.calculator), \
+                patch.dict(os.environ, {'PRICING_PROFILE_TOKEN': 'secret'}):
+            response = self.client.post('/api/calculate', json=self.body,
+                                        headers={'X-Profile': '1', 'X-Profile-Token': 'wrong'})
+
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
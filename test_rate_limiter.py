@@ -0,0 +1,144 @@
+"""
+Rate Limiter 테스트
+
+AdaptiveRateLimiter의 속도 제한과 스로틀링, 일시적 오류 재시도 기능을 테스트하는 모듈입니다.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from rate_limiter import AdaptiveRateLimiter
+from aws_pricing_client import AWSPricingClient
+from pricing_cache import NullCache
+
+
+def make_client_error(code):
+    """테스트용 ClientError를 생성합니다."""
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'GetProducts')
+
+
+class FakeTime:
+    """테스트용 시계와 대기 함수"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """AdaptiveRateLimiter 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.time = FakeTime()
+
+    def make_limiter(self, **kwargs):
+        return AdaptiveRateLimiter(clock=self.time.clock, sleep=self.time.sleep, **kwargs)
+
+    def test_token_bucket_waits_when_empty(self):
+        """버킷이 비면 허용 속도에 맞춰 대기하는지 테스트"""
+        limiter = self.make_limiter(rate=2, burst=2)
+
+        for _ in range(4):
+            limiter.call(lambda: 'ok')
+
+        self.assertAlmostEqual(self.time.now, 1.0)
+        self.assertAlmostEqual(limiter.metrics()['rateLimitWaitSeconds'], 1.0)
+
+    def test_retry_on_throttling(self):
+        """스로틀링 오류 시 재시도하고 허용 속도를 줄이는지 테스트"""
+        limiter = self.make_limiter(rate=10, max_retries=3)
+        func = MagicMock(side_effect=[make_client_error('ThrottlingException'), 'ok'])
+
+        self.assertEqual(limiter.call(func), 'ok')
+
+        metrics = limiter.metrics()
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(metrics['retries'], 1)
+        self.assertEqual(metrics['throttles'], 1)
+        self.assertLess(metrics['currentRate'], 10)
+
+    def test_gives_up_after_max_retries(self):
+        """재시도 횟수를 초과하면 오류를 전파하는지 테스트"""
+        limiter = self.make_limiter(rate=10, max_retries=2)
+        func = MagicMock(side_effect=make_client_error('ThrottlingException'))
+
+        with self.assertRaises(ClientError):
+            limiter.call(func)
+
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(limiter.metrics()['failures'], 1)
+
+    def test_other_errors_not_retried(self):
+        """스로틀링이 아닌 오류는 재시도하지 않는지 테스트"""
+        limiter = self.make_limiter(rate=10)
+        func = MagicMock(side_effect=make_client_error('AccessDeniedException'))
+
+        with self.assertRaises(ClientError):
+            limiter.call(func)
+
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(limiter.metrics()['retries'], 0)
+
+    def test_retry_on_transient_errors(self):
+        """5xx 응답, 연결 실패, 시간 초과는 허용 속도를 줄이지 않고 재시도하는지 테스트"""
+        limiter = self.make_limiter(rate=10, max_transient_retries=3)
+        server_error = ClientError({'Error': {'Code': 'InternalFailure', 'Message': 'error'},
+                                    'ResponseMetadata': {'HTTPStatusCode': 503}}, 'GetProducts')
+        func = MagicMock(side_effect=[
+            server_error,
+            EndpointConnectionError(endpoint_url='https://api.pricing.us-east-1.amazonaws.com'),
+            ReadTimeoutError(endpoint_url='https://api.pricing.us-east-1.amazonaws.com'),
+            'ok'
+        ])
+
+        self.assertEqual(limiter.call(func), 'ok')
+
+        metrics = limiter.metrics()
+        self.assertEqual(func.call_count, 4)
+        self.assertEqual(metrics['retries'], 3)
+        self.assertEqual(metrics['transientErrors'], 3)
+        self.assertEqual(metrics['throttles'], 0)
+        self.assertEqual(metrics['currentRate'], 10)
+
+    def test_gives_up_after_max_transient_retries(self):
+        """일시적 오류가 계속되면 max_transient_retries번 재시도한 뒤 오류를 전파하는지 테스트"""
+        limiter = self.make_limiter(rate=10, max_transient_retries=2)
+        func = MagicMock(side_effect=EndpointConnectionError(endpoint_url='https://example.com'))
+
+        with self.assertRaises(EndpointConnectionError):
+            limiter.call(func)
+
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(limiter.metrics()['failures'], 1)
+
+
+class TestAWSPricingClientRateLimit(unittest.TestCase):
+    """AWSPricingClient 속도 제한 연동 테스트 클래스"""
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_services_retry_on_throttling(self, mock_boto_client):
+        """get_services 호출이 스로틀링 후 재시도되는지 테스트"""
+        fake_time = FakeTime()
+        limiter = AdaptiveRateLimiter(rate=10, clock=fake_time.clock, sleep=fake_time.sleep)
+        mock_boto_client.return_value.describe_services.side_effect = [
+            make_client_error('ThrottlingException'),
+            {'Services': [{'ServiceCode': 'AmazonEC2'}]}
+        ]
+        client = AWSPricingClient(cache=NullCache(), rate_limiter=limiter)
+
+        services = client.get_services()
+
+        self.assertEqual(services[0]['serviceCode'], 'AmazonEC2')
+        self.assertEqual(limiter.metrics()['retries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+"""
+Shared Price Table 테스트
+
+워커 프로세스가 공유하는 가격표 파일의 쓰기, 매핑 조회, 다시 매핑, PricingCalculator 연동을 테스트하는 모듈입니다.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from aws_pricing_client import PricingCalculator
+from offer_store import OfferStore
+from price_index import PriceIndex
+from shared_price_table import PriceTableWriter, SharedPriceTable
+from term_table import TermTable
+from test_offer_store import make_offer_file
+from test_price_index import EC2_ATTRIBUTES, EC2_FILTERS, make_product
+from test_term_table import make_product_with_terms
+
+TIERED_PRICING = {
+    'currency': 'USD',
+    'pricePerUnit': 0.023,
+    'unit': 'GB-Mo',
+    'description': '스토리지 요금',
+    'tiers': [
+        {'beginRange': 0.0, 'endRange': 51200.0, 'pricePerUnit': 0.023},
+        {'beginRange': 51200.0, 'endRange': None, 'pricePerUnit': 0.022}
+    ]
+}
+
+
+def write_table(path, products, pricing_by_sku=None):
+    """제품 목록으로 가격표 파일을 씁니다."""
+    calculator = PricingCalculator(MagicMock(), max_workers=1, price_index=None)
+    writer = PriceTableWriter()
+    writer.add_service('AmazonEC2')
+    for product in products:
+        sku = product['product']['sku']
+        pricing = (pricing_by_sku or {}).get(sku) or calculator._extract_price_from_product(product)
+        writer.add('AmazonEC2', sku, product['product']['attributes'], pricing, TermTable.from_product(product))
+    return writer.write(path)
+
+
+def read_price_in_child(path, queue):
+    """자식 프로세스에서 가격표를 조회합니다."""
+    queue.put(SharedPriceTable(path).lookup('AmazonEC2', EC2_FILTERS)[0].price_per_unit)
+
+
+class TestSharedPriceTable(unittest.TestCase):
+    """SharedPriceTable 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'prices.bin')
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """가격표 레코드가 원래 속성, 가격, 구간, 약정 행을 그대로 돌려주는지 테스트"""
+        product = make_product_with_terms(attributes={**EC2_ATTRIBUTES, 'note': '서울 리전'})
+        result = write_table(self.path, [product, make_product('S3', 0.023, dict(EC2_ATTRIBUTES))],
+                             pricing_by_sku={'S3': TIERED_PRICING})
+
+        self.assertEqual(result['services'], {'AmazonEC2': 2})
+        records = SharedPriceTable(self.path).lookup('AmazonEC2', list(reversed(EC2_FILTERS)))
+
+        self.assertEqual([record.sku for record in records], ['M5', 'S3'])
+        self.assertEqual(records[0].attributes, product['product']['attributes'])
+        self.assertEqual(records[0].get_attribute('note'), '서울 리전')
+        self.assertIsNone(records[0].get_attribute('vcpu'))
+        self.assertEqual(records[0].terms.rows, TermTable.from_product(product).rows)
+        self.assertEqual(records[1].pricing, TIERED_PRICING)
+        self.assertIsNone(records[1].terms.rows[0][1])
+
+    def test_complete_service(self):
+        """가격표에 있는 서비스는 없는 키에 빈 목록을, 색인할 수 없는 필터와 다른 서비스에는 None을 반환하는지 테스트"""
+        write_table(self.path, [make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES))])
+        table = SharedPriceTable(self.path)
+        other = [dict(item, value='c5.xlarge') if item['field'] == 'instanceType' else item for item in EC2_FILTERS]
+
+        self.assertEqual(len(table.lookup('AmazonEC2', other)), 0)
+        self.assertIsNone(table.lookup('AmazonEC2', EC2_FILTERS[:2]))
+        self.assertIsNone(table.lookup('AmazonRDS', EC2_FILTERS))
+        self.assertEqual(table.stats()['hits'], 1)
+        self.assertEqual(table.stats()['records'], 1)
+
+    def test_zero_copy_views(self):
+        """레코드 배열이 파일을 매핑한 읽기 전용 메모리의 뷰인지 테스트"""
+        write_table(self.path, [make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES))])
+        record = SharedPriceTable(self.path).lookup('AmazonEC2', EC2_FILTERS)[0]
+
+        prices = record.table.array('AmazonEC2', 'price')
+        self.assertFalse(prices.flags.writeable)
+        self.assertFalse(prices.flags.owndata)
+
+    def test_reload_after_replace(self):
+        """파일을 다시 만들면 확인 간격 뒤에 새 파일을 매핑하고, 이전 레코드도 계속 읽을 수 있는지 테스트"""
+        now = [0.0]
+        table = SharedPriceTable(self.path, check_interval=10, clock=lambda: now[0])
+        self.assertIsNone(table.lookup('AmazonEC2', EC2_FILTERS))
+
+        write_table(self.path, [make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES))])
+        now[0] = 10
+        old = table.lookup('AmazonEC2', EC2_FILTERS)[0]
+        write_table(self.path, [make_product('SKU1', 0.1, dict(EC2_ATTRIBUTES))])
+
+        now[0] = 15
+        self.assertEqual(table.lookup('AmazonEC2', EC2_FILTERS)[0].price_per_unit, 0.096)
+        now[0] = 20
+        self.assertEqual(table.lookup('AmazonEC2', EC2_FILTERS)[0].price_per_unit, 0.1)
+        self.assertEqual(old.price_per_unit, 0.096)
+        self.assertEqual(table.stats()['reloads'], 2)
+
+    def test_invalid_file(self):
+        """가격표 형식이 아닌 파일은 조회하지 않는지 테스트"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a price table')
+
+        self.assertIsNone(SharedPriceTable(self.path).lookup('AmazonEC2', EC2_FILTERS))
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'fork is not available')
+    def test_other_process(self):
+        """다른 프로세스가 같은 파일을 매핑하여 조회하는지 테스트"""
+        write_table(self.path, [make_product('SKU1', 0.096, dict(EC2_ATTRIBUTES))])
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        process = context.Process(target=read_price_in_child, args=(self.path, queue))
+        process.start()
+        process.join(10)
+
+        self.assertEqual(queue.get(timeout=1), 0.096)
+
+
+class TestCalculatorSharedPriceTable(unittest.TestCase):
+    """PricingCalculator 공유 가격표 연동 테스트 클래스"""
+
+    def test_same_result_as_price_index(self):
+        """공유 가격표 조회 결과가 가격 색인 조회 결과와 같은지 테스트"""
+        products = [make_product_with_terms(attributes=dict(EC2_ATTRIBUTES)),
+                    make_product_with_terms('M5B', 0.1, dict(EC2_ATTRIBUTES))]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'prices.bin')
+            write_table(path, products)
+            pricing_client = MagicMock()
+            shared = PricingCalculator(pricing_client, price_index=PriceIndex(), shared_table=SharedPriceTable(path))
+            indexed = PricingCalculator(pricing_client, price_index=PriceIndex())
+            indexed.index_products('AmazonEC2', products, EC2_FILTERS)
+
+            self.assertEqual(shared.calculate_price('AmazonEC2', EC2_FILTERS, purchase_options=True),
+                             indexed.calculate_price('AmazonEC2', EC2_FILTERS, purchase_options=True))
+            pricing_client.iter_products.assert_not_called()
+
+    def test_build_from_offer_store(self):
+        """오프라인 저장소 전체 카탈로그로 가격표를 만들고 계산기가 새 파일을 바로 읽는지 테스트"""
+        offer = make_offer_file()
+        for product in offer['products'].values():
+            product['attributes']['tenancy'] = 'Shared'
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'prices.bin')
+            store = OfferStore(os.path.join(tmpdir, 'offers.db'))
+            store.ingest(io.BytesIO(json.dumps(offer).encode('utf-8')))
+            pricing_client = MagicMock()
+            pricing_client.offer_store = store
+            calculator = PricingCalculator(pricing_client, price_index=PriceIndex(),
+                                           shared_table=SharedPriceTable(path, check_interval=3600))
+            self.assertIsNone(calculator.shared_table.lookup('AmazonEC2', EC2_FILTERS))
+
+            result = calculator.build_shared_price_table(path, ['AmazonEC2'])
+
+            self.assertEqual(result['services'], {'AmazonEC2': 3})
+            filters = [
+                {'type': 'TERM_MATCH', 'field': 'location', 'value': 'US East (N. Virginia)'},
+                {'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'},
+                {'type': 'TERM_MATCH', 'field': 'operatingSystem', 'value': 'Windows'},
+                {'type': 'TERM_MATCH', 'field': 'tenancy', 'value': 'Shared'}
+            ]
+            price_info = calculator.calculate_price('AmazonEC2', filters)['priceInfos'][0]
+            self.assertEqual(price_info['resourceDetails']['operatingSystem'], 'Windows')
+            self.assertEqual(calculator.price_index.stats()['hits'], 0)
+            with self.assertRaises(ValueError):
+                calculator.build_shared_price_table(path, ['AmazonRDS'])
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Single Flight 테스트
+
+동일한 조회 요청을 하나로 합치는 SingleFlight 기능을 테스트하는 모듈입니다.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from single_flight import SingleFlight
+from aws_pricing_client import AWSPricingClient
+from pricing_cache import NullCache
+
+
+class TestSingleFlight(unittest.TestCase):
+    """SingleFlight 테스트 클래스"""
+
+    def run_concurrently(self, count, func):
+        """func를 count개의 스레드에서 동시에 실행하고 결과 목록을 반환합니다."""
+        barrier = threading.Barrier(count)
+
+        def call():
+            barrier.wait()
+            return func()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(call) for _ in range(count)]
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_calls_coalesced(self):
+        """동시에 들어온 같은 키의 호출이 한 번만 실행되는지 테스트"""
+        single_flight = SingleFlight()
+        executions = []
+
+        def fetch():
+            executions.append(1)
+            time.sleep(0.05)
+            return ['result']
+
+        results = self.run_concurrently(8, lambda: single_flight.do('key', fetch))
+
+        self.assertEqual(len(executions), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        stats = single_flight.stats()
+        self.assertEqual(stats['calls'], 8)
+        self.assertEqual(stats['coalesced'], 7)
+        self.assertEqual(stats['inFlight'], 0)
+
+    def test_error_shared_with_waiters(self):
+        """실행 중 발생한 예외가 대기 중인 호출자에게도 전달되는지 테스트"""
+        single_flight = SingleFlight()
+
+        def fetch():
+            time.sleep(0.05)
+            raise ValueError('upstream failed')
+
+        results = self.run_concurrently(4, lambda: single_flight.do('key', fetch))
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    @patch('aws_pricing_client.boto3.client')
+    def test_client_coalesces_get_products(self, mock_boto_client):
+        """동일한 필터의 동시 get_products 요청이 한 번의 AWS 호출로 처리되는지 테스트"""
+        def get_products(**kwargs):
+            time.sleep(0.05)
+            return {'PriceList': ['{"product": {"sku": "ABC"}}']}
+
+        mock_boto_client.return_value.get_products.side_effect = get_products
+        client = AWSPricingClient(cache=NullCache())
+        filters = [{'type': 'TERM_MATCH', 'field': 'instanceType', 'value': 't2.micro'}]
+
+        results = self.run_concurrently(6, lambda: client.get_products('AmazonEC2', filters))
+
+        self.assertEqual(mock_boto_client.return_value.get_products.call_count, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(client.single_flight.stats()['coalesced'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+스트리밍 응답 테스트
+
+/api/calculate의 NDJSON / SSE 스트리밍 응답 기능을 테스트하는 모듈입니다.
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+from app_swagger import app
+
+
+RESOURCE_COST = {
+    'serviceCode': 'AmazonEC2',
+    'resourceDetails': {'instanceType': 't2.micro'},
+    'quantity': 1,
+    'usageDetails': {'type': 'Hours', 'value': 730},
+    'cost': 8.468
+}
+
+
+class TestStreamingResponses(unittest.TestCase):
+    """스트리밍 응답 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.app = app.test_client()
+        self.app.testing = True
+
+    @patch('app_swagger.pricing_calculator.iter_total_cost')
+    def test_calculate_ndjson(self, mock_iter_total_cost):
+        """Accept: application/x-ndjson 요청 시 리소스 비용과 총 비용을 한 줄씩 전송하는지 테스트"""
+        mock_iter_total_cost.return_value = iter([
+            {'type': 'resourceCost', 'index': 0, 'resourceCost': RESOURCE_COST},
+            {'type': 'totalCost', 'totalCost': {'currency': 'USD', 'amount': 8.468, 'timeUnit': 'monthly'},
+             'resourceCount': 1}
+        ])
+
+        response = self.app.post(
+            '/api/calculate',
+            json={'resources': [{'serviceCode': 'AmazonEC2', 'filters': []}]},
+            headers={'Accept': 'application/x-ndjson'}
+        )
+        lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual([line['type'] for line in lines], ['resourceCost', 'totalCost'])
+        self.assertEqual(lines[1]['totalCost']['amount'], 8.468)
+
+    @patch('app_swagger.pricing_calculator.calculate_price')
+    def test_pricing_json_only(self, mock_calculate_price):
+        """/api/pricing은 Accept: text/event-stream 요청에도 JSON으로 응답하는지 테스트"""
+        mock_calculate_price.return_value = {
+            'serviceCode': 'AmazonEC2',
+            'priceInfos': [{'serviceCode': 'AmazonEC2', 'pricing': {'pricePerUnit': 0.0116}}]
+        }
+
+        response = self.app.post(
+            '/api/pricing',
+            json={'serviceCode': 'AmazonEC2', 'filters': []},
+            headers={'Accept': 'text/event-stream'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.get_json()['priceInfos'][0]['pricing']['pricePerUnit'], 0.0116)
+
+    @patch('app_swagger.pricing_calculator.calculate_total_cost')
+    def test_json_by_default(self, mock_calculate_total_cost):
+        """Accept 헤더에 스트리밍 형식이 없으면 기존 JSON 응답을 반환하는지 테스트"""
+        mock_calculate_total_cost.return_value = {'totalCost': {'amount': 0}, 'resourceCosts': []}
+
+        response = self.app.post(
+            '/api/calculate',
+            json={'resources': [{'serviceCode': 'AmazonEC2', 'filters': []}]},
+            headers={'Accept': '*/*'}
+        )
+
+        self.assertEqual(response.mimetype, 'application/json')
+        mock_calculate_total_cost.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Term Table 테스트
+
+약정별 요금표 생성과 구매 옵션 계산, /api/pricing의 purchaseOptions 응답을 테스트하는 모듈입니다.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from app_swagger import app
+from aws_pricing_client import PricingCalculator
+from price_index import PriceIndex
+from term_table import TermTable
+from test_price_index import EC2_ATTRIBUTES, EC2_FILTERS
+
+
+def make_reserved_term(sku, code, lease, purchase_option, upfront, hourly, offering_class='standard'):
+    """테스트용 예약 약정 정보를 생성합니다."""
+    dimensions = {
+        f'{sku}.{code}.6YS6EN2CT7': {'unit': 'Hrs', 'description': 'hourly', 'pricePerUnit': {'USD': str(hourly)}}
+    }
+    if upfront:
+        dimensions[f'{sku}.{code}.2TG2D8R56U'] = {
+            'unit': 'Quantity', 'description': 'Upfront Fee', 'pricePerUnit': {'USD': str(upfront)}
+        }
+    return {
+        'offerTermCode': code,
+        'termAttributes': {
+            'LeaseContractLength': lease,
+            'OfferingClass': offering_class,
+            'PurchaseOption': purchase_option
+        },
+        'priceDimensions': dimensions
+    }
+
+
+def make_product_with_terms(sku='M5', hourly=0.096, attributes=EC2_ATTRIBUTES):
+    """온디맨드와 예약 약정이 있는 테스트용 제품 정보를 생성합니다."""
+    return {
+        'product': {'sku': sku, 'attributes': attributes},
+        'terms': {
+            'OnDemand': {f'{sku}.JRTCKXETXF': {'priceDimensions': {
+                f'{sku}.JRTCKXETXF.6YS6EN2CT7': {
+                    'unit': 'Hrs', 'description': 'on demand', 'pricePerUnit': {'USD': str(hourly)}
+                }
+            }}},
+            'Reserved': {
+                f'{sku}.NQ3QZPMQV9': make_reserved_term(sku, 'NQ3QZPMQV9', '3yr', 'All Upfront', 1000, 0),
+                f'{sku}.4NA7Y494T4': make_reserved_term(sku, '4NA7Y494T4', '1yr', 'No Upfront', 0, 0.06),
+                f'{sku}.HU7G6KETJZ': make_reserved_term(sku, 'HU7G6KETJZ', '1yr', 'Partial Upfront', 240, 0.03)
+            }
+        }
+    }
+
+
+class TestTermTable(unittest.TestCase):
+    """TermTable 테스트 클래스"""
+
+    def test_purchase_options(self):
+        """모든 약정을 읽어 실질 월 비용과 절감률을 계산하는지 테스트"""
+        table = TermTable.from_product(make_product_with_terms())
+
+        options = table.purchase_options()
+
+        self.assertEqual(
+            [(option['termType'], option['leaseContractLength'], option['purchaseOption']) for option in options],
+            [('OnDemand', None, None), ('Reserved', '1yr', 'No Upfront'),
+             ('Reserved', '1yr', 'Partial Upfront'), ('Reserved', '3yr', 'All Upfront')]
+        )
+        monthly = [option['effectiveMonthlyCost'] for option in options]
+        self.assertAlmostEqual(monthly[0], 0.096 * 730)
+        self.assertAlmostEqual(monthly[1], 0.06 * 730)
+        self.assertAlmostEqual(monthly[2], 0.03 * 730 + 240 / 12)
+        self.assertAlmostEqual(monthly[3], 1000 / 36)
+        self.assertEqual(options[0]['savingsVsOnDemand'], 0)
+        self.assertAlmostEqual(options[1]['savingsVsOnDemand'], round(1 - 0.06 / 0.096, 4))
+        self.assertEqual(options[2]['upfrontFee'], 240)
+
+    def test_no_terms(self):
+        """약정이 없는 제품은 None을 반환하는지 테스트"""
+        self.assertIsNone(TermTable.from_product({'product': {'sku': 'A'}, 'terms': {}}))
+
+
+class TestCalculatePricePurchaseOptions(unittest.TestCase):
+    """calculate_price의 purchase_options 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.pricing_client = MagicMock()
+        self.pricing_client.iter_products.side_effect = lambda service_code, filters: iter([make_product_with_terms()])
+
+    def test_from_products_and_index(self):
+        """조회한 제품과 가격 색인 모두에서 추가 호출 없이 구매 옵션을 반환하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=PriceIndex())
+
+        fetched = calculator.calculate_price('AmazonEC2', EC2_FILTERS, purchase_options=True)
+        indexed = calculator.calculate_price('AmazonEC2', EC2_FILTERS, purchase_options=True)
+
+        self.assertEqual(self.pricing_client.iter_products.call_count, 1)
+        self.assertEqual(len(fetched['priceInfos'][0]['purchaseOptions']), 4)
+        self.assertEqual(indexed['priceInfos'][0]['purchaseOptions'], fetched['priceInfos'][0]['purchaseOptions'])
+
+    def test_opt_in(self):
+        """purchase_options를 지정하지 않으면 응답 형식이 바뀌지 않는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=None)
+
+        result = calculator.calculate_price('AmazonEC2', EC2_FILTERS)
+
+        self.assertNotIn('purchaseOptions', result['priceInfos'][0])
+        self.assertEqual(result['priceInfos'][0]['pricing']['pricePerUnit'], 0.096)
+
+
+class TestPricingEndpointPurchaseOptions(unittest.TestCase):
+    """/api/pricing purchaseOptions 테스트 클래스"""
+
+    def test_purchase_options(self):
+        """purchaseOptions 요청 시 구매 옵션 목록을 반환하는지 테스트"""
+        pricing_client = MagicMock()
+        pricing_client.iter_products.side_effect = lambda service_code, filters: iter([make_product_with_terms()])
+        calculator = PricingCalculator(pricing_client, max_workers=1, price_index=None)
+
+        with patch('app_swagger.pricing_calculator', calculator):
+            response = app.test_client().post('/api/pricing', json={
+                'serviceCode': 'AmazonEC2',
+                'filters': EC2_FILTERS,
+                'purchaseOptions': True
+            })
+
+        self.assertEqual(response.status_code, 200)
+        options = response.get_json()['priceInfos'][0]['purchaseOptions']
+        self.assertEqual(options[-1]['leaseContractLength'], '3yr')
+        self.assertEqual(options[-1]['purchaseOption'], 'All Upfront')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tier Engine 테스트
+
+구간별 가격 요금표와 구간별 가격을 적용한 비용 계산을 테스트하는 모듈입니다.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from aws_pricing_client import PricingCalculator
+from cost_engine import ScenarioCalculator
+from product_record import AttributeSchema, CompactProduct
+from tier_engine import TierSchedule, parse_tiers
+
+
+S3_ATTRIBUTES = {'location': 'US East (N. Virginia)', 'storageClass': 'General Purpose', 'volumeType': 'Standard'}
+
+S3_FILTERS = [{'type': 'TERM_MATCH', 'field': field, 'value': value} for field, value in S3_ATTRIBUTES.items()]
+
+# S3 Standard 스토리지: 50TB까지 0.023, 다음 450TB는 0.022, 그 이상은 0.021 (GB-Mo)
+S3_TIERS = [(51200, 0.022), (0, 0.023), (512000, 0.021)]
+
+
+def make_tiered_product(sku='S3STD', tiers=S3_TIERS):
+    """가격 차원이 구간별로 나뉜 테스트용 제품 정보를 생성합니다 (차원 순서는 정렬되지 않음)."""
+    bounds = sorted(begin for begin, _ in tiers)
+    dimensions = {}
+    for position, (begin, price) in enumerate(tiers):
+        later = [bound for bound in bounds if bound > begin]
+        dimensions[f'{sku}.TERM.DIM{position}'] = {
+            'unit': 'GB-Mo',
+            'description': f'from {begin} GB',
+            'beginRange': str(begin),
+            'endRange': str(later[0]) if later else 'Inf',
+            'pricePerUnit': {'USD': str(price)}
+        }
+    return {
+        'product': {'sku': sku, 'attributes': S3_ATTRIBUTES},
+        'terms': {'OnDemand': {f'{sku}.TERM': {'priceDimensions': dimensions}}}
+    }
+
+
+def tiered_cost(usage):
+    """구간별 비용을 반복문으로 계산합니다 (기대값)."""
+    return min(usage, 51200) * 0.023 + min(max(usage - 51200, 0), 460800) * 0.022 + max(usage - 512000, 0) * 0.021
+
+
+class TestTierSchedule(unittest.TestCase):
+    """TierSchedule 테스트 클래스"""
+
+    def test_parse_tiers(self):
+        """가격 차원에서 구간을 시작점 순으로 추출하는지 테스트"""
+        tiers = parse_tiers(make_tiered_product()['terms']['OnDemand']['S3STD.TERM']['priceDimensions'])
+
+        self.assertEqual([tier['beginRange'] for tier in tiers], [0, 51200, 512000])
+        self.assertEqual(tiers[0]['endRange'], 51200)
+        self.assertIsNone(tiers[-1]['endRange'])
+
+    def test_cost(self):
+        """구간 경계 전후의 비용을 정확히 계산하는지 테스트"""
+        schedule = TierSchedule([0, 51200, 512000], [0.023, 0.022, 0.021])
+
+        for usage in (0, 1000, 51200, 51201, 300000, 512000, 2000000):
+            self.assertAlmostEqual(schedule.cost(usage), tiered_cost(usage))
+
+    def test_batch_matches_scalar(self):
+        """여러 사용량을 한 번에 계산한 결과가 하나씩 계산한 결과와 같은지 테스트"""
+        schedule = TierSchedule([0, 51200, 512000], [0.023, 0.022, 0.021])
+        usages = np.random.default_rng(0).uniform(0, 1000000, 1000)
+
+        np.testing.assert_allclose(schedule.costs(usages), [schedule.cost(usage) for usage in usages])
+
+    def test_usage_below_first_tier(self):
+        """첫 구간 시작점보다 작은 사용량은 비용이 0인지 테스트"""
+        schedule = TierSchedule([100, 200], [1.0, 0.5])
+
+        self.assertEqual(schedule.cost(50), 0)
+        self.assertEqual(schedule.costs([50, 150]).tolist(), [0, 50])
+
+
+class TestTieredCalculation(unittest.TestCase):
+    """구간별 가격 비용 계산 테스트 클래스"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.pricing_client = MagicMock()
+        self.pricing_client.iter_products.side_effect = lambda service_code, filters: iter([make_tiered_product()])
+        self.resources = [
+            {'serviceCode': 'AmazonS3', 'filters': S3_FILTERS, 'quantity': 1, 'usageType': 'GB-Mo', 'usageValue': usage}
+            for usage in (1000, 100000, 1000000)
+        ]
+
+    def test_extract_price_uses_first_tier(self):
+        """가격 정보의 단위당 가격은 첫 구간 가격이고 구간 목록을 포함하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=None)
+
+        pricing = calculator._extract_price_from_product(make_tiered_product())
+
+        self.assertEqual(pricing['pricePerUnit'], 0.023)
+        self.assertEqual(len(pricing['tiers']), 3)
+
+    def test_total_cost(self):
+        """calculate_total_cost가 리소스마다 구간 단가를 적용하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=None)
+
+        result = calculator.calculate_total_cost(self.resources)
+
+        self.assertEqual(self.pricing_client.iter_products.call_count, 1)
+        for resource_cost, resource in zip(result['resourceCosts'], self.resources):
+            self.assertAlmostEqual(resource_cost['cost'], tiered_cost(resource['usageValue']))
+        calculator.shutdown()
+
+    def test_compact_record_keeps_tiers(self):
+        """가격 색인 레코드가 구간별 가격을 그대로 보관하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=None)
+        pricing = calculator._extract_price_from_product(make_tiered_product())
+
+        record = CompactProduct.from_parts('S3STD', S3_ATTRIBUTES, pricing, AttributeSchema())
+
+        self.assertEqual(record.pricing, pricing)
+
+    def test_scenarios(self):
+        """시나리오 계산도 구간 단가를 적용하는지 테스트"""
+        calculator = PricingCalculator(self.pricing_client, max_workers=1, price_index=None)
+
+        result = ScenarioCalculator(calculator).calculate_scenarios(
+            self.resources, [{'name': 'baseline'}, {'name': 'double', 'usageScale': 2}]
+        )
+
+        baseline, double = (scenario['totalCost']['amount'] for scenario in result['scenarios'])
+        self.assertAlmostEqual(baseline, sum(tiered_cost(resource['usageValue']) for resource in self.resources))
+        self.assertAlmostEqual(double, sum(tiered_cost(resource['usageValue'] * 2) for resource in self.resources))
+        calculator.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Tier Engine
+
+구간(tier)별 단가가 다른 가격 차원(beginRange/endRange)으로 사용량의 비용을 계산하는 모듈입니다.
+
+S3 스토리지, 데이터 전송, Lambda 요청처럼 사용량 구간마다 단가가 달라지는 제품은
+가격 차원이 여러 개입니다. TierSchedule은 제품마다 구간 시작점(정렬된 배열), 구간 단가,
+구간 시작점까지의 누적 비용을 미리 계산해 두고, 사용량이 속한 구간을 이진 탐색으로 찾아
+누적 비용 + (사용량 - 구간 시작점) * 구간 단가로 비용을 계산합니다.
+여러 사용량은 numpy.searchsorted로 한 번에 계산합니다.
+"""
+
+import bisect
+import functools
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _parse_range(value: Any) -> Optional[float]:
+    """beginRange/endRange 값을 숫자로 변환합니다 ('Inf'는 None)."""
+    if value is None or value == '' or str(value).lower() == 'inf':
+        return None
+    return float(value)
+
+
+def parse_tiers(price_dimensions: Dict[str, Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    가격 차원 목록에서 구간 정보를 추출합니다.
+
+    Args:
+        price_dimensions (Dict[str, Dict[str, Any]]): 약정의 priceDimensions
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: beginRange 순으로 정렬된 구간 목록
+            (예: [{'beginRange': 0.0, 'endRange': 51200.0, 'pricePerUnit': 0.023}, ...]),
+            구간이 두 개 이상이 아니면 None
+
+    Raises:
+        ValueError: 구간이나 가격을 숫자로 읽을 수 없는 경우
+    """
+    tiers = []
+    begins = set()
+    for dimension in price_dimensions.values():
+        begin = _parse_range(dimension.get('beginRange'))
+        # 시작점이 같은 차원이 여러 개면 첫 번째 차원 사용
+        if begin is None or begin in begins:
+            continue
+        begins.add(begin)
+        tiers.append({
+            'beginRange': begin,
+            'endRange': _parse_range(dimension.get('endRange')),
+            'pricePerUnit': float(dimension.get('pricePerUnit', {}).get('USD', 0))
+        })
+
+    if len(tiers) < 2:
+        return None
+    return sorted(tiers, key=lambda tier: tier['beginRange'])
+
+
+class TierSchedule:
+    """구간별 단가 요금표 (구간 시작점, 구간 단가, 구간 시작점까지의 누적 비용)"""
+
+    __slots__ = ('breakpoints', 'rates', 'base_costs', '_bounds')
+
+    def __init__(self, breakpoints: Sequence[float], rates: Sequence[float]):
+        """
+        TierSchedule 초기화
+
+        Args:
+            breakpoints (Sequence[float]): 오름차순으로 정렬된 구간 시작점
+            rates (Sequence[float]): 구간별 단위당 가격
+
+        Raises:
+            ValueError: 구간이 없거나 시작점이 정렬되지 않은 경우
+        """
+        if not breakpoints or len(breakpoints) != len(rates):
+            raise ValueError("Tier breakpoints and rates must be non-empty and have the same length")
+        if any(later <= earlier for earlier, later in zip(breakpoints, breakpoints[1:])):
+            raise ValueError("Tier breakpoints must be strictly increasing")
+
+        self.breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        # 각 구간 시작점까지의 누적 비용
+        self.base_costs = np.concatenate(([0.0], np.cumsum(np.diff(self.breakpoints) * self.rates[:-1])))
+        # 사용량 하나를 계산할 때 bisect로 탐색할 시작점 튜플
+        self._bounds = tuple(float(breakpoint) for breakpoint in breakpoints)
+
+    @classmethod
+    def from_tiers(cls, tiers: Sequence[Dict[str, Any]]) -> 'TierSchedule':
+        """
+        parse_tiers 형식의 구간 목록으로 요금표를 만듭니다 (같은 구간 목록은 한 번만 계산).
+
+        Args:
+            tiers (Sequence[Dict[str, Any]]): beginRange 순으로 정렬된 구간 목록
+
+        Returns:
+            TierSchedule: 요금표
+        """
+        return _cached_schedule(tuple((tier['beginRange'], tier['pricePerUnit']) for tier in tiers))
+
+    @classmethod
+    def from_pricing(cls, pricing: Dict[str, Any]) -> 'TierSchedule':
+        """
+        가격 정보(_extract_price_from_product 결과)로 요금표를 만듭니다.
+
+        Args:
+            pricing (Dict[str, Any]): 가격 정보 (구간이 없으면 pricePerUnit 하나의 구간)
+
+        Returns:
+            TierSchedule: 요금표
+        """
+        tiers = pricing.get('tiers')
+        if tiers:
+            return cls.from_tiers(tiers)
+        return _cached_schedule(((0.0, float(pricing['pricePerUnit'])),))
+
+    def __len__(self) -> int:
+        return len(self.breakpoints)
+
+    def cost(self, usage: float) -> float:
+        """
+        사용량 하나의 비용을 계산합니다.
+
+        Args:
+            usage (float): 사용량 (예: GB, 요청 수)
+
+        Returns:
+            float: 구간별 단가를 적용한 비용 (첫 구간 시작점보다 작은 사용량은 0)
+        """
+        tier = bisect.bisect_right(self._bounds, usage) - 1
+        if tier < 0:
+            return 0.0
+        return float(self.base_costs[tier] + (usage - self.breakpoints[tier]) * self.rates[tier])
+
+    def costs(self, usages: Any) -> np.ndarray:
+        """
+        여러 사용량의 비용을 한 번에 계산합니다.
+
+        Args:
+            usages (Any): 사용량 배열 (또는 숫자 목록)
+
+        Returns:
+            np.ndarray: 사용량별 비용 (float64)
+        """
+        usages = np.asarray(usages, dtype=np.float64)
+        tiers = np.searchsorted(self.breakpoints, usages, side='right') - 1
+        below = tiers < 0
+        tiers = np.maximum(tiers, 0)
+        costs = self.base_costs[tiers] + (usages - self.breakpoints[tiers]) * self.rates[tiers]
+        return np.where(below, 0.0, costs)
+
+    def __repr__(self) -> str:
+        return f"TierSchedule(tiers={len(self.breakpoints)})"
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_schedule(tiers: Tuple[Tuple[float, float], ...]) -> TierSchedule:
+    return TierSchedule([begin for begin, _ in tiers], [rate for _, rate in tiers])
@@ -0,0 +1,11 @@
+"""
+WSGI 진입점
+
+gunicorn 등 WSGI 서버에서 API 서버를 실행하기 위한 모듈입니다.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app_swagger import app
+
+application = app